@@ -23,7 +23,6 @@ from datetime import timedelta
 from werkzeug.exceptions import HTTPException
 from werkzeug.middleware.proxy_fix import ProxyFix
 import os
-import json
 import time
 import logging
 from logging.config import dictConfig
@@ -394,17 +393,10 @@ def create_app():
 
     app.config.from_object(Config)
 
-    # Load cities data once during app startup and cache it
-    json_path = os.path.join(app.root_path, 'static', 'data', 'cities_by_country.json')
-    try:
-        with open(json_path, 'r') as f:
-            app.config['CITIES_BY_COUNTRY'] = json.load(f)
-    except FileNotFoundError:
-        app.logger.error(f"Could not find cities_by_country.json at {json_path}")
-        app.config['CITIES_BY_COUNTRY'] = {}  # Fallback to empty dict if file not found
-    except json.JSONDecodeError as e:
-        app.logger.error(f"Error decoding JSON file: {str(e)}")
-        app.config['CITIES_BY_COUNTRY'] = {}
+    # Compile the cities data once at startup into pre-encoded, ETagged
+    # per-country responses (shared by forked workers under preload_app)
+    from app.lib.city_index import init_city_index
+    init_city_index(app)
 
 
     # Static file configuration
@@ -590,6 +582,8 @@ def create_app():
     # when no kwargs — use gettext_js for runtime JS format strings.
     from flask_babel import gettext as gettext_js
     app.jinja_env.globals['gettext_js'] = gettext_js
+    from app.lib.image_variants import image_variant_url
+    app.jinja_env.globals['image_variant_url'] = image_variant_url
 
     @app.context_processor
     def inject_i18n():
@@ -699,6 +693,9 @@ def create_app():
         if not text:
             return ''
         import markdown as md
+        from app.lib.cpu_offload import MARKDOWN_OFFLOAD_MIN_CHARS, offload
+        if len(text) >= MARKDOWN_OFFLOAD_MIN_CHARS:
+            return Markup(offload('markdown', md.markdown, text, extensions=['extra', 'nl2br']))
         return Markup(md.markdown(text, extensions=['extra', 'nl2br']))
     
     def strip_so_what(text):
@@ -819,6 +816,8 @@ def create_app():
     # scikit-learn / native-library startup health check.
     # Runs once at boot so any sklearn unavailability surfaces immediately in
     # the startup logs rather than silently on the first scheduler tick.
+    # It only probes native libs and locates the package; sklearn itself is
+    # imported lazily by the first clustering call (see app/lib/lazy_import.py).
     from app.lib.sklearn_compat import check_sklearn_health
     _sklearn_health = check_sklearn_health()
     if _sklearn_health["sklearn_available"]:
@@ -1,5 +1,5 @@
 # app/admin/routes.py
-from flask import Blueprint, render_template, redirect, url_for, request, flash, current_app, session, jsonify
+from flask import Blueprint, render_template, redirect, url_for, request, flash, current_app, session, jsonify, abort
 from flask_login import login_required, current_user
 from app import db
 from app.models import User, IndividualProfile, CompanyProfile, Discussion, DailyQuestion, DailyQuestionResponse, DailyQuestionSubscriber, Statement, TrendingTopic, StatementFlag, DailyQuestionResponseFlag, NewsSource, Subscription, PricingPlan, StatementVote, Partner, PartnerDomain, PartnerApiKey, PartnerMember, PartnerUsageEvent, Programme, OrganizationMember, generate_unique_slug
@@ -18,6 +18,7 @@ from app.admin import admin_bp
 from app.decorators import admin_required
 from app.admin.audit import write_admin_audit_event
 from app.admin.utils import escape_like as _escape_like
+from app.lib import admin_counters
 
 # Import Polymarket admin routes
 try:
@@ -26,6 +27,7 @@ except ImportError:
     pass  # Polymarket routes are optional
 from sqlalchemy.orm import joinedload, aliased
 from sqlalchemy.exc import IntegrityError
+import hmac
 import time
 import os
 
@@ -58,17 +60,14 @@ def _log_admin_audit_event(action, target_type=None, target_id=None, metadata=No
 @login_required
 @admin_required
 def dashboard():
-    users_count = User.query.count()
-    individual_profiles_count = IndividualProfile.query.count()
-    company_profiles_count = CompanyProfile.query.count()
-    discussions_count = Discussion.query.count()
+    totals = admin_counters.table_totals(User, IndividualProfile, CompanyProfile, Discussion)
 
     return render_template(
         'admin/admin_dashboard.html',
-        users_count=users_count,
-        individual_profiles_count=individual_profiles_count,
-        company_profiles_count=company_profiles_count,
-        discussions_count=discussions_count
+        users_count=totals[User.__tablename__],
+        individual_profiles_count=totals[IndividualProfile.__tablename__],
+        company_profiles_count=totals[CompanyProfile.__tablename__],
+        discussions_count=totals[Discussion.__tablename__]
     )
 
 
@@ -118,6 +117,8 @@ def launch_room_health():
     from app.programmes.export_jobs import get_programme_export_queue_metrics
     from app.discussions.counter_integrity import get_statement_counter_drift_metrics
     from app.models import ConsensusJob, ProgrammeExportJob
+    from app.lib.storage_cache import cache_stats
+    from app.lib.job_dispatch import dispatch_stats
 
     consensus_metrics = get_consensus_queue_metrics()
     export_metrics = get_programme_export_queue_metrics()
@@ -147,6 +148,8 @@ def launch_room_health():
             "heartbeats": heartbeats["workers"],
             "errors": heartbeats["errors"],
         },
+        "storage_cache": cache_stats(),
+        "job_dispatch": dispatch_stats(),
         "slo_targets": {
             "api_latency_ms": {"p95": 500, "vote_p95": 200},
             "error_rate_max": 0.005,
@@ -160,6 +163,38 @@ def launch_room_health():
     return jsonify(response)
 
 
+def _scheduler_metrics_token_ok():
+    expected = current_app.config.get('SCHEDULER_METRICS_TOKEN')
+    supplied = request.headers.get('Authorization', '')
+    if not expected or not supplied.startswith('Bearer '):
+        return False
+    return hmac.compare_digest(supplied[len('Bearer '):].strip(), expected)
+
+
+@admin_bp.route('/launch-room/scheduler')
+@login_required
+@admin_required
+def scheduler_metrics_page():
+    """Per-job scheduler run time, lag, overlap skips and query counts."""
+    from app.lib.scheduler_metrics import job_summaries, snapshot
+
+    return render_template('admin/scheduler_metrics.html', jobs=job_summaries(snapshot()))
+
+
+@admin_bp.route('/launch-room/scheduler/metrics')
+def scheduler_metrics_export():
+    """Prometheus text exposition of the scheduler job metrics."""
+    from app.lib.scheduler_metrics import render_prometheus, snapshot
+
+    if not _scheduler_metrics_token_ok() and not (current_user.is_authenticated and current_user.is_admin):
+        abort(403)
+    return current_app.response_class(
+        render_prometheus(snapshot()),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+        headers={'Cache-Control': 'no-store'},
+    )
+
+
 # Profile Management Routes
 @admin_bp.route('/profiles')
 @login_required
@@ -1759,15 +1794,15 @@ def list_daily_subscribers():
     else:
         available_users = []
 
+    breakdown = admin_counters.grouped_counts(DailyQuestionSubscriber.is_active, DailyQuestionSubscriber.email_frequency)
     status_counts = {
-        'active': DailyQuestionSubscriber.query.filter_by(is_active=True).count(),
-        'unsubscribed': DailyQuestionSubscriber.query.filter_by(is_active=False).count(),
+        'active': sum(count for (is_active, _), count in breakdown.items() if is_active is True),
+        'unsubscribed': sum(count for (is_active, _), count in breakdown.items() if is_active is False),
     }
 
     frequency_counts = {
-        'daily': DailyQuestionSubscriber.query.filter_by(email_frequency='daily', is_active=True).count(),
-        'weekly': DailyQuestionSubscriber.query.filter_by(email_frequency='weekly', is_active=True).count(),
-        'monthly': DailyQuestionSubscriber.query.filter_by(email_frequency='monthly', is_active=True).count(),
+        frequency: breakdown.get((True, frequency), 0)
+        for frequency in ('daily', 'weekly', 'monthly')
     }
 
     return render_template(
@@ -1785,6 +1820,10 @@ def list_daily_subscribers():
     )
 
 
+def _invalidate_subscriber_counts():
+    admin_counters.invalidate(DailyQuestionSubscriber.is_active, DailyQuestionSubscriber.email_frequency)
+
+
 @admin_bp.route('/daily-questions/subscribers/bulk-add', methods=['POST'])
 @login_required
 @admin_required
@@ -1799,6 +1838,7 @@ def bulk_subscribe_users():
         current_app.logger.error(f"Bulk subscribe error: {e}")
         flash(f'Error during bulk subscription: {str(e)}', 'error')
     
+    _invalidate_subscriber_counts()
     return redirect(url_for('admin.list_daily_subscribers'))
 
 
@@ -1844,6 +1884,7 @@ def add_subscriber():
             db.session.rollback()
     
     flash(f'Added {added} subscriber(s).', 'success')
+    _invalidate_subscriber_counts()
     return redirect(url_for('admin.list_daily_subscribers'))
 
 
@@ -1858,6 +1899,7 @@ def toggle_subscriber(subscriber_id):
     
     status = 'activated' if subscriber.is_active else 'deactivated'
     flash(f'Subscriber {subscriber.email} {status}.', 'success')
+    _invalidate_subscriber_counts()
     return redirect(url_for('admin.list_daily_subscribers'))
 
 
@@ -1890,6 +1932,7 @@ def update_subscriber_frequency(subscriber_id):
     db.session.commit()
     
     flash(f'Updated {subscriber.email} to {new_frequency} emails.', 'success')
+    _invalidate_subscriber_counts()
     return redirect(url_for('admin.list_daily_subscribers'))
 
 
@@ -1907,6 +1950,7 @@ def delete_subscriber(subscriber_id):
     db.session.commit()
 
     flash(f'Subscriber {email} removed.', 'success')
+    _invalidate_subscriber_counts()
     return redirect(url_for('admin.list_daily_subscribers'))
 
 
@@ -1934,6 +1978,7 @@ def bulk_remove_subscribers():
     removed = delete_question_subscribers_bulk(int_ids)
     db.session.commit()
     flash(f'Removed {removed} subscriber(s).', 'success')
+    _invalidate_subscriber_counts()
     return redirect(url_for('admin.list_daily_subscribers'))
 
 
@@ -2009,6 +2054,7 @@ def bulk_import_subscribers():
         msg_parts.append(f'{skipped_invalid} invalid')
     
     flash(', '.join(msg_parts) if msg_parts else 'No emails processed.', 'success' if added else 'info')
+    _invalidate_subscriber_counts()
     return redirect(url_for('admin.list_daily_subscribers'))
 
 
@@ -2078,7 +2124,7 @@ def list_statement_flags():
         joinedload(StatementFlag.statement),
         joinedload(StatementFlag.flagger),
         joinedload(StatementFlag.reviewer)
-    ).join(Statement, StatementFlag.statement_id == Statement.id).outerjoin(flagger, StatementFlag.flagged_by_user_id == flagger.id)
+    ).join(Statement, StatementFlag.statement_id == Statement.id).outerjoin(flagger, StatementFlag.flagger_user_id == flagger.id)
 
     # Apply filters
     if status_filter and status_filter != 'all':
@@ -2104,9 +2150,10 @@ def list_statement_flags():
     flags = query.paginate(page=page, per_page=per_page, error_out=False)
 
     # Get counts for summary
-    pending_count = StatementFlag.query.filter_by(status='pending').count()
-    reviewed_count = StatementFlag.query.filter_by(status='reviewed').count()
-    dismissed_count = StatementFlag.query.filter_by(status='dismissed').count()
+    counts = admin_counters.status_counts(StatementFlag.status)
+    pending_count = counts.get('pending', 0)
+    reviewed_count = counts.get('reviewed', 0)
+    dismissed_count = counts.get('dismissed', 0)
 
     return render_template(
         'admin/flags/statement_flags.html',
@@ -2153,6 +2200,7 @@ def review_statement_flag(flag_id):
             flag.additional_context = review_notes
 
         db.session.commit()
+        admin_counters.invalidate(StatementFlag.status)
         current_app.logger.info(f"Admin {current_user.username} {action}ed statement flag {flag_id}")
         flash(flash_msg, 'success')
     except Exception as e:
@@ -2205,6 +2253,7 @@ def bulk_review_statement_flags():
             processed += 1
 
         db.session.commit()
+        admin_counters.invalidate(StatementFlag.status)
         action_word = 'approved' if action == 'approve' else 'dismissed'
 
         msg_parts = [f'{processed} flag(s) {action_word}']
@@ -2269,10 +2318,11 @@ def list_response_flags():
     flags = query.paginate(page=page, per_page=per_page, error_out=False)
 
     # Get counts for summary
-    pending_count = DailyQuestionResponseFlag.query.filter_by(status='pending').count()
-    reviewed_valid_count = DailyQuestionResponseFlag.query.filter_by(status='reviewed_valid').count()
-    reviewed_invalid_count = DailyQuestionResponseFlag.query.filter_by(status='reviewed_invalid').count()
-    dismissed_count = DailyQuestionResponseFlag.query.filter_by(status='dismissed').count()
+    counts = admin_counters.status_counts(DailyQuestionResponseFlag.status)
+    pending_count = counts.get('pending', 0)
+    reviewed_valid_count = counts.get('reviewed_valid', 0)
+    reviewed_invalid_count = counts.get('reviewed_invalid', 0)
+    dismissed_count = counts.get('dismissed', 0)
 
     return render_template(
         'admin/flags/response_flags.html',
@@ -2341,6 +2391,7 @@ def review_response_flag(flag_id):
             flag.review_notes = review_notes
 
         db.session.commit()
+        admin_counters.invalidate(DailyQuestionResponseFlag.status)
         current_app.logger.info(f"Admin {current_user.username} marked response flag {flag_id} as {action}")
         flash(flash_msg, 'success')
     except Exception as e:
@@ -2411,6 +2462,7 @@ def bulk_review_response_flags():
             processed += 1
 
         db.session.commit()
+        admin_counters.invalidate(DailyQuestionResponseFlag.status)
         action_msg = {
             'valid': 'validated',
             'invalid': 'marked invalid',
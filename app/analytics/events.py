@@ -1,11 +1,12 @@
-from datetime import timedelta
+from datetime import date, datetime, time, timedelta
 import logging
 
-from sqlalchemy import and_, distinct, func
+from sqlalchemy import and_, func
 
 from app import db
+from app.lib.hyperloglog import HyperLogLog
 from app.lib.time import utcnow_naive
-from app.models import AnalyticsDailyAggregate, AnalyticsEvent, Discussion
+from app.models import AnalyticsDailyAggregate, AnalyticsEvent, AnalyticsRollupState, Discussion
 
 logger = logging.getLogger(__name__)
 
@@ -51,58 +52,182 @@ def record_event(event_name, commit=True, **kwargs):
         return None
 
 
-def rollup_analytics_daily(days_back=14):
-    """
-    Rebuild daily aggregates for recent window from raw immutable events.
-    Deterministic delete+insert by date window to avoid drift.
-    """
-    end_time = utcnow_naive()
-    start_time = end_time - timedelta(days=max(1, days_back))
-    start_date = start_time.date()
+ROLLUP_STATE_NAME = 'analytics_daily'
+
+# Incremental runs only fold events older than this. Ids come from a sequence
+# allocated at INSERT time, so a slow transaction can commit a lower id after a
+# higher one is visible; holding back the newest events keeps the watermark
+# from skipping them. The nightly full rebuild repairs anything that still slips.
+INCREMENTAL_SAFETY_LAG = timedelta(minutes=2)
+
+_AGGREGATE_DIMS = ('event_date', 'event_name', 'programme_id', 'discussion_id', 'cohort_slug', 'country')
 
-    db.session.query(AnalyticsDailyAggregate).filter(
-        AnalyticsDailyAggregate.event_date >= start_date
-    ).delete(synchronize_session=False)
-    db.session.flush()
 
+def _lock_rollup_state(create=True):
+    """Fetch the rollup watermark row locked FOR UPDATE, creating it if ``create``."""
+    state = db.session.query(AnalyticsRollupState).filter_by(
+        name=ROLLUP_STATE_NAME
+    ).with_for_update().first()
+    if state is None and create:
+        state = AnalyticsRollupState(name=ROLLUP_STATE_NAME, last_event_id=0)
+        db.session.add(state)
+        db.session.flush()
+    return state
+
+
+def _fold_events(*filters):
+    """
+    Group canonical events matching ``filters`` by aggregate dimensions.
+
+    Returns ``{dims: (event_count, HyperLogLog)}``. Grouping includes user_id
+    so the sketch is fed distinct users without shipping every event row.
+    """
+    event_date = func.date(AnalyticsEvent.created_at)
     rows = db.session.query(
-        func.date(AnalyticsEvent.created_at).label('event_date'),
+        event_date.label('event_date'),
         AnalyticsEvent.event_name,
         AnalyticsEvent.programme_id,
         AnalyticsEvent.discussion_id,
         AnalyticsEvent.cohort_slug,
         AnalyticsEvent.country,
+        AnalyticsEvent.user_id,
         func.count(AnalyticsEvent.id).label('event_count'),
-        func.count(distinct(AnalyticsEvent.user_id)).label('unique_users'),
     ).filter(
-        and_(
-            AnalyticsEvent.created_at >= start_time,
-            AnalyticsEvent.event_name.in_(list(CANONICAL_EVENT_NAMES))
-        )
+        AnalyticsEvent.event_name.in_(list(CANONICAL_EVENT_NAMES)),
+        *filters,
     ).group_by(
-        func.date(AnalyticsEvent.created_at),
+        event_date,
         AnalyticsEvent.event_name,
         AnalyticsEvent.programme_id,
         AnalyticsEvent.discussion_id,
         AnalyticsEvent.cohort_slug,
         AnalyticsEvent.country,
+        AnalyticsEvent.user_id,
     ).all()
 
+    groups = {}
     for row in rows:
-        aggregate = AnalyticsDailyAggregate(
-            event_date=row.event_date,
-            event_name=row.event_name,
-            programme_id=row.programme_id,
-            discussion_id=row.discussion_id,
-            cohort_slug=row.cohort_slug,
-            country=row.country,
-            event_count=int(row.event_count or 0),
-            unique_users=int(row.unique_users or 0),
+        day = row.event_date
+        if isinstance(day, str):  # SQLite returns DATE() as text
+            day = date.fromisoformat(day)
+        dims = (day, row.event_name, row.programme_id, row.discussion_id, row.cohort_slug, row.country)
+        count, sketch = groups.get(dims, (0, None))
+        if sketch is None:
+            sketch = HyperLogLog()
+        if row.user_id is not None:
+            sketch.add(row.user_id)
+        groups[dims] = (count + int(row.event_count or 0), sketch)
+    return groups
+
+
+def _merge_into_aggregates(groups):
+    """Add folded event groups onto existing aggregate rows (or create them)."""
+    if not groups:
+        return
+    dates = {dims[0] for dims in groups}
+    names = {dims[1] for dims in groups}
+    # Nullable dimensions rule out ON CONFLICT on uq_analytics_daily_dims
+    # (NULLs never conflict), so match existing rows in Python instead.
+    existing = {
+        tuple(getattr(row, dim) for dim in _AGGREGATE_DIMS): row
+        for row in AnalyticsDailyAggregate.query.filter(
+            AnalyticsDailyAggregate.event_date.in_(dates),
+            AnalyticsDailyAggregate.event_name.in_(names),
+        ).all()
+    }
+
+    for dims, (count, sketch) in groups.items():
+        row = existing.get(dims)
+        if row is None:
+            row = AnalyticsDailyAggregate(
+                **dict(zip(_AGGREGATE_DIMS, dims)),
+                event_count=0,
+                unique_users=0,
+            )
+            db.session.add(row)
+            previous = HyperLogLog()
+        else:
+            previous = HyperLogLog.from_bytes(row.unique_users_sketch)
+        row.event_count = int(row.event_count or 0) + count
+        if previous is None:
+            # Row predates sketches: the new users cannot be de-duplicated
+            # against it, so keep a lower bound until the next full rebuild.
+            row.unique_users_sketch = sketch.to_bytes()
+            row.unique_users = max(int(row.unique_users or 0), sketch.count())
+        else:
+            previous.merge(sketch)
+            row.unique_users_sketch = previous.to_bytes()
+            row.unique_users = previous.count()
+
+
+def rollup_analytics_incremental():
+    """
+    Fold events added since the last run into the daily aggregates.
+
+    Reads only events above the high-water mark, updates just the affected
+    (date, event, programme, discussion, cohort, country) groups, and merges
+    their distinct-user sketches. Returns the number of groups touched.
+    """
+    state = _lock_rollup_state(create=False)
+    if state is None:
+        # No watermark yet, but the aggregates may already count the whole
+        # event history: folding from id 0 would double every event_count.
+        # Rebuild the recent window instead; it starts the watermark at max(id).
+        return rollup_analytics_daily()
+    cutoff = utcnow_naive() - INCREMENTAL_SAFETY_LAG
+    upper = db.session.query(func.max(AnalyticsEvent.id)).filter(
+        AnalyticsEvent.id > state.last_event_id,
+        AnalyticsEvent.created_at < cutoff,
+    ).scalar()
+    if not upper:
+        db.session.commit()
+        return 0
+
+    groups = _fold_events(
+        AnalyticsEvent.id > state.last_event_id,
+        AnalyticsEvent.id <= upper,
+    )
+    _merge_into_aggregates(groups)
+    state.last_event_id = upper
+    db.session.commit()
+    return len(groups)
+
+
+def rollup_analytics_daily(days_back=14):
+    """
+    Full rebuild of daily aggregates for the recent window from raw events.
+    Deterministic delete+insert by date window to avoid drift; kept for repair
+    alongside ``rollup_analytics_incremental``. Advances the shared watermark
+    so the incremental path does not count rebuilt events twice.
+    """
+    state = _lock_rollup_state()
+    end_time = utcnow_naive()
+    start_time = end_time - timedelta(days=max(1, days_back))
+    start_date = start_time.date()
+    upper = db.session.query(func.max(AnalyticsEvent.id)).scalar() or 0
+
+    db.session.query(AnalyticsDailyAggregate).filter(
+        AnalyticsDailyAggregate.event_date >= start_date
+    ).delete(synchronize_session=False)
+    db.session.flush()
+
+    groups = _fold_events(
+        and_(
+            AnalyticsEvent.created_at >= datetime.combine(start_date, time.min),
+            AnalyticsEvent.id <= upper,
         )
-        db.session.add(aggregate)
+    )
+    for dims, (count, sketch) in groups.items():
+        db.session.add(AnalyticsDailyAggregate(
+            **dict(zip(_AGGREGATE_DIMS, dims)),
+            event_count=count,
+            unique_users=sketch.count(),
+            unique_users_sketch=sketch.to_bytes(),
+        ))
 
+    state.last_event_id = max(int(state.last_event_id or 0), upper)
     db.session.commit()
-    return len(rows)
+    return len(groups)
 
 
 def event_context_for_discussion(discussion_id):
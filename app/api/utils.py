@@ -287,6 +287,28 @@ def get_discussion_participant_count(
     Returns:
         int: Number of unique participants
     """
+    if not include_deleted_statement_votes and min_mod_status == 0:
+        # Published semantics are maintained in ``discussion_stats``.
+        from app.discussions.discussion_stats import get_discussion_stats
+        return get_discussion_stats(discussion.id)['participant_count']
+    return count_discussion_participants(
+        discussion.id,
+        include_deleted_statement_votes=include_deleted_statement_votes,
+        min_mod_status=min_mod_status,
+    )
+
+
+def count_discussion_participants(
+    discussion_id,
+    include_deleted_statement_votes=False,
+    min_mod_status=0,
+):
+    """
+    Exact distinct-participant count from ``statement_vote`` rows.
+
+    Same arguments as ``get_discussion_participant_count``; use this when the
+    maintained ``discussion_stats`` figure must not be trusted (reconciliation).
+    """
     from sqlalchemy import func, distinct
     from app import db
     from app.models import StatementVote, Statement
@@ -295,7 +317,7 @@ def get_discussion_participant_count(
     user_query = db.session.query(
         func.count(distinct(StatementVote.user_id))
     ).filter(
-        StatementVote.discussion_id == discussion.id,
+        StatementVote.discussion_id == discussion_id,
         StatementVote.user_id.isnot(None)
     )
     if not include_deleted_statement_votes or min_mod_status is not None:
@@ -312,7 +334,7 @@ def get_discussion_participant_count(
     anon_query = db.session.query(
         func.count(distinct(StatementVote.session_fingerprint))
     ).filter(
-        StatementVote.discussion_id == discussion.id,
+        StatementVote.discussion_id == discussion_id,
         StatementVote.user_id.is_(None),
         StatementVote.session_fingerprint.isnot(None)
     )
@@ -9,6 +9,7 @@ from flask_login import login_required, current_user
 from datetime import date, datetime, timedelta
 from app.lib.time import utcnow_naive
 from app import db
+from app.lib.queue_wakeup import QUEUE_EMERGENCY_BRIEF, notify
 from app.models import DailyBrief, BriefItem, TrendingTopic, User
 from app.brief.generator import generate_daily_brief
 from app.brief.topic_selector import select_todays_topics
@@ -316,6 +317,7 @@ def emergency_generate():
         r.set(f'{key}:step', 'Queued — waiting for scheduler pickup...', ex=900)
         r.delete(f'{key}:error')
         r.delete(f'{key}:queue_alerted')
+        notify(QUEUE_EMERGENCY_BRIEF)
         
         logger.info(f"Emergency brief generation queued for {brief_date}")
         flash('Emergency generation started in the background. This page will update automatically.', 'success')
@@ -126,6 +126,8 @@ class AudioStorage:
         Returns:
             True if deleted, False otherwise
         """
+        from app.lib.storage_cache import invalidate
+        invalidate(f"audio/{filename}")
         try:
             if self.provider == 's3':
                 return self._delete_s3(filename)
@@ -10,7 +10,7 @@ import secrets
 import threading
 import logging
 import pytz
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 from app.lib.time import utcnow_naive
 from email.utils import parseaddr
 from typing import List, Optional
@@ -23,6 +23,7 @@ from app.resend_client import (
     _email_sending_allowed_for_environment,
 )
 from app.briefing.link_tracker import wrap_links as _wrap_links, sign_url as _sign_url
+from app.lib.send_claims import ack_sends, claim_for_send, new_send_id, per_row_value
 from app.storage_utils import get_base_url
 
 try:
@@ -32,6 +33,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Subscribers claimed, sent and acknowledged together by send_to_subscribers.
+BRIEF_SEND_PAGE_SIZE = 100
+
 
 _SYSTEM_FONT = (
     "-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,"
@@ -259,7 +263,8 @@ class ResendClient:
     def send_brief(
         self,
         subscriber: DailyBriefSubscriber,
-        brief: DailyBrief
+        brief: DailyBrief,
+        record: bool = True,
     ) -> bool:
         """
         Send brief email to a subscriber.
@@ -267,6 +272,9 @@ class ResendClient:
         Args:
             subscriber: DailyBriefSubscriber instance
             brief: DailyBrief instance to send
+            record: Write the outcome (last_sent_at, bounce suppression,
+                    send analytics) for this subscriber. Bulk sends pass
+                    False and acknowledge the whole page at once.
 
         Returns:
             bool: True if sent successfully
@@ -296,18 +304,10 @@ class ResendClient:
             unsubscribe_url = f"{base_url}/brief/unsubscribe/{subscriber.unsubscribe_token or subscriber.magic_token}"
             preferences_url = f"{base_url}/brief/preferences/{subscriber.magic_token}"
 
-            # Render email HTML (sorted_items passed to avoid a second DB query)
-            html_content = self._render_email(subscriber, brief, sorted_items=sorted_items)
-
-            # Wrap links for click tracking (tracks clicks in EmailEvent)
-            secret = current_app.config.get('SECRET_KEY', '')
-            html_content = _wrap_links(
-                html=html_content,
-                base_url=base_url,
-                run_id=brief.id,
-                r_hash=str(subscriber.id),
-                secret=secret,
-                track_path='/brief/track/click',
+            # Render email HTML (sorted_items passed to avoid a second DB query),
+            # with links wrapped for click tracking (tracks clicks in EmailEvent)
+            html_content = self._render_email(
+                subscriber, brief, sorted_items=sorted_items, track_clicks=True,
             )
 
             # Prepare email data with List-Unsubscribe headers for compliance
@@ -351,6 +351,9 @@ class ResendClient:
             send_idempotency_key = f"brief:{brief.id}:{subscriber.id}"
             success = self._send_with_retry(email_data, idempotency_key=send_idempotency_key)
 
+            if not record:
+                return success
+
             if success:
                 subscriber.last_sent_at = utcnow_naive()
                 subscriber.last_brief_id_sent = brief.id
@@ -441,15 +444,21 @@ class ResendClient:
         subscriber: DailyBriefSubscriber,
         brief: DailyBrief,
         sorted_items=None,
+        track_clicks: bool = False,
     ) -> str:
         """
         Render email HTML from template.
 
+        The brief is rendered and minified once per send (see
+        app/lib/bulk_email_render.py); each subscriber only fills in their
+        own magic, preferences and unsubscribe URLs.
+
         Args:
             subscriber: Subscriber info for personalization
             brief: Brief content to render
             sorted_items: Pre-fetched brief items (avoids a redundant DB query when
                           called from send_brief which already fetches them for the text renderer)
+            track_clicks: Rewrite links through /brief/track/click for this subscriber
 
         Returns:
             str: HTML email content
@@ -468,40 +477,57 @@ class ResendClient:
         # Note: This assumes template exists at templates/emails/daily_brief.html
         # DailyBriefSubscriber has no language field; the daily brief is an
         # English-language news product, so we render under the default 'en'
-        # locale. Pass None to _render_for_user so it pins the locale
-        # explicitly rather than inheriting from an unrelated request context.
-        from app.resend_client import _render_for_user as _render_email_for_user
+        # locale. Pass None as the user so the locale is pinned explicitly
+        # rather than inherited from an unrelated request context.
+        from app.lib.bulk_email_render import ClickTracking, bulk_renderer_for
         from app.lib.personal_briefs_cta import (
             personal_briefs_cta_url,
             DEFAULT_TRIAL_TEMPLATE_SLUG,
         )
-        # Default to the global trial template for cold-traffic conversion
-        # when the self-serve flow is enabled. See build doc Block C item 16.
-        personal_briefs_url = personal_briefs_cta_url(
-            base_url,
-            utm_source='daily_brief',
-            utm_medium='email',
-            utm_campaign='personal_briefs_cta',
-            template_slug=DEFAULT_TRIAL_TEMPLATE_SLUG,
-        )
+
+        def shared_context(_placeholders):
+            # Default to the global trial template for cold-traffic conversion
+            # when the self-serve flow is enabled. See build doc Block C item 16.
+            personal_briefs_url = personal_briefs_cta_url(
+                base_url,
+                utm_source='daily_brief',
+                utm_medium='email',
+                utm_campaign='personal_briefs_cta',
+                template_slug=DEFAULT_TRIAL_TEMPLATE_SLUG,
+            )
+            return {
+                'brief': brief,
+                'sorted_items': sorted_items,
+                'base_url': base_url,
+                'personal_briefs_cta_url': personal_briefs_url,
+                'SECTIONS': SECTIONS,
+                'TOPIC_DISPLAY_LABELS': TOPIC_DISPLAY_LABELS,
+                'TOPIC_DISPLAY_COLORS': TOPIC_DISPLAY_COLORS,
+            }
+
+        tracking = None
+        if track_clicks:
+            tracking = ClickTracking(
+                base_url=base_url,
+                run_id=brief.id,
+                secret=current_app.config.get('SECRET_KEY', ''),
+                track_path='/brief/track/click',
+            )
         try:
-            html = _render_email_for_user(
+            return bulk_renderer_for(self).render(
                 None,
                 'emails/daily_brief.html',
-                brief=brief,
-                sorted_items=sorted_items,
-                subscriber=subscriber,
-                magic_link_url=magic_link_url,
-                unsubscribe_url=unsubscribe_url,
-                preferences_url=preferences_url,
-                base_url=base_url,
-                personal_briefs_cta_url=personal_briefs_url,
-                SECTIONS=SECTIONS,
-                TOPIC_DISPLAY_LABELS=TOPIC_DISPLAY_LABELS,
-                TOPIC_DISPLAY_COLORS=TOPIC_DISPLAY_COLORS
+                content_key=('daily_brief', brief.id, tuple(item.id for item in sorted_items)),
+                slots={
+                    'magic_link_url': magic_link_url,
+                    'unsubscribe_url': unsubscribe_url,
+                    'preferences_url': preferences_url,
+                },
+                context=shared_context,
+                postprocess=_minify_email_html,
+                tracking=tracking,
+                r_hash=str(subscriber.id),
             )
-            html = _minify_email_html(html)
-            return html
         except Exception as e:
             logger.error(f"Template rendering failed: {e}")
             # The DB connection may have dropped mid-render (e.g. SSL EOF), leaving
@@ -512,7 +538,17 @@ class ResendClient:
                 db.session.rollback()
             except Exception:
                 pass
-            return self._fallback_html(brief, magic_link_url, unsubscribe_url)
+            html = self._fallback_html(brief, magic_link_url, unsubscribe_url)
+            if tracking is not None:
+                html = _wrap_links(
+                    html=html,
+                    base_url=base_url,
+                    run_id=brief.id,
+                    r_hash=str(subscriber.id),
+                    secret=tracking.secret,
+                    track_path=tracking.track_path,
+                )
+            return html
 
     def _fallback_html(self, brief: DailyBrief, magic_link_url: str, unsubscribe_url: str) -> str:
         """
@@ -756,6 +792,85 @@ class BriefEmailScheduler:
         logger.info(f"Found {len(subscribers_to_send)} {cadence} subscribers for hour {utc_hour}")
         return subscribers_to_send
 
+    def _claim_page(self, ids: List[int], brief: DailyBrief, send_id: str) -> List[DailyBriefSubscriber]:
+        """
+        Claim the still-eligible subscribers among ``ids`` for this send, and
+        fill missing/expired magic tokens and missing unsubscribe tokens in the
+        same statement.
+        """
+        sub = DailyBriefSubscriber
+        now = utcnow_naive()
+        today_start = datetime.combine(date.today(), time.min)
+        needs_magic = db.or_(sub.magic_token.is_(None), sub.magic_token_expires < now)
+        magic_tokens = {sid: secrets.token_urlsafe(32) for sid in ids}
+        unsubscribe_tokens = {sid: secrets.token_urlsafe(32) for sid in ids}
+        return claim_for_send(
+            sub,
+            ids,
+            send_id,
+            # Same rules as can_receive_brief(brief_id=...), evaluated in SQL.
+            eligible=(
+                sub.status == 'active',
+                db.or_(sub.last_brief_id_sent.is_(None), sub.last_brief_id_sent != brief.id),
+                db.or_(sub.last_sent_at.is_(None), sub.last_sent_at < today_start),
+            ),
+            values={
+                sub.magic_token: db.case(
+                    (needs_magic, per_row_value(sub.id, magic_tokens)), else_=sub.magic_token
+                ),
+                sub.magic_token_expires: db.case(
+                    (needs_magic, now + timedelta(hours=168)), else_=sub.magic_token_expires
+                ),
+                sub.unsubscribe_token: db.func.coalesce(
+                    sub.unsubscribe_token, per_row_value(sub.id, unsubscribe_tokens)
+                ),
+            },
+        )
+
+    def _ack_page(
+        self,
+        send_id: str,
+        brief: DailyBrief,
+        sent: List[DailyBriefSubscriber],
+        bounced_ids: List[int],
+        release_ids: List[int],
+    ) -> None:
+        """Record a page's outcomes in one UPDATE, then its send analytics."""
+        sub = DailyBriefSubscriber
+        now = utcnow_naive()
+        analytics_rows = [{'email': s.email, 'brief_subscriber_id': s.id} for s in sent]
+        try:
+            ack_sends(
+                sub,
+                send_id,
+                [
+                    ([s.id for s in sent], {
+                        sub.last_sent_at: now,
+                        sub.last_brief_id_sent: brief.id,
+                        sub.total_briefs_received: db.func.coalesce(sub.total_briefs_received, 0) + 1,
+                    }),
+                    # Resend rejected the address (422): suppress future sends.
+                    (bounced_ids, {sub.status: 'bounced', sub.unsubscribed_at: now}),
+                ],
+                release_ids=release_ids,
+            )
+            db.session.commit()
+        except Exception as e:
+            # Claims lapse after SEND_CLAIM_STALE_SECONDS; a re-send within 24h
+            # is deduplicated by Resend on the brief:{brief}:{subscriber} key.
+            db.session.rollback()
+            logger.error(f"Failed to acknowledge brief send page for brief {brief.id}: {e}", exc_info=True)
+            return
+
+        if analytics_rows:
+            from app.lib.email_analytics import EmailAnalytics
+            EmailAnalytics.record_sends(
+                analytics_rows,
+                category=EmailAnalytics.CATEGORY_DAILY_BRIEF,
+                subject=brief.title,
+                brief_id=brief.id,
+            )
+
     def send_to_subscribers(
         self,
         subscribers: List[DailyBriefSubscriber],
@@ -764,6 +879,11 @@ class BriefEmailScheduler:
         """
         Send brief to list of subscribers.
 
+        Works in pages of BRIEF_SEND_PAGE_SIZE: each page is claimed with one
+        UPDATE ... RETURNING (which also re-checks eligibility and fills
+        tokens), sent, then acknowledged with one UPDATE. Subscribers that are
+        no longer eligible, or are in flight in another send, are skipped.
+
         Args:
             subscribers: List of DailyBriefSubscriber instances
             brief: DailyBrief to send
@@ -777,68 +897,56 @@ class BriefEmailScheduler:
             'errors': []
         }
 
-        for subscriber in subscribers:
-            subscriber_id = getattr(subscriber, 'id', None)
-            try:
-                # Re-fetch latest subscriber state before each send to reduce race risk.
-                current_subscriber = DailyBriefSubscriber.query.filter_by(
-                    id=subscriber_id
-                ).with_for_update().first()
-
-                if not current_subscriber:
-                    results['failed'] += 1
-                    results['errors'].append(f"Subscriber {subscriber_id} no longer exists")
-                    db.session.rollback()
-                    continue
-
-                email_str = extract_clean_email(str(current_subscriber.email or ''))
-                if not email_str:
-                    results['failed'] += 1
-                    results['errors'].append(
-                        f"Subscriber {current_subscriber.id} has invalid email: {repr(current_subscriber.email)}"
-                    )
-                    logger.error(
-                        f"Skipping subscriber {current_subscriber.id} — invalid email: {repr(current_subscriber.email)}"
-                    )
-                    db.session.rollback()
-                    continue
+        ids = list(dict.fromkeys(
+            s.id for s in subscribers if getattr(s, 'id', None) is not None
+        ))
+        send_id = new_send_id(f"brief:{brief.id}")
 
-                if not current_subscriber.can_receive_brief(brief_id=brief.id):
-                    db.session.rollback()
-                    continue
-
-                if not current_subscriber.magic_token or (
-                    current_subscriber.magic_token_expires and current_subscriber.magic_token_expires < utcnow_naive()
-                ):
-                    current_subscriber.generate_magic_token(expires_hours=168)
+        for offset in range(0, len(ids), BRIEF_SEND_PAGE_SIZE):
+            page_ids = ids[offset:offset + BRIEF_SEND_PAGE_SIZE]
+            try:
+                claimed = self._claim_page(page_ids, brief, send_id)
+            except Exception as e:
+                db.session.rollback()
+                results['failed'] += len(page_ids)
+                error_msg = f"Could not claim subscribers {page_ids[0]}..{page_ids[-1]}: {e}"
+                results['errors'].append(error_msg)
+                logger.error(error_msg, exc_info=True)
+                continue
 
-                # Ensure every subscriber has a stable unsubscribe token before
-                # their email goes out. Idempotent — only writes if token is None.
-                current_subscriber.ensure_unsubscribe_token()
+            if len(claimed) < len(page_ids):
+                logger.info(
+                    f"Skipping {len(page_ids) - len(claimed)} subscribers that are no longer "
+                    f"eligible or are being sent by another worker"
+                )
 
-                # Flush is a write — protect it explicitly so a DB error here
-                # doesn't propagate as an unrecoverable exception into the outer
-                # loop and abort sends for all subsequent subscribers.
+            sent, bounced_ids, release_ids = [], [], []
+            for current_subscriber in claimed:
+                subscriber_id = current_subscriber.id
                 try:
-                    db.session.flush()
-                except Exception as flush_err:
-                    db.session.rollback()
-                    results['failed'] += 1
-                    err_msg = f"DB flush failed for subscriber {current_subscriber.id}: {flush_err}"
-                    results['errors'].append(err_msg)
-                    logger.error(err_msg, exc_info=True)
-                    continue
+                    email_str = extract_clean_email(str(current_subscriber.email or ''))
+                    if not email_str:
+                        results['failed'] += 1
+                        results['errors'].append(
+                            f"Subscriber {subscriber_id} has invalid email: {repr(current_subscriber.email)}"
+                        )
+                        logger.error(
+                            f"Skipping subscriber {subscriber_id} — invalid email: {repr(current_subscriber.email)}"
+                        )
+                        release_ids.append(subscriber_id)
+                        continue
 
-                # Attach Sentry context so every error in this iteration is
-                # tagged with the subscriber and brief for fast triage at scale.
-                if _sentry_sdk:
-                    _sentry_sdk.set_tag('brief_subscriber_id', current_subscriber.id)
-                    _sentry_sdk.set_tag('brief_id', getattr(brief, 'id', None))
+                    # Attach Sentry context so every error in this iteration is
+                    # tagged with the subscriber and brief for fast triage at scale.
+                    if _sentry_sdk:
+                        _sentry_sdk.set_tag('brief_subscriber_id', subscriber_id)
+                        _sentry_sdk.set_tag('brief_id', getattr(brief, 'id', None))
+
+                    if self.client.send_brief(current_subscriber, brief, record=False):
+                        results['sent'] += 1
+                        sent.append(current_subscriber)
+                        continue
 
-                success = self.client.send_brief(current_subscriber, brief)
-                if success:
-                    results['sent'] += 1
-                else:
                     results['failed'] += 1
                     resend_error = getattr(self.client, 'last_send_error', None) or 'unknown error'
                     error_entry = (
@@ -848,21 +956,23 @@ class BriefEmailScheduler:
                     logger.error(
                         error_entry,
                         extra={
-                            'subscriber_id': current_subscriber.id,
+                            'subscriber_id': subscriber_id,
                             'brief_id': getattr(brief, 'id', None),
                         },
                     )
-                    db.session.rollback()
+                    if '422' in str(resend_error):
+                        bounced_ids.append(subscriber_id)
+                    else:
+                        release_ids.append(subscriber_id)
 
-            except Exception as e:
-                db.session.rollback()
-                results['failed'] += 1
-                # Use subscriber_id (captured before the re-fetch) so the log
-                # is useful even if current_subscriber was never assigned or its
-                # .email attribute was what caused the failure.
-                error_msg = f"Error sending to subscriber {subscriber_id}: {str(e)}"
-                results['errors'].append(error_msg)
-                logger.error(error_msg, exc_info=True)
+                except Exception as e:
+                    results['failed'] += 1
+                    release_ids.append(subscriber_id)
+                    error_msg = f"Error sending to subscriber {subscriber_id}: {str(e)}"
+                    results['errors'].append(error_msg)
+                    logger.error(error_msg, exc_info=True)
+
+            self._ack_page(send_id, brief, sent, bounced_ids, release_ids)
 
         logger.info(f"Batch send complete: {results['sent']} sent, {results['failed']} failed")
         return results
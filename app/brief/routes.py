@@ -831,8 +831,8 @@ def get_audio_job_status(job_id):
 def serve_audio(filename):
     """Serve audio files from storage"""
     from app.brief.audio_storage import audio_storage
-    from flask import Response
-    
+    from app.lib.storage_cache import serve_cached
+
     # Security: validate filename to prevent path traversal
     if not filename or '..' in filename or '/' in filename or '\\' in filename:
         return jsonify({'error': _('Invalid filename')}), 400
@@ -847,11 +847,6 @@ def serve_audio(filename):
         return jsonify({'error': _('Audio not found')}), 404
     
     try:
-        audio_data = audio_storage.get(filename)
-        
-        if not audio_data:
-            return jsonify({'error': _('Audio not found')}), 404
-        
         # Determine content type from extension
         if filename.endswith('.wav'):
             mimetype = 'audio/wav'
@@ -859,16 +854,19 @@ def serve_audio(filename):
             mimetype = 'audio/mpeg'
         else:
             mimetype = 'audio/wav'  # Default
-        
-        return Response(
-            audio_data,
+
+        # Names carry a timestamp and hash, so a cached copy never goes stale.
+        response = serve_cached(
+            f"audio/{filename}",
+            lambda: audio_storage.get(filename),
             mimetype=mimetype,
-            headers={
-                'Content-Disposition': f'inline; filename="{filename}"',
-                'Cache-Control': 'public, max-age=31536000'  # Cache for 1 year
-            }
+            download_name=filename,
+            cache_control='public, max-age=31536000',  # Cache for 1 year
         )
-        
+        if response is None:
+            return jsonify({'error': _('Audio not found')}), 404
+        return response
+
     except Exception as e:
         logger.error(f"Failed to serve audio: {e}")
         return jsonify({'error': _('Failed to serve audio')}), 500
@@ -1058,11 +1056,12 @@ def resend_webhook():
     Resend sends events: email.sent, email.delivered, email.opened,
     email.clicked, email.bounced, email.complained
     
-    Uses EmailAnalytics service for DRY event processing.
+    Only verifies and queues the payload; EmailAnalytics.record_webhook_batch
+    records queued events in bulk (see app.lib.email_webhook_queue).
     
     Docs: https://resend.com/docs/dashboard/webhooks/introduction
     """
-    from app.lib.email_analytics import EmailAnalytics
+    from app.lib.email_webhook_queue import enqueue_webhook
     
     try:
         svix_id = request.headers.get('svix-id')
@@ -1138,9 +1137,9 @@ def resend_webhook():
             return jsonify({'status': 'ignored'}), 200
         
         logger.info(f"Resend webhook received: {event_type}")
-        
-        # Use unified EmailAnalytics service (DRY)
-        event = EmailAnalytics.record_from_webhook(payload)
+
+        # Recorded in batches by the process_email_webhook_queue job.
+        queued = enqueue_webhook(payload)
 
         if dedupe_key:
             try:
@@ -1148,28 +1147,9 @@ def resend_webhook():
                 cache.set(dedupe_key, 1, timeout=86400)
             except Exception as cache_error:
                 logger.warning(f"Webhook dedupe cache write failed: {cache_error}")
-        
-        # Update subscriber metrics in a separate transaction for isolation
-        try:
-            data = payload.get('data', {})
-            to_list = data.get('to', [])
-            to_email = to_list[0] if to_list else None
-            
-            if to_email:
-                subscriber = DailyBriefSubscriber.query.filter_by(email=to_email).first()
-                if subscriber:
-                    normalized_type = event_type.replace('email.', '')
-                    if normalized_type == 'opened':
-                        subscriber.total_opens = (subscriber.total_opens or 0) + 1
-                        subscriber.last_opened_at = utcnow_naive()
-                    elif normalized_type == 'clicked':
-                        subscriber.total_clicks = (subscriber.total_clicks or 0) + 1
-                        subscriber.last_clicked_at = utcnow_naive()
-                    db.session.commit()
-        except Exception as sub_error:
-            logger.warning(f"Failed to update subscriber metrics (non-fatal): {sub_error}")
-            db.session.rollback()
-        
+
+        if queued:
+            return jsonify({'status': 'queued'}), 200
         return jsonify({'status': 'processed'}), 200
         
     except Exception as e:
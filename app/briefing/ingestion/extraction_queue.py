@@ -9,6 +9,7 @@ import logging
 from datetime import datetime, timedelta
 from app.lib.time import utcnow_naive
 from app import db
+from app.lib.queue_wakeup import QUEUE_EXTRACTION, notify
 from app.models import InputSource
 from app.briefing.ingestion import extract_text_from_pdf, extract_text_from_docx
 
@@ -157,6 +158,7 @@ def retry_failed_extraction(source_id: int) -> bool:
         source.status = 'extracting'
         source.extraction_error = None
         db.session.commit()
+        notify(QUEUE_EXTRACTION)
 
         logger.info(f"Reset InputSource {source_id} for retry")
         return True
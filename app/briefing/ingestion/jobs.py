@@ -11,6 +11,7 @@ import logging
 from typing import Optional
 
 from app import db
+from app.lib.queue_wakeup import QUEUE_SOURCE_INGESTION, notify
 from app.models import InputSource
 from app.briefing.ingestion.source_ingester import SourceIngester
 
@@ -71,6 +72,7 @@ def queue_ingestion_job(
             return False
 
         client.lpush(INGESTION_QUEUE_KEY, json.dumps(payload))
+        notify(QUEUE_SOURCE_INGESTION)
         return True
     except Exception as e:
         logger.error(f"Failed to queue ingestion job for source {source_id}: {e}")
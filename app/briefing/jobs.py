@@ -9,16 +9,22 @@ Features:
 - Dead-letter queue for permanently failed jobs
 - Queue size limits to prevent runaway growth
 - Metrics logging for monitoring
+- Status updates pushed to watchers (``watch_job``) over Redis pub/sub,
+  so progress pages need no polling. One pattern subscription per process
+  fans updates out to all local watchers.
 """
 
 import os
 import json
 import logging
+import queue
 import threading
+import time
 from datetime import datetime, timedelta
 from app.lib.time import utcnow_naive
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List
 from flask_babel import gettext as _
+from app.lib.queue_wakeup import QUEUE_BRIEF_GENERATION, notify
 from app.lib.redis_client import get_client as _get_shared_redis
 
 logger = logging.getLogger(__name__)
@@ -37,6 +43,12 @@ MAX_QUEUE_SIZE = 1000  # Maximum pending jobs in queue
 DEAD_LETTER_QUEUE = 'briefing:dead_letter_queue'
 RETRY_QUEUE = 'briefing:retry_queue'
 
+# Every saved job state is published here for watch_job().
+JOB_EVENTS_CHANNEL_PREFIX = 'briefing:job_events:'
+TERMINAL_STATUSES = ('completed', 'failed', 'dead')
+# Stay below the shared pool's socket timeout (REDIS_SHARED_POOL_OP_TIMEOUT_SECONDS).
+_WATCH_BLOCK_SECONDS = 4
+
 # In-process fallback store used when Redis is unavailable.
 # This preserves user-facing job tracking semantics in single-process environments.
 _IN_MEMORY_JOBS: Dict[str, Dict[str, Any]] = {}
@@ -202,6 +214,7 @@ class GenerationJob:
             try:
                 with _IN_MEMORY_JOBS_LOCK:
                     _IN_MEMORY_JOBS[self.job_id] = self.to_dict()
+                _JOB_EVENTS.deliver(self.job_id, json.dumps(self.to_dict()))
                 # Opportunistically sweep expired entries to prevent unbounded growth
                 if len(_IN_MEMORY_JOBS) > 50:
                     _purge_expired_in_memory_jobs()
@@ -212,11 +225,17 @@ class GenerationJob:
 
         try:
             key = f"{JOB_PREFIX}{self.job_id}"
-            client.setex(key, JOB_EXPIRY, json.dumps(self.to_dict()))
-            return True
+            payload = json.dumps(self.to_dict())
+            client.setex(key, JOB_EXPIRY, payload)
         except Exception as e:
             logger.error(f"Failed to save job {self.job_id}: {e}")
             return False
+        try:
+            client.publish(f"{JOB_EVENTS_CHANNEL_PREFIX}{self.job_id}", payload)
+        except Exception as e:
+            # Watchers fall back to re-reading the job; the save itself succeeded.
+            logger.debug(f"Could not publish update for job {self.job_id}: {e}")
+        return True
     
     @classmethod
     def get(cls, job_id: str) -> Optional['GenerationJob']:
@@ -272,6 +291,140 @@ class GenerationJob:
         self.save()
 
 
+class _JobEventHub:
+    """
+    Fans job updates out to the watchers in this process.
+
+    A single background thread (a greenlet under gevent) holds one pub/sub
+    connection with a pattern subscription on every job's channel, so the
+    number of watchers never changes how many Redis connections the
+    process uses. The thread starts with the first watcher and exits
+    shortly after the last one leaves.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters: Dict[str, set] = {}
+        self._thread: Optional[threading.Thread] = None
+        self.subscribed = threading.Event()
+
+    def register(self, job_id: str) -> queue.Queue:
+        waiter: queue.Queue = queue.Queue()
+        with self._lock:
+            self._waiters.setdefault(job_id, set()).add(waiter)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='briefing-job-events', daemon=True)
+                self._thread.start()
+        return waiter
+
+    def unregister(self, job_id: str, waiter: queue.Queue) -> None:
+        with self._lock:
+            waiters = self._waiters.get(job_id)
+            if waiters is not None:
+                waiters.discard(waiter)
+                if not waiters:
+                    del self._waiters[job_id]
+
+    def deliver(self, job_id: str, payload: str) -> None:
+        with self._lock:
+            waiters = list(self._waiters.get(job_id, ()))
+        for waiter in waiters:
+            waiter.put(payload)
+
+    def _has_waiters(self) -> bool:
+        with self._lock:
+            if self._waiters:
+                return True
+            self._thread = None
+            return False
+
+    def _run(self) -> None:
+        while self._has_waiters():
+            client = get_redis_client()
+            if not client:
+                # In-memory saves call deliver() directly.
+                time.sleep(1)
+                continue
+            pubsub = None
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(f"{JOB_EVENTS_CHANNEL_PREFIX}*")
+                self.subscribed.set()
+                # Reconnect if the shared client was rebuilt (e.g. after fork).
+                while get_redis_client() is client and self._has_waiters():
+                    message = pubsub.get_message(timeout=_WATCH_BLOCK_SECONDS)
+                    if message and message.get('type') == 'pmessage':
+                        job_id = message['channel'][len(JOB_EVENTS_CHANNEL_PREFIX):]
+                        self.deliver(job_id, message['data'])
+            except Exception as e:
+                logger.debug(f"Job update subscription lost, watchers re-read jobs meanwhile: {e}")
+                time.sleep(1)
+            finally:
+                self.subscribed.clear()
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+
+_JOB_EVENTS = _JobEventHub()
+
+
+def watch_job(job_id: str, timeout: float) -> Iterator[Optional[GenerationJob]]:
+    """
+    Yield the job's current state, then each saved update, until it reaches
+    a terminal status, disappears or ``timeout`` seconds pass.
+
+    Yields None after each idle interval (a few seconds) so callers can send
+    keep-alives or give up. Updates arrive through the process's shared
+    subscription; each idle interval also re-reads the job, which covers
+    updates saved while that subscription was (re)connecting. Use with
+    ``contextlib.closing`` when stopping early.
+    """
+    deadline = time.monotonic() + max(0.0, timeout)
+    waiter = _JOB_EVENTS.register(job_id)
+    try:
+        if get_redis_client():
+            # Register before the first read so no update falls in between.
+            _JOB_EVENTS.subscribed.wait(timeout=1.0)
+        job = GenerationJob.get(job_id)
+        yield job
+        while job is not None and job.status not in TERMINAL_STATUSES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            block = _WATCH_BLOCK_SECONDS if _JOB_EVENTS.subscribed.is_set() else 1.0
+            try:
+                update = GenerationJob.from_dict(json.loads(waiter.get(timeout=min(block, remaining))))
+            except queue.Empty:
+                update = GenerationJob.get(job_id)
+                if update is None:
+                    return
+            if update.updated_at <= job.updated_at:
+                # Already seen (re-read first, or published twice).
+                yield None
+                continue
+            job = update
+            yield job
+    finally:
+        _JOB_EVENTS.unregister(job_id, waiter)
+
+
+def wait_for_job_change(job_id: str, since: Optional[str], timeout: float) -> Optional[GenerationJob]:
+    """
+    Long-poll helper: return the job once its ``updated_at`` differs from
+    ``since`` or it is terminal, or its current state after ``timeout``.
+    """
+    from contextlib import closing
+
+    with closing(watch_job(job_id, timeout)) as updates:
+        for job in updates:
+            if job is not None and (job.updated_at != since or job.status in TERMINAL_STATUSES):
+                return job
+    return GenerationJob.get(job_id)
+
+
 def queue_brief_generation(briefing_id: int, user_id: int) -> Optional[str]:
     """
     Queue a brief generation job.
@@ -349,6 +502,7 @@ def queue_brief_generation(briefing_id: int, user_id: int) -> Optional[str]:
     if job.save():
         try:
             client.lpush('briefing:generation_queue', job_id)
+            notify(QUEUE_BRIEF_GENERATION)
             increment_user_jobs(user_id, 'queued')
             logger.info(f"Queued generation job {job_id} for briefing {briefing_id}")
             _log_metrics('job_queued', {'job_id': job_id, 'briefing_id': briefing_id})
@@ -100,6 +100,25 @@ def recipient_hash(run_id: int, email: str) -> str:
     return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:16]
 
 
+def tracked_href(
+    raw_url: str,
+    base_url: str,
+    run_id: int,
+    r_hash: str,
+    secret: str,
+    track_path: str = '/briefings/track/click',
+):
+    """
+    Tracking URL for one raw (HTML-escaped) href value, or None when the
+    link must be left untouched. This is the per-link step of wrap_links.
+    """
+    if _should_skip(raw_url):
+        return None
+    target = unescape(raw_url)
+    ltype = _link_type(target, base_url)
+    return make_tracked_url(base_url, run_id, target, r_hash, secret, ltype, track_path=track_path)
+
+
 def wrap_links(
     html: str,
     base_url: str,
@@ -126,13 +145,9 @@ def wrap_links(
         raw_url = match.group(3)
         suffix = match.group(4)
 
-        if _should_skip(raw_url):
+        tracked = tracked_href(raw_url, base_url, run_id, r_hash, secret, track_path)
+        if tracked is None:
             return match.group(0)
-
-        target = unescape(raw_url)
-
-        ltype = _link_type(target, base_url)
-        tracked = make_tracked_url(base_url, run_id, target, r_hash, secret, ltype, track_path=track_path)
         return f'{prefix} href={quote}{tracked}{quote}{suffix}'
 
     return _RE_HREF.sub(_replace, html)
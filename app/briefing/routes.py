@@ -5,7 +5,7 @@ CRUD routes for multi-tenant briefing system.
 """
 
 from functools import wraps
-from flask import render_template, redirect, url_for, flash, request, jsonify, g, session, current_app
+from flask import render_template, redirect, url_for, flash, request, jsonify, g, session, current_app, Response, stream_with_context
 from flask_login import login_required, current_user
 from datetime import datetime, date, timedelta
 from app.lib.time import utcnow_naive
@@ -20,7 +20,7 @@ from app import db, limiter, csrf
 from app.models import (
     Briefing, BriefRun, BriefRunItem, BriefTemplate, InputSource, IngestedItem,
     BriefingSource, BriefRecipient, SendingDomain, User, CompanyProfile, NewsSource,
-    BriefEmailOpen, BriefLinkClick, OrganizationMember, Subscription
+    OrganizationMember, Subscription
 )
 from app.models.email import EmailEvent
 from app.billing.enforcement import (
@@ -33,12 +33,16 @@ from app.billing.service import (
     get_user_organization
 )
 from sqlalchemy.orm import joinedload, selectinload
+import base64
+import json
 import logging
+import time
 try:
     import posthog
 except ImportError:
     posthog = None
 from app.lib.posthog_utils import safe_posthog_capture
+from app.lib.queue_wakeup import QUEUE_EXTRACTION, notify as notify_queue
 from flask_babel import gettext as _
 
 logger = logging.getLogger(__name__)
@@ -2372,6 +2376,7 @@ def upload_source():
             
             db.session.add(source)
             db.session.commit()
+            notify_queue(QUEUE_EXTRACTION)
             
             record_upload(current_user.id, file_size)
             
@@ -3497,7 +3502,8 @@ def test_generate(briefing_id):
                         'success': True,
                         'job_id': job_id,
                         'message': _('Brief generation started'),
-                        'status_url': url_for('briefing.generation_status', briefing_id=briefing_id, job_id=job_id)
+                        'status_url': url_for('briefing.generation_status', briefing_id=briefing_id, job_id=job_id),
+                        'events_url': url_for('briefing.generation_events', briefing_id=briefing_id, job_id=job_id)
                     })
                 # For regular form submission, redirect to a waiting page
                 flash(_('Brief generation started. This may take up to a minute.'), 'info')
@@ -3552,32 +3558,105 @@ def test_generate(briefing_id):
         return redirect(url_for('briefing.detail', briefing_id=briefing_id))
 
 
+# Long-poll requests hold a worker greenlet; keep them under typical proxy read timeouts.
+_GENERATION_STATUS_MAX_WAIT_SECONDS = 25
+_GENERATION_EVENTS_KEEPALIVE_SECONDS = 15
+
+
+def _generation_status_payload(job, briefing_id):
+    """JSON body shared by the status endpoint and the event stream."""
+    payload = {
+        'status': job.status,
+        'message': job.progress_message,
+        'job_id': job.job_id,
+        'updated_at': job.updated_at,
+    }
+    if job.status == 'completed' and job.brief_run_id:
+        payload['redirect_url'] = url_for('briefing.view_run', briefing_id=briefing_id, run_id=job.brief_run_id)
+    elif job.status in ('failed', 'dead'):
+        payload['error'] = job.error
+    return payload
+
+
+def _get_owned_generation_job(briefing_id, job_id):
+    """The job if it belongs to this user AND briefing (security check), else None."""
+    from app.briefing.jobs import GenerationJob
+
+    job = GenerationJob.get(job_id)
+    if not job or job.briefing_id != briefing_id or job.user_id != current_user.id:
+        return None
+    return job
+
+
 @briefing_bp.route('/<int:briefing_id>/generation-status/<job_id>', methods=['GET'])
 @login_required
 def generation_status(briefing_id, job_id):
-    """Check status of a generation job (for polling)"""
-    from app.briefing.jobs import GenerationJob
-    
-    job = GenerationJob.get(job_id)
+    """
+    Status of a generation job.
+
+    With ``?wait=<seconds>`` this long-polls: it answers as soon as the job's
+    ``updated_at`` differs from ``?since=`` (or the job finishes), or after
+    the wait. Used by clients without EventSource.
+    """
+    from app.briefing.jobs import wait_for_job_change
+
+    job = _get_owned_generation_job(briefing_id, job_id)
     if not job:
         return jsonify({'error': _('Job not found'), 'status': 'failed'}), 404
-    
-    # Verify this job belongs to the user AND briefing (security check)
-    if job.briefing_id != briefing_id or job.user_id != current_user.id:
+
+    wait = min(request.args.get('wait', 0, type=float) or 0, _GENERATION_STATUS_MAX_WAIT_SECONDS)
+    if wait > 0:
+        since = request.args.get('since') or job.updated_at
+        # Don't hold a pooled connection while waiting.
+        db.session.remove()
+        job = wait_for_job_change(job_id, since, wait) or job
+
+    return jsonify(_generation_status_payload(job, briefing_id))
+
+
+@briefing_bp.route('/<int:briefing_id>/generation-events/<job_id>', methods=['GET'])
+@login_required
+def generation_events(briefing_id, job_id):
+    """
+    Server-sent events for a generation job: one ``status`` event with the
+    current state, then one per update until the job finishes.
+
+    Ownership is checked once here; the stream itself only reads Redis.
+    """
+    from contextlib import closing
+    from app.briefing.jobs import TERMINAL_STATUSES, watch_job
+
+    job = _get_owned_generation_job(briefing_id, job_id)
+    if not job:
         return jsonify({'error': _('Job not found'), 'status': 'failed'}), 404
-    
-    response = {
-        'status': job.status,
-        'message': job.progress_message,
-        'job_id': job.job_id
-    }
-    
-    if job.status == 'completed' and job.brief_run_id:
-        response['redirect_url'] = url_for('briefing.view_run', briefing_id=briefing_id, run_id=job.brief_run_id)
-    elif job.status == 'failed':
-        response['error'] = job.error
-    
-    return jsonify(response)
+
+    max_seconds = current_app.config.get('BRIEFING_GENERATION_EVENTS_MAX_SECONDS', 300)
+    # Release the request's DB connection; nothing below touches the database.
+    db.session.remove()
+
+    def stream():
+        # EventSource reconnects after this delay if the stream ends early.
+        yield 'retry: 3000\n\n'
+        last_sent = time.monotonic()
+        with closing(watch_job(job_id, max_seconds)) as updates:
+            for update in updates:
+                if update is None:
+                    if time.monotonic() - last_sent >= _GENERATION_EVENTS_KEEPALIVE_SECONDS:
+                        last_sent = time.monotonic()
+                        yield ': keep-alive\n\n'
+                    continue
+                last_sent = time.monotonic()
+                yield f"event: status\ndata: {json.dumps(_generation_status_payload(update, briefing_id))}\n\n"
+                if update.status in TERMINAL_STATUSES:
+                    return
+        # Job expired or the stream hit its cap; the client falls back to status_url.
+        yield 'event: timeout\ndata: {}\n\n'
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
 
 
 @briefing_bp.route('/<int:briefing_id>/generation-progress/<job_id>')
@@ -3612,7 +3691,8 @@ def generation_progress(briefing_id, job_id):
         'briefing/generation_progress.html',
         briefing=briefing,
         job_id=job_id,
-        status_url=url_for('briefing.generation_status', briefing_id=briefing_id, job_id=job_id)
+        status_url=url_for('briefing.generation_status', briefing_id=briefing_id, job_id=job_id),
+        events_url=url_for('briefing.generation_events', briefing_id=briefing_id, job_id=job_id)
     )
 
 
@@ -3875,55 +3955,36 @@ def browse_sources():
 # Analytics Tracking Routes (Open Pixel & Click Tracking)
 # =============================================================================
 
+# 1x1 transparent GIF
+_TRACKING_PIXEL_GIF = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+
 @briefing_bp.route("/track/open/<int:run_id>.gif")
 def track_open(run_id):
     """
     Track email opens via 1x1 transparent GIF pixel.
     Returns a transparent GIF image.
     """
-    import base64
     import hashlib
-    
+    from app.briefing.tracking_buffer import record_open
+
     try:
-        # Get brief run
-        brief_run = db.session.get(BriefRun,run_id)
-        if brief_run:
-            # Get recipient hash or generate one from IP+UA for deduplication
-            recipient_hash = request.args.get("r", "")
-            if not recipient_hash:
-                # Generate a fingerprint for deduplication when no hash provided
-                fingerprint = f"{run_id}:{request.remote_addr}:{request.headers.get('User-Agent', '')}"
-                recipient_hash = hashlib.sha256(fingerprint.encode()).hexdigest()[:16]
-            
-            # Check if this is a unique open (dedup by recipient hash per run)
-            existing_open = BriefEmailOpen.query.filter_by(
-                brief_run_id=run_id,
-                recipient_email=recipient_hash
-            ).first()
-            
-            # Log the open (always log for audit trail)
-            open_record = BriefEmailOpen(
-                brief_run_id=run_id,
-                recipient_email=recipient_hash,
-                user_agent=request.headers.get("User-Agent", "")[:500],
-                ip_address=request.remote_addr
-            )
-            db.session.add(open_record)
-            
-            # Update aggregates only for truly unique opens
-            if not existing_open:
-                brief_run.unique_opens = (brief_run.unique_opens or 0) + 1
-            
-            db.session.commit()
-            logger.debug(f"Tracked email open for brief_run {run_id}")
+        # Get recipient hash or generate one from IP+UA for deduplication
+        recipient_hash = request.args.get("r", "")
+        if not recipient_hash:
+            # Generate a fingerprint for deduplication when no hash provided
+            fingerprint = f"{run_id}:{request.remote_addr}:{request.headers.get('User-Agent', '')}"
+            recipient_hash = hashlib.sha256(fingerprint.encode()).hexdigest()[:16]
+
+        # Buffered in Redis; the tracking flush job writes rows and counters.
+        record_open(run_id, recipient_hash, request.headers.get("User-Agent", ""), request.remote_addr)
     except Exception as e:
         logger.warning(f"Error tracking email open for run {run_id}: {e}")
         db.session.rollback()
-    
+
     # Return 1x1 transparent GIF
-    gif_data = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
     from flask import Response
-    return Response(gif_data, mimetype="image/gif")
+    return Response(_TRACKING_PIXEL_GIF, mimetype="image/gif")
 
 
 @briefing_bp.route("/track/click/<int:run_id>")
@@ -3964,23 +4025,10 @@ def track_click(run_id):
         logger.warning(f"Invalid click-tracking signature for run {run_id}: {target_url[:100]}")
         return redirect("/")
 
-    # Record the click (best-effort — never block the redirect on DB errors)
+    # Record the click (best-effort — never block the redirect on tracking errors)
     try:
-        click_record = BriefLinkClick(
-            brief_run_id=run_id,
-            recipient_email=r_hash or None,
-            target_url=target_url[:2000],
-            link_type=link_type[:50] if link_type else None,
-            user_agent=request.headers.get("User-Agent", "")[:500],
-        )
-        db.session.add(click_record)
-
-        brief_run = db.session.get(BriefRun, run_id)
-        if brief_run:
-            brief_run.total_clicks = (brief_run.total_clicks or 0) + 1
-
-        db.session.commit()
-        logger.debug(f"Tracked click for brief_run {run_id} -> {target_url[:60]}")
+        from app.briefing.tracking_buffer import record_click
+        record_click(run_id, r_hash, target_url, link_type, request.headers.get("User-Agent", ""))
     except Exception as e:
         logger.warning(f"Error recording click for run {run_id}: {e}")
         db.session.rollback()
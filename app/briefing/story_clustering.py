@@ -8,8 +8,9 @@ three separate Google posts.
 from __future__ import annotations
 
 import re
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Sequence, Set, Tuple
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
 
 from app.models import IngestedItem
 
@@ -70,29 +71,36 @@ def _content_words(title: str) -> Set[str]:
     return {w for w in words if len(w) > 2 and w not in _STOP_WORDS}
 
 
-def headline_similarity(a: str, b: str) -> float:
-    """Jaccard similarity on meaningful title words."""
-    words_a = _content_words(a)
-    words_b = _content_words(b)
+def _jaccard(words_a: FrozenSet[str], words_b: FrozenSet[str]) -> float:
     if not words_a or not words_b:
         return 0.0
-    intersection = words_a & words_b
-    union = words_a | words_b
-    return len(intersection) / len(union)
+    intersection = len(words_a & words_b)
+    return intersection / (len(words_a) + len(words_b) - intersection)
 
 
-def _same_story(a: IngestedItem, b: IngestedItem) -> bool:
-    if headline_similarity(a.title or '', b.title or '') >= HEADLINE_SIMILARITY_THRESHOLD:
+def headline_similarity(a: str, b: str) -> float:
+    """Jaccard similarity on meaningful title words."""
+    return _jaccard(frozenset(_content_words(a)), frozenset(_content_words(b)))
+
+
+def _same_story_words(words_a: FrozenSet[str], words_b: FrozenSet[str]) -> bool:
+    """``_same_story`` on pre-tokenised titles (see ``_content_words``)."""
+    similarity = _jaccard(words_a, words_b)
+    if similarity >= HEADLINE_SIMILARITY_THRESHOLD:
         return True
     # Shared prominent entity tokens (e.g. "google", "openai") with moderate overlap.
-    words_a = _content_words(a.title or '')
-    words_b = _content_words(b.title or '')
-    shared = words_a & words_b
-    if len(shared) >= 2 and headline_similarity(a.title or '', b.title or '') >= 0.35:
+    if similarity >= 0.35 and len(words_a & words_b) >= 2:
         return True
     return False
 
 
+def _same_story(a: IngestedItem, b: IngestedItem) -> bool:
+    return _same_story_words(
+        frozenset(_content_words(a.title or '')),
+        frozenset(_content_words(b.title or '')),
+    )
+
+
 def cluster_scored_items(
     scored_items: Sequence[Tuple[IngestedItem, float]],
     *,
@@ -101,6 +109,10 @@ def cluster_scored_items(
     """
     Group scored items into story clusters (highest score per cluster wins).
 
+    Each title is tokenised once and candidate clusters are shortlisted via an
+    inverted word index, so large candidate pools cluster in near-linear time
+    while producing the same clusters as a full pairwise comparison.
+
     Args:
         scored_items: (IngestedItem, score) pairs, any order.
         similarity_threshold: Minimum Jaccard overlap to merge (unused override
@@ -116,18 +128,36 @@ def cluster_scored_items(
 
     sorted_items = sorted(scored_items, key=lambda x: x[1], reverse=True)
     clusters: List[StoryCluster] = []
+    # Tokenised titles of every member, parallel to ``clusters``.
+    member_words: List[List[FrozenSet[str]]] = []
+    # Inverted index: content word -> indices of clusters with a member using it.
+    # Both merge rules need a non-zero Jaccard overlap, so only clusters that
+    # share at least one word with the item can ever match.
+    word_index: Dict[str, Set[int]] = defaultdict(set)
 
     for item, score in sorted_items:
-        placed = False
-        for cluster in clusters:
-            if _same_story(item, cluster.primary) or any(
-                _same_story(item, r) for r in cluster.related
-            ):
-                cluster.related.append(item)
-                placed = True
+        words = frozenset(_content_words(item.title or ''))
+        candidates: Set[int] = set()
+        for word in words:
+            candidates.update(word_index.get(word, ()))
+
+        # Lowest index first preserves the "first matching cluster wins"
+        # ordering of the original pairwise scan.
+        target: Optional[int] = None
+        for idx in sorted(candidates):
+            if any(_same_story_words(words, other) for other in member_words[idx]):
+                target = idx
                 break
-        if not placed:
+
+        if target is None:
+            target = len(clusters)
             clusters.append(StoryCluster(primary=item, score=score))
+            member_words.append([words])
+        else:
+            clusters[target].related.append(item)
+            member_words[target].append(words)
+        for word in words:
+            word_index[word].add(target)
 
     clusters.sort(key=lambda c: c.score, reverse=True)
     return clusters
@@ -0,0 +1,309 @@
+"""
+Buffered ingestion for briefing email open/click tracking.
+
+A briefing run lands in thousands of inboxes within a minute or two, and
+every open pixel and tracked click used to do a dedup SELECT, an INSERT
+and a read-modify-write of ``BriefRun.unique_opens`` / ``total_clicks``
+with its own commit. All of those hits contend for one ``brief_run`` row,
+and concurrent read-modify-writes lose increments.
+
+The request path now makes one Redis round trip (a small Lua script):
+
+- once ``TRACKING_EVENTS_KEY`` holds ``TRACKING_BUFFER_MAX`` events new
+  hits are dropped, so a flood cannot exhaust Redis memory;
+- otherwise opens ``SADD`` the recipient hash to a per-run seen set (the
+  result, 1 = first time, becomes the event's uniqueness flag) and the
+  event is ``RPUSH``ed as JSON.
+
+``flush_tracking_events()`` (scheduler job, every 30 seconds) pops
+batches off the list, bulk-inserts the raw ``BriefEmailOpen`` /
+``BriefLinkClick`` rows and applies the counter deltas with one atomic
+``SET col = col + n`` per run. Unique opens are also checked against the
+rows already stored, which covers seen sets that expired and opens
+recorded before the buffer existed. A batch the database rejects is
+retried one event at a time; events it still rejects go to
+``TRACKING_DEAD_LETTER_KEY`` so they cannot block later flushes.
+
+Without Redis (or if the Redis write fails) the hit is applied directly
+through the same code path, so tracking degrades to the old synchronous
+behaviour with atomic increments rather than being lost.
+"""
+import json
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app import db
+from app.lib.time import utcnow_naive
+from app.models import BriefEmailOpen, BriefLinkClick, BriefRun
+
+logger = logging.getLogger(__name__)
+
+TRACKING_EVENTS_KEY = 'brief_track:events'
+TRACKING_DEAD_LETTER_KEY = 'brief_track:dead_letter'
+TRACKING_DEAD_LETTER_MAX = 10_000
+_OPENED_KEY = 'brief_track:opened:{run_id}'
+# Opens of a run arriving after this are rare; the DB check still dedupes them.
+OPENED_SET_TTL_SECONDS = 45 * 24 * 3600
+TRACKING_BUFFER_MAX = 500_000
+FLUSH_BATCH_SIZE = 5_000
+# Column widths of BriefEmailOpen / BriefLinkClick; the request values are
+# unbounded query parameters and headers.
+_RECIPIENT_MAX = 255
+_IP_MAX = 45
+
+
+def _get_redis_client():
+    from app.lib.redis_client import get_client
+    return get_client(decode_responses=True)
+
+
+def record_open(run_id: int, recipient_hash: str, user_agent: str, ip_address: Optional[str]) -> None:
+    """Record an open-pixel hit for ``run_id``."""
+    event = {
+        'k': 'open',
+        'run': run_id,
+        'r': (recipient_hash or '')[:_RECIPIENT_MAX] or None,
+        'ua': (user_agent or '')[:500],
+        'ip': ip_address[:_IP_MAX] if ip_address else None,
+        'at': utcnow_naive().isoformat(),
+    }
+    _record(event, seen_key=_OPENED_KEY.format(run_id=run_id) if event['r'] else None)
+
+
+def record_click(
+    run_id: int,
+    recipient_hash: Optional[str],
+    target_url: str,
+    link_type: Optional[str],
+    user_agent: str,
+) -> None:
+    """Record a verified tracked-link click for ``run_id``."""
+    event = {
+        'k': 'click',
+        'run': run_id,
+        'r': (recipient_hash or '')[:_RECIPIENT_MAX] or None,
+        'url': target_url[:2000],
+        't': link_type[:50] if link_type else None,
+        'ua': (user_agent or '')[:500],
+        'at': utcnow_naive().isoformat(),
+    }
+    _record(event)
+
+
+# One round trip: drop the event if the buffer is full (before marking the
+# recipient seen, so a dropped open cannot make a later one look repeated),
+# otherwise dedupe the open against the run's seen set and append the event
+# prefixed with the uniqueness flag ('1' first time, '0' repeat).
+_RECORD_SCRIPT = """
+if redis.call('LLEN', KEYS[1]) >= tonumber(ARGV[4]) then
+  return -1
+end
+local unique = 1
+if #KEYS > 1 then
+  unique = redis.call('SADD', KEYS[2], ARGV[2])
+  redis.call('EXPIRE', KEYS[2], ARGV[3])
+end
+redis.call('RPUSH', KEYS[1], unique .. ARGV[1])
+return unique
+"""
+
+
+def _record(event: dict, seen_key: Optional[str] = None) -> None:
+    client = _get_redis_client()
+    if client is not None:
+        payload = json.dumps(event, separators=(',', ':'))
+        keys = [TRACKING_EVENTS_KEY] + ([seen_key] if seen_key else [])
+        try:
+            result = client.eval(
+                _RECORD_SCRIPT, len(keys), *keys,
+                payload, event.get('r') or '', OPENED_SET_TTL_SECONDS, TRACKING_BUFFER_MAX,
+            )
+            if int(result) < 0:
+                logger.warning(f"Tracking buffer full; dropped {event['k']} for run {event['run']}")
+            return
+        except Exception as e:
+            logger.debug(f"Tracking buffer unavailable, writing {event['k']} directly: {e}")
+
+    _apply_events([event])
+    db.session.commit()
+
+
+def _decode(raw: str) -> Optional[dict]:
+    try:
+        event = json.loads(raw[1:])
+        event['u'] = raw[0] == '1'
+        event['run'] = int(event['run'])
+        return event
+    except (ValueError, TypeError, KeyError, IndexError):
+        logger.warning(f"Dropping malformed tracking event: {raw[:200]!r}")
+        return None
+
+
+def _event_time(event: dict) -> datetime:
+    try:
+        return datetime.fromisoformat(event['at'])
+    except (KeyError, TypeError, ValueError):
+        return utcnow_naive()
+
+
+def _apply_events(events: Iterable[dict]) -> Dict[str, int]:
+    """
+    Insert the raw rows for ``events`` and apply their counter deltas.
+
+    An open counts towards ``unique_opens`` when Redis saw it first (``u``,
+    assumed when written directly), it is the first open of that recipient
+    in this batch, and no open of that recipient is stored for the run yet.
+    Events for deleted runs are dropped. Does not commit.
+    """
+    events = list(events)
+    run_ids = {e['run'] for e in events}
+    if not run_ids:
+        return {'opens': 0, 'clicks': 0, 'unique_opens': 0}
+    live_runs = set(db.session.scalars(select(BriefRun.id).where(BriefRun.id.in_(run_ids))))
+    events = [e for e in events if e['run'] in live_runs]
+
+    opens = [e for e in events if e.get('k') == 'open']
+    clicks = [e for e in events if e.get('k') == 'click']
+
+    candidates = {(e['run'], e['r']) for e in opens if e.get('r') and e.get('u', True)}
+    stored = set()
+    if candidates:
+        stored = {tuple(row) for row in db.session.execute(
+            select(BriefEmailOpen.brief_run_id, BriefEmailOpen.recipient_email)
+            .where(
+                BriefEmailOpen.brief_run_id.in_({run for run, _ in candidates}),
+                BriefEmailOpen.recipient_email.in_({r for _, r in candidates}),
+            )
+            .distinct()
+        )}
+
+    unique_opens: Counter = Counter()
+    for e in opens:
+        pair = (e['run'], e.get('r'))
+        if pair in candidates and pair not in stored:
+            unique_opens[e['run']] += 1
+            stored.add(pair)
+    total_clicks = Counter(e['run'] for e in clicks)
+
+    if opens:
+        db.session.execute(insert(BriefEmailOpen), [
+            {
+                'brief_run_id': e['run'],
+                'recipient_email': e.get('r'),
+                'opened_at': _event_time(e),
+                'user_agent': e.get('ua'),
+                'ip_address': e.get('ip'),
+            }
+            for e in opens
+        ])
+    if clicks:
+        db.session.execute(insert(BriefLinkClick), [
+            {
+                'brief_run_id': e['run'],
+                'recipient_email': e.get('r'),
+                'target_url': e.get('url') or '',
+                'link_type': e.get('t'),
+                'clicked_at': _event_time(e),
+                'user_agent': e.get('ua'),
+            }
+            for e in clicks
+        ])
+
+    for run_id in sorted(set(unique_opens) | set(total_clicks)):
+        db.session.execute(
+            update(BriefRun)
+            .where(BriefRun.id == run_id)
+            .values(
+                unique_opens=func.coalesce(BriefRun.unique_opens, 0) + unique_opens[run_id],
+                total_clicks=func.coalesce(BriefRun.total_clicks, 0) + total_clicks[run_id],
+            )
+            .execution_options(synchronize_session=False)
+        )
+    return {'opens': len(opens), 'clicks': len(clicks), 'unique_opens': sum(unique_opens.values())}
+
+
+def _dead_letter(client, raw_events: List[str]) -> None:
+    pipe = client.pipeline(transaction=False)
+    pipe.lpush(TRACKING_DEAD_LETTER_KEY, *raw_events)
+    pipe.ltrim(TRACKING_DEAD_LETTER_KEY, 0, TRACKING_DEAD_LETTER_MAX - 1)
+    pipe.execute()
+
+
+def _apply_one_by_one(client, raw_events: List[str], events: List[dict]) -> Dict[str, int]:
+    """
+    Write a rejected batch event by event, dead-lettering the events the
+    database refuses (bad data, constraint violations). Any other error
+    means the database itself is failing: the unwritten rest of the batch
+    goes back onto the head of the list and the error propagates.
+    """
+    totals = {'opens': 0, 'clicks': 0, 'unique_opens': 0}
+    rejected = []
+    for index, (raw, event) in enumerate(zip(raw_events, events)):
+        try:
+            written = _apply_events([event])
+            db.session.commit()
+        except (DataError, IntegrityError) as e:
+            db.session.rollback()
+            logger.warning(f"Dead-lettering tracking event the database rejected: {e}")
+            rejected.append(raw)
+            continue
+        except Exception:
+            db.session.rollback()
+            if rejected:
+                _dead_letter(client, rejected)
+            client.lpush(TRACKING_EVENTS_KEY, *reversed(raw_events[index:]))
+            raise
+        for key, value in written.items():
+            totals[key] += value
+    if rejected:
+        _dead_letter(client, rejected)
+    return totals
+
+
+def flush_tracking_events(batch_size: int = FLUSH_BATCH_SIZE, max_batches: int = 20) -> Dict[str, int]:
+    """
+    Move buffered tracking events into the database.
+
+    Each batch is popped atomically (LRANGE + LTRIM in MULTI) and committed
+    in one transaction. If the database rejects the batch's data it is
+    retried event by event and the rejected events are dead-lettered; on
+    any other failure the batch is pushed back onto the head of the list
+    for the next run. Returns the totals written.
+    """
+    totals = {'opens': 0, 'clicks': 0, 'unique_opens': 0}
+    client = _get_redis_client()
+    if client is None:
+        return totals
+
+    for _ in range(max_batches):
+        pipe = client.pipeline(transaction=True)
+        pipe.lrange(TRACKING_EVENTS_KEY, 0, batch_size - 1)
+        pipe.ltrim(TRACKING_EVENTS_KEY, batch_size, -1)
+        raw_events: List[str] = pipe.execute()[0]
+        if not raw_events:
+            break
+
+        decoded = [(raw, _decode(raw)) for raw in raw_events]
+        decoded = [(raw, event) for raw, event in decoded if event is not None]
+        try:
+            written = _apply_events([event for _, event in decoded])
+            db.session.commit()
+        except (DataError, IntegrityError):
+            db.session.rollback()
+            written = _apply_one_by_one(
+                client, [raw for raw, _ in decoded], [event for _, event in decoded],
+            )
+        except Exception:
+            db.session.rollback()
+            client.lpush(TRACKING_EVENTS_KEY, *reversed(raw_events))
+            raise
+        for key, value in written.items():
+            totals[key] += value
+        if len(raw_events) < batch_size:
+            break
+    return totals
@@ -720,4 +720,329 @@ def init_commands(app):
                 db.session.rollback()
                 click.echo(f"✗ {v:6s}  Error: {e}", err=True)
                 import traceback
-                traceback.print_exc()
\ No newline at end of file
+                traceback.print_exc()
+
+    @app.cli.command('rebuild-game-daily-tally')
+    @click.option('--days', default=1, help='Number of UTC days to rebuild, ending today')
+    @click.option('--scenario', default=None, help='Only rebuild this scenario slug')
+    def rebuild_game_daily_tally_cmd(days, scenario):
+        """
+        Recount daily game choice tallies from completed runs.
+
+        Repairs drift in game_daily_choice_tally (e.g. after runs are deleted)
+        and backfills days played before the counters existed.
+
+        Example:
+            flask rebuild-game-daily-tally
+            flask rebuild-game-daily-tally --days 30
+            flask rebuild-game-daily-tally --scenario pandemic-outbreak
+        """
+        from app.game.constants import GAME_RUN_STATUS_COMPLETED
+        from app.game.services.daily_results_service import _day_window, rebuild_daily_tally
+        from app.models import GameDailyChoiceTally, GameRun
+
+        today = utcnow_naive().date()
+        for offset in range(days):
+            day = today - timedelta(days=offset)
+            if scenario:
+                slugs = [scenario]
+            else:
+                # Scenarios with counters but no remaining runs are rebuilt too,
+                # which deletes their stale rows for the day.
+                start, end = _day_window(day)
+                played = db.session.query(GameRun.scenario_slug).filter(
+                    GameRun.mode == 'daily',
+                    GameRun.status == GAME_RUN_STATUS_COMPLETED,
+                    GameRun.started_at >= start,
+                    GameRun.started_at < end,
+                )
+                tallied = db.session.query(GameDailyChoiceTally.scenario_slug).filter(
+                    GameDailyChoiceTally.tally_date == day,
+                )
+                slugs = sorted({slug for (slug,) in played.union(tallied)})
+            for slug in slugs:
+                try:
+                    runs = rebuild_daily_tally(slug, day)
+                    db.session.commit()
+                    click.echo(f"✓ {day.isoformat()}  {slug}: {runs} runs")
+                except Exception as e:
+                    db.session.rollback()
+                    click.echo(f"✗ {day.isoformat()}  {slug}: {e}", err=True)
+
+    @app.cli.command('rebuild-programme-vote-rollups')
+    @click.option('--programme-id', default=None, type=int, help='Only rebuild this programme')
+    def rebuild_programme_vote_rollups_cmd(programme_id):
+        """
+        Rebuild NSP dashboard vote rollups from statement_vote.
+
+        Run once after the migration that adds programme_vote_daily_rollup to
+        backfill existing votes; the nightly scheduler job keeps them exact.
+
+        Example:
+            flask rebuild-programme-vote-rollups
+            flask rebuild-programme-vote-rollups --programme-id 12
+        """
+        from app.programmes.vote_rollup import (
+            rebuild_programme_vote_rollup,
+            reconcile_programme_vote_rollups,
+        )
+
+        if programme_id is None:
+            rebuilt = reconcile_programme_vote_rollups()
+            click.echo(f"✓ Rebuilt vote rollups for {rebuilt} programmes")
+            return
+        try:
+            rebuild_programme_vote_rollup(programme_id)
+            db.session.commit()
+            click.echo(f"✓ Rebuilt vote rollups for programme {programme_id}")
+        except Exception as e:
+            db.session.rollback()
+            click.echo(f"✗ Programme {programme_id}: {e}", err=True)
+
+    @app.cli.command('reconcile-discussion-stats')
+    @click.option('--discussion-id', default=None, type=int, help='Only recount this discussion')
+    @click.option('--stale-only', is_flag=True, help='Only recount rows flagged stale')
+    def reconcile_discussion_stats_cmd(discussion_id, stale_only):
+        """
+        Recount maintained discussion participation stats from source rows.
+
+        Run once after the migration that adds discussion_stats to backfill
+        existing discussions; the scheduler keeps them exact afterwards.
+
+        Example:
+            flask reconcile-discussion-stats
+            flask reconcile-discussion-stats --discussion-id 42
+        """
+        from app.discussions.discussion_stats import (
+            reconcile_discussion_stats,
+            refresh_discussion_stats,
+        )
+
+        if discussion_id is None:
+            drifted = reconcile_discussion_stats(stale_only=stale_only)
+            click.echo(f"✓ Reconciled discussion stats ({drifted} rows changed)")
+            return
+        try:
+            stats = refresh_discussion_stats(discussion_id)
+            db.session.commit()
+            click.echo(
+                f"✓ Discussion {discussion_id}: {stats['participant_count']} participants, "
+                f"{stats['statement_count']} statements, {stats['total_votes']} votes"
+            )
+        except Exception as e:
+            db.session.rollback()
+            click.echo(f"✗ Discussion {discussion_id}: {e}", err=True)
+
+    @app.cli.command('rebuild-search-index')
+    def rebuild_search_index_cmd():
+        """
+        Install and re-index the SQLite FTS5 search tables (local dev).
+
+        PostgreSQL search uses GIN expression indexes from migrations and
+        needs no rebuild; this command only reports that.
+
+        Example:
+            flask rebuild-search-index
+        """
+        from app.lib.text_search import SQLITE_FTS_TABLES, install_sqlite_fts
+
+        if db.engine.dialect.name != 'sqlite':
+            click.echo("✓ Search uses database-maintained GIN indexes; nothing to rebuild")
+            return
+        try:
+            with db.engine.begin() as connection:
+                installed = install_sqlite_fts(connection, rebuild=True)
+            if installed:
+                click.echo(f"✓ Rebuilt {len(SQLITE_FTS_TABLES)} FTS5 search tables")
+            else:
+                click.echo("✗ This SQLite build has no FTS5; search falls back to ILIKE", err=True)
+        except Exception as e:
+            click.echo(f"Error rebuilding search index: {e}", err=True)
+
+    @app.cli.command('rollup-analytics')
+    @click.option('--full', is_flag=True, help='Rebuild the window from raw events instead of folding new ones')
+    @click.option('--days', default=14, help='Days to rebuild with --full')
+    def rollup_analytics_cmd(full, days):
+        """
+        Update analytics_daily_aggregate from the raw analytics_event stream.
+
+        Without --full, folds only events above the stored high-water mark.
+        --full deletes and rebuilds the last --days days (repair, and to add
+        unique-user sketches to rows created before they existed).
+
+        Example:
+            flask rollup-analytics
+            flask rollup-analytics --full --days 30
+        """
+        from app.analytics.events import rollup_analytics_daily, rollup_analytics_incremental
+
+        try:
+            rows = rollup_analytics_daily(days_back=days) if full else rollup_analytics_incremental()
+            click.echo(f"✓ {'Rebuilt' if full else 'Updated'} {rows} aggregate groups")
+        except Exception as e:
+            db.session.rollback()
+            click.echo(f"Error during analytics rollup: {e}", err=True)
+
+    @app.cli.command('rollup-email-analytics')
+    @click.option('--rebuild', is_flag=True, help='Clear the rollups and backfill them from every stored event')
+    def rollup_email_analytics_cmd(rebuild):
+        """
+        Update the email analytics rollups from the raw email_event stream.
+
+        Without --rebuild, folds only events above the stored high-water
+        mark. --rebuild backfills history (run once after upgrading).
+
+        Example:
+            flask rollup-email-analytics
+            flask rollup-email-analytics --rebuild
+        """
+        from app.lib.email_rollup import rebuild_email_rollups, rollup_email_events_incremental
+
+        try:
+            folded = rebuild_email_rollups() if rebuild else rollup_email_events_incremental()
+            click.echo(f"✓ Folded {folded} email events into the rollups")
+        except Exception as e:
+            db.session.rollback()
+            click.echo(f"Error during email analytics rollup: {e}", err=True)
+
+    @app.cli.command('backfill-image-variants')
+    @click.option('--force', is_flag=True, help='Regenerate variants even for images that already have them')
+    def backfill_image_variants_cmd(force):
+        """
+        Generate resized avatar/logo/banner variants for stored profile images.
+
+        New uploads get variants automatically; run this once for images
+        uploaded before variants existed, or after changing the widths.
+
+        Example:
+            flask backfill-image-variants
+        """
+        from app.lib.image_variants import backfill_variants
+        from app.storage_utils import _get_client
+
+        filenames = set()
+        for column in (
+            IndividualProfile.profile_image,
+            IndividualProfile.banner_image,
+            CompanyProfile.logo,
+            CompanyProfile.banner_image,
+        ):
+            filenames.update(value for (value,) in db.session.query(column).filter(column.isnot(None)).distinct())
+
+        totals = backfill_variants(filenames, _get_client(), force=force)
+        click.echo(
+            f"✓ Generated variants for {totals['generated']} images "
+            f"({totals['skipped']} skipped, {totals['failed']} failed)"
+        )
+
+    @app.cli.command('refresh-sitemaps')
+    @click.option('--force', is_flag=True, help='Re-render every section even if unchanged')
+    def refresh_sitemaps_cmd(force):
+        """
+        Regenerate the stored sitemap index and shards.
+
+        Example:
+            flask refresh-sitemaps
+            flask refresh-sitemaps --force
+        """
+        from app.seo import refresh_sitemaps
+
+        try:
+            result = refresh_sitemaps(force=force)
+            rebuilt = ', '.join(result['rebuilt']) or 'nothing (all sections current)'
+            click.echo(f"✓ Rebuilt {rebuilt}; index lists {result['urls']} URLs in {result['shards']} shards")
+        except Exception as e:
+            db.session.rollback()
+            click.echo(f"Error refreshing sitemaps: {e}", err=True)
+
+    @app.cli.command('split-consensus-analyses')
+    @click.option('--batch-size', default=50, help='Analyses converted per commit')
+    def split_consensus_analyses_cmd(batch_size):
+        """
+        Move inline per-participant arrays out of older consensus analyses.
+
+        Rewrites cluster_data to the lean summary and stores cluster
+        assignments / PCA coordinates in consensus_analysis_participants.
+
+        Example:
+            flask split-consensus-analyses
+        """
+        from app.lib.consensus_engine import split_analysis_results
+        from app.models import ConsensusAnalysis, ConsensusAnalysisParticipants
+
+        converted = 0
+        last_id = 0
+        try:
+            while True:
+                batch = ConsensusAnalysis.query.outerjoin(
+                    ConsensusAnalysisParticipants,
+                    ConsensusAnalysisParticipants.analysis_id == ConsensusAnalysis.id,
+                ).filter(
+                    ConsensusAnalysis.id > last_id,
+                    ConsensusAnalysisParticipants.analysis_id.is_(None),
+                ).order_by(ConsensusAnalysis.id).limit(batch_size).all()
+                if not batch:
+                    break
+                for analysis in batch:
+                    last_id = analysis.id
+                    data = dict(analysis.cluster_data or {})
+                    if 'cluster_assignments' not in data:
+                        continue
+                    summary, participants = split_analysis_results(data)
+                    analysis.cluster_data = summary
+                    analysis.participants = participants
+                    converted += 1
+                db.session.commit()
+                db.session.expunge_all()
+            click.echo(f"✓ Split {converted} consensus analyses")
+        except Exception as e:
+            db.session.rollback()
+            click.echo(f"Error splitting consensus analyses: {e}", err=True)
+
+    @app.cli.command('profile-imports')
+    @click.option('--limit', default=25, help='Rows to show per table')
+    @click.option('--budget-seconds', default=None, type=float, help='Exit non-zero if create_app() takes longer')
+    def profile_imports_cmd(limit, budget_seconds):
+        """
+        Report web-worker boot cost: create_app() time and per-module import time.
+
+        Boots the app in a fresh interpreter under ``python -X importtime``.
+        Fails if any module in lazy_import.HEAVY_MODULES (numpy, pandas,
+        sklearn, LLM SDKs, …) is imported at boot, or if --budget-seconds
+        is exceeded.
+
+        Example:
+            flask profile-imports
+            flask profile-imports --limit 40 --budget-seconds 4
+        """
+        import sys
+        from app.lib.import_profile import profile_app_boot, time_by_package
+
+        try:
+            profile = profile_app_boot()
+        except Exception as e:
+            click.echo(f"✗ {e}", err=True)
+            sys.exit(1)
+
+        modules = profile['modules']
+        click.echo(f"create_app() boot: {profile['boot_seconds']:.2f}s, {len(modules)} modules imported")
+
+        click.echo("\nSlowest packages (self time):")
+        packages = sorted(time_by_package(modules).items(), key=lambda item: item[1], reverse=True)
+        for package, ms in packages[:limit]:
+            click.echo(f"  {ms:9.1f} ms  {package}")
+
+        click.echo("\nSlowest modules (cumulative):")
+        for row in sorted(modules, key=lambda row: row['cumulative_ms'], reverse=True)[:limit]:
+            click.echo(f"  {row['cumulative_ms']:9.1f} ms  {row['module']}")
+
+        failed = False
+        if profile['heavy_loaded']:
+            click.echo(f"\n✗ Heavy modules imported at boot: {', '.join(profile['heavy_loaded'])}", err=True)
+            failed = True
+        if budget_seconds is not None and profile['boot_seconds'] > budget_seconds:
+            click.echo(f"✗ Boot took {profile['boot_seconds']:.2f}s, budget {budget_seconds:.2f}s", err=True)
+            failed = True
+        if failed:
+            sys.exit(1)
+        click.echo("\n✓ Import budget OK")
@@ -0,0 +1,322 @@
+"""
+Streaming, resumable daily question email send.
+
+Subscribers are walked in keyset pages (``id > last_id ORDER BY id``), so
+memory stays flat however large the list grows and no page is skipped or
+repeated when rows are added mid-send (which OFFSET paging could not
+promise). Each page is rendered and sent through the Resend batch API,
+then the last subscriber id is checkpointed in ``DailyQuestionSendRun``.
+
+The run row also carries a lease: a worker sends only while it holds an
+unexpired lease and renews it after every page. If the process dies the
+lease lapses and any worker (the scheduler's resume sweep, or the next
+misfired job) continues from the checkpoint. ``last_email_sent`` stays the
+per-subscriber guard, so a page that was sent but not yet checkpointed is
+not sent twice.
+
+Per page the subscriber rows are claimed, token-refreshed and returned by a
+single ``UPDATE ... RETURNING`` and acknowledged by a single UPDATE after
+the batch call (see ``app.lib.send_claims``), with analytics recorded in
+one bulk INSERT.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import secrets
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func, or_
+
+from app import db
+from app.lib.db_upsert import dialect_insert
+from app.lib.send_claims import ack_sends, claim_for_send, new_send_id, per_row_value, release_claims
+from app.lib.time import utcnow_naive
+from app.models import DailyQuestionSendRun, DailyQuestionSubscriber
+
+logger = logging.getLogger(__name__)
+
+DAILY_SEND_PAGE_SIZE = 500  # five Resend batch calls per page
+DAILY_SEND_LEASE_SECONDS = 15 * 60
+MAGIC_TOKEN_EXPIRY_HOURS = 48  # DailyQuestionSubscriber.generate_magic_token default
+
+
+def _worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _ensure_send_run(question_id: int) -> None:
+    now = utcnow_naive()
+    stmt = dialect_insert(DailyQuestionSendRun).values(
+        daily_question_id=question_id,
+        last_subscriber_id=0,
+        sent_count=0,
+        failed_count=0,
+        pages=0,
+        started_at=now,
+        updated_at=now,
+    ).on_conflict_do_nothing(index_elements=['daily_question_id'])
+    db.session.execute(stmt)
+
+
+def claim_send_run(question_id: int, owner: str, lease_seconds: int = DAILY_SEND_LEASE_SECONDS):
+    """
+    Take (or renew) the lease on a question's send run. Commits.
+
+    Returns the run when ``owner`` now holds the lease, or None when the run
+    is complete or another worker holds an unexpired lease.
+    """
+    _ensure_send_run(question_id)
+    now = utcnow_naive()
+    claimed = db.session.query(DailyQuestionSendRun).filter(
+        DailyQuestionSendRun.daily_question_id == question_id,
+        DailyQuestionSendRun.completed_at.is_(None),
+        or_(
+            DailyQuestionSendRun.lease_owner.is_(None),
+            DailyQuestionSendRun.lease_owner == owner,
+            DailyQuestionSendRun.lease_expires_at < now,
+        ),
+    ).update({
+        DailyQuestionSendRun.lease_owner: owner,
+        DailyQuestionSendRun.lease_expires_at: now + timedelta(seconds=lease_seconds),
+    }, synchronize_session=False)
+    db.session.commit()
+    if not claimed:
+        return None
+    return DailyQuestionSendRun.query.filter_by(daily_question_id=question_id).first()
+
+
+def _checkpoint(run_id: int, owner: str, last_id: int, sent: int, failed: int, lease_seconds: int) -> bool:
+    """Advance the checkpoint and renew the lease; False if the lease was lost."""
+    now = utcnow_naive()
+    updated = db.session.query(DailyQuestionSendRun).filter(
+        DailyQuestionSendRun.id == run_id,
+        DailyQuestionSendRun.lease_owner == owner,
+    ).update({
+        DailyQuestionSendRun.last_subscriber_id: last_id,
+        DailyQuestionSendRun.sent_count: DailyQuestionSendRun.sent_count + sent,
+        DailyQuestionSendRun.failed_count: DailyQuestionSendRun.failed_count + failed,
+        DailyQuestionSendRun.pages: DailyQuestionSendRun.pages + 1,
+        DailyQuestionSendRun.lease_expires_at: now + timedelta(seconds=lease_seconds),
+        DailyQuestionSendRun.updated_at: now,
+    }, synchronize_session=False)
+    db.session.commit()
+    return bool(updated)
+
+
+def _finish(run_id: int, owner: str) -> None:
+    db.session.query(DailyQuestionSendRun).filter(
+        DailyQuestionSendRun.id == run_id,
+        DailyQuestionSendRun.lease_owner == owner,
+    ).update({
+        DailyQuestionSendRun.completed_at: utcnow_naive(),
+        DailyQuestionSendRun.lease_owner: None,
+        DailyQuestionSendRun.lease_expires_at: None,
+    }, synchronize_session=False)
+    db.session.commit()
+
+
+def _release(run_id: int, owner: str) -> None:
+    db.session.query(DailyQuestionSendRun).filter(
+        DailyQuestionSendRun.id == run_id,
+        DailyQuestionSendRun.lease_owner == owner,
+    ).update({
+        DailyQuestionSendRun.lease_owner: None,
+        DailyQuestionSendRun.lease_expires_at: None,
+    }, synchronize_session=False)
+    db.session.commit()
+
+
+def _eligibility(today_start: datetime):
+    return (
+        DailyQuestionSubscriber.email_frequency == 'daily',
+        DailyQuestionSubscriber.is_active.is_(True),
+        or_(
+            DailyQuestionSubscriber.last_email_sent.is_(None),
+            DailyQuestionSubscriber.last_email_sent < today_start,
+        ),
+    )
+
+
+def _eligible_page_ids(after_id: int, today_start: datetime, page_size: int):
+    rows = db.session.query(DailyQuestionSubscriber.id).filter(
+        *_eligibility(today_start),
+        DailyQuestionSubscriber.id > after_id,
+    ).order_by(DailyQuestionSubscriber.id).limit(page_size).all()
+    return [row.id for row in rows]
+
+
+def _claim_page(ids, today_start: datetime, send_id: str, lease_seconds: int):
+    """
+    Claim a page for this send, rotating magic tokens and filling missing
+    unsubscribe tokens in the same UPDATE ... RETURNING.
+    """
+    sub = DailyQuestionSubscriber
+    now = utcnow_naive()
+    magic_tokens = {sid: secrets.token_urlsafe(32) for sid in ids}
+    unsubscribe_tokens = {sid: secrets.token_hex(32) for sid in ids}
+    return claim_for_send(
+        sub,
+        ids,
+        send_id,
+        eligible=_eligibility(today_start),
+        values={
+            sub.magic_token: per_row_value(sub.id, magic_tokens),
+            sub.token_expires_at: now + timedelta(hours=MAGIC_TOKEN_EXPIRY_HOURS),
+            sub.unsubscribe_token: func.coalesce(sub.unsubscribe_token, per_row_value(sub.id, unsubscribe_tokens)),
+        },
+        # A crashed sender's claims lapse with its lease.
+        stale_seconds=lease_seconds,
+    )
+
+
+def _ack_page(send_id: str, page, result: Dict[str, Any], question) -> None:
+    """Record the page's outcome in one UPDATE plus one analytics INSERT."""
+    from app.lib.email_analytics import EmailAnalytics
+
+    sub = DailyQuestionSubscriber
+    now = utcnow_naive()
+    sent_ids = set(result.get('sent_ids') or ())
+    invalid_ids = set(result.get('invalid_ids') or ()) - sent_ids
+    page_ids = [s.id for s in page]
+    analytics_rows = [
+        {'email': s.email, 'question_subscriber_id': s.id} for s in page if s.id in sent_ids
+    ]
+    ack_sends(
+        sub,
+        send_id,
+        [
+            (sorted(sent_ids), {sub.last_email_sent: now}),
+            # Bad address that blocked the batch: deactivate permanently.
+            (sorted(invalid_ids), {
+                sub.is_active: False,
+                sub.unsubscribe_reason: 'invalid_email',
+                sub.unsubscribed_at: now,
+            }),
+        ],
+        release_ids=page_ids,
+    )
+    db.session.commit()
+    if invalid_ids:
+        logger.warning(f"Deactivated {len(invalid_ids)} daily question subscribers with invalid addresses")
+    EmailAnalytics.record_sends(
+        analytics_rows,
+        category=EmailAnalytics.CATEGORY_DAILY_QUESTION,
+        subject=f"Daily Question #{question.question_number}: {question.topic_category or 'Civic'}",
+        daily_question_id=question.id,
+    )
+
+
+def send_daily_question_emails(
+    question,
+    *,
+    client=None,
+    page_size: int = DAILY_SEND_PAGE_SIZE,
+    lease_seconds: int = DAILY_SEND_LEASE_SECONDS,
+) -> Dict[str, Any]:
+    """
+    Send ``question`` to every eligible daily subscriber, resuming any
+    earlier interrupted run for the same question.
+
+    Returns ``{'status', 'sent', 'failed', 'pages', 'last_subscriber_id',
+    'emails_per_second'}`` for this invocation; ``status`` is ``'complete'``,
+    ``'busy'`` (another worker holds the lease), ``'already_complete'`` or
+    ``'lease_lost'``.
+    """
+    owner = _worker_id()
+    run = claim_send_run(question.id, owner, lease_seconds)
+    summary = {'status': 'busy', 'sent': 0, 'failed': 0, 'pages': 0,
+               'last_subscriber_id': None, 'emails_per_second': 0.0}
+    if run is None:
+        done = DailyQuestionSendRun.query.filter_by(daily_question_id=question.id).first()
+        if done is not None and done.is_complete:
+            summary['status'] = 'already_complete'
+        return summary
+
+    run_id = run.id
+    last_id = run.last_subscriber_id or 0
+    if last_id:
+        logger.info(f"Resuming daily question #{question.question_number} send after subscriber {last_id}")
+
+    if client is None:
+        from app.resend_client import get_resend_client
+        client = get_resend_client()
+
+    today = utcnow_naive().date()
+    today_start = datetime(today.year, today.month, today.day)
+    send_id = new_send_id(f"dq:{question.id}")
+    started = time.monotonic()
+
+    try:
+        while True:
+            page_ids = _eligible_page_ids(last_id, today_start, page_size)
+            if not page_ids:
+                break
+
+            page = _claim_page(page_ids, today_start, send_id, lease_seconds)
+            if page:
+                result = client.send_daily_question_batch(page, question)
+                _ack_page(send_id, page, result, question)
+            else:
+                result = {'sent': 0, 'failed': 0, 'errors': []}
+            last_id = page_ids[-1]
+            summary['sent'] += result['sent']
+            summary['failed'] += result['failed']
+            summary['pages'] += 1
+            for error in result.get('errors', [])[:5]:
+                logger.warning(f"Daily question batch error: {error}")
+
+            if not _checkpoint(run_id, owner, last_id, result['sent'], result['failed'], lease_seconds):
+                logger.warning(
+                    f"Daily question send lease lost after subscriber {last_id}; "
+                    f"another worker will continue"
+                )
+                summary['status'] = 'lease_lost'
+                break
+
+            # Drop the page from the identity map so memory stays flat.
+            for subscriber in page:
+                db.session.expunge(subscriber)
+
+            elapsed = time.monotonic() - started
+            logger.info(
+                f"Daily question send page {summary['pages']}: {summary['sent']} sent, "
+                f"{summary['failed']} failed, through subscriber {last_id} "
+                f"({summary['sent'] / elapsed if elapsed > 0 else 0:.1f} emails/sec)"
+            )
+
+        if summary['status'] != 'lease_lost':
+            _finish(run_id, owner)
+            summary['status'] = 'complete'
+    except Exception:
+        db.session.rollback()
+        release_claims(DailyQuestionSubscriber, send_id)
+        _release(run_id, owner)
+        raise
+
+    elapsed = time.monotonic() - started
+    summary['last_subscriber_id'] = last_id
+    summary['emails_per_second'] = summary['sent'] / elapsed if elapsed > 0 else 0.0
+    logger.info(
+        f"Daily question #{question.question_number} send {summary['status']}: "
+        f"{summary['sent']} sent, {summary['failed']} failed in {summary['pages']} pages "
+        f"({summary['emails_per_second']:.1f} emails/sec)"
+    )
+    return summary
+
+
+def pending_send_run(question_id: int) -> Optional[DailyQuestionSendRun]:
+    """The question's unfinished run whose lease has lapsed, if any (resume candidate)."""
+    now = utcnow_naive()
+    return DailyQuestionSendRun.query.filter(
+        DailyQuestionSendRun.daily_question_id == question_id,
+        DailyQuestionSendRun.completed_at.is_(None),
+        or_(
+            DailyQuestionSendRun.lease_owner.is_(None),
+            DailyQuestionSendRun.lease_expires_at < now,
+        ),
+    ).first()
@@ -754,7 +754,16 @@ def sync_vote_to_statement(question, vote_value, fingerprint):
             else:
                 statement.vote_count_unsure = (statement.vote_count_unsure or 0) + 1
             
+            _record_daily_sync_vote_rollup(
+                question,
+                old_vote=old_vote,
+                old_confidence=existing_vote.confidence,
+                old_changed_at=existing_vote.updated_at or existing_vote.created_at,
+                new_vote=vote_value,
+                new_confidence=existing_vote.confidence,
+            )
             existing_vote.vote = vote_value
+            _record_daily_sync_stats(statement, old_vote=old_vote, new_vote=vote_value)
             return False, True
         return False, False
     else:
@@ -767,6 +776,7 @@ def sync_vote_to_statement(question, vote_value, fingerprint):
             vote=vote_value
         )
         db.session.add(stmt_vote)
+        _record_daily_sync_vote_rollup(question, new_vote=vote_value)
         
         # Update statement vote counts
         if vote_value == 1:
@@ -775,10 +785,34 @@ def sync_vote_to_statement(question, vote_value, fingerprint):
             statement.vote_count_disagree = (statement.vote_count_disagree or 0) + 1
         else:
             statement.vote_count_unsure = (statement.vote_count_unsure or 0) + 1
-        
+
+        _record_daily_sync_stats(statement, new_vote=vote_value, fingerprint=fingerprint)
         return True, False
 
 
+def _record_daily_sync_vote_rollup(question, **delta):
+    """Keep the programme vote rollup in step with a daily-question vote sync."""
+    from app.programmes.vote_rollup import record_vote_rollup_delta
+
+    prog_id = db.session.query(Discussion.programme_id).filter(
+        Discussion.id == question.source_discussion_id
+    ).scalar()
+    record_vote_rollup_delta(prog_id, question.source_discussion_id, **delta)
+
+
+def _record_daily_sync_stats(statement, *, old_vote=None, new_vote=None, fingerprint=None):
+    """Keep the discussion's maintained participation stats in step with a daily-question vote sync."""
+    from app.discussions.discussion_stats import record_vote_stats_delta
+
+    record_vote_stats_delta(
+        statement,
+        old_vote=old_vote,
+        new_vote=new_vote,
+        user_id=current_user.id if current_user.is_authenticated else None,
+        session_fingerprint=None if current_user.is_authenticated else fingerprint,
+    )
+
+
 def _invalidate_programme_summary_if_daily_question_synced(question):
     """Bust programme summary cache when daily participation writes StatementVote rows."""
     did = getattr(question, 'source_discussion_id', None)
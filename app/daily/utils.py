@@ -395,6 +395,15 @@ def get_source_articles_for_question(question, limit=3):
     return get_source_articles(question, limit=limit)
 
 
+def digest_vote_urls(question, vote_token, base_url):
+    """One-click vote URLs for a question in the weekly/monthly digest email."""
+    return {
+        'agree': f"{base_url}/daily/v/{vote_token}/agree?q={question.id}&source=weekly_digest",
+        'disagree': f"{base_url}/daily/v/{vote_token}/disagree?q={question.id}&source=weekly_digest",
+        'unsure': f"{base_url}/daily/v/{vote_token}/unsure?q={question.id}&source=weekly_digest",
+    }
+
+
 def build_question_email_data(question, subscriber, base_url=None):
     """
     Build all the data needed for a question in the weekly digest email.
@@ -432,11 +441,7 @@ def build_question_email_data(question, subscriber, base_url=None):
 
     if base_url:
         # Use provided base_url (for use outside request context, e.g., email sending)
-        vote_urls = {
-            'agree': f"{base_url}/daily/v/{vote_token}/agree?q={question.id}&source=weekly_digest",
-            'disagree': f"{base_url}/daily/v/{vote_token}/disagree?q={question.id}&source=weekly_digest",
-            'unsure': f"{base_url}/daily/v/{vote_token}/unsure?q={question.id}&source=weekly_digest",
-        }
+        vote_urls = digest_vote_urls(question, vote_token, base_url)
         question_url = f"{base_url}/daily/{question.question_date.isoformat()}"
     else:
         # Use url_for (for use within request context)
@@ -6,15 +6,18 @@ Provides endpoints for running consensus analysis and viewing results
 """
 from flask import abort, render_template, redirect, url_for, flash, request, Blueprint, jsonify, current_app, make_response
 from flask_login import login_required, current_user
-from app import db, limiter
+from sqlalchemy.orm import selectinload
+from app import cache, db, limiter
 from app.models import Discussion, ConsensusAnalysis, ConsensusJob, Statement, StatementVote
 from app.lib.participation_metrics import visible_statement_vote_filters
 from app.lib.vote_identity import anonymous_fingerprint_aliases_for_daily_lookup
 from app.lib.consensus_engine import can_cluster, get_consensus_execution_plan
+from app.lib.cpu_offload import offload
 from app.discussions.jobs import enqueue_consensus_job
 from app.discussions.thresholds import consensus_thresholds_dict, CONSENSUS_VIEW_RESULTS_MIN_VOTES
 from app.programmes.permissions import can_view_programme
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from app.lib.time import utcnow_naive
 import logging
 from flask_babel import gettext as _
@@ -128,6 +131,356 @@ def _invalidate_snapshot_cache(discussion_id):
         pass
 
 
+# =============================================================================
+# RESULTS VIEW-MODEL CACHE
+# =============================================================================
+#
+# The results page only changes when a new analysis is saved (or its summary /
+# labels are edited), so its view-model is built once per analysis revision
+# and language and served from cache. ``latest`` points a discussion at the
+# current revision token ("<analysis_id>.<rev>"); view-models live under
+# that token, so a new analysis never serves a stale page and old entries
+# simply expire. Per-viewer parts (participation gate, "you are here",
+# drift notice) stay per request.
+
+_RESULTS_CACHE_TIMEOUT = 7 * 24 * 3600
+# Statement translations land from a background worker after the analysis,
+# so translated view-models are rebuilt periodically to pick them up.
+_RESULTS_TRANSLATED_CACHE_TIMEOUT = 15 * 60
+_RESULTS_DRIFT_CACHE_TIMEOUT = 60
+
+
+def _results_latest_key(discussion_id):
+    return f"consensus:results:latest:{discussion_id}"
+
+
+def _results_view_key(token, lang):
+    return f"consensus:results:{token}:{lang}"
+
+
+def _statement_view(stmt):
+    return {
+        'id': stmt.id,
+        'content': stmt.content,
+        'vote_count_agree': stmt.vote_count_agree,
+        'vote_count_disagree': stmt.vote_count_disagree,
+        'vote_count_unsure': stmt.vote_count_unsure,
+    }
+
+
+def build_results_view_model(analysis, discussion, lang):
+    """
+    Everything the results page renders that depends only on the analysis.
+
+    Plain dicts/lists so the result caches cleanly; ``view_results`` adds the
+    per-viewer parts.
+    """
+    from app.lib.translation import get_cached_discussion_translation, get_cached_statement_translations
+
+    _, withheld_reason = _assess_analysis_publishability(analysis)
+    view_model = {
+        'analysis_id': analysis.id,
+        'withheld_reason': withheld_reason,
+        'analysis': {
+            'id': analysis.id,
+            'cluster_data': dict(analysis.cluster_data or {}),
+            'num_clusters': analysis.num_clusters,
+            'silhouette_score': analysis.silhouette_score,
+            'method': analysis.method,
+            'participants_count': analysis.participants_count,
+            'statements_count': analysis.statements_count,
+            'created_at': analysis.created_at,
+        },
+    }
+    if withheld_reason:
+        return view_model
+
+    # Get statement details for consensus/bridge/divisive
+    consensus_stmt_ids = [s['statement_id'] for s in analysis.cluster_data.get('consensus_statements', [])]
+    bridge_stmt_ids = [s['statement_id'] for s in analysis.cluster_data.get('bridge_statements', [])]
+    divisive_stmt_ids = [s['statement_id'] for s in analysis.cluster_data.get('divisive_statements', [])]
+
+    # Build opinion groups — include ALL clusters, even those too small to have
+    # representative statements, so users are never silently missing groups.
+    cluster_sizes = analysis.cluster_sizes()
+    representative_data = analysis.cluster_data.get('representative_statements', {})
+
+    # ── Normalise representative_data keys to int/str once ────────────────────
+    # JSON round-trips may produce string keys for numeric cluster IDs.
+    # Doing this once here lets us use a simple dict.get() throughout.
+    def _norm_cid(k):
+        try:
+            return int(k)
+        except (ValueError, TypeError):
+            return str(k)
+
+    _rep_data: dict = {_norm_cid(k): v for k, v in representative_data.items()}
+
+    # ── Collect ALL cluster IDs (representative_data + cluster_sizes) ─────────
+    all_cluster_ids: set = set(_rep_data.keys())
+    for c in cluster_sizes:
+        all_cluster_ids.add(_norm_cid(c))
+
+    # ── One round-trip for every statement the page can show ─────────────────
+    axis_loadings = analysis.cluster_data.get('pca_axis_loadings', {}) or {}
+    all_rep_stmt_ids = [s['statement_id'] for stmts in _rep_data.values() for s in stmts]
+    needed_ids = set(consensus_stmt_ids) | set(bridge_stmt_ids) | set(divisive_stmt_ids) | set(all_rep_stmt_ids)
+    for axis in axis_loadings.values():
+        for key in ('positive_statement_ids', 'negative_statement_ids'):
+            needed_ids.update(axis.get(key, []) or [])
+    statements_by_id = {
+        s.id: s for s in Statement.query.filter(Statement.id.in_(needed_ids)).all()
+    } if needed_ids else {}
+
+    def _existing(ids):
+        return [statements_by_id[sid] for sid in dict.fromkeys(ids) if sid in statements_by_id]
+
+    consensus_statements = _existing(consensus_stmt_ids)
+    bridge_statements = _existing(bridge_stmt_ids)
+    divisive_statements = _existing(divisive_stmt_ids)
+    rep_statements_map = {sid: statements_by_id[sid] for sid in all_rep_stmt_ids if sid in statements_by_id}
+
+    def _sort_cid(x):
+        try:
+            return (0, int(x))
+        except (ValueError, TypeError):
+            return (1, str(x))
+
+    opinion_groups = []
+    for cluster_id in sorted(all_cluster_ids, key=_sort_cid):
+        target_cluster = _norm_cid(cluster_id)
+
+        # Human-readable name: integer cluster IDs are 0-indexed internally
+        if isinstance(target_cluster, int):
+            group_name = f"Group {target_cluster + 1}"
+            participant_count = sum(
+                n for c, n in cluster_sizes.items()
+                if _norm_cid(c) == target_cluster
+            )
+        else:
+            group_name = target_cluster.title()
+            participant_count = sum(
+                n for c, n in cluster_sizes.items()
+                if str(c) == target_cluster
+            )
+
+        # ── Build enriched statement list ────────────────────────────────────
+        # New (post-rigour-pass) fields: wilson_low/high, lift, p_value,
+        # significant, out_agreement_rate, tested_direction. All have safe
+        # fallbacks for analyses written by older versions of the engine.
+        group_stmts = []
+        for stmt_data in _rep_data.get(target_cluster, []):
+            stmt = rep_statements_map.get(stmt_data['statement_id'])
+            if not stmt:
+                continue
+            agree_count = stmt_data.get('agree_count', 0)
+            vote_count = stmt_data.get('vote_count', 0)
+            agreement_rate = stmt_data.get('agreement_rate', 0)
+            # Older analyses pre-dating the dead-zone classifier use a 0.5
+            # cutoff. Keep that fallback so historical views don't flip.
+            fallback_direction = 'agree' if agreement_rate >= 0.5 else 'reject'
+            group_stmts.append({
+                'statement_id': stmt.id,
+                'content': stmt.content,
+                'agreement_rate': agreement_rate,
+                'wilson_low': stmt_data.get('wilson_low'),
+                'wilson_high': stmt_data.get('wilson_high'),
+                'vote_count': vote_count,
+                'agree_count': agree_count,
+                'disagree_count': stmt_data.get('disagree_count', vote_count - agree_count),
+                'out_agreement_rate': stmt_data.get('out_agreement_rate'),
+                'lift': stmt_data.get('lift'),
+                'p_value': stmt_data.get('p_value'),
+                'significant': stmt_data.get('significant'),
+                'direction': stmt_data.get('direction', fallback_direction),
+                'tested_direction': stmt_data.get('tested_direction', fallback_direction),
+                'strength': stmt_data.get('strength', 0),
+            })
+
+        # Split into agreement / rejection / mixed buckets. Mixed (dead-zone)
+        # statements are surfaced separately because a 49%–60% agreement
+        # rate is not a defining belief of the group.
+        agree_statements = [s for s in group_stmts if s['direction'] == 'agree']
+        reject_statements = [s for s in group_stmts if s['direction'] == 'reject']
+        mixed_statements = [s for s in group_stmts if s['direction'] == 'mixed']
+
+        opinion_groups.append({
+            'id': target_cluster,
+            'name': group_name,
+            'participant_count': participant_count,
+            'statements': group_stmts,
+            'agree_statements': agree_statements,
+            'reject_statements': reject_statements,
+            'mixed_statements': mixed_statements,
+            # True when no representative statements could be surfaced.
+            # Common for small groups or groups whose members voted on
+            # different subsets of statements.  Re-running analysis after
+            # more votes arrive will fill this in.
+            'too_few_votes': len(group_stmts) == 0,
+            # Flag for low statistical reliability — shown as a caution badge.
+            'small_sample': participant_count < 5,
+            # True if at least one representative statement is FDR-significant.
+            'has_significant_signal': any(s.get('significant') for s in group_stmts),
+        })
+
+    # ── PCA axis labels from top loadings ─────────────────────────────────
+    # The engine stores top-loading statement IDs per axis. Resolve the
+    # statement content so the chart can display "← Agrees: 'X' │ 'Y' →"
+    # instead of a bare "Principal Component 1".
+    axis_loading_map = {
+        sid: {
+            'statement_id': sid,
+            'content': stmt.content,
+            'short': (stmt.content[:80] + '…') if len(stmt.content) > 80 else stmt.content,
+        }
+        for sid, stmt in statements_by_id.items()
+    }
+
+    _all_for_i18n = (
+        list(consensus_statements)
+        + list(bridge_statements)
+        + list(divisive_statements)
+        + list(rep_statements_map.values())
+    )
+    translation_map = (
+        get_cached_statement_translations(_all_for_i18n, lang)
+        if lang != 'en' and _all_for_i18n
+        else {}
+    )
+    discussion_translation = (
+        get_cached_discussion_translation(discussion, lang)
+        if lang != 'en'
+        else None
+    )
+
+    # Build lookups so the template can render CI + lift + out-group rate
+    # on consensus / bridge / divisive statement cards (previously only
+    # carried raw vote counts).
+    view_model.update({
+        'consensus_statements': [_statement_view(s) for s in consensus_statements],
+        'bridge_statements': [_statement_view(s) for s in bridge_statements],
+        'divisive_statements': [_statement_view(s) for s in divisive_statements],
+        'consensus_data_by_id': {
+            int(s['statement_id']): s
+            for s in (analysis.cluster_data.get('consensus_statements') or [])
+        },
+        'bridge_data_by_id': {
+            int(s['statement_id']): s
+            for s in (analysis.cluster_data.get('bridge_statements') or [])
+        },
+        'divisive_data_by_id': {
+            int(s['statement_id']): s
+            for s in (analysis.cluster_data.get('divisive_statements') or [])
+        },
+        'opinion_groups': opinion_groups,
+        'axis_loadings': axis_loadings,
+        'axis_loading_map': axis_loading_map,
+        'translation_map': translation_map,
+        'discussion_translation': discussion_translation,
+    })
+    return view_model
+
+
+def _cache_results_view_model(token, lang, view_model):
+    timeout = _RESULTS_CACHE_TIMEOUT if lang == 'en' else _RESULTS_TRANSLATED_CACHE_TIMEOUT
+    cache.set(_results_view_key(token, lang), view_model, timeout=timeout)
+
+
+def publish_results_view_models(analysis, discussion=None):
+    """
+    Build the analysis's results view-models for every language and point the
+    discussion at them. Called when an analysis is saved and after its summary
+    or labels change; a fresh revision token means edits never mix with
+    cached pages from before them.
+
+    If building fails the ``latest`` pointer is dropped before re-raising,
+    so the page builds live instead of serving the previous revision.
+    """
+    from app.lib.locale_utils import SUPPORTED_LANGUAGES
+
+    try:
+        discussion = discussion or db.session.get(Discussion, analysis.discussion_id)
+        token = f"{analysis.id}.{int(utcnow_naive().timestamp() * 1000)}"
+        for lang in SUPPORTED_LANGUAGES:
+            _cache_results_view_model(token, lang, build_results_view_model(analysis, discussion, lang))
+    except Exception:
+        cache.delete(_results_latest_key(analysis.discussion_id))
+        raise
+    cache.set(_results_latest_key(analysis.discussion_id), token, timeout=_RESULTS_CACHE_TIMEOUT)
+    return token
+
+
+def _republish_results(analysis, discussion):
+    try:
+        publish_results_view_models(analysis, discussion)
+    except Exception:
+        logger.exception("Failed to refresh cached consensus results for discussion %s", analysis.discussion_id)
+
+
+def get_results_view_model(discussion, lang):
+    """
+    Cached results view-model for the discussion's latest analysis, or None
+    when it has none. A warm hit is two cache reads and no SQL.
+    """
+    token = cache.get(_results_latest_key(discussion.id))
+    if token:
+        view_model = cache.get(_results_view_key(token, lang))
+        if view_model is not None:
+            return view_model
+
+    analysis = ConsensusAnalysis.query.filter_by(
+        discussion_id=discussion.id
+    ).order_by(ConsensusAnalysis.created_at.desc()).first()
+    if not analysis:
+        return None
+    if not token or not token.startswith(f"{analysis.id}."):
+        token = f"{analysis.id}.0"
+        cache.set(_results_latest_key(discussion.id), token, timeout=_RESULTS_CACHE_TIMEOUT)
+    view_model = build_results_view_model(analysis, discussion, lang)
+    _cache_results_view_model(token, lang, view_model)
+    return view_model
+
+
+def _results_drift(discussion_id, analysis):
+    """
+    Stale-analysis detection, cached briefly per discussion.
+
+    If votes arrived after the analysis was stored, let the viewer know a
+    re-run would refresh the picture. Thresholds chosen to avoid nagging when
+    the drift is small.
+    """
+    key = f"consensus:results:drift:{discussion_id}:{analysis.id}"
+    drift = cache.get(key)
+    if drift is not None:
+        return drift
+
+    from sqlalchemy import func
+    current_stmt_count = Statement.query.filter_by(
+        discussion_id=discussion_id, is_deleted=False
+    ).count()
+    current_vote_total = db.session.query(
+        func.coalesce(
+            func.sum(Statement.vote_count_agree) + func.sum(Statement.vote_count_disagree) + func.sum(Statement.vote_count_unsure),
+            0,
+        )
+    ).filter(Statement.discussion_id == discussion_id, Statement.is_deleted.is_(False)).scalar() or 0
+    analysed_stmt_count = int(analysis.statements_count or 0)
+    analysed_participants = int(analysis.participants_count or 0)
+    stmt_drift = current_stmt_count - analysed_stmt_count
+    # 10% participant drift or any new statement triggers the notice.
+    drift = {
+        'is_stale_analysis': (
+            stmt_drift > 0
+            or (analysed_participants > 0 and current_vote_total > 0
+                and current_vote_total >= int(analysed_participants * 1.1))
+        ),
+        'current_stmt_count': current_stmt_count,
+        'analysed_stmt_count': analysed_stmt_count,
+    }
+    cache.set(key, drift, timeout=_RESULTS_DRIFT_CACHE_TIMEOUT)
+    return drift
+
+
 def get_user_vote_count(discussion_id):
     """
     Get the number of statements a user has voted on in this discussion.
@@ -232,9 +585,17 @@ def build_consensus_ui_state(discussion, precomputed_metrics=None, participant_c
     else:
         min_mod_status = None  # both args pre-supplied; no queries will run
 
+    published = None
+    if min_mod_status == 0:
+        from app.discussions.discussion_stats import get_discussion_stats
+        published = get_discussion_stats(discussion.id)
+
     if precomputed_metrics is not None:
         total_votes = int(precomputed_metrics.get('total_votes') or 0)
         statement_count = int(precomputed_metrics.get('statement_count') or 0)
+    elif published is not None:
+        total_votes = published['total_votes']
+        statement_count = published['statement_count']
     else:
         statement_scope = Statement.query.filter(
             Statement.discussion_id == discussion.id,
@@ -253,7 +614,9 @@ def build_consensus_ui_state(discussion, precomputed_metrics=None, participant_c
             func.count(Statement.id)
         ).scalar() or 0
 
-    if participant_count is None:
+    if participant_count is None and published is not None:
+        participant_count = published['participant_count']
+    elif participant_count is None:
         participant_count = get_discussion_participant_count(
             discussion,
             include_deleted_statement_votes=False,
@@ -378,12 +741,12 @@ def view_results(discussion_id):
                                  votes_needed=votes_needed,
                                  threshold=PARTICIPATION_THRESHOLD)
     
-    # Get latest analysis
-    analysis = ConsensusAnalysis.query.filter_by(
-        discussion_id=discussion_id
-    ).order_by(ConsensusAnalysis.created_at.desc()).first()
-    
-    if not analysis:
+    from app.lib.translation import resolve_language
+
+    view_lang = resolve_language(request)
+    view_model = get_results_view_model(discussion, view_lang)
+
+    if view_model is None:
         # Check if ready for first analysis
         plan = get_consensus_execution_plan(discussion_id, db)
         can_analyze = plan.get('is_ready', False)
@@ -395,183 +758,17 @@ def view_results(discussion_id):
                              message=ready_message,
                              consensus_thresholds=consensus_thresholds_dict())
 
-    is_publishable, withheld_reason = _assess_analysis_publishability(analysis)
-    if not is_publishable:
+    if view_model['withheld_reason']:
         return render_template(
             'discussions/consensus_not_ready.html',
             discussion=discussion,
             can_analyze=(is_creator or is_admin),
-            message=withheld_reason,
+            message=view_model['withheld_reason'],
             consensus_thresholds=consensus_thresholds_dict(),
         )
-    
-    # Get statement details for consensus/bridge/divisive
-    consensus_stmt_ids = [s['statement_id'] for s in analysis.cluster_data.get('consensus_statements', [])]
-    bridge_stmt_ids = [s['statement_id'] for s in analysis.cluster_data.get('bridge_statements', [])]
-    divisive_stmt_ids = [s['statement_id'] for s in analysis.cluster_data.get('divisive_statements', [])]
-    
-    consensus_statements = Statement.query.filter(Statement.id.in_(consensus_stmt_ids)).all() if consensus_stmt_ids else []
-    bridge_statements = Statement.query.filter(Statement.id.in_(bridge_stmt_ids)).all() if bridge_stmt_ids else []
-    divisive_statements = Statement.query.filter(Statement.id.in_(divisive_stmt_ids)).all() if divisive_stmt_ids else []
-    
-    # Build opinion groups — include ALL clusters, even those too small to have
-    # representative statements, so users are never silently missing groups.
-    cluster_assignments = analysis.cluster_data.get('cluster_assignments', {})
-    representative_data = analysis.cluster_data.get('representative_statements', {})
-
-    # ── Normalise representative_data keys to int/str once ────────────────────
-    # JSON round-trips may produce string keys for numeric cluster IDs.
-    # Doing this once here lets us use a simple dict.get() throughout.
-    def _norm_cid(k):
-        try:
-            return int(k)
-        except (ValueError, TypeError):
-            return str(k)
-
-    _rep_data: dict = {_norm_cid(k): v for k, v in representative_data.items()}
-
-    # ── Collect ALL cluster IDs (representative_data + cluster_assignments) ───
-    all_cluster_ids: set = set(_rep_data.keys())
-    for c in cluster_assignments.values():
-        all_cluster_ids.add(_norm_cid(c))
-
-    # ── Batch-fetch representative Statement objects (single DB round-trip) ───
-    all_rep_stmt_ids = [s['statement_id'] for stmts in _rep_data.values() for s in stmts]
-    rep_statements_map: dict = {}
-    if all_rep_stmt_ids:
-        rep_stmts = Statement.query.filter(Statement.id.in_(all_rep_stmt_ids)).all()
-        rep_statements_map = {s.id: s for s in rep_stmts}
-
-    def _sort_cid(x):
-        try:
-            return (0, int(x))
-        except (ValueError, TypeError):
-            return (1, str(x))
-
-    opinion_groups = []
-    for cluster_id in sorted(all_cluster_ids, key=_sort_cid):
-        target_cluster = _norm_cid(cluster_id)
-
-        # Human-readable name: integer cluster IDs are 0-indexed internally
-        if isinstance(target_cluster, int):
-            group_name = f"Group {target_cluster + 1}"
-            participant_count = sum(
-                1 for c in cluster_assignments.values()
-                if _norm_cid(c) == target_cluster
-            )
-        else:
-            group_name = target_cluster.title()
-            participant_count = sum(
-                1 for c in cluster_assignments.values()
-                if str(c) == target_cluster
-            )
-
-        # ── Build enriched statement list ────────────────────────────────────
-        # New (post-rigour-pass) fields: wilson_low/high, lift, p_value,
-        # significant, out_agreement_rate, tested_direction. All have safe
-        # fallbacks for analyses written by older versions of the engine.
-        group_stmts = []
-        for stmt_data in _rep_data.get(target_cluster, []):
-            stmt = rep_statements_map.get(stmt_data['statement_id'])
-            if not stmt:
-                continue
-            agree_count = stmt_data.get('agree_count', 0)
-            vote_count = stmt_data.get('vote_count', 0)
-            agreement_rate = stmt_data.get('agreement_rate', 0)
-            # Older analyses pre-dating the dead-zone classifier use a 0.5
-            # cutoff. Keep that fallback so historical views don't flip.
-            fallback_direction = 'agree' if agreement_rate >= 0.5 else 'reject'
-            group_stmts.append({
-                'statement_id': stmt.id,
-                'content': stmt.content,
-                'agreement_rate': agreement_rate,
-                'wilson_low': stmt_data.get('wilson_low'),
-                'wilson_high': stmt_data.get('wilson_high'),
-                'vote_count': vote_count,
-                'agree_count': agree_count,
-                'disagree_count': stmt_data.get('disagree_count', vote_count - agree_count),
-                'out_agreement_rate': stmt_data.get('out_agreement_rate'),
-                'lift': stmt_data.get('lift'),
-                'p_value': stmt_data.get('p_value'),
-                'significant': stmt_data.get('significant'),
-                'direction': stmt_data.get('direction', fallback_direction),
-                'tested_direction': stmt_data.get('tested_direction', fallback_direction),
-                'strength': stmt_data.get('strength', 0),
-            })
-
-        # Split into agreement / rejection / mixed buckets. Mixed (dead-zone)
-        # statements are surfaced separately because a 49%–60% agreement
-        # rate is not a defining belief of the group.
-        agree_statements = [s for s in group_stmts if s['direction'] == 'agree']
-        reject_statements = [s for s in group_stmts if s['direction'] == 'reject']
-        mixed_statements = [s for s in group_stmts if s['direction'] == 'mixed']
-
-        opinion_groups.append({
-            'id': target_cluster,
-            'name': group_name,
-            'participant_count': participant_count,
-            'statements': group_stmts,
-            'agree_statements': agree_statements,
-            'reject_statements': reject_statements,
-            'mixed_statements': mixed_statements,
-            # True when no representative statements could be surfaced.
-            # Common for small groups or groups whose members voted on
-            # different subsets of statements.  Re-running analysis after
-            # more votes arrive will fill this in.
-            'too_few_votes': len(group_stmts) == 0,
-            # Flag for low statistical reliability — shown as a caution badge.
-            'small_sample': participant_count < 5,
-            # True if at least one representative statement is FDR-significant.
-            'has_significant_signal': any(s.get('significant') for s in group_stmts),
-        })
-
-    # ── Stale-analysis detection ──────────────────────────────────────────
-    # If votes arrived after the analysis was stored, let the viewer know
-    # a re-run would refresh the picture. Thresholds chosen to avoid
-    # nagging when the drift is small.
-    from sqlalchemy import func
-    current_stmt_count = Statement.query.filter_by(
-        discussion_id=discussion.id, is_deleted=False
-    ).count()
-    current_vote_total = db.session.query(
-        func.coalesce(
-            func.sum(Statement.vote_count_agree) + func.sum(Statement.vote_count_disagree) + func.sum(Statement.vote_count_unsure),
-            0,
-        )
-    ).filter(Statement.discussion_id == discussion.id, Statement.is_deleted.is_(False)).scalar() or 0
-    analysed_stmt_count = int(analysis.statements_count or 0)
-    analysed_participants = int(analysis.participants_count or 0)
-    stmt_drift = current_stmt_count - analysed_stmt_count
-    # 10% participant drift or any new statement triggers the notice.
-    is_stale_analysis = (
-        stmt_drift > 0
-        or (analysed_participants > 0 and current_vote_total > 0
-            and current_vote_total >= int(analysed_participants * 1.1))
-    )
 
-    # ── PCA axis labels from top loadings ─────────────────────────────────
-    # The engine stores top-loading statement IDs per axis. Resolve the
-    # statement content so the chart can display "← Agrees: 'X' │ 'Y' →"
-    # instead of a bare "Principal Component 1". Re-use already-fetched
-    # Statement objects and only issue a DB query for the residual.
-    axis_loadings = analysis.cluster_data.get('pca_axis_loadings', {}) or {}
-    axis_loading_stmts_map = {
-        s.id: s
-        for s in (
-            list(rep_statements_map.values())
-            + list(consensus_statements)
-            + list(bridge_statements)
-            + list(divisive_statements)
-        )
-    }
-    needed_ids = set()
-    for axis in axis_loadings.values():
-        for key in ('positive_statement_ids', 'negative_statement_ids'):
-            needed_ids.update(axis.get(key, []) or [])
-    missing_ids = needed_ids - axis_loading_stmts_map.keys()
-    if missing_ids:
-        for stmt in Statement.query.filter(Statement.id.in_(missing_ids)).all():
-            axis_loading_stmts_map[stmt.id] = stmt
+    analysis = SimpleNamespace(**view_model['analysis'])
+    drift = _results_drift(discussion.id, analysis)
 
     # ── "You are here": keys that the scatter-plot JS uses to highlight the viewer's dot.
     # Matches build_vote_matrix's participant ids (u_{id} for auth, a_{fp16} for anon).
@@ -599,87 +796,37 @@ def view_results(discussion_id):
                 'discussion_id': discussion.id,
                 'discussion_title': discussion.title,
                 'has_analysis': True,
-                'num_clusters': analysis.num_clusters if analysis else 0,
-                'participants_count': analysis.participants_count if analysis else 0
+                'num_clusters': analysis.num_clusters,
+                'participants_count': analysis.participants_count,
             })
         except Exception as e:
             current_app.logger.debug(f"Consensus tracking error: {e}")
 
     from app.lib.locale_utils import language_preference_cookie_params
-    from app.lib.translation import (
-        get_cached_discussion_translation,
-        get_cached_statement_translations,
-        resolve_language,
-    )
 
-    view_lang = resolve_language(request)
-    # Reuse already-fetched Statement objects — no extra DB round-trip needed.
-    # consensus/bridge/divisive are lists of ORM objects; rep_statements_map
-    # holds the objects for representative statements.
-    _all_for_i18n = (
-        list(consensus_statements)
-        + list(bridge_statements)
-        + list(divisive_statements)
-        + list(rep_statements_map.values())
-    )
-    translation_map = (
-        get_cached_statement_translations(_all_for_i18n, view_lang)
-        if view_lang != 'en' and _all_for_i18n
-        else {}
-    )
-    discussion_translation = (
-        get_cached_discussion_translation(discussion, view_lang)
-        if view_lang != 'en'
-        else None
-    )
-
-    # Build a simple id → statement-ish dict for axis labels (template
-    # needs both the statement object and the raw content for truncation).
-    axis_loading_map = {
-        sid: {
-            'statement_id': sid,
-            'content': stmt.content,
-            'short': (stmt.content[:80] + '…') if len(stmt.content) > 80 else stmt.content,
-        }
-        for sid, stmt in axis_loading_stmts_map.items()
-    }
-
-    # Build lookups so the template can render CI + lift + out-group rate
-    # on consensus / bridge / divisive statement cards (previously only
-    # carried raw vote counts).
-    consensus_data_by_id = {
-        int(s['statement_id']): s
-        for s in (analysis.cluster_data.get('consensus_statements') or [])
-    }
-    bridge_data_by_id = {
-        int(s['statement_id']): s
-        for s in (analysis.cluster_data.get('bridge_statements') or [])
-    }
-    divisive_data_by_id = {
-        int(s['statement_id']): s
-        for s in (analysis.cluster_data.get('divisive_statements') or [])
-    }
+    def _statements(key):
+        return [SimpleNamespace(**s) for s in view_model[key]]
 
     resp = make_response(render_template(
         'discussions/consensus_results.html',
         discussion=discussion,
         analysis=analysis,
-        consensus_statements=consensus_statements,
-        bridge_statements=bridge_statements,
-        divisive_statements=divisive_statements,
-        consensus_data_by_id=consensus_data_by_id,
-        bridge_data_by_id=bridge_data_by_id,
-        divisive_data_by_id=divisive_data_by_id,
-        opinion_groups=opinion_groups,
-        translation_map=translation_map,
-        discussion_translation=discussion_translation,
+        consensus_statements=_statements('consensus_statements'),
+        bridge_statements=_statements('bridge_statements'),
+        divisive_statements=_statements('divisive_statements'),
+        consensus_data_by_id=view_model['consensus_data_by_id'],
+        bridge_data_by_id=view_model['bridge_data_by_id'],
+        divisive_data_by_id=view_model['divisive_data_by_id'],
+        opinion_groups=view_model['opinion_groups'],
+        translation_map=view_model['translation_map'],
+        discussion_translation=view_model['discussion_translation'],
         current_lang=view_lang,
-        axis_loadings=axis_loadings,
-        axis_loading_map=axis_loading_map,
+        axis_loadings=view_model['axis_loadings'],
+        axis_loading_map=view_model['axis_loading_map'],
         viewer_participant_keys=viewer_participant_keys,
-        is_stale_analysis=is_stale_analysis,
-        current_stmt_count=current_stmt_count,
-        analysed_stmt_count=analysed_stmt_count,
+        is_stale_analysis=drift['is_stale_analysis'],
+        current_stmt_count=drift['current_stmt_count'],
+        analysed_stmt_count=drift['analysed_stmt_count'],
     ))
     if view_lang != 'en':
         resp.set_cookie('ss_lang', view_lang, **language_preference_cookie_params())
@@ -712,10 +859,11 @@ def get_cluster_data(discussion_id):
             'message': withheld_reason,
         }), 409
 
-    # Return cluster data
+    # Return cluster data (the only read of the per-participant arrays)
+    cluster_assignments, pca_coordinates = analysis.participant_arrays()
     return jsonify({
-        'cluster_assignments': analysis.cluster_data.get('cluster_assignments', {}),
-        'pca_coordinates': analysis.cluster_data.get('pca_coordinates', {}),
+        'cluster_assignments': cluster_assignments,
+        'pca_coordinates': pca_coordinates,
         'metadata': analysis.cluster_data.get('metadata', {})
     })
 
@@ -883,6 +1031,118 @@ def generate_report(discussion_id):
                          for_print=request.args.get('print') == 'true')
 
 
+def _export_classification_map(cluster_data):
+    """
+    ``({statement_id: classification/metrics}, all statement ids)`` for the
+    CSV export, from a stored analysis's ``cluster_data``.
+    """
+    # Build a lookup: statement_id -> (classification, metrics) from cluster_data
+    classification_map = {}
+    for label, stmts in (
+        ('consensus', cluster_data.get('consensus_statements', [])),
+        ('bridge',    cluster_data.get('bridge_statements', [])),
+        ('divisive',  cluster_data.get('divisive_statements', [])),
+    ):
+        for entry in stmts:
+            sid = entry.get('statement_id')
+            if sid is not None:
+                # Normalise field names: bridge uses mean_agreement, divisive uses agree_rate
+                agreement_rate = (
+                    entry.get('agreement_rate')
+                    or entry.get('mean_agreement')
+                    or entry.get('agree_rate')
+                    or ''
+                )
+                classification_map[sid] = {
+                    'classification':   label,
+                    'agreement_rate':   agreement_rate,
+                    'wilson_low':       entry.get('wilson_low', ''),
+                    'wilson_high':      entry.get('wilson_high', ''),
+                    'gap_ci_low':       entry.get('gap_ci_low', entry.get('wilson_low', '')),
+                    'gap_ci_high':      entry.get('gap_ci_high', entry.get('wilson_high', '')),
+                    'p_value':          entry.get('p_value', ''),
+                    'p_value_gap':      entry.get('p_value_gap', ''),
+                    'chi2':             entry.get('chi2', ''),
+                    'significant':      entry.get('significant', ''),
+                    'group_gap':        entry.get('group_gap', ''),
+                    'polarity':         entry.get('polarity', ''),
+                    'strength':         entry.get('strength', ''),
+                    'vote_count':       entry.get('vote_count', ''),
+                }
+
+    # Collect all statement IDs mentioned in the analysis
+    all_stmt_ids = set(classification_map.keys())
+    # Also include any that appear only in representative_statements
+    for stmts in cluster_data.get('representative_statements', {}).values():
+        for entry in stmts:
+            sid = entry.get('statement_id')
+            if sid is not None:
+                all_stmt_ids.add(sid)
+    return classification_map, all_stmt_ids
+
+
+def _export_csv_bytes(all_stmt_ids, classification_map, statement_rows):
+    """
+    Render the consensus CSV export. ``statement_rows`` maps statement id to
+    ``(content, agree_count, disagree_count)``; plain data only, as this runs
+    on an offload thread.
+    """
+    import csv
+    import io
+
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow([
+        'statement_id',
+        'content',
+        'classification',
+        'polarity',
+        'agree_count',
+        'disagree_count',
+        'total_votes',
+        'agreement_rate',
+        'wilson_low',
+        'wilson_high',
+        'gap_ci_low_newcombe',
+        'gap_ci_high_newcombe',
+        'p_value_omnibus_permutation',
+        'p_value_gap_fisher',
+        'chi2_observed',
+        'fdr_significant',
+        'group_gap',
+        'strength',
+    ])
+
+    for sid in sorted(all_stmt_ids):
+        row = statement_rows.get(sid)
+        meta = classification_map.get(sid, {})
+        content, agree, disagree = row if row else ('', '', '')
+        total   = (agree + disagree) if isinstance(agree, int) and isinstance(disagree, int) else ''
+        writer.writerow([
+            sid,
+            content,
+            meta.get('classification', 'unclassified'),
+            meta.get('polarity', ''),
+            agree,
+            disagree,
+            total,
+            meta.get('agreement_rate', ''),
+            meta.get('wilson_low', ''),
+            meta.get('wilson_high', ''),
+            meta.get('gap_ci_low', ''),
+            meta.get('gap_ci_high', ''),
+            meta.get('p_value', ''),
+            meta.get('p_value_gap', ''),
+            meta.get('chi2', ''),
+            meta.get('significant', ''),
+            meta.get('group_gap', ''),
+            meta.get('strength', ''),
+        ])
+
+    # UTF-8 BOM ensures Excel on Windows detects encoding correctly
+    return b'\xef\xbb\xbf' + output.getvalue().encode('utf-8')
+
+
 @consensus_bp.route('/api/discussions/<int:discussion_id>/consensus/export')
 def export_analysis(discussion_id):
     """
@@ -894,10 +1154,15 @@ def export_analysis(discussion_id):
     if discussion.programme and not can_view_programme(discussion.programme, current_user):
         return jsonify({'error': 'forbidden'}), 403
 
-    # Get latest analysis
-    analysis = ConsensusAnalysis.query.filter_by(
-        discussion_id=discussion_id
-    ).order_by(ConsensusAnalysis.created_at.desc()).first()
+    export_format = request.args.get('format', 'json')
+
+    # Get latest analysis. The JSON export needs the participants row; load it
+    # here, since decoding and serialising it run off the event loop, outside
+    # the session.
+    query = ConsensusAnalysis.query.filter_by(discussion_id=discussion_id)
+    if export_format != 'csv':
+        query = query.options(selectinload(ConsensusAnalysis.participants))
+    analysis = query.order_by(ConsensusAnalysis.created_at.desc()).first()
     
     if not analysis:
         return jsonify({'error': _('No analysis available')}), 404
@@ -909,114 +1174,13 @@ def export_analysis(discussion_id):
             'message': withheld_reason,
         }), 409
 
-    export_format = request.args.get('format', 'json')
-    
     if export_format == 'csv':
-        import csv
-        import io
-
-        cluster_data = analysis.cluster_data or {}
-
-        # Build a lookup: statement_id -> (classification, metrics) from cluster_data
-        classification_map = {}
-        for label, stmts in (
-            ('consensus', cluster_data.get('consensus_statements', [])),
-            ('bridge',    cluster_data.get('bridge_statements', [])),
-            ('divisive',  cluster_data.get('divisive_statements', [])),
-        ):
-            for entry in stmts:
-                sid = entry.get('statement_id')
-                if sid is not None:
-                    # Normalise field names: bridge uses mean_agreement, divisive uses agree_rate
-                    agreement_rate = (
-                        entry.get('agreement_rate')
-                        or entry.get('mean_agreement')
-                        or entry.get('agree_rate')
-                        or ''
-                    )
-                    classification_map[sid] = {
-                        'classification':   label,
-                        'agreement_rate':   agreement_rate,
-                        'wilson_low':       entry.get('wilson_low', ''),
-                        'wilson_high':      entry.get('wilson_high', ''),
-                        'gap_ci_low':       entry.get('gap_ci_low', entry.get('wilson_low', '')),
-                        'gap_ci_high':      entry.get('gap_ci_high', entry.get('wilson_high', '')),
-                        'p_value':          entry.get('p_value', ''),
-                        'p_value_gap':      entry.get('p_value_gap', ''),
-                        'chi2':             entry.get('chi2', ''),
-                        'significant':      entry.get('significant', ''),
-                        'group_gap':        entry.get('group_gap', ''),
-                        'polarity':         entry.get('polarity', ''),
-                        'strength':         entry.get('strength', ''),
-                        'vote_count':       entry.get('vote_count', ''),
-                    }
-
-        # Collect all statement IDs mentioned in the analysis
-        all_stmt_ids = set(classification_map.keys())
-        # Also include any that appear only in representative_statements
-        for stmts in cluster_data.get('representative_statements', {}).values():
-            for entry in stmts:
-                sid = entry.get('statement_id')
-                if sid is not None:
-                    all_stmt_ids.add(sid)
-
-        statements_by_id = {
-            s.id: s
+        classification_map, all_stmt_ids = _export_classification_map(analysis.cluster_data or {})
+        statement_rows = {
+            s.id: (s.content, getattr(s, 'agree_count', 0), getattr(s, 'disagree_count', 0))
             for s in Statement.query.filter(Statement.id.in_(all_stmt_ids)).all()
         } if all_stmt_ids else {}
-
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow([
-            'statement_id',
-            'content',
-            'classification',
-            'polarity',
-            'agree_count',
-            'disagree_count',
-            'total_votes',
-            'agreement_rate',
-            'wilson_low',
-            'wilson_high',
-            'gap_ci_low_newcombe',
-            'gap_ci_high_newcombe',
-            'p_value_omnibus_permutation',
-            'p_value_gap_fisher',
-            'chi2_observed',
-            'fdr_significant',
-            'group_gap',
-            'strength',
-        ])
-
-        for sid in sorted(all_stmt_ids):
-            stmt = statements_by_id.get(sid)
-            meta = classification_map.get(sid, {})
-            agree   = getattr(stmt, 'agree_count',    0) if stmt else ''
-            disagree = getattr(stmt, 'disagree_count', 0) if stmt else ''
-            total   = (agree + disagree) if isinstance(agree, int) and isinstance(disagree, int) else ''
-            writer.writerow([
-                sid,
-                stmt.content if stmt else '',
-                meta.get('classification', 'unclassified'),
-                meta.get('polarity', ''),
-                agree,
-                disagree,
-                total,
-                meta.get('agreement_rate', ''),
-                meta.get('wilson_low', ''),
-                meta.get('wilson_high', ''),
-                meta.get('gap_ci_low', ''),
-                meta.get('gap_ci_high', ''),
-                meta.get('p_value', ''),
-                meta.get('p_value_gap', ''),
-                meta.get('chi2', ''),
-                meta.get('significant', ''),
-                meta.get('group_gap', ''),
-                meta.get('strength', ''),
-            ])
-
-        # UTF-8 BOM ensures Excel on Windows detects encoding correctly
-        csv_bytes = b'\xef\xbb\xbf' + output.getvalue().encode('utf-8')
+        csv_bytes = offload('export', _export_csv_bytes, all_stmt_ids, classification_map, statement_rows)
         safe_title = ''.join(c if c.isalnum() or c in ('-', '_') else '_' for c in discussion.title)
         filename = f"consensus_{discussion_id}_{safe_title[:40].strip('_')}.csv"
 
@@ -1028,12 +1192,25 @@ def export_analysis(discussion_id):
         )
 
     # Return full JSON data
-    return jsonify({
+    dumps = current_app.json.dumps
+    header = {
         'discussion_id': discussion_id,
         'discussion_title': discussion.title,
         'analysis_date': analysis.created_at.isoformat(),
-        'data': analysis.cluster_data
-    })
+    }
+
+    def _json_body():
+        cluster_assignments, pca_coordinates = analysis.participant_arrays()
+        return dumps({
+            **header,
+            'data': {
+                **analysis.cluster_data,
+                'cluster_assignments': cluster_assignments,
+                'pca_coordinates': pca_coordinates,
+            }
+        }, separators=(',', ':')) + '\n'
+
+    return current_app.response_class(offload('export', _json_body), mimetype='application/json')
 
 
 # =============================================================================
@@ -1106,6 +1283,7 @@ def generate_summary(discussion_id):
             analysis.cluster_data['summary_generated_by'] = current_user.id
             db.session.commit()
             _invalidate_snapshot_cache(discussion_id)
+            _republish_results(analysis, discussion)
             
             flash(_("AI summary generated successfully!"), "success")
         else:
@@ -1234,6 +1412,7 @@ def generate_cluster_labels_route(discussion_id):
             analysis.cluster_data['labels_dropped_for_grounding'] = dropped
             db.session.commit()
             _invalidate_snapshot_cache(discussion_id)
+            _republish_results(analysis, discussion)
 
             if dropped:
                 flash(_("Cluster labels generated. %(n)d label(s) were withheld because the model could not cite supporting statements.", n=dropped), "info")
@@ -0,0 +1,199 @@
+"""
+Maintained per-discussion participation stats.
+
+Discussion pages, embeds and partner snapshots show the same published
+numbers: distinct participants, visible statements and vote totals. Counting
+them meant two ``COUNT(DISTINCT ...)`` scans over ``statement_vote`` plus a
+statement aggregate on every view. ``DiscussionStats`` keeps them in one row:
+
+* the vote paths apply deltas in the caller's transaction
+  (``record_vote_stats_delta``) — a voter's first vote on a visible statement
+  in the discussion adds a participant, and vote value changes move totals;
+* new visible statements are counted by a mapper listener on ``Statement``;
+* moderation, deletion and vote removal mark the row stale, and the next vote
+  (or ``reconcile_discussion_stats``) recomputes it exactly.
+
+Reads never trust a stale or missing row; they fall back to the exact
+recount, so published numbers stay correct while the row catches up.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Dict, Optional
+
+from sqlalchemy import func
+
+from app import db
+from app.lib.db_upsert import upsert
+from app.lib.participation_metrics import visible_statement_vote_filters
+from app.lib.time import utcnow_naive
+from app.models import DiscussionStats, Statement, StatementVote
+
+logger = logging.getLogger(__name__)
+
+_VOTE_COLUMNS = {1: 'agree_votes', -1: 'disagree_votes', 0: 'unsure_votes'}
+
+
+def _is_visible(statement) -> bool:
+    return not statement.is_deleted and (statement.mod_status or 0) >= 0
+
+
+def compute_discussion_stats(discussion_id: int) -> Dict[str, int]:
+    """Exact published stats for one discussion, straight from source rows."""
+    from app.api.utils import count_discussion_participants
+
+    aggregates = db.session.query(
+        func.count(Statement.id),
+        func.coalesce(func.sum(Statement.vote_count_agree), 0),
+        func.coalesce(func.sum(Statement.vote_count_disagree), 0),
+        func.coalesce(func.sum(Statement.vote_count_unsure), 0),
+    ).filter(
+        Statement.discussion_id == discussion_id,
+        *visible_statement_vote_filters(Statement),
+    ).first()
+    statement_count, agree, disagree, unsure = (int(v or 0) for v in aggregates)
+
+    return {
+        'participant_count': int(count_discussion_participants(discussion_id) or 0),
+        'statement_count': statement_count,
+        'agree_votes': agree,
+        'disagree_votes': disagree,
+        'unsure_votes': unsure,
+        'total_votes': agree + disagree + unsure,
+    }
+
+
+def get_discussion_stats(discussion_id: int) -> Dict[str, int]:
+    """
+    Published stats for a discussion: one primary-key read when the row is
+    current, an exact recount (not persisted) when it is stale or missing.
+    """
+    row = db.session.query(DiscussionStats).filter(
+        DiscussionStats.discussion_id == discussion_id
+    ).populate_existing().first()
+    if row is not None and not row.is_stale:
+        return row.to_dict()
+    return compute_discussion_stats(discussion_id)
+
+
+def refresh_discussion_stats(discussion_id: int) -> Dict[str, int]:
+    """
+    Recompute one discussion exactly and upsert its row, clearing ``is_stale``
+    in the same statement. Caller commits.
+
+    The existing row is locked before the recount, so a moderation change that
+    marks it stale meanwhile waits for this transaction and re-marks it after,
+    instead of being overwritten by a recount that missed it.
+    """
+    db.session.query(DiscussionStats.discussion_id).filter(
+        DiscussionStats.discussion_id == discussion_id
+    ).with_for_update().first()
+    stats = compute_discussion_stats(discussion_id)
+
+    now = utcnow_naive()
+    values = {key: value for key, value in stats.items() if key != 'total_votes'}
+    values.update(is_stale=False, updated_at=now, reconciled_at=now)
+    upsert(DiscussionStats, {'discussion_id': discussion_id, **values},
+           index_elements=['discussion_id'], set_=values)
+    return stats
+
+
+def _is_new_participant(statement, user_id, session_fingerprint) -> bool:
+    """True when this identity has no vote on any other visible statement here."""
+    query = db.session.query(StatementVote.id).join(
+        Statement, StatementVote.statement_id == Statement.id
+    ).filter(
+        StatementVote.discussion_id == statement.discussion_id,
+        StatementVote.statement_id != statement.id,
+        *visible_statement_vote_filters(Statement),
+    )
+    if user_id is not None:
+        query = query.filter(StatementVote.user_id == user_id)
+    else:
+        query = query.filter(
+            StatementVote.user_id.is_(None),
+            StatementVote.session_fingerprint == session_fingerprint,
+        )
+    return not db.session.query(query.exists()).scalar()
+
+
+def record_vote_stats_delta(
+    statement,
+    *,
+    old_vote=None,
+    new_vote=None,
+    user_id: Optional[int] = None,
+    session_fingerprint: Optional[str] = None,
+) -> None:
+    """
+    Apply one vote write to the discussion's stats row in the caller's transaction.
+
+    ``old_vote`` is the value before the write (None for a first vote on this
+    statement) and ``new_vote`` the value after. Call it after the vote row and
+    statement counters are written: when the row is missing or stale it is
+    rebuilt exactly instead, which already includes this vote.
+    """
+    if not _is_visible(statement):
+        return
+
+    deltas: Dict[str, int] = {}
+    if old_vote is not None and old_vote in _VOTE_COLUMNS:
+        deltas[_VOTE_COLUMNS[old_vote]] = deltas.get(_VOTE_COLUMNS[old_vote], 0) - 1
+    if new_vote is not None and new_vote in _VOTE_COLUMNS:
+        deltas[_VOTE_COLUMNS[new_vote]] = deltas.get(_VOTE_COLUMNS[new_vote], 0) + 1
+    if old_vote is None and new_vote is not None and (user_id is not None or session_fingerprint):
+        if _is_new_participant(statement, user_id, session_fingerprint):
+            deltas['participant_count'] = 1
+    deltas = {column: n for column, n in deltas.items() if n}
+    if not deltas:
+        return
+
+    table = DiscussionStats.__table__
+    result = db.session.execute(
+        table.update().where(
+            table.c.discussion_id == statement.discussion_id,
+            table.c.is_stale.is_(False),
+        ).values(
+            updated_at=utcnow_naive(),
+            **{column: table.c[column] + n for column, n in deltas.items()},
+        )
+    )
+    if result.rowcount == 0:
+        refresh_discussion_stats(statement.discussion_id)
+
+
+def reconcile_discussion_stats(stale_only: bool = False) -> int:
+    """
+    Recompute stats rows from authoritative rows and repair drift.
+
+    ``stale_only`` limits the pass to rows flagged stale (cheap, frequent);
+    the full pass also builds rows for discussions that have statements but
+    no row yet. Commits per discussion so one failure does not discard the
+    rest. Returns the number of stale rows refreshed (``stale_only``) or of
+    rows whose values changed.
+    """
+    rows = db.session.query(DiscussionStats)
+    if stale_only:
+        rows = rows.filter(DiscussionStats.is_stale.is_(True))
+    existing = {row.discussion_id: row.to_dict() for row in rows.all()}
+
+    discussion_ids = list(existing)
+    if not stale_only:
+        discussion_ids += [
+            int(row[0]) for row in db.session.query(Statement.discussion_id).filter(
+                Statement.discussion_id.notin_(discussion_ids or [0])
+            ).distinct().all()
+        ]
+
+    drifted = 0
+    for discussion_id in discussion_ids:
+        try:
+            stats = refresh_discussion_stats(discussion_id)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            logger.exception("Discussion stats reconcile failed for discussion_id=%s", discussion_id)
+            continue
+        if stale_only or existing.get(discussion_id) != stats:
+            drifted += 1
+    return drifted
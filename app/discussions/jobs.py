@@ -8,6 +8,7 @@ from sqlalchemy import func
 
 from app import db
 from app.analytics.events import record_event
+from app.lib.queue_wakeup import QUEUE_CONSENSUS, notify
 from app.lib.time import utcnow_naive
 from app.lib.consensus_engine import (
     build_oversize_consensus_results,
@@ -15,7 +16,13 @@ from app.lib.consensus_engine import (
     run_consensus_analysis,
     save_consensus_analysis,
 )
-from app.models import ConsensusJob, Discussion, StatementVote
+from app.models import (
+    ConsensusAnalysis,
+    ConsensusAnalysisParticipants,
+    ConsensusJob,
+    Discussion,
+    StatementVote,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +73,7 @@ def enqueue_consensus_job(discussion_id, requested_by_user_id=None, reason='manu
     )
     db.session.add(job)
     db.session.commit()
+    notify(QUEUE_CONSENSUS)
     return job, True, "Analysis queued."
 
 
@@ -196,3 +204,44 @@ def process_next_consensus_job():
         job.completed_at = utcnow_naive() if job.status == ConsensusJob.STATUS_DEAD_LETTER else None
         db.session.commit()
         return True
+
+
+def prune_consensus_analyses(keep_participants=3, keep_analyses=10):
+    """
+    Trim stored analyses per discussion, heavy parts first.
+
+    Per-participant arrays are only plotted for the latest analysis, so they
+    are kept for the ``keep_participants`` most recent analyses; summaries are
+    kept for ``keep_analyses``. Returns ``(participant_rows, analyses)`` deleted.
+    """
+    participants_deleted = 0
+    analyses_deleted = 0
+    discussion_ids = db.session.query(ConsensusAnalysis.discussion_id).group_by(
+        ConsensusAnalysis.discussion_id
+    ).having(func.count(ConsensusAnalysis.id) > keep_participants).all()
+
+    for (discussion_id,) in discussion_ids:
+        try:
+            analysis_ids = [
+                row[0] for row in db.session.query(ConsensusAnalysis.id).filter_by(
+                    discussion_id=discussion_id
+                ).order_by(ConsensusAnalysis.created_at.desc(), ConsensusAnalysis.id.desc()).all()
+            ]
+            participants_deleted += ConsensusAnalysisParticipants.query.filter(
+                ConsensusAnalysisParticipants.analysis_id.in_(analysis_ids[keep_participants:])
+            ).delete(synchronize_session=False)
+
+            to_delete = analysis_ids[keep_analyses:]
+            if to_delete:
+                # ORM deletes so jobs pointing at these analyses are unlinked.
+                for analysis in ConsensusAnalysis.query.filter(ConsensusAnalysis.id.in_(to_delete)).all():
+                    db.session.delete(analysis)
+                analyses_deleted += len(to_delete)
+            db.session.commit()
+            if to_delete:
+                logger.info(f"Deleted {len(to_delete)} old analyses for discussion {discussion_id}")
+        except Exception as e:
+            logger.error(f"Error cleaning up analyses for discussion {discussion_id}: {e}")
+            db.session.rollback()
+
+    return participants_deleted, analyses_deleted
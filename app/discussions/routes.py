@@ -8,6 +8,7 @@ from app.middleware import track_discussion_view
 from app.email_utils import create_discussion_notification
 from app.webhook_security import webhook_required, webhook_with_timestamp
 from app.discussions.consensus import build_consensus_ui_state, PARTICIPATION_THRESHOLD
+from app.discussions.discussion_stats import get_discussion_stats
 from app.api.utils import (
     is_partner_origin_allowed,
     get_partner_allowed_origins,
@@ -30,10 +31,16 @@ from app.discussions.sorting import apply_statement_sort
 from app.discussions.query_utils import apply_discussion_visibility
 from app.discussions.follower_notifications import notify_discussion_followers
 from app.discussions.thresholds import consensus_thresholds_dict
+from app.lib.city_index import CITY_SEARCH_DEFAULT_LIMIT, CITY_SEARCH_MAX_LIMIT, get_city_index
 from app.lib.db_utils import retry_on_db_disconnect
 from app.lib.url_utils import safe_next_url as _validate_next_url
 from app.lib.locale_utils import language_preference_cookie_params
 from app.lib.vote_identity import anonymous_fingerprint_aliases_for_daily_lookup
+from app.lib.text_search import (
+    apply_discussion_search,
+    apply_statement_search,
+    discussion_keywords_condition,
+)
 from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy import and_, func, or_
 import json
@@ -116,11 +123,8 @@ def _build_user_votes_map(statement_ids):
     return {sid: vote for sid, (vote, _) in best.items()}
 
 
-def _apply_statement_text_search(query, search_term):
-    cleaned = (search_term or '').strip()
-    if not cleaned:
-        return query
-    return query.filter(Statement.content.ilike(f"%{cleaned}%"))
+def _apply_statement_text_search(query, search_term, order_by_rank=False):
+    return apply_statement_search(query, search_term, order_by_rank=order_by_rank)
 
 
 def _parse_markdown_links(raw_text):
@@ -886,13 +890,32 @@ def view_discussion(discussion_id, slug):
         per_page = current_app.config.get('DISCUSSION_STATEMENTS_PER_PAGE', 20)
         
         base_query, query = _statement_queries_for_discussion(discussion)
+        can_view_unapproved = current_user.is_authenticated and (
+            current_user.id == discussion.creator_id or getattr(current_user, 'is_admin', False)
+        )
 
-        aggregates = base_query.with_entities(
-            func.count(Statement.id),
-            func.coalesce(func.sum(Statement.vote_count_agree), 0),
-            func.coalesce(func.sum(Statement.vote_count_disagree), 0),
-            func.coalesce(func.sum(Statement.vote_count_unsure), 0),
-        ).first()
+        if can_view_unapproved:
+            aggregates = base_query.with_entities(
+                func.count(Statement.id),
+                func.coalesce(func.sum(Statement.vote_count_agree), 0),
+                func.coalesce(func.sum(Statement.vote_count_disagree), 0),
+                func.coalesce(func.sum(Statement.vote_count_unsure), 0),
+            ).first()
+            discussion_participant_count = get_discussion_participant_count(
+                discussion,
+                include_deleted_statement_votes=False,
+                min_mod_status=None,
+            )
+        else:
+            # Published view: maintained stats row instead of per-view scans.
+            published = get_discussion_stats(discussion.id)
+            aggregates = (
+                published['statement_count'],
+                published['agree_votes'],
+                published['disagree_votes'],
+                published['unsure_votes'],
+            )
+            discussion_participant_count = published['participant_count']
         if aggregates:
             statement_metrics['statement_count'] = int(aggregates[0] or 0)
             statement_metrics['agree_votes'] = int(aggregates[1] or 0)
@@ -910,14 +933,6 @@ def view_discussion(discussion_id, slug):
         statements_pagination = query.paginate(page=page, per_page=per_page, error_out=False)
         statements = statements_pagination.items
 
-        can_view_unapproved = current_user.is_authenticated and (
-            current_user.id == discussion.creator_id or getattr(current_user, 'is_admin', False)
-        )
-        discussion_participant_count = get_discussion_participant_count(
-            discussion,
-            include_deleted_statement_votes=False,
-            min_mod_status=None if can_view_unapproved else 0,
-        )
         consensus_ui_state = build_consensus_ui_state(
             discussion,
             precomputed_metrics=statement_metrics,
@@ -1229,14 +1244,18 @@ def search_statements():
     )
     query = apply_discussion_visibility(query, current_user)
 
-    if q:
-        query = _apply_statement_text_search(query, q)
     if topic:
         query = query.filter(Discussion.topic == topic)
 
-    if sort not in {'recent', 'most_voted', 'best', 'controversial'}:
+    if 'sort' not in request.args and q:
+        sort = 'relevance'
+    if sort not in {'relevance', 'recent', 'most_voted', 'best', 'controversial'}:
         sort = 'recent'
-    query = apply_statement_sort(query, sort, 0, db.session)
+    if q and sort == 'relevance':
+        query = _apply_statement_text_search(query, q, order_by_rank=True)
+    else:
+        query = _apply_statement_text_search(query, q)
+        query = apply_statement_sort(query, 'recent' if sort == 'relevance' else sort, 0, db.session)
 
     pagination = query.paginate(page=page, per_page=20, error_out=False)
 
@@ -1350,14 +1369,9 @@ def fetch_discussions(search, country, city, topic, keywords, programme_id, page
         )
     )
 
-    # Apply filters if provided - search both title and description
+    # Apply filters if provided - full-text search over title and description
     if search:
-        query = query.filter(
-            or_(
-                Discussion.title.ilike(f"%{search}%"),
-                Discussion.description.ilike(f"%{search}%")
-            )
-        )
+        query = apply_discussion_search(query, search, order_by_rank=(sort == 'relevance'))
     if country:
         query = query.filter_by(country=country)
     if city:
@@ -1365,12 +1379,14 @@ def fetch_discussions(search, country, city, topic, keywords, programme_id, page
     if topic:
         query = query.filter_by(topic=topic)
     if keywords:
-        query = query.filter(Discussion.keywords.ilike(f"%{keywords}%"))
+        keyword_condition = discussion_keywords_condition(keywords)
+        if keyword_condition is not None:
+            query = query.filter(keyword_condition)
     if programme_id:
         query = query.filter(Discussion.programme_id == programme_id)
 
-    # Apply sorting
-    if sort == 'recent':
+    # Apply sorting ('relevance' is ordered by the search itself)
+    if sort == 'recent' or (sort == 'relevance' and not search):
         query = query.order_by(Discussion.created_at.desc())
     elif sort == 'popular':
         query = query.order_by(Discussion.participant_count.desc())  # Example for popular sorting
@@ -1382,9 +1398,8 @@ def fetch_discussions(search, country, city, topic, keywords, programme_id, page
 
 @discussions_bp.route('/search', methods=['GET'])
 def search_discussions():
-    # Use cached cities data from app config (loaded at startup)
-    cities_by_country = current_app.config.get('CITIES_BY_COUNTRY', {})
-    countries = list(cities_by_country.keys())
+    # Country names from the city index compiled at startup
+    countries = get_city_index().countries
 
     # Get search parameters
     search_term = request.args.get('q', '')
@@ -1418,7 +1433,6 @@ def search_discussions():
         discussions=discussions,
         search_term=search_term,
         countries=countries,
-        cities_by_country=cities_by_country,
         programmes=programmes,
         discussion_translation_map=discussion_translation_map,
         current_lang=current_lang,
@@ -1508,6 +1522,9 @@ def api_search_discussions():
             'error': _('Internal server error')
         }), 500
 
+# City data only changes on deploy; ETags make revalidation after expiry cheap.
+CITIES_CACHE_MAX_AGE = 24 * 3600
+
 country_mapping = {
     "UK": "United Kingdom",
     "US": "United States",
@@ -1706,16 +1723,37 @@ country_mapping = {
 
 @discussions_bp.route('/api/cities/<country_code>')
 def get_cities_by_country(country_code):
+    """Whole city list for a country: pre-encoded bytes with a content ETag."""
     try:
         country_name = country_mapping.get(country_code, country_code)
-        cities_by_country = current_app.config.get('CITIES_BY_COUNTRY', {})
-        cities = cities_by_country.get(country_name, [])
-        return jsonify(cities)
+        encoded = get_city_index().encoded(country_name)
+        if 'gzip' in request.accept_encodings:
+            response = make_response(encoded.gzip_body)
+            response.headers['Content-Encoding'] = 'gzip'
+            response.set_etag(f'{encoded.etag}-gz')
+        else:
+            response = make_response(encoded.body)
+            response.set_etag(encoded.etag)
+        response.mimetype = 'application/json'
+        response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = f'public, max-age={CITIES_CACHE_MAX_AGE}'
+        return response.make_conditional(request)
     except Exception as e:
         current_app.logger.error(f"Error in get_cities_by_country: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
 
+@discussions_bp.route('/api/cities/<country_code>/search')
+def search_cities(country_code):
+    """Typeahead: up to ``limit`` cities in the country starting with ``q``."""
+    country_name = country_mapping.get(country_code, country_code)
+    limit = min(max(request.args.get('limit', CITY_SEARCH_DEFAULT_LIMIT, type=int), 1), CITY_SEARCH_MAX_LIMIT)
+    cities = get_city_index().search(country_name, request.args.get('q', ''), limit=limit)
+    response = jsonify(cities)
+    response.headers['Cache-Control'] = f'public, max-age={CITIES_CACHE_MAX_AGE}'
+    return response
+
+
 # Notification and Activity Tracking Endpoints
 
 @discussions_bp.route('/api/discussions/<int:discussion_id>/activity', methods=['POST'])
@@ -14,6 +14,8 @@ from app.email_utils import create_discussion_notification
 from app.discussions.follower_notifications import notify_discussion_followers
 from app.programmes.permissions import can_view_programme
 from app.programmes.utils import validate_cohort_for_discussion
+from app.programmes.vote_rollup import record_vote_rollup_delta
+from app.discussions.discussion_stats import record_vote_stats_delta
 from app.discussions.sorting import apply_statement_sort
 from app.analytics.events import record_event
 from app.lib.counter_utils import increment_counter
@@ -228,7 +230,11 @@ def _persist_vote_with_upsert(
     else:
         vote_lookup = vote_lookup.filter(StatementVote.session_fingerprint == session_fingerprint)
 
-    existing_vote = vote_lookup.with_entities(StatementVote.vote).first()
+    existing_vote = vote_lookup.with_entities(
+        StatementVote.vote,
+        StatementVote.confidence,
+        func.coalesce(StatementVote.updated_at, StatementVote.created_at),
+    ).first()
     old_vote = existing_vote[0] if existing_vote else None
 
     _upsert_statement_vote_row(
@@ -243,6 +249,23 @@ def _persist_vote_with_upsert(
     )
 
     counts = _apply_vote_counter_delta(statement.id, old_vote, vote_value)
+    discussion = statement.discussion
+    record_vote_rollup_delta(
+        discussion.programme_id if discussion else None,
+        statement.discussion_id,
+        old_vote=old_vote,
+        old_confidence=existing_vote[1] if existing_vote else None,
+        old_changed_at=existing_vote[2] if existing_vote else None,
+        new_vote=vote_value,
+        new_confidence=confidence,
+    )
+    record_vote_stats_delta(
+        statement,
+        old_vote=old_vote,
+        new_vote=vote_value,
+        user_id=user_id,
+        session_fingerprint=session_fingerprint,
+    )
     db.session.commit()
     if counts:
         statement.vote_count_agree = counts[0]
@@ -40,6 +40,10 @@ if False:  # pragma: no cover — pybabel extract only (never runs)
     gettext("Your briefs are paused — pick up where you left off any time")
     gettext("Still here when you're ready")
 
+    # --- BulkEmailRenderer.subject(user, '…') (memoised _subject_for_user) ---
+    gettext("5 Questions This Week: %(first)s...")
+    gettext("10 Questions This Month: %(first)s...")
+
     # --- Subjects built as f-strings today (not extractable as static msgids) ---
     # * send_trial_ending_email: day/plural copy is assembled in code.
     # * send_trial_mid_email: days_remaining interpolated in code.
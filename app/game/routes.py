@@ -74,6 +74,7 @@ from app.game.services.run_service import (
     start_quick_run,
 )
 from app.models.game import GameChallenge, GameReminderSubscription
+from app.lib.cpu_offload import offload
 from app.lib.url_utils import safe_next_url
 from app.lib.vote_identity import (
     get_voter_fingerprint,
@@ -666,8 +667,9 @@ def outcome_og_png(run_uuid: str):
     if png_bytes is None:
         view = build_outcome_view(run)
         emblem = emblem_for_run(run)
-        png_bytes = og_image_service.render_outcome_png(
-            run=run, view=view, emblem=emblem, world_badge=world_badge
+        png_bytes = offload(
+            'image', og_image_service.render_outcome_png,
+            run=run, view=view, emblem=emblem, world_badge=world_badge,
         )
         if png_bytes is None:
             return redirect(url_for('game.outcome_og_svg', run_uuid=run_uuid))
@@ -11,23 +11,16 @@ nothing renders from a tiny sample.
 
 from __future__ import annotations
 
-import json
-import logging
 from datetime import date, datetime, time, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from app import db
 from app.game.constants import GAME_RUN_STATUS_COMPLETED
 from app.game.engine.scenario import load_scenario
 from app.game.services.cohort_service import cohort_min_n
-from app.models.game import GameRun
-
-logger = logging.getLogger(__name__)
-
-# The tally is player-independent (same for everyone on the day), so it caches
-# cleanly. Short TTL keeps "today" feeling live without re-scanning every run's
-# choice_log on each outcome render — the hot-path cost the HTML page used to pay.
-_TALLY_CACHE_TTL_SECONDS = 60
+from app.lib.db_upsert import upsert
+from app.lib.time import utcnow_naive
+from app.models.game import GameDailyChoiceTally, GameRun
 
 
 def _day_window(day):
@@ -46,12 +39,71 @@ def _player_choice_by_turn(run: GameRun) -> Dict[int, str]:
     return out
 
 
-def _compute_tally(scenario_slug: str, day: date) -> Dict[str, Any]:
-    """Player-independent distribution for (scenario, UTC day).
+def _choice_counts(choice_log) -> Dict[Tuple[int, str], int]:
+    """(turn_index, choice_id) → count for one run's choice_log."""
+    counts: Dict[Tuple[int, str], int] = {}
+    for entry in choice_log or []:
+        try:
+            tidx = int(entry.get('turn_index'))
+        except (TypeError, ValueError):
+            continue
+        cid = entry.get('choice_id')
+        if cid is None:
+            continue
+        counts[(tidx, cid)] = counts.get((tidx, cid), 0) + 1
+    return counts
 
-    Returns ``{'sample_size': N, 'turns': [{turn_index, beat, choices:[{choice_id,
-    label, percent}]}]}`` — percentages only, no per-player marks, so it's safe to
-    share across every visitor (and to cache).
+
+def _increment_tally(scenario_slug: str, day: date, deltas: Dict[Tuple[int, str], int]) -> None:
+    """Add ``deltas`` to the counter rows via INSERT ... ON CONFLICT DO UPDATE.
+
+    Runs in the caller's transaction so the bump commits (or rolls back) with
+    the run completion itself.
+    """
+    if not deltas:
+        return
+
+    now = utcnow_naive()
+    rows = [
+        {
+            'scenario_slug': scenario_slug,
+            'tally_date': day,
+            'turn_index': tidx,
+            'choice_id': cid,
+            'count': n,
+            'updated_at': now,
+        }
+        # Sorted so concurrent completions lock rows in the same order.
+        for (tidx, cid), n in sorted(deltas.items())
+    ]
+    upsert(
+        GameDailyChoiceTally,
+        rows,
+        index_elements=['scenario_slug', 'tally_date', 'turn_index', 'choice_id'],
+        increment=['count'],
+        set_={'updated_at': now},
+    )
+
+
+def record_completed_daily_run(run: GameRun, choice_log=None) -> None:
+    """Fold a just-completed daily run into the (scenario, day) counters.
+
+    Called from ``run_service._complete_run`` before the completion commit.
+    Non-daily runs have no shared cohort and are ignored.
+    """
+    if run.mode != 'daily' or not run.started_at:
+        return
+    log = choice_log if choice_log is not None else run.choice_log_json
+    deltas = _choice_counts(log)
+    deltas[(GameDailyChoiceTally.RUNS_TURN_INDEX, '')] = 1
+    _increment_tally(run.scenario_slug, run.started_at.date(), deltas)
+
+
+def rebuild_daily_tally(scenario_slug: str, day: date) -> int:
+    """Recount (scenario, day) from completed runs and replace its counters.
+
+    Repair/backfill path — the original full scan of every run's choice_log.
+    Returns the number of completed runs counted. Caller commits.
     """
     start, end = _day_window(day)
     rows = (
@@ -66,18 +118,48 @@ def _compute_tally(scenario_slug: str, day: date) -> Dict[str, Any]:
         .all()
     )
 
-    counts: Dict[int, Dict[str, int]] = {}
+    deltas: Dict[Tuple[int, str], int] = {}
     for (log,) in rows:
-        for entry in log or []:
-            try:
-                tidx = int(entry.get('turn_index'))
-            except (TypeError, ValueError):
-                continue
-            cid = entry.get('choice_id')
-            if cid is None:
-                continue
-            counts.setdefault(tidx, {}).setdefault(cid, 0)
-            counts[tidx][cid] += 1
+        for key, n in _choice_counts(log).items():
+            deltas[key] = deltas.get(key, 0) + n
+    if rows:
+        deltas[(GameDailyChoiceTally.RUNS_TURN_INDEX, '')] = len(rows)
+
+    GameDailyChoiceTally.query.filter_by(
+        scenario_slug=scenario_slug, tally_date=day,
+    ).delete(synchronize_session=False)
+    _increment_tally(scenario_slug, day, deltas)
+    return len(rows)
+
+
+def _compute_tally(scenario_slug: str, day: date) -> Dict[str, Any]:
+    """Player-independent distribution for (scenario, UTC day).
+
+    Returns ``{'sample_size': N, 'turns': [{turn_index, beat, choices:[{choice_id,
+    label, percent}]}]}`` — percentages only, no per-player marks, so it's safe to
+    share across every visitor. Reads the maintained counters, so the cost is
+    O(choices) regardless of how many people played.
+    """
+    rows = (
+        db.session.query(
+            GameDailyChoiceTally.turn_index,
+            GameDailyChoiceTally.choice_id,
+            GameDailyChoiceTally.count,
+        )
+        .filter(
+            GameDailyChoiceTally.scenario_slug == scenario_slug,
+            GameDailyChoiceTally.tally_date == day,
+        )
+        .all()
+    )
+
+    sample_size = 0
+    counts: Dict[int, Dict[str, int]] = {}
+    for tidx, cid, n in rows:
+        if tidx == GameDailyChoiceTally.RUNS_TURN_INDEX:
+            sample_size = n
+            continue
+        counts.setdefault(tidx, {})[cid] = n
 
     scenario = load_scenario(scenario_slug)
     turns: List[Dict[str, Any]] = []
@@ -98,42 +180,7 @@ def _compute_tally(scenario_slug: str, day: date) -> Dict[str, Any]:
         choices.sort(key=lambda c: c['percent'], reverse=True)
         turns.append({'turn_index': tidx, 'beat': turn.get('beat'), 'choices': choices})
 
-    return {'sample_size': len(rows), 'turns': turns}
-
-
-def _tally_cache_key(scenario_slug: str, day: date) -> str:
-    return f'game:world:tally:{scenario_slug}:{day.isoformat()}'
-
-
-def _cached_tally(scenario_slug: str, day: date) -> Dict[str, Any]:
-    """``_compute_tally`` behind a short-TTL Redis cache (best-effort).
-
-    Without Redis (e.g. tests) this is a straight pass-through, so behaviour is
-    identical — just uncached.
-    """
-    try:
-        from app.lib.redis_client import get_client
-        client = get_client(decode_responses=False)
-    except Exception:  # noqa: BLE001 — never let cache wiring break the page
-        client = None
-
-    key = _tally_cache_key(scenario_slug, day)
-    if client is not None:
-        try:
-            raw = client.get(key)
-            if raw:
-                return json.loads(raw)
-        except Exception:  # noqa: BLE001 — a cache miss/parse error is non-fatal
-            logger.warning('world tally cache read failed', exc_info=True)
-
-    tally = _compute_tally(scenario_slug, day)
-
-    if client is not None:
-        try:
-            client.setex(key, _TALLY_CACHE_TTL_SECONDS, json.dumps(tally))
-        except Exception:  # noqa: BLE001 — write failure is non-fatal
-            logger.warning('world tally cache write failed', exc_info=True)
-    return tally
+    return {'sample_size': sample_size, 'turns': turns}
 
 
 def world_today(run: GameRun, *, min_n: Optional[int] = None) -> Optional[Dict[str, Any]]:
@@ -141,14 +188,14 @@ def world_today(run: GameRun, *, min_n: Optional[int] = None) -> Optional[Dict[s
 
     Returns ``None`` for non-daily runs (no shared cohort). Below the privacy
     floor returns ``{'ready': False, 'sample_size': N}`` so the UI can stay quiet.
-    The heavy distribution is cached per (scenario, day); only the cheap "is this
-    your pick" overlay is computed per request.
+    The distribution comes from the per-(scenario, day) counters; only the cheap
+    "is this your pick" overlay is computed per request.
     """
     if run.mode != 'daily' or not run.started_at:
         return None
 
     day = run.started_at.date()
-    tally = _cached_tally(run.scenario_slug, day)
+    tally = _compute_tally(run.scenario_slug, day)
     sample_size = tally['sample_size']
 
     threshold = min_n if min_n is not None else cohort_min_n()
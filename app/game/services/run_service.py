@@ -36,6 +36,7 @@ from app.game.engine.variant import (
     random_variant_seed,
     variation_descriptor,
 )
+from app.game.services.daily_results_service import record_completed_daily_run
 from app.game.services.daily_service import utc_game_date
 from app.lib.time import utcnow_naive
 from app.models.game import GameRun, GameRunOutcome
@@ -551,6 +552,7 @@ def _complete_run(
         contradiction_json=contradiction,
     )
     db.session.add(outcome)
+    record_completed_daily_run(run, choice_log)
     outcome_data['contradiction'] = contradiction
     return outcome_data
 
@@ -0,0 +1,123 @@
+"""
+Cached status breakdowns and table totals for admin pages.
+
+Admin list pages used to run one ``Model.query.filter_by(status=...).count()``
+per status on every load: four statements on each flag page, five on the
+subscriber page, four more for the dashboard totals. Each one scans the
+table or an index.
+
+- ``grouped_counts(*columns)`` computes a page's whole breakdown with a
+  single ``GROUP BY`` and ``status_counts(column)`` is its one-column form;
+- ``table_totals(*models)`` reads several unfiltered totals in one
+  statement (scalar subqueries), and on PostgreSQL substitutes the
+  planner's ``pg_class.reltuples`` estimate for tables above
+  ``ADMIN_COUNTERS_ESTIMATE_MIN_ROWS`` rows, where an exact count is slow
+  and its last digits are noise.
+
+Results are cached for ``ADMIN_COUNTERS_CACHE_SECONDS``. Routes that
+change the counted rows call ``invalidate()`` so admins see their own
+actions immediately. ``EmailAnalytics.get_dashboard_stats()`` reads its
+subscriber and user totals from here too, sharing the cache entries.
+"""
+import logging
+from typing import Any, Dict, Tuple
+
+from flask import current_app
+from sqlalchemy import func, select, text
+
+from app import cache, db
+
+logger = logging.getLogger(__name__)
+
+_CACHE_KEY = 'admin_counters:{name}'
+_DEFAULT_CACHE_SECONDS = 30
+_DEFAULT_ESTIMATE_MIN_ROWS = 1_000_000
+
+
+def _cache_seconds() -> int:
+    return int(current_app.config.get('ADMIN_COUNTERS_CACHE_SECONDS', _DEFAULT_CACHE_SECONDS))
+
+
+def _counter_name(columns) -> str:
+    table = columns[0].class_.__tablename__
+    return f"{table}:{','.join(column.key for column in columns)}"
+
+
+def _cached(name: str, compute):
+    key = _CACHE_KEY.format(name=name)
+    try:
+        value = cache.get(key)
+    except Exception as e:
+        logger.debug(f"Admin counter cache read failed for {name}: {e}")
+        value = None
+    if value is not None:
+        return value
+    value = compute()
+    try:
+        cache.set(key, value, timeout=_cache_seconds())
+    except Exception as e:
+        logger.debug(f"Admin counter cache write failed for {name}: {e}")
+    return value
+
+
+def grouped_counts(*columns) -> Dict[Tuple[Any, ...], int]:
+    """Row counts per distinct combination of ``columns`` (one GROUP BY)."""
+    def compute():
+        rows = db.session.query(*columns, func.count()).group_by(*columns).all()
+        return {tuple(row[:-1]): int(row[-1]) for row in rows}
+
+    return _cached(_counter_name(columns), compute)
+
+
+def status_counts(column) -> Dict[Any, int]:
+    """Row counts per value of ``column``; missing values count as 0 via ``.get``."""
+    return {values[0]: count for values, count in grouped_counts(column).items()}
+
+
+def _planner_estimates(tables) -> Dict[str, int]:
+    if db.engine.dialect.name != 'postgresql':
+        return {}
+    min_rows = int(current_app.config.get('ADMIN_COUNTERS_ESTIMATE_MIN_ROWS', _DEFAULT_ESTIMATE_MIN_ROWS))
+    estimates = {}
+    try:
+        for table in tables:
+            estimate = db.session.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+                {'table': f'"{table}"'},
+            ).scalar()
+            # reltuples is -1 (or 0) until the table's first ANALYZE.
+            if estimate is not None and estimate >= min_rows:
+                estimates[table] = int(estimate)
+    except Exception as e:
+        db.session.rollback()
+        logger.debug(f"Planner row estimates unavailable: {e}")
+        return {}
+    return estimates
+
+
+def table_totals(*models) -> Dict[str, int]:
+    """Unfiltered row counts keyed by table name, in one statement."""
+    tables = [model.__tablename__ for model in models]
+
+    def compute():
+        totals = _planner_estimates(tables)
+        exact = [model for model in models if model.__tablename__ not in totals]
+        if exact:
+            row = db.session.execute(
+                select(*[
+                    select(func.count()).select_from(model).scalar_subquery().label(model.__tablename__)
+                    for model in exact
+                ])
+            ).one()
+            totals.update({model.__tablename__: int(row[i]) for i, model in enumerate(exact)})
+        return totals
+
+    return _cached(f"totals:{','.join(tables)}", compute)
+
+
+def invalidate(*columns) -> None:
+    """Drop the cached ``grouped_counts``/``status_counts`` for ``columns``."""
+    try:
+        cache.delete(_CACHE_KEY.format(name=_counter_name(columns)))
+    except Exception as e:
+        logger.debug(f"Admin counter cache invalidation failed: {e}")
@@ -0,0 +1,238 @@
+"""
+Render-once templating for bulk email sends.
+
+Bulk sends (daily question batches, weekly/monthly digests, the daily
+brief) render the same template for thousands of recipients whose emails
+differ only in a handful of URLs: magic link, preferences, unsubscribe and
+vote links. ``BulkEmailRenderer`` renders each body once per (template,
+locale, content key) with opaque placeholder tokens in place of those
+per-recipient values, runs post-processing such as minification once, and
+keeps the result as a skeleton. Each recipient then costs a string join.
+
+Per-recipient values ("slots") are HTML-escaped when filled, exactly as
+Jinja's autoescape would have escaped them, so the output is byte-identical
+to rendering with the real values. That holds as long as a template outputs
+slots verbatim (``{{ url }}``, ``|e``, ``email_anchor_html``) and never
+transforms them. A blank slot is rendered inline and becomes part of the
+cache key, because templates branch on it (``{% if streak_message %}``).
+
+Click tracking folds in the same way: links without a slot are wrapped once
+with a placeholder recipient hash; links built from a slot are signed per
+recipient after filling, as ``wrap_links`` would have signed them.
+"""
+from __future__ import annotations
+
+import re
+import secrets
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional, Union
+from urllib.parse import quote_plus
+
+from markupsafe import escape
+
+from app.briefing.link_tracker import _RE_HREF, tracked_href
+from app.lib.locale_utils import resolve_user_locale
+
+_R_HASH_SLOT = '__r_hash__'
+
+
+class ClickTracking(NamedTuple):
+    """Arguments of ``wrap_links`` shared by every recipient of a send."""
+    base_url: str
+    run_id: int
+    secret: str
+    track_path: str
+
+
+class EmailSkeleton:
+    """A rendered email body split around its per-recipient slots."""
+
+    __slots__ = ('_parts', '_tracking')
+
+    def __init__(self, parts: list, tracking: Optional[ClickTracking]):
+        self._parts = parts
+        self._tracking = tracking
+
+    def fill(self, values: Mapping[str, Any], r_hash: Optional[str] = None) -> str:
+        filled = {name: str(escape(value)) for name, value in values.items()}
+        if self._tracking is not None:
+            filled[_R_HASH_SLOT] = quote_plus(r_hash or '')
+        out = []
+        for part in self._parts:
+            if part.__class__ is str:
+                out.append(part)
+            elif part[0] == 'slot':
+                out.append(filled[part[1]])
+            else:
+                out.append(self._fill_link(part, filled, r_hash or ''))
+        return ''.join(out)
+
+    def _fill_link(self, part, filled: Dict[str, str], r_hash: str) -> str:
+        _, whole, prefix, quote, raw_url, suffix = part
+        raw = _join(raw_url, filled)
+        tracking = self._tracking
+        tracked = tracked_href(
+            raw, tracking.base_url, tracking.run_id, r_hash, tracking.secret, tracking.track_path,
+        )
+        if tracked is None:
+            return _join(whole, filled)
+        return f'{_join(prefix, filled)} href={quote}{tracked}{quote}{_join(suffix, filled)}'
+
+
+def _join(segment: list, filled: Dict[str, str]) -> str:
+    return ''.join(p if p.__class__ is str else filled[p[1]] for p in segment)
+
+
+def _is_blank(value) -> bool:
+    return not (value and str(value).strip())
+
+
+class BulkEmailRenderer:
+    """
+    Per-send cache of email skeletons and translated subjects.
+
+    Keep one instance for the lifetime of a send (it hangs off the email
+    client), so ``content_key`` only has to distinguish content that can
+    differ within that send.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._skeletons: 'OrderedDict[tuple, EmailSkeleton]' = OrderedDict()
+        self._subjects: Dict[tuple, str] = {}
+        self.renders = 0
+
+    def render(
+        self,
+        user,
+        template: str,
+        *,
+        content_key,
+        slots: Mapping[str, Any],
+        context: Union[Mapping[str, Any], Callable[[Dict[str, Any]], Mapping[str, Any]]],
+        postprocess: Optional[Callable[[str], str]] = None,
+        tracking: Optional[ClickTracking] = None,
+        r_hash: Optional[str] = None,
+    ) -> str:
+        """
+        Render ``template`` for ``user`` with per-recipient ``slots``.
+
+        ``context`` holds everything shared by recipients with the same
+        ``content_key``. It may be a callable taking the slot placeholders
+        (name -> token) so templates can reach slots through nested data;
+        it is only called on a cache miss. Every slot is also passed to
+        the template under its own name.
+        """
+        locale = resolve_user_locale(user)
+        blank = tuple(sorted((name, value) for name, value in slots.items() if _is_blank(value)))
+        key = (template, locale, content_key, tuple(sorted(slots)), blank, tracking)
+        skeleton = self._skeletons.get(key)
+        if skeleton is None:
+            skeleton = self._build(user, template, slots, context, postprocess, tracking)
+            self._skeletons[key] = skeleton
+            if len(self._skeletons) > self.max_entries:
+                self._skeletons.popitem(last=False)
+        else:
+            self._skeletons.move_to_end(key)
+        return skeleton.fill(
+            {name: value for name, value in slots.items() if not _is_blank(value)},
+            r_hash=r_hash,
+        )
+
+    def subject(self, user, message: str, **variables) -> str:
+        """``_subject_for_user`` memoised per (locale, message, variables)."""
+        key = (resolve_user_locale(user), message, tuple(sorted(variables.items())))
+        subject = self._subjects.get(key)
+        if subject is None:
+            from app.resend_client import _subject_for_user
+            subject = _subject_for_user(user, message, **variables)
+            self._subjects[key] = subject
+        return subject
+
+    def _build(self, user, template, slots, context, postprocess, tracking) -> EmailSkeleton:
+        from app.resend_client import _render_for_user
+
+        nonce = secrets.token_hex(6)
+        placeholders: Dict[str, Any] = {}
+        names: Dict[str, str] = {}
+        for index, name in enumerate(sorted(slots)):
+            value = slots[name]
+            if _is_blank(value):
+                placeholders[name] = value
+            else:
+                token = f'bulkslot{nonce}n{index}x'
+                placeholders[name] = token
+                names[token] = name
+
+        ctx = dict(context(placeholders) if callable(context) else context)
+        for name, value in placeholders.items():
+            ctx.setdefault(name, value)
+
+        r_token = None
+        if tracking is not None:
+            r_token = f'bulkslot{nonce}r'
+            names[r_token] = _R_HASH_SLOT
+
+        html = _render_for_user(user, template, **ctx)
+        if postprocess is not None:
+            html = postprocess(html)
+        self.renders += 1
+        return EmailSkeleton(_split(html, names, tracking, r_token), tracking)
+
+
+def _split(html: str, names: Dict[str, str], tracking: Optional[ClickTracking], r_token: Optional[str]) -> list:
+    splitter = re.compile('(' + '|'.join(map(re.escape, names)) + ')') if names else None
+
+    def segment(text: str) -> list:
+        if splitter is None:
+            return [text] if text else []
+        pieces = splitter.split(text)
+        return [
+            ('slot', names[piece]) if i % 2 else piece
+            for i, piece in enumerate(pieces) if piece
+        ]
+
+    if tracking is None:
+        return _merge(segment(html))
+
+    parts = []
+    pos = 0
+    for match in _RE_HREF.finditer(html):
+        parts.extend(segment(html[pos:match.start()]))
+        prefix, quote, raw_url, suffix = match.groups()
+        if splitter is not None and splitter.search(raw_url):
+            parts.append((
+                'link', segment(match.group(0)), segment(prefix), quote,
+                segment(raw_url), segment(suffix),
+            ))
+        else:
+            tracked = tracked_href(
+                raw_url, tracking.base_url, tracking.run_id, r_token,
+                tracking.secret, tracking.track_path,
+            )
+            if tracked is None:
+                parts.extend(segment(match.group(0)))
+            else:
+                parts.extend(segment(f'{prefix} href={quote}{tracked}{quote}{suffix}'))
+        pos = match.end()
+    parts.extend(segment(html[pos:]))
+    return _merge(parts)
+
+
+def _merge(parts: list) -> list:
+    merged = []
+    for part in parts:
+        if part.__class__ is str and merged and merged[-1].__class__ is str:
+            merged[-1] += part
+        else:
+            merged.append(part)
+    return merged
+
+
+def bulk_renderer_for(owner) -> BulkEmailRenderer:
+    """The renderer cached on an email client, created on first use."""
+    renderer = getattr(owner, '_bulk_renderer', None)
+    if renderer is None:
+        renderer = BulkEmailRenderer()
+        owner._bulk_renderer = renderer
+    return renderer
@@ -0,0 +1,122 @@
+"""
+Pre-encoded city lists for the discussion/profile location pickers.
+
+static/data/cities_by_country.json (1.4 MB) is compiled once at startup into
+a CityIndex: for each country the JSON body is encoded once, gzip-compressed
+once and given a content-hash ETag, so /api/cities/<code> only picks bytes
+and answers repeat requests with 304. Under gunicorn's preload_app the index
+is built in the master and shared by every forked worker.
+
+Typeahead uses search(): a country's names are sorted by a folded key
+(casefold, accents stripped) on its first lookup, and each prefix query is
+two bisects rather than shipping the whole list to the browser.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, List, NamedTuple, Tuple
+
+logger = logging.getLogger(__name__)
+
+CITY_SEARCH_DEFAULT_LIMIT = 10
+CITY_SEARCH_MAX_LIMIT = 50
+
+
+def fold_city_name(name: str) -> str:
+    """Case- and accent-insensitive search key ("São Paulo" -> "sao paulo")."""
+    if name.isascii():
+        return name.lower().strip()
+    decomposed = unicodedata.normalize('NFKD', name.casefold())
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).strip()
+
+
+class EncodedCities(NamedTuple):
+    """One country's city list, ready to send."""
+    body: bytes
+    gzip_body: bytes
+    etag: str
+
+
+def _encode(cities: List[str]) -> EncodedCities:
+    body = json.dumps(cities, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return EncodedCities(
+        body=body,
+        gzip_body=gzip.compress(body, compresslevel=6, mtime=0),
+        etag=hashlib.sha256(body).hexdigest()[:32],
+    )
+
+
+class CityIndex:
+    """Per-country encoded lists plus a sorted prefix-search index."""
+
+    def __init__(self, cities_by_country: Dict[str, List[str]]):
+        self.countries: List[str] = list(cities_by_country)
+        self._cities = cities_by_country
+        self._encoded: Dict[str, EncodedCities] = {
+            country: _encode(cities) for country, cities in cities_by_country.items()
+        }
+        self._empty = _encode([])
+        # Search keys are built per country on its first lookup.
+        self._search: Dict[str, Tuple[List[str], List[str]]] = {}
+        self._search_lock = threading.Lock()
+
+    def _search_keys(self, country: str) -> Tuple[List[str], List[str]]:
+        entry = self._search.get(country)
+        if entry is None:
+            with self._search_lock:
+                entry = self._search.get(country)
+                if entry is None:
+                    ordered = sorted({(fold_city_name(city), city) for city in self._cities.get(country, ())})
+                    entry = ([key for key, _ in ordered], [city for _, city in ordered])
+                    self._search[country] = entry
+        return entry
+
+    def encoded(self, country: str) -> EncodedCities:
+        """Encoded list for ``country`` (an empty list for unknown countries)."""
+        return self._encoded.get(country, self._empty)
+
+    def search(self, country: str, prefix: str, limit: int = CITY_SEARCH_DEFAULT_LIMIT) -> List[str]:
+        """Cities in ``country`` whose name starts with ``prefix``, alphabetically."""
+        folded = fold_city_name(prefix)
+        if not folded or limit <= 0:
+            return []
+        keys, names = self._search_keys(country)
+        start = bisect_left(keys, folded)
+        # Every key with this prefix sorts below prefix + U+10FFFF.
+        end = bisect_left(keys, folded + '\U0010ffff', lo=start)
+        return list(names[start:min(end, start + limit)])
+
+
+def load_city_index(json_path: str) -> CityIndex:
+    """Build the index from the cities JSON; empty if the file is missing or invalid."""
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        logger.error(f"Could not find cities_by_country.json at {json_path}")
+        data = {}
+    except json.JSONDecodeError as e:
+        logger.error(f"Error decoding JSON file: {str(e)}")
+        data = {}
+    return CityIndex(data)
+
+
+def init_city_index(app) -> CityIndex:
+    index = load_city_index(os.path.join(app.root_path, 'static', 'data', 'cities_by_country.json'))
+    app.extensions['city_index'] = index
+    return index
+
+
+def get_city_index() -> CityIndex:
+    """The current app's city index (built at startup by create_app)."""
+    from flask import current_app
+
+    index = current_app.extensions.get('city_index')
+    if index is None:
+        index = init_city_index(current_app)
+    return index
@@ -26,8 +26,6 @@ Method references:
   - pol.is red-dwarf clustering library (AGPL-3.0):
     https://github.com/polis-community/red-dwarf  (sparsity-aware scaling)
 """
-import numpy as np
-import pandas as pd
 from datetime import datetime
 from app.lib.time import utcnow_naive
 from app.discussions.thresholds import (
@@ -38,13 +36,13 @@ from app.discussions.thresholds import (
 from typing import Dict, List, Tuple, Optional
 import logging
 
-from app.lib.sklearn_compat import (
-    SKLEARN_AVAILABLE,
-    AgglomerativeClustering,
-    KMeans,
-    PCA,
-    silhouette_score,
-)
+from app.lib.lazy_import import lazy_module
+from app.lib.sklearn_compat import get_sklearn
+
+# numpy/pandas load on first use: web routes import this module only for
+# get_consensus_execution_plan(), which needs neither.
+np = lazy_module('numpy')
+pd = lazy_module('pandas')
 
 logger = logging.getLogger(__name__)
 
@@ -925,7 +923,8 @@ def perform_pca(vote_matrix, n_components=2):
         def __init__(self, ratios):
             self.explained_variance_ratio_ = ratios
 
-    if not SKLEARN_AVAILABLE:
+    sklearn = get_sklearn()
+    if sklearn is None:
         matrix = np.array(vote_matrix)
         transformed, explained_ratios = _numpy_pca(matrix, n_components)
         logger.info(f"Numpy PCA explained variance: {explained_ratios}")
@@ -933,7 +932,7 @@ def perform_pca(vote_matrix, n_components=2):
         return transformed, _PCAResult(explained_ratios)
 
     try:
-        pca = PCA(n_components=n_components)
+        pca = sklearn.PCA(n_components=n_components)
         vote_matrix_pca = pca.fit_transform(vote_matrix)
         logger.info(f"PCA explained variance: {pca.explained_variance_ratio_}")
         logger.info(f"PCA components shape: {vote_matrix_pca.shape}")
@@ -1028,17 +1027,17 @@ def _cluster_at_k(data, k, method='agglomerative', random_state=42):
     available or not.
     """
     data = np.asarray(data)
-    use_sklearn = SKLEARN_AVAILABLE
-    if use_sklearn:
+    sklearn = get_sklearn()
+    if sklearn is not None:
         try:
             if method == 'agglomerative':
-                clusterer = AgglomerativeClustering(
+                clusterer = sklearn.AgglomerativeClustering(
                     n_clusters=k, linkage='average', metric='cosine'
                 )
             else:
-                clusterer = KMeans(n_clusters=k, random_state=random_state)
+                clusterer = sklearn.KMeans(n_clusters=k, random_state=random_state)
             labels = clusterer.fit_predict(data)
-            score = silhouette_score(data, labels, metric='cosine')
+            score = sklearn.silhouette_score(data, labels, metric='cosine')
             return labels, float(score)
         except (OSError, ImportError) as e:
             logger.error(
@@ -2098,15 +2097,44 @@ def run_consensus_analysis(discussion_id, db, method='agglomerative'):
     return results
 
 
+def split_analysis_results(results):
+    """
+    Split engine output into the JSON summary and the per-participant row.
+
+    The summary keeps everything pages and exports read (statement lists,
+    representatives, metadata) plus ``cluster_sizes``; cluster assignments and
+    PCA coordinates go to ``ConsensusAnalysisParticipants``.
+    """
+    from app.models import ConsensusAnalysisParticipants
+
+    summary = {
+        key: value for key, value in results.items()
+        if key not in ('cluster_assignments', 'pca_coordinates')
+    }
+    cluster_assignments = results.get('cluster_assignments') or {}
+    cluster_sizes = {}
+    for cluster_id in cluster_assignments.values():
+        cluster_sizes[str(cluster_id)] = cluster_sizes.get(str(cluster_id), 0) + 1
+    summary['cluster_sizes'] = cluster_sizes
+
+    participants = ConsensusAnalysisParticipants.from_results(
+        cluster_assignments,
+        results.get('pca_coordinates') or {},
+    )
+    return summary, participants
+
+
 def save_consensus_analysis(discussion_id, results, db):
     """
     Save consensus analysis results to database
     """
     from app.models import ConsensusAnalysis, Discussion
-    
+
+    summary, participants = split_analysis_results(results)
     analysis = ConsensusAnalysis(
         discussion_id=discussion_id,
-        cluster_data=results,  # Stored as JSON
+        cluster_data=summary,  # Stored as JSON
+        participants=participants,
         num_clusters=results['metadata']['num_clusters'],
         silhouette_score=results['metadata']['silhouette_score'],
         method=results['metadata']['method'],
@@ -2122,6 +2150,12 @@ def save_consensus_analysis(discussion_id, results, db):
     except Exception:
         pass
 
+    try:
+        from app.discussions.consensus import publish_results_view_models
+        publish_results_view_models(analysis)
+    except Exception:
+        logger.exception("Failed to pre-build consensus results for discussion %s", discussion_id)
+
     try:
         discussion = db.session.get(Discussion, discussion_id)
         if discussion and discussion.partner_fk_id:
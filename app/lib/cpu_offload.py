@@ -0,0 +1,148 @@
+"""
+Keep CPU-bound work off the gevent event loop.
+
+Web workers run gunicorn's gevent worker: every request in a process shares
+one hub, so a handler that computes for 300ms (a Pillow render, a large CSV
+export, rendering a 10k-URL sitemap) stalls every other connection on that
+worker for 300ms. ``offload(kind, fn, ...)`` runs ``fn`` on a native thread
+from gevent's threadpool while the calling greenlet waits cooperatively;
+Pillow, zlib and most of the SDK network stack release the GIL, and the hub
+keeps switching greenlets either way.
+
+Each ``kind`` has its own concurrency cap (``OFFLOAD_LIMITS``) so a burst of
+one kind of work cannot take every pool thread; the pool is sized for the
+sum of the caps plus headroom for gevent's threaded DNS resolver, which
+shares it.
+
+Offloaded callables run without the Flask app/request context and must not
+touch ``db.session``: query in the request, pass plain data in.
+
+Outside a monkey-patched gevent process (tests, CLI, the scheduler worker)
+``offload`` simply calls ``fn``.
+
+``install_loop_block_monitor()`` (called from gunicorn's ``post_fork``)
+enables gevent's monitor thread and logs any greenlet that holds the hub
+longer than ``GEVENT_MAX_BLOCKING_MS``.
+"""
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Per-kind caps on concurrent offloaded calls within one worker process.
+OFFLOAD_LIMITS = {
+    'image': 2,      # Pillow share-card renders
+    'export': 2,     # consensus CSV / JSON exports
+    'sitemap': 1,    # cold-store sitemap rendering
+    'markdown': 2,   # large markdown documents
+    'llm': 4,        # synchronous OpenAI / Anthropic SDK calls
+}
+_DEFAULT_LIMIT = 1
+# python-markdown with 'extra' costs roughly 13ms per 1,000 characters;
+# short snippets stay inline, long documents (briefs, programme pages) move.
+MARKDOWN_OFFLOAD_MIN_CHARS = 2_000
+
+# Threads left free for gevent's resolver_thread (getaddrinfo).
+_RESOLVER_HEADROOM = 4
+
+_semaphores = {}
+
+
+def gevent_active() -> bool:
+    """True in a gevent-patched process (the gunicorn web workers)."""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched('threading')
+
+
+def _semaphore(kind: str):
+    sem = _semaphores.get(kind)
+    if sem is None:
+        from gevent.lock import BoundedSemaphore
+
+        sem = _semaphores[kind] = BoundedSemaphore(OFFLOAD_LIMITS.get(kind, _DEFAULT_LIMIT))
+    return sem
+
+
+def _threadpool():
+    import gevent
+
+    pool = gevent.get_hub().threadpool
+    wanted = sum(OFFLOAD_LIMITS.values()) + _RESOLVER_HEADROOM
+    if pool.maxsize < wanted:
+        pool.maxsize = wanted
+    return pool
+
+
+def offload(kind: str, fn, *args, **kwargs):
+    """
+    Call ``fn(*args, **kwargs)`` on a native thread and return its result.
+
+    Waits for a ``kind`` slot first, so at most ``OFFLOAD_LIMITS[kind]``
+    calls of that kind run at once per worker. Exceptions propagate to the
+    caller unchanged.
+    """
+    if not gevent_active():
+        return fn(*args, **kwargs)
+    with _semaphore(kind):
+        return _threadpool().apply(fn, args, kwargs)
+
+
+# ---------------------------------------------------------------------------
+# Event-loop block detection
+# ---------------------------------------------------------------------------
+
+_REPORT_MAX_LINES = 40
+
+
+def _log_loop_blocked(event) -> None:
+    from gevent.events import EventLoopBlocked
+
+    if not isinstance(event, EventLoopBlocked):
+        return
+    report = list(event.info or [])
+    if len(report) > _REPORT_MAX_LINES:
+        report = report[:_REPORT_MAX_LINES] + [f'... {len(report) - _REPORT_MAX_LINES} more lines']
+    logger.warning(
+        "gevent loop blocked for more than %.0fms by %r\n%s",
+        event.blocking_time * 1000,
+        event.greenlet,
+        '\n'.join(report),
+    )
+
+
+def _quiet_blocking_report(hub, report, active_greenlet):
+    # gevent's default prints the full greenlet tree to stderr; the
+    # EventLoopBlocked subscriber already logged it.
+    return True
+
+
+def install_loop_block_monitor():
+    """
+    Start gevent's monitor thread in this worker and log blocked-loop events.
+
+    Controlled by ``GEVENT_LOOP_MONITOR`` (default on) and
+    ``GEVENT_MAX_BLOCKING_MS`` (default 200). Returns the monitor thread, or
+    None when disabled or not running under gevent.
+    """
+    if os.getenv('GEVENT_LOOP_MONITOR', 'true').lower() != 'true' or not gevent_active():
+        return None
+
+    import gevent
+    from gevent import events
+
+    try:
+        threshold_ms = float(os.getenv('GEVENT_MAX_BLOCKING_MS', '200'))
+    except ValueError:
+        threshold_ms = 200.0
+    gevent.config.max_blocking_time = threshold_ms / 1000.0
+    gevent.config.monitor_thread = True
+
+    if _log_loop_blocked not in events.subscribers:
+        events.subscribers.append(_log_loop_blocked)
+    monitor = gevent.get_hub().start_periodic_monitoring_thread()
+    if monitor is not None:
+        monitor._show_blocking_report = _quiet_blocking_report
+    return monitor
@@ -0,0 +1,60 @@
+"""
+Dialect-aware ``INSERT ... ON CONFLICT`` for maintained counter tables.
+
+PostgreSQL and SQLite (tests) both support ``ON CONFLICT`` but through
+separate ``insert`` constructs; ``dialect_insert`` picks the one for the
+session's bind. ``upsert`` builds the additive form the counter write paths
+share: an increment column is added onto the stored row in a single
+statement, so concurrent writers never lose each other's updates.
+"""
+from typing import Callable, Dict, Iterable, Mapping, Optional, Sequence, Union
+
+from app import db
+
+SetClause = Union[Mapping[str, object], Callable[[object], Mapping[str, object]]]
+
+
+def dialect_insert(model):
+    """``insert(model)`` from the current bind's dialect (PostgreSQL or SQLite)."""
+    bind = db.session.get_bind()
+    dialect_name = bind.dialect.name if bind else ''
+    if dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise RuntimeError(f"Unsupported database dialect for upsert into {model.__tablename__}: {dialect_name}")
+    return insert(model)
+
+
+def upsert(
+    model,
+    rows: Union[Dict, Sequence[Dict]],
+    *,
+    index_elements: Iterable[str],
+    increment: Iterable[str] = (),
+    set_: Optional[SetClause] = None,
+    chunk_size: Optional[int] = None,
+) -> None:
+    """
+    Insert ``rows``; on conflict add each ``increment`` column of the new row
+    onto the stored one and apply ``set_`` (a mapping, or a callable given
+    ``stmt.excluded`` that returns one). Rows are written ``chunk_size`` at a
+    time (default: one statement). Does not commit.
+
+    Sort ``rows`` by the conflict key when concurrent writers may touch the
+    same rows, so they lock them in the same order.
+    """
+    rows = [rows] if isinstance(rows, dict) else list(rows)
+    if not rows:
+        return
+    index_elements = list(index_elements)
+    increment = list(increment)
+    size = chunk_size or len(rows)
+    for start in range(0, len(rows), size):
+        stmt = dialect_insert(model).values(rows[start:start + size])
+        excluded = stmt.excluded
+        values = {column: getattr(model, column) + getattr(excluded, column) for column in increment}
+        if set_ is not None:
+            values.update(set_(excluded) if callable(set_) else set_)
+        db.session.execute(stmt.on_conflict_do_update(index_elements=index_elements, set_=values))
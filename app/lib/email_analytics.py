@@ -100,6 +100,46 @@ class EmailAnalytics:
             db.session.rollback()
             return None
 
+    @classmethod
+    def record_sends(cls, sends: List[Dict[str, Any]], category: str, subject: Optional[str] = None,
+                     brief_id: Optional[int] = None, daily_question_id: Optional[int] = None) -> int:
+        """
+        Record a page of sent emails with one multi-row INSERT.
+        Bulk counterpart of record_send for batch sends; each item in
+        ``sends`` has ``email`` and optionally ``brief_subscriber_id`` /
+        ``question_subscriber_id``.
+
+        Returns:
+            int: Number of events recorded (0 on failure)
+        """
+        from sqlalchemy import insert
+
+        rows = [
+            {
+                'recipient_email': send['email'],
+                'event_type': cls.EVENT_SENT,
+                'email_category': category,
+                'email_subject': subject,
+                'brief_subscriber_id': send.get('brief_subscriber_id'),
+                'question_subscriber_id': send.get('question_subscriber_id'),
+                'brief_id': brief_id,
+                'daily_question_id': daily_question_id,
+            }
+            for send in sends
+            if send.get('email')
+        ]
+        if not rows:
+            return 0
+        try:
+            db.session.execute(insert(EmailEvent), rows)
+            db.session.commit()
+            logger.debug(f"Recorded {len(rows)} send events ({category})")
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Failed to record send events: {e}")
+            db.session.rollback()
+            return 0
+
     @classmethod
     def record_click(
         cls,
@@ -144,6 +184,81 @@ class EmailAnalytics:
             db.session.rollback()
             return None
 
+    @classmethod
+    def _parse_webhook(cls, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Extract the fields recorded for a Resend webhook payload.
+
+        Returns None for payloads that are malformed or deliberately not
+        recorded (Resend clicks when first-party tracking is authoritative).
+        """
+        event_type = payload.get('type', '')
+        data = payload.get('data', {}) or {}
+
+        if not event_type:
+            logger.warning("Webhook payload missing event type")
+            return None
+
+        # Extract recipient email
+        to_list = data.get('to', [])
+        recipient_email = to_list[0] if to_list else None
+
+        if not recipient_email:
+            logger.warning("Webhook payload missing recipient email")
+            return None
+
+        # Normalize event type (remove 'email.' prefix)
+        normalized_type = event_type.replace('email.', '')
+
+        # Optional: ignore Resend email.clicked when first-party tracking is authoritative
+        # (set EMAIL_ANALYTICS_RECORD_RESEND_WEBHOOK_CLICKS=false; see admin email analytics).
+        if normalized_type == cls.EVENT_CLICKED:
+            if has_app_context() and not current_app.config.get(
+                "EMAIL_ANALYTICS_RECORD_RESEND_WEBHOOK_CLICKS", True
+            ):
+                logger.info(
+                    "Skipping Resend email.clicked webhook (EMAIL_ANALYTICS_RECORD_RESEND_WEBHOOK_CLICKS is false)"
+                )
+                return None
+            click_preview = ""
+            click_block = data.get("click") or {}
+            if isinstance(click_block, dict):
+                click_preview = (
+                    click_block.get("link")
+                    or click_block.get("url")
+                    or ""
+                )
+            if _FIRST_PARTY_CLICK_TRACKER_PATH in (click_preview or ""):
+                logger.info(
+                    "Skipping Resend email.clicked; link uses first-party brief tracker URL"
+                )
+                return None
+
+        # Extract additional data based on event type
+        click_url: Optional[str] = None
+        bounce_type: Optional[str] = None
+        complaint_type: Optional[str] = None
+
+        if normalized_type == cls.EVENT_CLICKED:
+            click_data = data.get('click', {})
+            click_url = click_data.get('link') or click_data.get('url')
+        elif normalized_type == cls.EVENT_BOUNCED:
+            bounce_data = data.get('bounce', {})
+            bounce_type = bounce_data.get('type', 'unknown')
+        elif normalized_type == cls.EVENT_COMPLAINED:
+            complaint_data = data.get('complaint', {})
+            complaint_type = complaint_data.get('type', 'spam')
+
+        return {
+            'event_type': normalized_type,
+            'recipient_email': recipient_email,
+            'resend_email_id': data.get('email_id'),
+            'email_subject': data.get('subject'),
+            'click_url': click_url,
+            'bounce_type': bounce_type,
+            'complaint_type': complaint_type,
+        }
+
     @classmethod
     def record_from_webhook(cls, payload: Dict[str, Any]) -> Optional[EmailEvent]:
         """
@@ -157,51 +272,16 @@ class EmailAnalytics:
             EmailEvent or None if processing failed
         """
         try:
-            event_type = payload.get('type', '')
-            data = payload.get('data', {})
-            
-            if not event_type:
-                logger.warning("Webhook payload missing event type")
+            parsed = cls._parse_webhook(payload)
+            if parsed is None:
                 return None
-            
-            # Extract recipient email
-            to_list = data.get('to', [])
-            recipient_email = to_list[0] if to_list else None
-            
-            if not recipient_email:
-                logger.warning("Webhook payload missing recipient email")
-                return None
-            
-            # Normalize event type (remove 'email.' prefix)
-            normalized_type = event_type.replace('email.', '')
-
-            # Optional: ignore Resend email.clicked when first-party tracking is authoritative
-            # (set EMAIL_ANALYTICS_RECORD_RESEND_WEBHOOK_CLICKS=false; see admin email analytics).
-            if normalized_type == cls.EVENT_CLICKED:
-                if has_app_context() and not current_app.config.get(
-                    "EMAIL_ANALYTICS_RECORD_RESEND_WEBHOOK_CLICKS", True
-                ):
-                    logger.info(
-                        "Skipping Resend email.clicked webhook (EMAIL_ANALYTICS_RECORD_RESEND_WEBHOOK_CLICKS is false)"
-                    )
-                    return None
-                click_preview = ""
-                click_block = data.get("click") or {}
-                if isinstance(click_block, dict):
-                    click_preview = (
-                        click_block.get("link")
-                        or click_block.get("url")
-                        or ""
-                    )
-                if _FIRST_PARTY_CLICK_TRACKER_PATH in (click_preview or ""):
-                    logger.info(
-                        "Skipping Resend email.clicked; link uses first-party brief tracker URL"
-                    )
-                    return None
+            normalized_type = parsed['event_type']
+            recipient_email = parsed['recipient_email']
+            bounce_type = parsed['bounce_type']
 
             # Durable idempotency: ignore duplicate webhook events for same
             # resend_email_id + event_type + recipient combination.
-            resend_email_id = data.get('email_id')
+            resend_email_id = parsed['resend_email_id']
             if resend_email_id:
                 duplicate = EmailEvent.query.filter_by(
                     resend_email_id=resend_email_id,
@@ -216,22 +296,7 @@ class EmailAnalytics:
                     return duplicate
             
             # Determine email category and find related records
-            category, context = cls._identify_email_context(recipient_email, data)
-            
-            # Extract additional data based on event type
-            click_url: Optional[str] = None
-            bounce_type: Optional[str] = None
-            complaint_type: Optional[str] = None
-            
-            if normalized_type == cls.EVENT_CLICKED:
-                click_data = data.get('click', {})
-                click_url = click_data.get('link') or click_data.get('url')
-            elif normalized_type == cls.EVENT_BOUNCED:
-                bounce_data = data.get('bounce', {})
-                bounce_type = bounce_data.get('type', 'unknown')
-            elif normalized_type == cls.EVENT_COMPLAINED:
-                complaint_data = data.get('complaint', {})
-                complaint_type = complaint_data.get('type', 'spam')
+            category, context = cls._identify_email_context(recipient_email, payload.get('data') or {})
             
             # Record the event
             event = EmailEvent.record_event(
@@ -239,14 +304,14 @@ class EmailAnalytics:
                 event_type=normalized_type,
                 email_category=category,
                 resend_email_id=resend_email_id,
-                email_subject=data.get('subject'),
+                email_subject=parsed['email_subject'],
                 user_id=context.get('user_id'),
                 brief_subscriber_id=context.get('brief_subscriber_id'),
                 question_subscriber_id=context.get('question_subscriber_id'),
                 brief_id=context.get('brief_id'),
-                click_url=click_url,
+                click_url=parsed['click_url'],
                 bounce_type=bounce_type,
-                complaint_type=complaint_type
+                complaint_type=parsed['complaint_type']
             )
             
             if event is None:
@@ -267,30 +332,78 @@ class EmailAnalytics:
             return None
 
     @classmethod
-    def _identify_email_context(cls, email: str, data: Dict) -> tuple:
+    def record_webhook_batch(cls, payloads: List[Dict[str, Any]]) -> int:
         """
-        Identify email category and related records based on recipient.
-        Subscriber/list membership takes precedence over User heuristics so
-        webhook rows match categories used at send time (record_send).
+        Record a batch of Resend webhook payloads set-wise.
+        Bulk counterpart of record_from_webhook for the webhook queue worker:
+        one duplicate check, one lookup per recipient table, one multi-row
+        INSERT, then the bounce/complaint suppressions and brief subscriber
+        open/click counters as a handful of UPDATEs. Commits.
+
+        Raises on database errors so the caller can retry the batch.
 
         Returns:
-            tuple: (category, context_dict)
+            int: Number of events recorded
         """
-        subject = (data.get("subject") or "").lower()
-        context: Dict[str, Any] = {}
-
-        brief_subscriber = DailyBriefSubscriber.query.filter_by(email=email).first()
-        briefing_recipient = BriefRecipient.query.filter_by(email=email).first()
-        question_subscriber = DailyQuestionSubscriber.query.filter_by(email=email).first()
-        user = User.query.filter_by(email=email).first()
+        from collections import Counter
+        from sqlalchemy import insert
+
+        parsed = [p for p in (cls._parse_webhook(payload) for payload in payloads) if p is not None]
+
+        # Durable idempotency, as in record_from_webhook, plus duplicates
+        # within the batch itself.
+        resend_ids = {p['resend_email_id'] for p in parsed if p['resend_email_id']}
+        seen = set()
+        if resend_ids:
+            seen = {
+                tuple(row) for row in db.session.query(
+                    EmailEvent.resend_email_id, EmailEvent.event_type, EmailEvent.recipient_email
+                ).filter(EmailEvent.resend_email_id.in_(resend_ids))
+            }
+        events = []
+        for p in parsed:
+            key = (p['resend_email_id'], p['event_type'], p['recipient_email'])
+            if p['resend_email_id'] and key in seen:
+                continue
+            seen.add(key)
+            events.append(p)
+        if not events:
+            return 0
 
-        if brief_subscriber:
-            context["brief_subscriber_id"] = brief_subscriber.id
-        if question_subscriber:
-            context["question_subscriber_id"] = question_subscriber.id
-        if user:
-            context["user_id"] = user.id
+        contexts = cls._identify_email_contexts(
+            [(p['recipient_email'], p['email_subject']) for p in events]
+        )
+        rows = []
+        for p, (category, context) in zip(events, contexts):
+            rows.append({
+                **p,
+                'event_type': EmailEvent.normalize_event_type(p['event_type']),
+                'email_category': category,
+                'user_id': context.get('user_id'),
+                'brief_subscriber_id': context.get('brief_subscriber_id'),
+                'question_subscriber_id': context.get('question_subscriber_id'),
+            })
+        db.session.execute(insert(EmailEvent), rows)
+
+        hard_bounces = {r['recipient_email'] for r in rows
+                        if r['event_type'] == cls.EVENT_BOUNCED and r['bounce_type'] == 'hard'}
+        soft_bounces = {r['recipient_email'] for r in rows
+                        if r['event_type'] == cls.EVENT_BOUNCED and r['bounce_type'] == 'soft'}
+        complaints = {r['recipient_email'] for r in rows if r['event_type'] == cls.EVENT_COMPLAINED}
+        cls._handle_deliverability_issues(hard_bounces, soft_bounces, complaints)
+
+        cls._record_engagement(
+            Counter(r['recipient_email'] for r in rows if r['event_type'] == cls.EVENT_OPENED),
+            Counter(r['recipient_email'] for r in rows if r['event_type'] == cls.EVENT_CLICKED),
+        )
+        db.session.commit()
+        logger.info(f"Recorded {len(rows)} webhook events ({len(parsed) - len(rows)} duplicates skipped)")
+        return len(rows)
 
+    @classmethod
+    def _categorise(cls, subject: str, brief_subscriber: bool, briefing_recipient: bool,
+                    question_subscriber: bool, user: bool) -> str:
+        """Category for an event given which lists the recipient is on."""
         # Precedence: list membership first (matches send-time categories); subject only
         # disambiguates when the same address appears on multiple lists.
         if brief_subscriber and briefing_recipient:
@@ -298,10 +411,9 @@ class EmailAnalytics:
                 k in subject
                 for k in ("question of the day", "daily question")
             ):
-                category = cls.CATEGORY_DAILY_QUESTION
-            else:
-                category = cls.CATEGORY_DAILY_BRIEF
-        elif brief_subscriber and question_subscriber:
+                return cls.CATEGORY_DAILY_QUESTION
+            return cls.CATEGORY_DAILY_BRIEF
+        if brief_subscriber and question_subscriber:
             if any(
                 k in subject
                 for k in (
@@ -310,26 +422,79 @@ class EmailAnalytics:
                     "your question",
                 )
             ):
-                category = cls.CATEGORY_DAILY_QUESTION
-            else:
-                category = cls.CATEGORY_DAILY_BRIEF
-        elif brief_subscriber or briefing_recipient:
-            category = cls.CATEGORY_DAILY_BRIEF
-        elif question_subscriber:
-            category = cls.CATEGORY_DAILY_QUESTION
-        elif user:
+                return cls.CATEGORY_DAILY_QUESTION
+            return cls.CATEGORY_DAILY_BRIEF
+        if brief_subscriber or briefing_recipient:
+            return cls.CATEGORY_DAILY_BRIEF
+        if question_subscriber:
+            return cls.CATEGORY_DAILY_QUESTION
+        if user:
             if "password" in subject or "reset" in subject:
-                category = cls.CATEGORY_AUTH
-            elif "welcome" in subject:
-                category = cls.CATEGORY_AUTH
-            elif "discussion" in subject or "notification" in subject:
-                category = cls.CATEGORY_DISCUSSION
-            else:
-                category = cls.CATEGORY_AUTH
-        else:
-            category = cls.CATEGORY_AUTH
+                return cls.CATEGORY_AUTH
+            if "welcome" in subject:
+                return cls.CATEGORY_AUTH
+            if "discussion" in subject or "notification" in subject:
+                return cls.CATEGORY_DISCUSSION
+        return cls.CATEGORY_AUTH
 
-        return category, context
+    @classmethod
+    def _identify_email_context(cls, email: str, data: Dict) -> tuple:
+        """
+        Identify email category and related records based on recipient.
+        Subscriber/list membership takes precedence over User heuristics so
+        webhook rows match categories used at send time (record_send).
+
+        Returns:
+            tuple: (category, context_dict)
+        """
+        return cls._identify_email_contexts([(email, data.get("subject"))])[0]
+
+    @classmethod
+    def _identify_email_contexts(cls, recipients: List[Tuple[str, Optional[str]]]) -> List[tuple]:
+        """
+        Batch form of _identify_email_context: one query per recipient table
+        for all ``(email, subject)`` pairs.
+
+        Returns:
+            list: (category, context_dict) per input pair, in order
+        """
+        emails = {email for email, _ in recipients}
+        brief_subscribers = dict(
+            db.session.query(DailyBriefSubscriber.email, DailyBriefSubscriber.id)
+            .filter(DailyBriefSubscriber.email.in_(emails))
+        )
+        briefing_recipients = {
+            email for (email,) in db.session.query(BriefRecipient.email)
+            .filter(BriefRecipient.email.in_(emails)).distinct()
+        }
+        question_subscribers = dict(
+            db.session.query(DailyQuestionSubscriber.email, DailyQuestionSubscriber.id)
+            .filter(DailyQuestionSubscriber.email.in_(emails))
+        )
+        users = {}
+        for email, user_id in (
+            db.session.query(User.email, User.id).filter(User.email.in_(emails)).order_by(User.id)
+        ):
+            users.setdefault(email, user_id)
+
+        results = []
+        for email, subject in recipients:
+            context: Dict[str, Any] = {}
+            if email in brief_subscribers:
+                context["brief_subscriber_id"] = brief_subscribers[email]
+            if email in question_subscribers:
+                context["question_subscriber_id"] = question_subscribers[email]
+            if email in users:
+                context["user_id"] = users[email]
+            category = cls._categorise(
+                (subject or "").lower(),
+                brief_subscriber=email in brief_subscribers,
+                briefing_recipient=email in briefing_recipients,
+                question_subscriber=email in question_subscribers,
+                user=email in users,
+            )
+            results.append((category, context))
+        return results
 
     # Number of soft bounces before an address is suppressed.
     SOFT_BOUNCE_SUPPRESS_THRESHOLD = 3
@@ -420,6 +585,74 @@ class EmailAnalytics:
         except Exception as e:
             logger.error(f"Failed to handle deliverability issue: {e}")
 
+    @classmethod
+    def _handle_deliverability_issues(cls, hard_bounces: set, soft_bounces: set, complaints: set) -> None:
+        """
+        Set-wise _handle_deliverability_issue for a webhook batch: the batch's
+        events must already be flushed so soft bounces are counted with them.
+        """
+        from sqlalchemy import func
+
+        suppress_soft = set()
+        if soft_bounces:
+            counts = db.session.query(EmailEvent.recipient_email, func.count(EmailEvent.id)).filter(
+                EmailEvent.recipient_email.in_(soft_bounces),
+                EmailEvent.event_type == cls.EVENT_BOUNCED,
+                EmailEvent.bounce_type == 'soft',
+            ).group_by(EmailEvent.recipient_email)
+            suppress_soft = {
+                email for email, count in counts if count >= cls.SOFT_BOUNCE_SUPPRESS_THRESHOLD
+            }
+            if suppress_soft:
+                logger.warning(
+                    f"Soft-bounce threshold reached for {len(suppress_soft)} addresses — suppressing"
+                )
+
+        bounced = (hard_bounces | suppress_soft) - complaints
+        suppressed = bounced | complaints
+        if not suppressed:
+            return
+        now = utcnow_naive()
+
+        if complaints:
+            DailyBriefSubscriber.query.filter(DailyBriefSubscriber.email.in_(complaints)).update(
+                {DailyBriefSubscriber.status: 'unsubscribed', DailyBriefSubscriber.unsubscribed_at: now},
+                synchronize_session=False,
+            )
+        if bounced:
+            DailyBriefSubscriber.query.filter(DailyBriefSubscriber.email.in_(bounced)).update(
+                {DailyBriefSubscriber.status: 'bounced'}, synchronize_session=False,
+            )
+        DailyQuestionSubscriber.query.filter(DailyQuestionSubscriber.email.in_(suppressed)).update(
+            {DailyQuestionSubscriber.is_active: False}, synchronize_session=False,
+        )
+        BriefRecipient.query.filter(BriefRecipient.email.in_(suppressed)).update(
+            {BriefRecipient.status: 'unsubscribed', BriefRecipient.unsubscribed_at: now},
+            synchronize_session=False,
+        )
+        logger.info(
+            f"Suppressed {len(bounced)} bounced and {len(complaints)} complaining addresses"
+        )
+
+    @classmethod
+    def _record_engagement(cls, opens: Dict[str, int], clicks: Dict[str, int]) -> None:
+        """Add webhook open/click counts to the matching brief subscribers."""
+        now = utcnow_naive()
+        sub = DailyBriefSubscriber
+        for counts, total_col, last_col in (
+            (opens, sub.total_opens, sub.last_opened_at),
+            (clicks, sub.total_clicks, sub.last_clicked_at),
+        ):
+            if not counts:
+                continue
+            sub.query.filter(sub.email.in_(list(counts))).update(
+                {
+                    total_col: db.func.coalesce(total_col, 0) + db.case(dict(counts), value=sub.email),
+                    last_col: now,
+                },
+                synchronize_session=False,
+            )
+
     @classmethod
     def get_dashboard_stats(cls, days: int = 7) -> Dict[str, Any]:
         """
@@ -429,8 +662,13 @@ class EmailAnalytics:
         Returns:
             Dict with overall stats and per-category breakdowns
         """
-        # Overall stats
-        overall = EmailEvent.get_stats(days=days)
+        from collections import Counter
+        from app.lib.email_rollup import event_counts_since
+
+        # One read of the hourly rollups (plus events not yet folded) serves
+        # the overall and every per-category breakdown.
+        counts = event_counts_since(utcnow_naive() - timedelta(days=days))
+        overall = EmailEvent.stats_from_counts(sum(counts.values(), Counter()))
         
         # Per-category stats
         categories = {}
@@ -441,12 +679,19 @@ class EmailAnalytics:
             cls.CATEGORY_DISCUSSION,
             cls.CATEGORY_ADMIN,
         ]:
-            categories[cat] = EmailEvent.get_stats(email_category=cat, days=days)
+            categories[cat] = EmailEvent.stats_from_counts(counts.get(cat, {}))
         
-        # Subscriber counts
-        brief_subscribers = DailyBriefSubscriber.query.filter_by(status='active').count()
-        question_subscribers = DailyQuestionSubscriber.query.filter_by(is_active=True).count()
-        total_users = User.query.count()
+        # Subscriber counts, shared (and cached) with the admin list pages
+        from app.lib import admin_counters
+
+        brief_subscribers = admin_counters.status_counts(DailyBriefSubscriber.status).get('active', 0)
+        question_subscribers = sum(
+            count for (is_active, _), count in admin_counters.grouped_counts(
+                DailyQuestionSubscriber.is_active, DailyQuestionSubscriber.email_frequency
+            ).items()
+            if is_active is True
+        )
+        total_users = admin_counters.table_totals(User)[User.__tablename__]
         
         return {
             'overall': overall,
@@ -485,18 +730,32 @@ class EmailAnalytics:
         return query.limit(limit).all()
 
     @classmethod
-    def get_email_performance(cls, email: str, days: int = 30) -> Dict[str, Any]:
+    def get_email_performance(cls, email: str, days: Optional[int] = 30) -> Dict[str, Any]:
         """
         Get performance metrics for a specific email address.
         Useful for subscriber detail views.
+
+        Counts the last ``days`` days from the events; pass ``days=None``
+        for lifetime totals from the per-recipient engagement summary.
         """
-        cutoff = utcnow_naive() - timedelta(days=days)
-        
-        events = EmailEvent.query.filter(
-            EmailEvent.recipient_email == email,
-            EmailEvent.created_at >= cutoff
-        ).all()
-        
+        from sqlalchemy import func
+        from app.lib.email_rollup import recipient_counts
+
+        if days is None:
+            counts = recipient_counts(email)
+        else:
+            cutoff = utcnow_naive() - timedelta(days=days)
+            counts = {}
+            for category, event_type, count in db.session.query(
+                EmailEvent.email_category, EmailEvent.event_type, func.count(EmailEvent.id)
+            ).filter(
+                EmailEvent.recipient_email == email,
+                EmailEvent.created_at >= cutoff,
+            ).group_by(EmailEvent.email_category, EmailEvent.event_type):
+                counts.setdefault(category, {})
+                normalized_type = EmailEvent.normalize_event_type(event_type)
+                counts[category][normalized_type] = counts[category].get(normalized_type, 0) + count
+
         stats = {
             "total_sent": 0,
             "total_delivered": 0,
@@ -506,26 +765,16 @@ class EmailAnalytics:
             "total_complained": 0,
             "categories": {},
         }
-        
-        for event in events:
-            normalized_type = EmailEvent.normalize_event_type(event.event_type)
-            if normalized_type == cls.EVENT_SENT:
-                stats["total_sent"] += 1
-            elif normalized_type == cls.EVENT_DELIVERED:
-                stats["total_delivered"] += 1
-            elif normalized_type == cls.EVENT_OPENED:
-                stats["total_opened"] += 1
-            elif normalized_type == cls.EVENT_CLICKED:
-                stats["total_clicked"] += 1
-            elif normalized_type == cls.EVENT_BOUNCED:
-                stats["total_bounced"] += 1
-            elif normalized_type == cls.EVENT_COMPLAINED:
-                stats["total_complained"] += 1
-            
-            # Track by category
-            if event.email_category not in stats["categories"]:
-                stats["categories"][event.email_category] = 0
-            stats["categories"][event.email_category] += 1
+        for category, event_counts in counts.items():
+            stats["total_sent"] += event_counts.get(cls.EVENT_SENT, 0)
+            stats["total_delivered"] += event_counts.get(cls.EVENT_DELIVERED, 0)
+            stats["total_opened"] += event_counts.get(cls.EVENT_OPENED, 0)
+            stats["total_clicked"] += event_counts.get(cls.EVENT_CLICKED, 0)
+            stats["total_bounced"] += event_counts.get(cls.EVENT_BOUNCED, 0)
+            stats["total_complained"] += event_counts.get(cls.EVENT_COMPLAINED, 0)
+            total = sum(event_counts.values())
+            if total:
+                stats["categories"][category] = total
         
         rates = EmailEvent.compute_rate_metrics(
             stats["total_sent"],
@@ -0,0 +1,237 @@
+"""
+Incremental email analytics rollups.
+
+email_event grows by millions of rows a month, and the admin email
+dashboard used to scan its whole window once overall and once per
+category on every load. Two summaries are now folded from it above a
+high-water mark on ``email_event.id`` (``analytics_rollup_state`` row
+``email_events``, the same mechanism as the analytics daily rollup):
+
+- ``EmailEventHourlyRollup`` — counts per (UTC hour, category, event type);
+- ``EmailRecipientEngagement`` — lifetime counts per (address, category).
+
+Both are applied with additive upserts, so each event is counted once no
+matter how the folds are chunked. Readers add the small tail of events
+above the watermark, so results stay current between runs and remain
+correct (if slower) before the first backfill.
+"""
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import func
+
+from app import db
+from app.lib.db_upsert import upsert
+from app.lib.time import utcnow_naive
+from app.models import AnalyticsRollupState, EmailEvent, EmailEventHourlyRollup, EmailRecipientEngagement
+
+ROLLUP_STATE_NAME = 'email_events'
+# Same reasoning as app.analytics.events.INCREMENTAL_SAFETY_LAG: ids are
+# allocated at INSERT, so hold back the newest events until earlier
+# transactions have committed.
+INCREMENTAL_SAFETY_LAG = timedelta(minutes=2)
+# Event ids folded per transaction; bounds memory and lock time on backfill.
+FOLD_CHUNK_IDS = 50_000
+_UPSERT_ROWS = 1_000
+
+
+def _hour_bucket(column):
+    bind = db.session.get_bind()
+    if bind is not None and bind.dialect.name == 'postgresql':
+        return func.date_trunc('hour', column)
+    return func.strftime('%Y-%m-%d %H:00:00', column)
+
+
+def _as_datetime(value) -> Optional[datetime]:
+    if isinstance(value, str):  # SQLite returns strftime() as text
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _lock_rollup_state():
+    """Fetch (creating if needed) the email rollup watermark row, locked FOR UPDATE."""
+    state = db.session.query(AnalyticsRollupState).filter_by(
+        name=ROLLUP_STATE_NAME
+    ).with_for_update().first()
+    if state is None:
+        state = AnalyticsRollupState(name=ROLLUP_STATE_NAME, last_event_id=0)
+        db.session.add(state)
+        db.session.flush()
+    return state
+
+
+def _watermark() -> int:
+    state = db.session.get(AnalyticsRollupState, ROLLUP_STATE_NAME)
+    return int(state.last_event_id or 0) if state is not None else 0
+
+
+def _fold_hourly(*filters) -> Counter:
+    bucket = _hour_bucket(EmailEvent.created_at)
+    groups = Counter()
+    rows = db.session.query(
+        bucket, EmailEvent.email_category, EmailEvent.event_type, func.count(EmailEvent.id),
+    ).filter(EmailEvent.created_at.isnot(None), *filters).group_by(
+        bucket, EmailEvent.email_category, EmailEvent.event_type,
+    )
+    for hour, category, event_type, count in rows:
+        groups[(_as_datetime(hour), category, EmailEvent.normalize_event_type(event_type))] += count
+    return groups
+
+
+def _fold_recipients(*filters) -> Dict[Tuple[str, str], dict]:
+    rows = db.session.query(
+        EmailEvent.recipient_email,
+        EmailEvent.email_category,
+        EmailEvent.event_type,
+        func.count(EmailEvent.id),
+        func.min(EmailEvent.created_at),
+        func.max(EmailEvent.created_at),
+    ).filter(*filters).group_by(
+        EmailEvent.recipient_email, EmailEvent.email_category, EmailEvent.event_type,
+    )
+    groups: Dict[Tuple[str, str], dict] = {}
+    for email, category, event_type, count, first_at, last_at in rows:
+        summary = groups.get((email, category))
+        if summary is None:
+            summary = groups[(email, category)] = {
+                'recipient_email': email,
+                'email_category': category,
+                **{column: 0 for column in EmailRecipientEngagement.COUNT_COLUMNS.values()},
+                'first_event_at': None,
+                'last_event_at': None,
+                'last_opened_at': None,
+                'last_clicked_at': None,
+            }
+        event_type = EmailEvent.normalize_event_type(event_type)
+        column = EmailRecipientEngagement.COUNT_COLUMNS.get(event_type)
+        if column:
+            summary[column] += count
+        if first_at and (summary['first_event_at'] is None or first_at < summary['first_event_at']):
+            summary['first_event_at'] = first_at
+        if last_at and (summary['last_event_at'] is None or last_at > summary['last_event_at']):
+            summary['last_event_at'] = last_at
+        if event_type == EmailEvent.EVENT_OPENED:
+            summary['last_opened_at'] = last_at
+        elif event_type == EmailEvent.EVENT_CLICKED:
+            summary['last_clicked_at'] = last_at
+    return groups
+
+
+def _upsert_hourly(groups: Counter) -> None:
+    rows = [
+        {'bucket_start': hour, 'email_category': category, 'event_type': event_type, 'event_count': count}
+        for (hour, category, event_type), count in sorted(groups.items())
+    ]
+    upsert(EmailEventHourlyRollup, rows, index_elements=['bucket_start', 'email_category', 'event_type'],
+           increment=['event_count'], chunk_size=_UPSERT_ROWS)
+
+
+def _upsert_recipients(groups: Dict[Tuple[str, str], dict]) -> None:
+    table = EmailRecipientEngagement
+
+    def timestamps(excluded):
+        return {
+            'first_event_at': func.coalesce(table.first_event_at, excluded.first_event_at),
+            'last_event_at': func.coalesce(excluded.last_event_at, table.last_event_at),
+            'last_opened_at': func.coalesce(excluded.last_opened_at, table.last_opened_at),
+            'last_clicked_at': func.coalesce(excluded.last_clicked_at, table.last_clicked_at),
+        }
+
+    upsert(table, [groups[key] for key in sorted(groups)], index_elements=['recipient_email', 'email_category'],
+           increment=table.COUNT_COLUMNS.values(), set_=timestamps, chunk_size=_UPSERT_ROWS)
+
+
+def rollup_email_events_incremental(chunk_ids: int = FOLD_CHUNK_IDS) -> int:
+    """
+    Fold email events above the watermark into both rollups.
+
+    Works in id chunks of ``chunk_ids``, committing (and advancing the
+    watermark) after each. Returns the number of events folded.
+    """
+    folded = 0
+    cutoff = utcnow_naive() - INCREMENTAL_SAFETY_LAG
+    target = db.session.query(func.max(EmailEvent.id)).filter(EmailEvent.created_at < cutoff).scalar() or 0
+    while True:
+        state = _lock_rollup_state()
+        lower = int(state.last_event_id or 0)
+        if lower >= target:
+            db.session.commit()
+            return folded
+
+        upper = min(lower + chunk_ids, target)
+        window = (EmailEvent.id > lower, EmailEvent.id <= upper)
+        _upsert_hourly(_fold_hourly(*window))
+        _upsert_recipients(_fold_recipients(*window))
+        folded += db.session.query(func.count(EmailEvent.id)).filter(*window).scalar() or 0
+        state.last_event_id = upper
+        db.session.commit()
+
+
+def rebuild_email_rollups(chunk_ids: int = FOLD_CHUNK_IDS) -> int:
+    """
+    Backfill: clear both rollups and fold every stored event from the start.
+
+    Readers stay correct throughout (the watermark is reset with the
+    tables, so they read the un-folded events directly). Returns the
+    number of events folded.
+    """
+    state = _lock_rollup_state()
+    db.session.query(EmailEventHourlyRollup).delete(synchronize_session=False)
+    db.session.query(EmailRecipientEngagement).delete(synchronize_session=False)
+    state.last_event_id = 0
+    db.session.commit()
+    return rollup_email_events_incremental(chunk_ids=chunk_ids)
+
+
+def event_counts_since(cutoff: datetime) -> Dict[str, Counter]:
+    """
+    ``{category: Counter(event_type -> count)}`` for events since ``cutoff``.
+
+    Reads hourly rollups from the hour containing ``cutoff`` (so the window
+    is hour-aligned) plus the raw events above the watermark.
+    """
+    counts: Dict[str, Counter] = {}
+    watermark = _watermark()
+    rollup_rows = db.session.query(
+        EmailEventHourlyRollup.email_category,
+        EmailEventHourlyRollup.event_type,
+        func.sum(EmailEventHourlyRollup.event_count),
+    ).filter(
+        EmailEventHourlyRollup.bucket_start >= _floor_hour(cutoff),
+    ).group_by(EmailEventHourlyRollup.email_category, EmailEventHourlyRollup.event_type)
+    tail_rows = db.session.query(
+        EmailEvent.email_category, EmailEvent.event_type, func.count(EmailEvent.id),
+    ).filter(
+        EmailEvent.id > watermark,
+        EmailEvent.created_at >= cutoff,
+    ).group_by(EmailEvent.email_category, EmailEvent.event_type)
+    _add_event_counts(counts, rollup_rows)
+    _add_event_counts(counts, tail_rows)
+    return counts
+
+
+def recipient_counts(email: str) -> Dict[str, Counter]:
+    """Lifetime ``{category: Counter(event_type -> count)}`` for one address."""
+    counts: Dict[str, Counter] = {}
+    by_column = {column: event_type for event_type, column in EmailRecipientEngagement.COUNT_COLUMNS.items()}
+    for row in EmailRecipientEngagement.query.filter_by(recipient_email=email):
+        category_counts = counts.setdefault(row.email_category, Counter())
+        for column, event_type in by_column.items():
+            category_counts[event_type] += getattr(row, column) or 0
+    _add_event_counts(counts, db.session.query(
+        EmailEvent.email_category, EmailEvent.event_type, func.count(EmailEvent.id),
+    ).filter(
+        EmailEvent.recipient_email == email,
+        EmailEvent.id > _watermark(),
+    ).group_by(EmailEvent.email_category, EmailEvent.event_type))
+    return counts
+
+
+def _add_event_counts(counts: Dict[str, Counter], rows: Iterable) -> None:
+    for category, event_type, count in rows:
+        counts.setdefault(category, Counter())[EmailEvent.normalize_event_type(event_type)] += int(count or 0)
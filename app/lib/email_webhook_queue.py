@@ -0,0 +1,134 @@
+"""
+Queue for Resend webhook payloads.
+
+After a large send Resend delivers hundreds of thousands of
+delivered/opened/clicked webhooks within minutes. Recording each one
+inline (context lookups, duplicate check, soft-bounce count, insert and
+commit) held a web worker per webhook. The endpoint now verifies the
+signature and ``enqueue_webhook``s the payload (one Redis RPUSH); the
+``process_email_webhook_queue`` scheduler job drains the list in batches
+through ``EmailAnalytics.record_webhook_batch``.
+
+Each batch is moved (LMOVE) onto a processing list and removed only after
+it is committed, so a worker that dies mid-batch loses nothing: the next
+run puts the unfinished batch back at the head of the queue. Recording is
+idempotent per Resend event, so a batch that committed just before the
+crash is not double counted.
+
+If a batch fails it is retried one payload at a time so a single bad
+payload cannot block the queue; payloads that still fail are requeued up
+to ``MAX_ATTEMPTS`` times. Without Redis the payload is recorded inline,
+as before.
+"""
+import json
+import logging
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_QUEUE_KEY = 'email_webhooks:queue'
+WEBHOOK_PROCESSING_KEY = 'email_webhooks:processing'
+WEBHOOK_BATCH_SIZE = 500
+MAX_ATTEMPTS = 5
+
+
+def _get_redis_client():
+    from app.lib.redis_client import get_client
+    return get_client(decode_responses=True)
+
+
+def enqueue_webhook(payload: Dict[str, Any]) -> bool:
+    """
+    Queue a verified webhook payload. Returns True if queued, False if it
+    was recorded inline because the queue is unavailable.
+    """
+    client = _get_redis_client()
+    if client is not None:
+        try:
+            client.rpush(WEBHOOK_QUEUE_KEY, json.dumps({'p': payload, 'n': 0}, separators=(',', ':')))
+            return True
+        except Exception as e:
+            logger.warning(f"Webhook queue unavailable, recording inline: {e}")
+
+    from app.lib.email_analytics import EmailAnalytics
+    _record_one(EmailAnalytics, {'p': payload, 'n': 0})
+    return False
+
+
+def _record_one(analytics, envelope: Dict[str, Any]) -> bool:
+    from app import db
+
+    try:
+        analytics.record_webhook_batch([envelope['p']])
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Failed to record webhook (attempt {envelope['n'] + 1}): {e}")
+        return False
+
+
+def _requeue_unfinished(client) -> None:
+    """Put a batch claimed by a run that never finished back on the queue."""
+    moved = 0
+    while client.lmove(WEBHOOK_PROCESSING_KEY, WEBHOOK_QUEUE_KEY, 'RIGHT', 'LEFT') is not None:
+        moved += 1
+    if moved:
+        logger.warning(f"Requeued {moved} webhooks left unfinished by an interrupted run")
+
+
+def _claim_batch(client, batch_size: int) -> List[str]:
+    pipe = client.pipeline(transaction=True)
+    for _ in range(batch_size):
+        pipe.lmove(WEBHOOK_QUEUE_KEY, WEBHOOK_PROCESSING_KEY, 'LEFT', 'RIGHT')
+    return [item for item in pipe.execute() if item is not None]
+
+
+def process_webhook_queue(batch_size: int = WEBHOOK_BATCH_SIZE, max_batches: int = 20) -> int:
+    """Record queued webhooks in batches. Returns the number of payloads handled."""
+    from app import db
+    from app.lib.email_analytics import EmailAnalytics
+
+    client = _get_redis_client()
+    if client is None:
+        return 0
+
+    _requeue_unfinished(client)
+    handled = 0
+    for _ in range(max_batches):
+        raw = _claim_batch(client, batch_size)
+        if not raw:
+            break
+
+        envelopes = []
+        for item in raw:
+            try:
+                envelopes.append(json.loads(item))
+            except ValueError:
+                logger.warning(f"Dropping malformed queued webhook: {item[:200]!r}")
+
+        retry = []
+        try:
+            EmailAnalytics.record_webhook_batch([e['p'] for e in envelopes])
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"Webhook batch of {len(envelopes)} failed, retrying individually: {e}")
+            for envelope in envelopes:
+                if _record_one(EmailAnalytics, envelope):
+                    continue
+                envelope['n'] += 1
+                if envelope['n'] < MAX_ATTEMPTS:
+                    retry.append(json.dumps(envelope, separators=(',', ':')))
+                else:
+                    logger.error(f"Dropping webhook after {MAX_ATTEMPTS} attempts: {json.dumps(envelope['p'])[:500]}")
+
+        # Requeue the failures and release the batch in one step.
+        pipe = client.pipeline(transaction=True)
+        if retry:
+            pipe.rpush(WEBHOOK_QUEUE_KEY, *retry)
+        pipe.delete(WEBHOOK_PROCESSING_KEY)
+        pipe.execute()
+
+        handled += len(envelopes)
+        if len(raw) < batch_size:
+            break
+    return handled
@@ -0,0 +1,92 @@
+"""
+HyperLogLog distinct-count sketch.
+
+Mergeable cardinality estimate used by incremental rollups: two sketches
+built from disjoint event batches merge (register-wise max) into the sketch
+of their union, so a rollup can keep ``unique_users`` current without
+re-reading the raw rows behind earlier batches.
+
+Serialised as zlib-compressed registers. Low-cardinality sketches are mostly
+zero registers and compress to a few dozen bytes; linear counting keeps
+small counts within a user or two of exact.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import zlib
+from typing import Iterable, Optional
+
+DEFAULT_PRECISION = 12  # 4096 registers, ~1.6% standard error
+
+
+class HyperLogLog:
+    """Fixed-precision HyperLogLog sketch."""
+
+    __slots__ = ('precision', 'registers')
+
+    def __init__(self, precision: int = DEFAULT_PRECISION, registers: Optional[bytearray] = None):
+        if not 4 <= precision <= 16:
+            raise ValueError("HyperLogLog precision must be between 4 and 16")
+        self.precision = precision
+        size = 1 << precision
+        if registers is not None and len(registers) != size:
+            raise ValueError("Register count does not match precision")
+        self.registers = registers if registers is not None else bytearray(size)
+
+    def add(self, value) -> None:
+        """Add one value; any object with a stable ``str()`` is accepted."""
+        digest = hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest()
+        x = int.from_bytes(digest, 'big')
+        idx = x >> (64 - self.precision)
+        rest_bits = 64 - self.precision
+        rest = x & ((1 << rest_bits) - 1)
+        rank = rest_bits - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def update(self, values: Iterable) -> 'HyperLogLog':
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """Fold ``other`` into this sketch in place (union of both inputs)."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        regs = self.registers
+        for i, r in enumerate(other.registers):
+            if r > regs[i]:
+                regs[i] = r
+        return self
+
+    def count(self) -> int:
+        m = len(self.registers)
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        total = 0.0
+        zeros = 0
+        for r in self.registers:
+            total += 2.0 ** -r
+            if r == 0:
+                zeros += 1
+        estimate = alpha * m * m / total
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        return bytes([self.precision]) + zlib.compress(bytes(self.registers))
+
+    @classmethod
+    def from_bytes(cls, data: Optional[bytes]) -> Optional['HyperLogLog']:
+        """Inverse of ``to_bytes``; returns None for empty/corrupt input."""
+        if not data:
+            return None
+        try:
+            return cls(data[0], bytearray(zlib.decompress(data[1:])))
+        except (ValueError, zlib.error):
+            return None
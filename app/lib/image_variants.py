@@ -0,0 +1,198 @@
+"""
+Resized variants of uploaded profile images, avatars and logos.
+
+Profile uploads are stored once at full size, and ``get_image`` used to
+proxy that original everywhere, so a 40px avatar in a discussion list
+cost a multi-megabyte photo. On upload (and for existing objects, via
+``flask backfill-image-variants``) each raster image is now re-encoded at
+``VARIANT_WIDTHS`` in ``VARIANT_FORMATS``:
+
+- variants live under content-hashed keys,
+  ``profile_images/variants/<sha256[:16]>/<width>.<ext>``, so identical
+  uploads share them and a key's bytes never change;
+- a small JSON manifest at ``profile_images/variants/<filename>.json``
+  maps the original's filename to its hash.
+
+Templates call ``image_variant_url(filename, width)``, which adds ``w`` to
+the ``profiles.get_image`` URL. The route serves the smallest variant at
+least that wide, as WebP when the browser accepts it and JPEG otherwise,
+and falls back to the original until a manifest exists (GIFs, SVGs and
+not-yet-backfilled uploads). Manifest lookups are cached.
+"""
+import hashlib
+import io
+import json
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+
+from flask import url_for
+
+from app import cache
+
+try:
+    from PIL import Image, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:  # pragma: no cover — exercised only in environments without Pillow
+    PIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+VARIANT_WIDTHS = (64, 256, 1024)
+VARIANT_FORMATS = ('webp', 'jpeg')
+_MIMETYPES = {'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+_ENCODE_OPTIONS = {
+    'webp': {'quality': 80, 'method': 4},
+    'jpeg': {'quality': 82, 'optimize': True, 'progressive': True},
+}
+_VARIANT_SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif')
+VARIANT_PREFIX = 'profile_images/variants'
+_MANIFEST_CACHE_KEY = 'image_variants:manifest:{filename}'
+_MANIFEST_CACHE_TIMEOUT = 24 * 3600
+# Misses are cached briefly so a backfill shows up without a deploy.
+_MISSING_MANIFEST_CACHE_TIMEOUT = 10 * 60
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def variant_key(digest: str, width: int, fmt: str) -> str:
+    return f"{VARIANT_PREFIX}/{digest}/{width}.{'jpg' if fmt == 'jpeg' else fmt}"
+
+
+def manifest_key(filename: str) -> str:
+    return f"{VARIANT_PREFIX}/{filename}.json"
+
+
+def supports_variants(filename: str) -> bool:
+    return bool(filename) and filename.lower().endswith(_VARIANT_SOURCE_EXTENSIONS)
+
+
+def render_variants(data: bytes) -> Dict[Tuple[int, str], bytes]:
+    """
+    Encode ``data`` at every ``VARIANT_WIDTHS`` x ``VARIANT_FORMATS``.
+
+    Pure CPU work with no app context, so callers can ``offload`` it.
+    Images are never upscaled. Returns {} for animated or unreadable images.
+    """
+    if not PIL_AVAILABLE:
+        return {}
+    try:
+        with Image.open(io.BytesIO(data)) as source:
+            if getattr(source, 'is_animated', False):
+                return {}
+            image = ImageOps.exif_transpose(source)
+            image.load()
+    except Exception as e:
+        logger.warning(f"Cannot decode image for variants: {e}")
+        return {}
+
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+    flattened = image
+    if has_alpha:
+        flattened = Image.new('RGB', image.size, (255, 255, 255))
+        flattened.paste(image, mask=image.getchannel('A'))
+
+    variants = {}
+    for width in VARIANT_WIDTHS:
+        for fmt in VARIANT_FORMATS:
+            resized = (image if fmt == 'webp' else flattened).copy()
+            resized.thumbnail((width, width * 4), Image.Resampling.LANCZOS)
+            out = io.BytesIO()
+            resized.save(out, format=fmt.upper(), **_ENCODE_OPTIONS[fmt])
+            variants[(width, fmt)] = out.getvalue()
+    return variants
+
+
+def generate_variants(filename: str, data: bytes, client) -> Optional[dict]:
+    """
+    Render and upload the variants of ``filename`` (whose bytes are ``data``)
+    and write its manifest. Returns the manifest, or None when the image
+    does not get variants.
+    """
+    from app.lib.cpu_offload import offload
+
+    if not supports_variants(filename):
+        return None
+    digest = content_hash(data)
+    variants = offload('image', render_variants, data)
+    if not variants:
+        return None
+    for (width, fmt), encoded in variants.items():
+        client.upload_from_bytes(variant_key(digest, width, fmt), encoded)
+    manifest = {
+        'hash': digest,
+        'widths': list(VARIANT_WIDTHS),
+        'formats': list(VARIANT_FORMATS),
+    }
+    client.upload_from_bytes(manifest_key(filename), json.dumps(manifest).encode('utf-8'))
+    cache.set(_MANIFEST_CACHE_KEY.format(filename=filename), manifest, timeout=_MANIFEST_CACHE_TIMEOUT)
+    return manifest
+
+
+def load_manifest(filename: str, client) -> Optional[dict]:
+    """The variant manifest for ``filename``, or None if it has none (cached)."""
+    if not supports_variants(filename):
+        return None
+    cache_key = _MANIFEST_CACHE_KEY.format(filename=filename)
+    manifest = cache.get(cache_key)
+    if manifest is not None:
+        return manifest or None
+    try:
+        raw = client.download_as_bytes(manifest_key(filename))
+        manifest = json.loads(raw) if raw else {}
+    except Exception as e:
+        if not _is_not_found(e):
+            logger.warning(f"Could not read image variant manifest for {filename}: {e}")
+            return None
+        manifest = {}
+    cache.set(
+        cache_key,
+        manifest,
+        timeout=_MANIFEST_CACHE_TIMEOUT if manifest else _MISSING_MANIFEST_CACHE_TIMEOUT,
+    )
+    return manifest or None
+
+
+def select_variant(manifest: dict, width: int, accept_mimetypes) -> Tuple[str, str]:
+    """``(storage key, mimetype)`` of the best variant for ``width`` and the Accept header."""
+    widths = sorted(int(w) for w in manifest.get('widths') or VARIANT_WIDTHS)
+    chosen = next((w for w in widths if w >= width), widths[-1])
+    formats = manifest.get('formats') or VARIANT_FORMATS
+    fmt = 'webp' if 'webp' in formats and accept_mimetypes['image/webp'] else 'jpeg'
+    return variant_key(manifest['hash'], chosen, fmt), _MIMETYPES[fmt]
+
+
+def image_variant_url(filename: str, width: int, **url_kwargs) -> str:
+    """Template helper: URL of ``filename`` resized for a ``width``-pixel slot."""
+    return url_for('profiles.get_image', filename=filename, w=int(width), **url_kwargs)
+
+
+def backfill_variants(filenames: Iterable[str], client, force: bool = False) -> Dict[str, int]:
+    """Generate variants for stored ``filenames`` lacking a manifest (or all, with ``force``)."""
+    totals = {'generated': 0, 'skipped': 0, 'failed': 0}
+    for filename in sorted(set(f for f in filenames if f)):
+        if not supports_variants(filename) or (not force and load_manifest(filename, client)):
+            totals['skipped'] += 1
+            continue
+        try:
+            data = client.download_as_bytes(f"profile_images/{filename}")
+            if data and generate_variants(filename, data, client):
+                totals['generated'] += 1
+            else:
+                totals['skipped'] += 1
+        except Exception as e:
+            logger.warning(f"Image variant backfill failed for {filename}: {e}")
+            totals['failed'] += 1
+    return totals
+
+
+def _is_not_found(error: Exception) -> bool:
+    message = str(error).lower()
+    return (
+        type(error).__name__ == 'ObjectNotFoundError'
+        or 'not found' in message
+        or 'does not exist' in message
+        or 'could not be found' in message
+    )
@@ -0,0 +1,84 @@
+"""
+Measure web-worker boot: import time per module and create_app() wall time.
+
+The app is booted in a fresh interpreter under ``python -X importtime`` so
+nothing already imported by the caller (the CLI, pytest) skews the numbers.
+Used by ``flask profile-imports`` and tests/test_import_budget.py.
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+_RESULT_MARKER = 'IMPORT_PROFILE '
+
+_BOOT_SCRIPT = '''
+import json, sys, time
+{setup}
+started = time.perf_counter()
+from app import create_app
+create_app()
+boot_seconds = time.perf_counter() - started
+from app.lib.lazy_import import HEAVY_MODULES
+print({marker!r} + json.dumps({{
+    'boot_seconds': boot_seconds,
+    'heavy_loaded': [name for name in HEAVY_MODULES if name in sys.modules],
+}}))
+'''
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """Parse ``-X importtime`` output into ``{module, self_ms, cumulative_ms, depth}`` rows."""
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        rows.append({
+            'module': module,
+            'self_ms': int(self_us) / 1000.0,
+            'cumulative_ms': int(cumulative_us) / 1000.0,
+            'depth': (len(indent) - 1) // 2,
+        })
+    return rows
+
+
+def time_by_package(rows: List[Dict]) -> Dict[str, float]:
+    """Self import time summed per top-level package, in ms."""
+    totals = defaultdict(float)
+    for row in rows:
+        totals[row['module'].split('.', 1)[0]] += row['self_ms']
+    return dict(totals)
+
+
+def profile_app_boot(setup: str = '', timeout: int = 300) -> Dict:
+    """
+    Boot the app in a subprocess and return ``{'boot_seconds', 'heavy_loaded',
+    'modules'}``. ``setup`` is Python run before the import (environment
+    overrides for tests). Raises RuntimeError if the app fails to boot.
+    """
+    script = _BOOT_SCRIPT.format(setup=setup, marker=_RESULT_MARKER)
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', script],
+        cwd=_REPO_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    result = None
+    for line in proc.stdout.splitlines():
+        if line.startswith(_RESULT_MARKER):
+            result = json.loads(line[len(_RESULT_MARKER):])
+    if proc.returncode != 0 or result is None:
+        tail = '\n'.join(line for line in proc.stderr.splitlines() if not line.startswith('import time:'))[-2000:]
+        raise RuntimeError(f"App boot failed (exit {proc.returncode}): {tail}")
+    result['modules'] = parse_importtime(proc.stderr)
+    return result
@@ -0,0 +1,302 @@
+"""
+Dispatch long scheduler jobs to a shared work queue.
+
+Only the scheduler process holding the Redis ``scheduler_lock`` lease (see
+``_run_scheduler_cycle`` in app/__init__.py) starts APScheduler, so cron
+triggering is already leader-elected. Execution was not: every job ran on
+the leader's eight-thread pool, so brief generation, the trending pipeline
+and hourly brief sends competed with the ten-second queue jobs, and a
+leader restart (every 30 minutes) waited for them to finish.
+
+With ``SCHEDULER_DISPATCH_ENABLED`` the leader replaces each job in
+``DISPATCHED_JOBS`` with a stub that pushes a run onto
+``job_dispatch:queue``. Any number of ``scripts/run_job_worker.py``
+processes consume it:
+
+- a job already waiting in the queue is not queued again (APScheduler's
+  ``coalesce``); the per-job marker expires, so a push that failed or a
+  worker that died mid-claim cannot block the job for good;
+- runs hold a slot in their concurrency group (``CONCURRENCY_LIMITS``,
+  default 1) across all workers; a run that finds its group full is
+  skipped, like APScheduler's ``max_instances``;
+- each run is appended to a capped per-job history in Redis with its
+  status, duration and queue lag (``dispatch_stats()`` summarises it),
+  and recorded in the scheduler metrics (``scheduler_metrics.measure``).
+
+Dispatch falls back to running the job inline on the leader when Redis is
+unavailable or no worker has sent a heartbeat recently, so enabling the
+flag before deploying workers never drops a run. Inline runs are recorded
+in the same history.
+"""
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Job id -> concurrency group. Jobs in one group never run concurrently
+# (beyond its limit), e.g. the daily brief job and its safety nets.
+# The digest jobs are not listed: they hand off to a background thread
+# guarded by an in-process flag, which a worker cannot share.
+DISPATCHED_JOBS: Dict[str, str] = {
+    'generate_daily_brief': 'daily_brief',
+    'daily_brief_safety_net': 'daily_brief',
+    'daily_brief_safety_net_2': 'daily_brief',
+    'generate_weekly_brief': 'weekly_brief',
+    'trending_topics_pipeline': 'trending_pipeline',
+    'send_brief_emails': 'brief_emails',
+    'process_briefing_runs': 'briefing_runs',
+    'send_approved_brief_runs': 'briefing_sends',
+}
+CONCURRENCY_LIMITS: Dict[str, int] = {}
+_DEFAULT_CONCURRENCY = 1
+
+DISPATCH_QUEUE_KEY = 'job_dispatch:queue'
+_QUEUED_KEY = 'job_dispatch:queued:{job_id}'
+_SLOT_KEY = 'job_dispatch:slot:{group}:{index}'
+_HISTORY_KEY = 'job_dispatch:history:{job_id}'
+_WORKERS_KEY = 'job_dispatch:workers:{worker_id}'
+_WORKERS_PATTERN = 'job_dispatch:workers:*'
+
+# A crashed worker's slot frees itself after this long.
+_SLOT_LEASE_SECONDS = 3 * 3600
+# A queued marker left behind (worker died between pop and clear) stops
+# coalescing after this long.
+_QUEUED_MARKER_TTL_SECONDS = 15 * 60
+_WORKER_HEARTBEAT_TTL_SECONDS = 60
+_HISTORY_LENGTH = 200
+# Stay below the shared pool's socket timeout (REDIS_SHARED_POOL_OP_TIMEOUT_SECONDS).
+_MAX_BLOCK_SECONDS = 4
+
+
+def _get_redis_client():
+    from app.lib.redis_client import get_client
+    return get_client(decode_responses=True)
+
+
+def worker_name() -> str:
+    return (os.getenv('JOB_WORKER_ID') or '').strip() or f"{socket.gethostname()}:{os.getpid()}"
+
+
+def concurrency_limit(group: str) -> int:
+    return max(1, int(CONCURRENCY_LIMITS.get(group, _DEFAULT_CONCURRENCY)))
+
+
+def publish_heartbeat(worker_id: str) -> None:
+    client = _get_redis_client()
+    if client is None:
+        return
+    try:
+        client.setex(_WORKERS_KEY.format(worker_id=worker_id), _WORKER_HEARTBEAT_TTL_SECONDS, str(int(time.time())))
+    except Exception as e:
+        logger.debug(f"Job worker heartbeat failed: {e}")
+
+
+def live_workers(client=None) -> List[str]:
+    client = client or _get_redis_client()
+    if client is None:
+        return []
+    try:
+        return sorted(key.split(':', 2)[2] for key in client.scan_iter(match=_WORKERS_PATTERN, count=100))
+    except Exception as e:
+        logger.debug(f"Could not list job workers: {e}")
+        return []
+
+
+def dispatch(job_id: str, func: Callable[[], None]) -> None:
+    """
+    Queue a run of ``job_id`` for the workers, or run ``func`` inline when
+    no worker can take it. Installed as the APScheduler job function.
+    """
+    client = _get_redis_client()
+    queued_at = time.time()
+    if client is None or not live_workers(client):
+        run_with_history(job_id, func, queued_at=queued_at, worker='scheduler-inline')
+        return
+    payload = {'run_id': uuid.uuid4().hex, 'job_id': job_id, 'queued_at': queued_at}
+    marker = _QUEUED_KEY.format(job_id=job_id)
+    marked = False
+    try:
+        if not client.set(marker, payload['run_id'], nx=True, ex=_QUEUED_MARKER_TTL_SECONDS):
+            logger.info(f"Job {job_id} is already queued for a worker; coalescing")
+            return
+        marked = True
+        client.rpush(DISPATCH_QUEUE_KEY, json.dumps(payload))
+    except Exception as e:
+        logger.warning(f"Could not dispatch job {job_id}, running inline: {e}")
+        if marked:
+            _clear_queued_marker(client, job_id, payload['run_id'])
+        run_with_history(job_id, func, queued_at=queued_at, worker='scheduler-inline')
+
+
+def _clear_queued_marker(client, job_id: str, run_id: str) -> None:
+    marker = _QUEUED_KEY.format(job_id=job_id)
+    try:
+        # Leave a newer run's marker alone (ours may have expired already).
+        if client.get(marker) == run_id:
+            client.delete(marker)
+    except Exception as e:
+        logger.debug(f"Could not clear queued marker for {job_id}: {e}")
+
+
+def install(scheduler, job_ids=None) -> List[str]:
+    """Route the listed jobs (default ``DISPATCHED_JOBS``) through ``dispatch``."""
+    from functools import partial
+
+    installed = []
+    for job_id in job_ids or DISPATCHED_JOBS:
+        job = scheduler.get_job(job_id)
+        if job is None:
+            continue
+        scheduler.modify_job(job_id, func=partial(dispatch, job_id, job.func), args=(), kwargs={})
+        installed.append(job_id)
+    return installed
+
+
+def claim_next(timeout: float = _MAX_BLOCK_SECONDS) -> Optional[dict]:
+    """Pop the next queued run, waiting up to ``timeout`` seconds."""
+    client = _get_redis_client()
+    if client is None:
+        time.sleep(timeout)
+        return None
+    popped = client.blpop([DISPATCH_QUEUE_KEY], timeout=max(1, min(_MAX_BLOCK_SECONDS, int(timeout))))
+    if not popped:
+        return None
+    payload = json.loads(popped[1])
+    # Once popped, a new trigger may queue the job again.
+    _clear_queued_marker(client, payload['job_id'], payload['run_id'])
+    return payload
+
+
+def execute(payload: dict, jobs: Dict[str, Callable[[], None]], worker_id: str) -> str:
+    """
+    Run a claimed ``payload`` with the worker's job function, holding a slot
+    in the job's concurrency group. Returns the recorded status.
+    """
+    job_id = payload['job_id']
+    func = jobs.get(job_id)
+    if func is None:
+        return _record(job_id, 'unknown_job', payload.get('queued_at'), worker=worker_id)
+
+    client = _get_redis_client()
+    slot = _acquire_slot(client, DISPATCHED_JOBS.get(job_id, job_id), payload['run_id'])
+    if slot is None:
+        logger.warning(f"Job {job_id} skipped: concurrency limit reached")
+        return _record(job_id, 'skipped', payload.get('queued_at'), worker=worker_id)
+    try:
+        return run_with_history(job_id, func, queued_at=payload.get('queued_at'), worker=worker_id)
+    finally:
+        _release_slot(client, slot, payload['run_id'])
+
+
+def run_with_history(job_id: str, func: Callable[[], None], *, queued_at: Optional[float], worker: str) -> str:
+    from app.lib.scheduler_metrics import measure
+
+    started_at = time.time()
+    try:
+        measure(job_id, func, lag=started_at - queued_at if queued_at else None)
+    except Exception as e:
+        logger.error(f"Dispatched job {job_id} failed: {e}", exc_info=True)
+        return _record(job_id, 'failed', queued_at, started_at=started_at, worker=worker, error=str(e))
+    return _record(job_id, 'succeeded', queued_at, started_at=started_at, worker=worker)
+
+
+def _acquire_slot(client, group: str, run_id: str) -> Optional[str]:
+    if client is None:
+        return ''
+    try:
+        for index in range(concurrency_limit(group)):
+            key = _SLOT_KEY.format(group=group, index=index)
+            if client.set(key, run_id, nx=True, ex=_SLOT_LEASE_SECONDS):
+                return key
+        return None
+    except Exception as e:
+        # Redis trouble must not stop the job; the jobs keep their own DB guards.
+        logger.warning(f"Could not take a concurrency slot for {group}: {e}")
+        return ''
+
+
+def _release_slot(client, key: str, run_id: str) -> None:
+    if not key or client is None:
+        return
+    try:
+        # Only release our own lease; it may have expired and been retaken.
+        if client.get(key) == run_id:
+            client.delete(key)
+    except Exception as e:
+        logger.debug(f"Could not release concurrency slot {key}: {e}")
+
+
+def _record(job_id, status, queued_at, *, started_at=None, worker=None, error=None) -> str:
+    finished_at = time.time()
+    entry = {
+        'status': status,
+        'worker': worker,
+        'queued_at': queued_at,
+        'started_at': started_at,
+        'finished_at': finished_at,
+        'duration_ms': round((finished_at - started_at) * 1000) if started_at else None,
+        'lag_ms': round((started_at - queued_at) * 1000) if started_at and queued_at else None,
+        'error': (error or '')[:500] or None,
+    }
+    client = _get_redis_client()
+    if client is not None:
+        key = _HISTORY_KEY.format(job_id=job_id)
+        try:
+            client.lpush(key, json.dumps(entry))
+            client.ltrim(key, 0, _HISTORY_LENGTH - 1)
+        except Exception as e:
+            logger.debug(f"Could not record run history for {job_id}: {e}")
+    return status
+
+
+def run_history(job_id: str, limit: int = 50) -> List[dict]:
+    """Most recent runs of ``job_id``, newest first."""
+    client = _get_redis_client()
+    if client is None:
+        return []
+    try:
+        return [json.loads(raw) for raw in client.lrange(_HISTORY_KEY.format(job_id=job_id), 0, limit - 1)]
+    except Exception as e:
+        logger.debug(f"Could not read run history for {job_id}: {e}")
+        return []
+
+
+def _percentile(values: List[int], pct: float) -> Optional[int]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct * (len(ordered) - 1))))]
+
+
+def dispatch_stats() -> dict:
+    """Queue depth, live workers and per-job run summaries for the health page."""
+    client = _get_redis_client()
+    stats = {'queue_depth': None, 'workers': live_workers(client), 'jobs': {}}
+    if client is not None:
+        try:
+            stats['queue_depth'] = client.llen(DISPATCH_QUEUE_KEY)
+        except Exception:
+            pass
+    for job_id in DISPATCHED_JOBS:
+        history = run_history(job_id, limit=_HISTORY_LENGTH)
+        if not history:
+            continue
+        durations = [run['duration_ms'] for run in history if run.get('duration_ms') is not None]
+        lags = [run['lag_ms'] for run in history if run.get('lag_ms') is not None]
+        stats['jobs'][job_id] = {
+            'runs': len(history),
+            'failed': sum(1 for run in history if run['status'] == 'failed'),
+            'skipped': sum(1 for run in history if run['status'] == 'skipped'),
+            'last_status': history[0]['status'],
+            'last_finished_at': history[0]['finished_at'],
+            'duration_ms_p50': _percentile(durations, 0.5),
+            'duration_ms_p95': _percentile(durations, 0.95),
+            'lag_ms_p95': _percentile(lags, 0.95),
+            'lag_ms_max': max(lags) if lags else None,
+        }
+    return stats
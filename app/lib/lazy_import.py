@@ -0,0 +1,65 @@
+"""
+Deferred imports for heavy dependencies.
+
+numpy, pandas and scikit-learn (which drags in scipy) add well over a
+second and tens of MB to every process that imports them, but only the
+consensus worker and the trending/polymarket jobs actually compute with
+them. Web route modules import those modules transitively, so importing
+the heavy libraries at module level made every gunicorn worker — recycled
+every ``max_requests`` — pay for them at boot.
+
+Modules that need one of these libraries bind a proxy instead::
+
+    np = lazy_module('numpy')
+
+and keep writing ``np.asarray(...)``. The real import happens on the first
+attribute access, i.e. the first time a function actually computes.
+``HEAVY_MODULES`` is the import budget checked by ``flask profile-imports``
+and tests/test_import_budget.py: none of them may be loaded by create_app().
+"""
+import importlib
+import threading
+from types import ModuleType
+
+HEAVY_MODULES = (
+    'numpy',
+    'pandas',
+    'scipy',
+    'sklearn',
+    'openai',
+    'anthropic',
+)
+
+
+class _LazyModule(ModuleType):
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_lock'] = threading.Lock()
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            with self.__dict__['_lazy_lock']:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_lazy_module'] is not None else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_module(name: str) -> ModuleType:
+    """Return a proxy for module ``name`` that imports it on first use."""
+    return _LazyModule(name)
@@ -16,6 +16,8 @@ from typing import Optional, Dict, List, Tuple
 from cryptography.fernet import Fernet
 from flask import current_app
 
+from app.lib.cpu_offload import offload
+
 logger = logging.getLogger(__name__)
 
 
@@ -154,9 +156,9 @@ Write in a neutral, informative tone. Focus on what participants agree on and wh
     
     try:
         if user_key.provider == 'openai':
-            summary = _generate_with_openai(api_key, context)
+            summary = offload('llm', _generate_with_openai, api_key, context)
         elif user_key.provider == 'anthropic':
-            summary = _generate_with_anthropic(api_key, context)
+            summary = offload('llm', _generate_with_anthropic, api_key, context)
         else:
             summary = None
         
@@ -350,11 +352,12 @@ def generate_cluster_labels(
     # the statement IDs we need for grounding.
     rep_by_cluster = cluster_data.get('representative_statements', {}) or {}
     statements_by_id = {int(s['id']): s for s in statements if 'id' in s}
-    cluster_assignments = cluster_data.get('cluster_assignments', {})
-
-    clusters: Dict = {}
-    for _, cid in cluster_assignments.items():
-        clusters.setdefault(cid, None)
+    # cluster_sizes is the stored summary; cluster_assignments is the raw
+    # engine output (and what analyses written before the split carry).
+    clusters: Dict = dict.fromkeys(
+        cluster_data.get('cluster_sizes')
+        or (cluster_data.get('cluster_assignments') or {}).values()
+    )
 
     labels: Dict[int, Dict] = {}
 
@@ -406,9 +409,9 @@ Rules:
 
         try:
             if user_key.provider == 'openai':
-                raw = _generate_with_openai(api_key, prompt, model="gpt-4o-mini")
+                raw = offload('llm', _generate_with_openai, api_key, prompt, model="gpt-4o-mini")
             elif user_key.provider == 'anthropic':
-                raw = _generate_with_anthropic(api_key, prompt, model="claude-haiku-4-5-20251001")
+                raw = offload('llm', _generate_with_anthropic, api_key, prompt, model="claude-haiku-4-5-20251001")
             else:
                 labels[cid_int] = {'label': f"Group {cid_int + 1}", 'supporting_statement_ids': []}
                 continue
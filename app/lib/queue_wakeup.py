@@ -0,0 +1,84 @@
+"""
+Wake queue consumers as soon as work is enqueued.
+
+The scheduler and the consensus worker used to find new work only by
+polling: extraction and brief-generation queues every 10s, ingestion and
+emergency briefs every 15s, consensus / export / partner-webhook queues
+every minute. Idle ticks still cost a DB or Redis query each, and a job
+enqueued just after a tick waited the full interval.
+
+Producers now call ``notify(queue)`` after committing their job. That
+pushes a token onto ``queue_wakeup:<queue>`` (trimmed to one, so a burst
+of enqueues is one wakeup). Consumers block on those keys with
+``wait_for_wakeup()`` (``BLPOP``) and run straight away; their polling
+intervals are kept only as a slow safety net for lost tokens and for jobs
+that become due later (retry backoff).
+
+A token is a hint, not the job itself: consumers still claim work from
+their queue, so a duplicate or stale token costs one empty pass. Without
+Redis, ``notify`` is a no-op and ``wait_for_wakeup`` simply sleeps.
+"""
+import logging
+import time
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+QUEUE_CONSENSUS = 'consensus'
+QUEUE_PROGRAMME_EXPORT = 'programme_export'
+QUEUE_PARTNER_WEBHOOKS = 'partner_webhooks'
+QUEUE_BRIEF_GENERATION = 'brief_generation'
+QUEUE_SOURCE_INGESTION = 'source_ingestion'
+QUEUE_EXTRACTION = 'extraction'
+QUEUE_EMERGENCY_BRIEF = 'emergency_brief'
+
+_WAKEUP_KEY = 'queue_wakeup:{queue}'
+# A token nobody consumes (consumer down) should not trigger a pass days later.
+_TOKEN_TTL_SECONDS = 3600
+# Stay below the shared pool's socket timeout (REDIS_SHARED_POOL_OP_TIMEOUT_SECONDS).
+_MAX_BLOCK_SECONDS = 4
+
+
+def _get_redis_client():
+    from app.lib.redis_client import get_client
+    return get_client(decode_responses=True)
+
+
+def notify(queue: str) -> None:
+    """Signal that ``queue`` has new work. Never raises."""
+    client = _get_redis_client()
+    if client is None:
+        return
+    key = _WAKEUP_KEY.format(queue=queue)
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.rpush(key, '1')
+        pipe.ltrim(key, -1, -1)
+        pipe.expire(key, _TOKEN_TTL_SECONDS)
+        pipe.execute()
+    except Exception as e:
+        logger.debug(f"Queue wakeup for {queue} not sent: {e}")
+
+
+def wait_for_wakeup(queues: Iterable[str], timeout: float) -> Optional[str]:
+    """
+    Block until one of ``queues`` is notified or ``timeout`` seconds pass.
+
+    Returns the woken queue, or None on timeout. Consumes the token.
+    """
+    keys = [_WAKEUP_KEY.format(queue=queue) for queue in queues]
+    deadline = time.monotonic() + max(0.0, timeout)
+    client = _get_redis_client()
+    while client is not None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        try:
+            popped = client.blpop(keys, timeout=max(1, min(_MAX_BLOCK_SECONDS, int(remaining))))
+        except Exception as e:
+            logger.debug(f"Queue wakeup wait failed, falling back to sleep: {e}")
+            break
+        if popped:
+            return popped[0].split(':', 1)[1]
+    time.sleep(max(0.0, deadline - time.monotonic()))
+    return None
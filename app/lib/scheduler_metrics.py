@@ -0,0 +1,295 @@
+"""
+Per-job duration, lag and query-count metrics for the APScheduler jobs.
+
+The scheduler's job listeners only logged, so there was no way to see
+which of the ~60 jobs were getting slower, how late misfired jobs ran or
+how much of the eight-thread pool each one used. ``instrument(scheduler)``
+(called from ``start_scheduler``) wraps every job so that each run records:
+
+- run duration, as a histogram (``DURATION_BUCKETS``, seconds);
+- scheduling lag, the actual start minus the planned fire time
+  (``LAG_BUCKETS``, seconds);
+- SQL statements executed on the job's thread (``QUERY_BUCKETS``);
+- run and error counts, plus overlap skips (``max_instances`` reached) and
+  misfires reported by APScheduler.
+
+Jobs handed to job workers (``app.lib.job_dispatch``) are not wrapped on
+the scheduler, where only their near-instant dispatch stub runs; the
+worker records each real run through ``measure()`` instead, with the
+queue wait as its lag.
+
+Counters live in one Redis hash per job (``scheduler_metrics:job:<id>``)
+so the web process can read what the scheduler process recorded; without
+Redis they are kept in process memory. ``snapshot()`` returns the raw
+counters, ``render_prometheus()`` the text exposition format and
+``job_summaries()`` the rows for the admin scheduler page.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from functools import partial
+from typing import Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.1, 0.5, 1, 5, 15, 60, 300, 900, 1800, 3600)
+LAG_BUCKETS = (0.1, 1, 5, 30, 60, 300, 900, 3600)
+QUERY_BUCKETS = (1, 10, 50, 100, 500, 1000, 5000)
+_HISTOGRAMS = {
+    'duration': DURATION_BUCKETS,
+    'lag': LAG_BUCKETS,
+    'queries': QUERY_BUCKETS,
+}
+
+_JOBS_KEY = 'scheduler_metrics:jobs'
+_JOB_KEY = 'scheduler_metrics:job:{job_id}'
+# Jobs that are removed from the scheduler drop out of the export.
+_KEY_TTL_SECONDS = 30 * 24 * 3600
+
+_local: Dict[str, Dict[str, float]] = {}
+_local_lock = threading.Lock()
+# Start time and query count of the last run of each job, handed from the
+# job wrapper to the executed/error listener (max_instances=1 keeps one run
+# per job in flight).
+_completed: Dict[str, tuple] = {}
+_run_state = threading.local()
+_query_listener_attached = False
+
+
+def _get_redis_client():
+    from app.lib.redis_client import get_client
+    return get_client(decode_responses=True)
+
+
+def _bucket_field(name: str, buckets: Sequence[float], value: float) -> str:
+    for bound in buckets:
+        if value <= bound:
+            return f'{name}_bucket:{bound:g}'
+    return f'{name}_bucket:+Inf'
+
+
+def _observe(increments: Dict[str, float], name: str, value: float) -> None:
+    increments[_bucket_field(name, _HISTOGRAMS[name], value)] = 1
+    increments[f'{name}_sum'] = value
+    increments[f'{name}_count'] = 1
+
+
+def _apply(job_id: str, increments: Dict[str, float]) -> None:
+    client = _get_redis_client()
+    if client is not None:
+        key = _JOB_KEY.format(job_id=job_id)
+        try:
+            pipe = client.pipeline(transaction=False)
+            for field, amount in increments.items():
+                pipe.hincrbyfloat(key, field, amount)
+            pipe.expire(key, _KEY_TTL_SECONDS)
+            pipe.sadd(_JOBS_KEY, job_id)
+            pipe.execute()
+            return
+        except Exception as e:
+            logger.debug(f"Scheduler metrics for {job_id} kept in memory: {e}")
+    with _local_lock:
+        counters = _local.setdefault(job_id, {})
+        for field, amount in increments.items():
+            counters[field] = counters.get(field, 0) + amount
+
+
+def record_run(job_id: str, duration: float, lag: Optional[float], queries: Optional[int], failed: bool) -> None:
+    increments = {'runs': 1}
+    if failed:
+        increments['errors'] = 1
+    _observe(increments, 'duration', max(0.0, duration))
+    if lag is not None:
+        _observe(increments, 'lag', max(0.0, lag))
+    if queries is not None:
+        _observe(increments, 'queries', queries)
+    _apply(job_id, increments)
+
+
+def record_event(job_id: str, field: str) -> None:
+    """Count a run that did not happen: ``skipped_overlap`` or ``missed``."""
+    _apply(job_id, {field: 1})
+
+
+def _count_query(*_args, **_kwargs):
+    queries = getattr(_run_state, 'queries', None)
+    if queries is not None:
+        _run_state.queries = queries + 1
+
+
+def _attach_query_listener() -> None:
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    global _query_listener_attached
+    if not _query_listener_attached:
+        event.listen(Engine, 'before_cursor_execute', _count_query)
+        _query_listener_attached = True
+
+
+def measure(job_id: str, func, lag: Optional[float] = None):
+    """Run ``func`` outside APScheduler and record it like an instrumented run."""
+    _attach_query_listener()
+    started = time.perf_counter()
+    _run_state.queries = 0
+    failed = True
+    try:
+        result = func()
+        failed = False
+        return result
+    finally:
+        queries, _run_state.queries = _run_state.queries, None
+        try:
+            record_run(job_id, time.perf_counter() - started, lag, queries, failed=failed)
+        except Exception as e:
+            logger.debug(f"Could not record scheduler metrics for {job_id}: {e}")
+
+
+def _timed_run(job_id, func, *args, **kwargs):
+    started_at = datetime.now(timezone.utc)
+    started = time.perf_counter()
+    _run_state.queries = 0
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _completed[job_id] = (started_at, time.perf_counter() - started, _run_state.queries)
+        _run_state.queries = None
+
+
+def _on_job_finished(event):
+    completed = _completed.pop(event.job_id, None)
+    if completed is None:
+        return
+    started_at, duration, queries = completed
+    lag = None
+    if event.scheduled_run_time is not None:
+        lag = (started_at - event.scheduled_run_time).total_seconds()
+    try:
+        record_run(event.job_id, duration, lag, queries, failed=event.exception is not None)
+    except Exception as e:
+        logger.debug(f"Could not record scheduler metrics for {event.job_id}: {e}")
+
+
+def _on_job_max_instances(event):
+    record_event(event.job_id, 'skipped_overlap')
+
+
+def _on_job_missed(event):
+    record_event(event.job_id, 'missed')
+
+
+def instrument(scheduler, skip: Sequence[str] = ()) -> None:
+    """
+    Wrap every job of ``scheduler`` except ``skip`` (dispatch stubs, whose
+    real runs are measured on the worker) and register the metric listeners.
+    """
+    from apscheduler.events import (
+        EVENT_JOB_ERROR,
+        EVENT_JOB_EXECUTED,
+        EVENT_JOB_MAX_INSTANCES,
+        EVENT_JOB_MISSED,
+    )
+
+    _attach_query_listener()
+    for job in scheduler.get_jobs():
+        if job.id in skip:
+            continue
+        scheduler.modify_job(job.id, func=partial(_timed_run, job.id, job.func))
+    scheduler.add_listener(_on_job_finished, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR)
+    scheduler.add_listener(_on_job_max_instances, EVENT_JOB_MAX_INSTANCES)
+    scheduler.add_listener(_on_job_missed, EVENT_JOB_MISSED)
+
+
+def snapshot() -> Dict[str, Dict[str, float]]:
+    """Raw counters per job id, from Redis and this process's fallback store."""
+    merged: Dict[str, Dict[str, float]] = {}
+    client = _get_redis_client()
+    if client is not None:
+        try:
+            for job_id in sorted(client.smembers(_JOBS_KEY)):
+                counters = client.hgetall(_JOB_KEY.format(job_id=job_id))
+                if counters:
+                    merged[job_id] = {field: float(value) for field, value in counters.items()}
+        except Exception as e:
+            logger.debug(f"Could not read scheduler metrics from Redis: {e}")
+    with _local_lock:
+        for job_id, counters in _local.items():
+            target = merged.setdefault(job_id, {})
+            for field, value in counters.items():
+                target[field] = target.get(field, 0) + value
+    return merged
+
+
+def _cumulative(counters: Dict[str, float], name: str) -> List[tuple]:
+    """``[(le, cumulative count), ...]`` including ``+Inf``."""
+    total = 0
+    rows = []
+    for bound in _HISTOGRAMS[name]:
+        total += counters.get(f'{name}_bucket:{bound:g}', 0)
+        rows.append((f'{bound:g}', total))
+    rows.append(('+Inf', total + counters.get(f'{name}_bucket:+Inf', 0)))
+    return rows
+
+
+def _quantile(counters: Dict[str, float], name: str, q: float) -> Optional[float]:
+    """Upper bucket bound containing the ``q`` quantile (None if no samples)."""
+    count = counters.get(f'{name}_count', 0)
+    if not count:
+        return None
+    for le, cumulative in _cumulative(counters, name):
+        if cumulative >= q * count:
+            return float(le)
+    return None
+
+
+def render_prometheus(counters_by_job: Dict[str, Dict[str, float]]) -> str:
+    lines = []
+    histograms = (
+        ('duration', 'scheduler_job_duration_seconds', 'Scheduler job run duration.'),
+        ('lag', 'scheduler_job_lag_seconds', 'Scheduler job start minus planned fire time.'),
+        ('queries', 'scheduler_job_db_queries', 'SQL statements executed per scheduler job run.'),
+    )
+    for name, metric, help_text in histograms:
+        lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} histogram']
+        for job_id, counters in counters_by_job.items():
+            if not counters.get(f'{name}_count'):
+                continue
+            for le, cumulative in _cumulative(counters, name):
+                lines.append(f'{metric}_bucket{{job="{job_id}",le="{le}"}} {cumulative:g}')
+            lines.append(f'{metric}_sum{{job="{job_id}"}} {counters.get(f"{name}_sum", 0):g}')
+            lines.append(f'{metric}_count{{job="{job_id}"}} {counters[f"{name}_count"]:g}')
+    totals = (
+        ('runs', 'scheduler_job_runs_total', 'Scheduler job runs.'),
+        ('errors', 'scheduler_job_errors_total', 'Scheduler job runs that raised.'),
+        ('skipped_overlap', 'scheduler_job_overlap_skips_total', 'Runs skipped because the previous run was still going.'),
+        ('missed', 'scheduler_job_misfires_total', 'Runs missed beyond misfire_grace_time.'),
+    )
+    for field, metric, help_text in totals:
+        lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} counter']
+        for job_id, counters in counters_by_job.items():
+            lines.append(f'{metric}{{job="{job_id}"}} {counters.get(field, 0):g}')
+    return '\n'.join(lines) + '\n'
+
+
+def job_summaries(counters_by_job: Dict[str, Dict[str, float]]) -> List[dict]:
+    """Admin page rows, busiest jobs (share of total run time) first."""
+    busy_total = sum(counters.get('duration_sum', 0) for counters in counters_by_job.values())
+    rows = []
+    for job_id, counters in counters_by_job.items():
+        runs = counters.get('runs', 0)
+        duration_sum = counters.get('duration_sum', 0)
+        rows.append({
+            'job_id': job_id,
+            'runs': int(runs),
+            'errors': int(counters.get('errors', 0)),
+            'skipped_overlap': int(counters.get('skipped_overlap', 0)),
+            'missed': int(counters.get('missed', 0)),
+            'avg_duration_seconds': round(duration_sum / runs, 2) if runs else None,
+            'p95_duration_seconds': _quantile(counters, 'duration', 0.95),
+            'p95_lag_seconds': _quantile(counters, 'lag', 0.95),
+            'avg_queries': round(counters.get('queries_sum', 0) / runs, 1) if runs else None,
+            'busy_share_pct': round(100 * duration_sum / busy_total, 1) if busy_total else None,
+        })
+    rows.sort(key=lambda row: (row['busy_share_pct'] or 0, row['runs']), reverse=True)
+    return rows
@@ -0,0 +1,139 @@
+"""
+Bulk claim / acknowledge protocol for subscriber email sends.
+
+Bulk sends used to lock, token-refresh, flush and commit each subscriber
+row around its email — three or four round trips per recipient. Instead a
+send now works a page at a time:
+
+1. ``claim_for_send`` — one ``UPDATE ... RETURNING`` marks the page's
+   eligible, unclaimed rows as in flight for ``send_id`` and fills any
+   missing or rotating tokens (pre-generated in Python, applied with a
+   per-row ``CASE``), returning the refreshed subscriber objects.
+   Concurrent senders cannot claim the same row: the UPDATE re-checks the
+   claim columns under its row lock.
+2. The caller sends the page.
+3. ``ack_sends`` — one UPDATE records each row's outcome (sent / bounced /
+   failed, again via ``CASE``) and clears the claim. The caller commits it
+   together with the page's analytics rows.
+
+Claims left behind by a crashed sender expire after ``stale_seconds`` and
+can then be claimed again.
+
+The subscriber model needs ``id``, ``send_claim_id`` and
+``send_claimed_at`` columns.
+"""
+import uuid
+from datetime import timedelta
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, case, or_, update
+
+from app import db
+from app.lib.time import utcnow_naive
+
+SEND_CLAIM_STALE_SECONDS = 30 * 60
+
+
+def new_send_id(prefix: str) -> str:
+    """Unique claim id for one send invocation, e.g. ``brief:42:<hex>``."""
+    return f"{prefix}:{uuid.uuid4().hex}"
+
+
+def per_row_value(id_column, values_by_id: Mapping[int, object]):
+    """SQL expression taking a different literal per row id (``CASE id WHEN ...``)."""
+    return case(dict(values_by_id), value=id_column)
+
+
+def claim_for_send(
+    model,
+    ids: Sequence[int],
+    send_id: str,
+    *,
+    eligible: Iterable = (),
+    values: Optional[Mapping] = None,
+    stale_seconds: int = SEND_CLAIM_STALE_SECONDS,
+) -> List:
+    """
+    Claim ``ids`` for ``send_id`` and return the claimed subscribers by id.
+
+    Only rows matching every ``eligible`` criterion and not already claimed
+    by a live send are claimed. ``values`` are extra ``{column: expression}``
+    SET clauses (token fills); they see the pre-update row. Commits, so
+    other senders see the claim immediately.
+    """
+    if not ids:
+        return []
+    now = utcnow_naive()
+    stmt = (
+        update(model)
+        .where(
+            model.id.in_(list(ids)),
+            or_(
+                model.send_claim_id.is_(None),
+                model.send_claimed_at < now - timedelta(seconds=stale_seconds),
+            ),
+            *eligible,
+        )
+        .values({
+            model.send_claim_id: send_id,
+            model.send_claimed_at: now,
+            **(values or {}),
+        })
+        .returning(model)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    claimed = sorted(db.session.scalars(stmt).all(), key=lambda row: row.id)
+    db.session.commit()
+    return claimed
+
+
+def ack_sends(
+    model,
+    send_id: str,
+    outcomes: Sequence[Tuple[Iterable[int], Mapping]],
+    *,
+    release_ids: Iterable[int] = (),
+) -> int:
+    """
+    Record send outcomes and release the claims in one UPDATE.
+
+    ``outcomes`` is ``[(ids, {column: value}), ...]``, e.g. the sent ids with
+    ``last_sent_at`` and the bounced ids with ``status``; ``release_ids``
+    are claimed rows that only need releasing (failed, skipped). Rows no
+    longer claimed by ``send_id`` are left alone. Does not commit. Returns
+    the number of rows updated.
+    """
+    whens: Dict = {}
+    all_ids = set(release_ids)
+    for ids, column_values in outcomes:
+        ids = list(ids)
+        if not ids:
+            continue
+        all_ids.update(ids)
+        for column, value in column_values.items():
+            whens.setdefault(column, []).append((model.id.in_(ids), value))
+    if not all_ids:
+        return 0
+
+    set_values = {model.send_claim_id: None, model.send_claimed_at: None}
+    for column, column_whens in whens.items():
+        set_values[column] = case(*column_whens, else_=column)
+    result = db.session.execute(
+        update(model)
+        .where(and_(model.id.in_(sorted(all_ids)), model.send_claim_id == send_id))
+        .values(set_values)
+        .execution_options(synchronize_session='fetch')
+    )
+    return result.rowcount or 0
+
+
+def release_claims(model, send_id: str) -> int:
+    """Release every claim held by ``send_id`` (after an aborted send). Commits."""
+    result = db.session.execute(
+        update(model)
+        .where(model.send_claim_id == send_id)
+        .values({model.send_claim_id: None, model.send_claimed_at: None})
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount or 0
@@ -7,13 +7,17 @@ libopenblas/libblas).  An [Errno 5] Input/output error at import time almost
 always means the dynamic linker found the .so file but could not read one of
 those transitive C dependencies — not a straightforward Python import failure.
 
-All consumers (clustering.py, consensus_engine.py, …) should import from here
-rather than importing sklearn directly inside functions, so the expensive
-import + native-lib check happens exactly once per process instead of on
-every scheduler tick or request handler invocation.
+All consumers (clustering.py, consensus_engine.py, …) should go through
+get_sklearn() rather than importing sklearn directly, so the expensive
+import + native-lib check happens at most once per process, and only in
+processes that actually cluster (not in every web worker at boot).
 """
 import ctypes
+import importlib.util
 import logging
+import threading
+from types import SimpleNamespace
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
@@ -42,8 +46,6 @@ def _try_load_native_lib(candidates: list) -> tuple:
     return False, None, last_err
 
 
-_NATIVE_LIBS_OK = True
-
 _NATIVE_LIB_GROUPS = [
     # OpenMP runtime — required by sklearn's parallel Cython extensions
     ["libgomp.so.1", "libgomp.so"],
@@ -51,57 +53,90 @@ _NATIVE_LIB_GROUPS = [
     ["libopenblas.so.0", "libopenblas.so", "libblas.so.3", "libblas.so"],
 ]
 
-for _candidates in _NATIVE_LIB_GROUPS:
-    _ok, _loaded, _err = _try_load_native_lib(_candidates)
-    if _ok:
-        logger.debug("Native library verified: %s", _loaded)
-    else:
-        logger.warning(
-            "Native library not loadable (%s): %s — sklearn C extensions may "
-            "fail with [Errno 5] Input/output error at import or call time.",
-            _candidates[0],
-            _err,
-        )
-        _NATIVE_LIBS_OK = False
+_native_libs_ok: Optional[bool] = None
+
+
+def native_libs_ok() -> bool:
+    """Probe the native libraries once per process (cheap: ctypes only)."""
+    global _native_libs_ok
+    if _native_libs_ok is None:
+        ok = True
+        for candidates in _NATIVE_LIB_GROUPS:
+            loaded_ok, loaded, err = _try_load_native_lib(candidates)
+            if loaded_ok:
+                logger.debug("Native library verified: %s", loaded)
+            else:
+                logger.warning(
+                    "Native library not loadable (%s): %s — sklearn C extensions may "
+                    "fail with [Errno 5] Input/output error at import or call time.",
+                    candidates[0],
+                    err,
+                )
+                ok = False
+        _native_libs_ok = ok
+    return _native_libs_ok
 
 
 # ---------------------------------------------------------------------------
-# 2. Module-level sklearn import (runs once per process)
+# 2. Lazy sklearn import (runs once per process, on first use)
+# ---------------------------------------------------------------------------
+# Importing sklearn pulls in scipy and takes well over a second. Web workers
+# never cluster, so the import is deferred until a clustering caller asks
+# for it via get_sklearn().
 # ---------------------------------------------------------------------------
 
-SKLEARN_AVAILABLE: bool = False
+_UNSET = object()
+_sklearn = _UNSET
+_sklearn_lock = threading.Lock()
 
-cosine_similarity = None
-AgglomerativeClustering = None
-KMeans = None
-PCA = None
-silhouette_score = None
 
-try:
-    from sklearn.metrics.pairwise import cosine_similarity as _cosine_similarity
-    from sklearn.cluster import AgglomerativeClustering as _AgglomerativeClustering
-    from sklearn.cluster import KMeans as _KMeans
-    from sklearn.decomposition import PCA as _PCA
-    from sklearn.metrics import silhouette_score as _silhouette_score
+def get_sklearn() -> Optional[SimpleNamespace]:
+    """
+    Return the sklearn entry points used by the app, importing on first call.
 
-    cosine_similarity = _cosine_similarity
-    AgglomerativeClustering = _AgglomerativeClustering
-    KMeans = _KMeans
-    PCA = _PCA
-    silhouette_score = _silhouette_score
+    The namespace has ``cosine_similarity``, ``AgglomerativeClustering``,
+    ``KMeans``, ``PCA`` and ``silhouette_score``. Returns None when sklearn
+    cannot be imported; callers then use their numpy fallbacks.
+    """
+    global _sklearn
+    if _sklearn is _UNSET:
+        with _sklearn_lock:
+            if _sklearn is _UNSET:
+                _sklearn = _import_sklearn()
+    return _sklearn
+
+
+def _import_sklearn() -> Optional[SimpleNamespace]:
+    native_libs_ok()
+    try:
+        from sklearn.metrics.pairwise import cosine_similarity
+        from sklearn.cluster import AgglomerativeClustering
+        from sklearn.cluster import KMeans
+        from sklearn.decomposition import PCA
+        from sklearn.metrics import silhouette_score
+    except (OSError, ImportError) as sklearn_err:
+        logger.warning(
+            "scikit-learn unavailable (%s: %s). "
+            "All clustering and PCA operations will use numpy fallback implementations.",
+            type(sklearn_err).__name__,
+            sklearn_err,
+        )
+        return None
 
-    SKLEARN_AVAILABLE = True
     logger.info("scikit-learn imported successfully.")
-
-except (OSError, ImportError) as _sklearn_err:
-    logger.warning(
-        "scikit-learn unavailable at import time (%s: %s). "
-        "All clustering and PCA operations will use numpy fallback implementations.",
-        type(_sklearn_err).__name__,
-        _sklearn_err,
+    return SimpleNamespace(
+        cosine_similarity=cosine_similarity,
+        AgglomerativeClustering=AgglomerativeClustering,
+        KMeans=KMeans,
+        PCA=PCA,
+        silhouette_score=silhouette_score,
     )
 
 
+def sklearn_available() -> bool:
+    return get_sklearn() is not None
+
+
 # ---------------------------------------------------------------------------
 # 3. Startup health-check helper
 # ---------------------------------------------------------------------------
@@ -111,8 +146,15 @@ def check_sklearn_health() -> dict:
     Return a summary dict of sklearn and native-library availability.
     Intended to be called once from create_app() so issues surface immediately
     at startup rather than silently at the first scheduler tick.
+
+    Does not import sklearn: ``sklearn_available`` reports whether it is
+    installed (or, once something has imported it, whether that worked).
     """
+    if _sklearn is _UNSET:
+        available = importlib.util.find_spec("sklearn") is not None
+    else:
+        available = _sklearn is not None
     return {
-        "sklearn_available": SKLEARN_AVAILABLE,
-        "native_libs_ok": _NATIVE_LIBS_OK,
+        "sklearn_available": available,
+        "native_libs_ok": native_libs_ok(),
     }
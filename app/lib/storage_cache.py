@@ -0,0 +1,268 @@
+"""
+Read-through local disk cache for serving object-storage files.
+
+Brief audio, profile images, static assets and programme exports all live
+in Replit/S3 object storage, and their routes used to download the whole
+object into memory on every request and return it with no validator.
+Audio players issue a stream of Range requests per listen and avatars
+appear on every discussion page, so the same objects were fetched over
+and over.
+
+``serve_cached(key, fetch, ...)`` serves ``key`` from a file under
+``STORAGE_CACHE_DIR``, filling it from ``fetch()`` (bytes, or None when the
+object does not exist) on a miss:
+
+- the response streams the cached file via ``send_file`` (the WSGI file
+  wrapper, so gunicorn can ``sendfile`` it) with ``conditional=True``,
+  which answers ``If-None-Match`` with 304 and ``Range`` with 206;
+- the ETag is strong: the SHA-256 of the content, computed at fill and
+  re-derived from the file after a restart;
+- the cache is size-bounded (``STORAGE_CACHE_MAX_BYTES``) and evicts least
+  recently served files first. A hit sets the file's atime; its mtime
+  stays the fill time, which ``ttl_seconds`` is checked against for keys
+  that can change in place.
+
+Fills write a temp file and ``os.replace`` it, so concurrent workers on a
+host share the directory safely. If the disk cache cannot be written the
+object is served from memory with the same headers.
+
+Counters (``cache_stats()``) are per process and report the hit rate and
+body bytes served from cache vs fetched from origin.
+"""
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from flask import send_file
+
+logger = logging.getLogger(__name__)
+
+STORAGE_CACHE_DIR = os.getenv(
+    'STORAGE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'societyspeaks-storage-cache')
+)
+try:
+    STORAGE_CACHE_MAX_BYTES = int(os.getenv('STORAGE_CACHE_MAX_BYTES', str(1024 * 1024 * 1024)))
+except ValueError:
+    STORAGE_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+# Eviction trims down to this fraction of the cap so it does not run on every fill.
+_EVICT_TO_FRACTION = 0.9
+# Fills between full directory scans; other workers on the host fill too.
+_RESCAN_EVERY_FILLS = 50
+
+_lock = threading.Lock()
+_stats = {
+    'hits': 0,
+    'misses': 0,
+    'not_found': 0,
+    'not_modified': 0,
+    'bytes_from_cache': 0,
+    'bytes_from_origin': 0,
+    'fill_errors': 0,
+    'evictions': 0,
+}
+_size_estimate: Optional[int] = None
+_fills_since_scan = 0
+# path -> (mtime_ns, size, etag); avoids re-hashing files on every hit.
+_etags: Dict[str, Tuple[int, int, str]] = {}
+
+
+def _path_for(key: str) -> str:
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+    return os.path.join(STORAGE_CACHE_DIR, digest[:2], digest)
+
+
+def _content_etag(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def _file_etag(path: str, st: os.stat_result) -> str:
+    memo = _etags.get(path)
+    if memo and memo[0] == st.st_mtime_ns and memo[1] == st.st_size:
+        return memo[2]
+    with open(path, 'rb') as handle:
+        etag = hashlib.file_digest(handle, 'sha256').hexdigest()[:32]
+    _etags[path] = (st.st_mtime_ns, st.st_size, etag)
+    return etag
+
+
+def _count(**deltas) -> None:
+    with _lock:
+        for name, value in deltas.items():
+            _stats[name] += value
+
+
+def cache_stats() -> Dict[str, float]:
+    """Snapshot of this process's cache counters, plus ``hit_rate``."""
+    with _lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+    return stats
+
+
+def _lookup(path: str, ttl_seconds: Optional[int]) -> Optional[Tuple[str, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    now = time.time()
+    if ttl_seconds is not None and now - st.st_mtime > ttl_seconds:
+        return None
+    try:
+        etag = _file_etag(path, st)
+        os.utime(path, (now, st.st_mtime))
+    except FileNotFoundError:  # evicted by another worker meanwhile
+        return None
+    return etag, st.st_size
+
+
+def _fill(path: str, data: bytes, etag: str) -> bool:
+    global _size_estimate, _fills_since_scan
+    tmp_path = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.fill-')
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+        st = os.stat(path)
+    except OSError as e:
+        logger.warning(f"Storage cache fill failed for {path}: {e}")
+        _count(fill_errors=1)
+        if tmp_path:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+        return False
+    _etags[path] = (st.st_mtime_ns, st.st_size, etag)
+
+    with _lock:
+        _fills_since_scan += 1
+        if _size_estimate is not None:
+            _size_estimate += len(data)
+        needs_scan = (
+            _size_estimate is None
+            or _size_estimate > STORAGE_CACHE_MAX_BYTES
+            or _fills_since_scan >= _RESCAN_EVERY_FILLS
+        )
+    if needs_scan:
+        _evict()
+    return True
+
+
+def _evict() -> None:
+    """Rescan the cache directory and drop least recently served files over the cap."""
+    global _size_estimate, _fills_since_scan
+    entries = []
+    total = 0
+    for root, _dirs, files in os.walk(STORAGE_CACHE_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if name.startswith('.fill-') and time.time() - st.st_mtime < 3600:
+                continue  # another worker's fill in progress
+            entries.append((st.st_atime, st.st_size, path))
+            total += st.st_size
+
+    evicted = 0
+    if total > STORAGE_CACHE_MAX_BYTES:
+        target = int(STORAGE_CACHE_MAX_BYTES * _EVICT_TO_FRACTION)
+        for _atime, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            _etags.pop(path, None)
+            total -= size
+            evicted += 1
+
+    with _lock:
+        _size_estimate = total
+        _fills_since_scan = 0
+        _stats['evictions'] += evicted
+
+
+def invalidate(key: str) -> None:
+    """Drop ``key`` from this host's cache (call after deleting or replacing the object)."""
+    path = _path_for(key)
+    _etags.pop(path, None)
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Storage cache invalidate failed for {key}: {e}")
+
+
+def serve_cached(
+    key: str,
+    fetch: Callable[[], Optional[bytes]],
+    *,
+    mimetype: str,
+    download_name: str,
+    as_attachment: bool = False,
+    cache_control: Optional[str] = None,
+    ttl_seconds: Optional[int] = None,
+):
+    """
+    Response serving object ``key``, or None when ``fetch()`` finds nothing.
+
+    ``fetch`` is only called on a miss; exceptions it raises propagate.
+    ``download_name`` goes in Content-Disposition (the cached file's own
+    name is a hash).
+    ``ttl_seconds`` bounds how long a cached copy is trusted (None: the
+    object under ``key`` never changes). ``cache_control`` sets the
+    response's Cache-Control header.
+    """
+    path = _path_for(key)
+    cached = _lookup(path, ttl_seconds)
+    if cached is not None:
+        etag, _size = cached
+        response = _send(path, etag, mimetype, download_name, as_attachment, cache_control)
+        _count(hits=1, bytes_from_cache=_body_bytes(response))
+        return response
+
+    data = fetch()
+    if not data:
+        _count(not_found=1)
+        return None
+    etag = _content_etag(data)
+    _count(misses=1, bytes_from_origin=len(data))
+    source = path if _fill(path, data, etag) else io.BytesIO(data)
+    return _send(source, etag, mimetype, download_name, as_attachment, cache_control)
+
+
+def _send(source, etag, mimetype, download_name, as_attachment, cache_control):
+    from flask import request
+
+    response = send_file(
+        source,
+        mimetype=mimetype,
+        as_attachment=as_attachment,
+        download_name=download_name,
+        conditional=True,
+        etag=etag,
+        max_age=None,
+    )
+    if cache_control:
+        response.headers['Cache-Control'] = cache_control
+    if response.status_code == 304 and request.if_none_match:
+        _count(not_modified=1)
+    return response
+
+
+def _body_bytes(response) -> int:
+    if response.status_code == 304:
+        return 0
+    return response.content_length or 0
@@ -0,0 +1,313 @@
+"""
+Full-text search over discussions and statements.
+
+Replaces leading-wildcard ``ILIKE '%term%'`` filters (which can never use an
+index) with the database's own text search:
+
+* **PostgreSQL** — GIN expression indexes over ``to_tsvector('simple', ...)``
+  (migration ``perf006``). The indexes are maintained by Postgres on every
+  insert/update, so search is in sync the moment a row commits. Matches are
+  ranked with ``ts_rank``; discussion titles weigh more than descriptions.
+* **SQLite** (tests / local dev) — FTS5 external-content tables kept in sync
+  by triggers, installed with the schema (``install_sqlite_fts``) and ranked
+  with ``bm25``.
+
+Both backends also match machine translations (``StatementTranslation`` /
+``DiscussionTranslation``), so a search in a reader's language finds the
+canonical row. Any other backend, or SQLite built without FTS5, falls back to
+the old ``ILIKE`` filters.
+
+The ``'simple'`` configuration is used deliberately: content is multilingual,
+so no language-specific stemming; terms match as word prefixes.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import weakref
+from typing import List, Optional
+
+from sqlalchemy import func, literal, literal_column, or_, select, table, text, union
+
+from app import db
+
+logger = logging.getLogger(__name__)
+
+MAX_SEARCH_TERMS = 8
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+# Postgres vector expressions; must stay identical to the index expressions
+# created in migrations/versions/perf006_full_text_search_indexes.py.
+_PG_CONFIG = "'simple'::regconfig"
+_PG_STATEMENT_VECTOR = f"to_tsvector({_PG_CONFIG}, statement.content)"
+_PG_STATEMENT_TRANSLATION_VECTOR = f"to_tsvector({_PG_CONFIG}, statement_translation.content)"
+_PG_DISCUSSION_VECTOR = (
+    f"(setweight(to_tsvector({_PG_CONFIG}, coalesce(discussion.title, '')), 'A') || "
+    f"setweight(to_tsvector({_PG_CONFIG}, coalesce(discussion.description, '')), 'B'))"
+)
+_PG_DISCUSSION_KEYWORDS_VECTOR = f"to_tsvector({_PG_CONFIG}, coalesce(discussion.keywords, ''))"
+_PG_DISCUSSION_TRANSLATION_VECTOR = (
+    f"to_tsvector({_PG_CONFIG}, coalesce(discussion_translation.title, '') || ' ' || "
+    f"coalesce(discussion_translation.description, ''))"
+)
+
+# SQLite FTS5 tables: fts table -> (source table, indexed columns).
+SQLITE_FTS_TABLES = {
+    'statement_fts': ('statement', ('content',)),
+    'statement_translation_fts': ('statement_translation', ('content',)),
+    'discussion_fts': ('discussion', ('title', 'description', 'keywords')),
+    'discussion_translation_fts': ('discussion_translation', ('title', 'description')),
+}
+# bm25 column weights for discussion_fts (title, description, keywords).
+_SQLITE_DISCUSSION_WEIGHTS = (10.0, 4.0, 2.0)
+
+_sqlite_fts_engines = weakref.WeakSet()
+
+
+def search_terms(raw: Optional[str]) -> List[str]:
+    """Lower-cased word tokens from user input, capped at ``MAX_SEARCH_TERMS``."""
+    return _WORD_RE.findall((raw or '').lower())[:MAX_SEARCH_TERMS]
+
+
+def _pg_tsquery(terms: List[str]):
+    # Tokens are \w+ only, so they are safe inside to_tsquery syntax.
+    return func.to_tsquery(literal_column(_PG_CONFIG), ' & '.join(f"{t}:*" for t in terms))
+
+
+def _fts5_query(terms: List[str], columns: Optional[tuple] = None) -> str:
+    expr = ' '.join(f'"{t}"*' for t in terms)
+    if columns:
+        return f"{{{' '.join(columns)}}} : ({expr})"
+    return expr
+
+
+def _sqlite_fts_ready(bind) -> bool:
+    engine = getattr(bind, 'engine', bind)
+    if engine in _sqlite_fts_engines:
+        return True
+    present = db.session.execute(text(
+        "SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = 'statement_fts'"
+    )).scalar()
+    if present:
+        _sqlite_fts_engines.add(engine)
+    return bool(present)
+
+
+def search_backend() -> str:
+    """``'postgresql'``, ``'sqlite'`` (FTS5) or ``'like'`` for the current bind."""
+    bind = db.session.get_bind()
+    dialect_name = bind.dialect.name if bind else ''
+    if dialect_name == 'postgresql':
+        return 'postgresql'
+    if dialect_name == 'sqlite':
+        try:
+            if _sqlite_fts_ready(bind):
+                return 'sqlite'
+        except Exception:
+            logger.debug("SQLite FTS5 probe failed; using ILIKE search", exc_info=True)
+    return 'like'
+
+
+def _fts_rowids(fts_table: str, match: str):
+    fts = literal_column(fts_table)
+    return select(literal_column('rowid')).select_from(table(fts_table)).where(fts.op('MATCH')(match))
+
+
+def _fts_rank(fts_table: str, match: str, rowid_col, weights: tuple = ()):
+    fts = literal_column(fts_table)
+    return select(-func.bm25(fts, *weights)).select_from(table(fts_table)).where(
+        fts.op('MATCH')(match),
+        literal_column(f'{fts_table}.rowid') == rowid_col,
+    ).scalar_subquery()
+
+
+def statement_search(term: Optional[str]):
+    """
+    ``(condition, rank)`` for statements matching ``term``, or None when the
+    term has no searchable words. ``rank`` is higher for better matches.
+    """
+    from app.models import Statement, StatementTranslation
+
+    terms = search_terms(term)
+    if not terms:
+        return None
+    backend = search_backend()
+
+    if backend == 'postgresql':
+        tsquery = _pg_tsquery(terms)
+        vector = literal_column(_PG_STATEMENT_VECTOR)
+        # One id set from two index scans. ``vector @@ q OR id IN (...)`` would
+        # stop the planner using the GIN index on the first arm and compute
+        # to_tsvector for every statement instead.
+        matched = union(
+            select(Statement.id).where(vector.op('@@')(tsquery)),
+            select(StatementTranslation.statement_id).where(
+                literal_column(_PG_STATEMENT_TRANSLATION_VECTOR).op('@@')(tsquery)
+            ),
+        )
+        return Statement.id.in_(matched), func.ts_rank(vector, tsquery)
+
+    if backend == 'sqlite':
+        match = _fts5_query(terms)
+        matched = union(
+            _fts_rowids('statement_fts', match),
+            select(StatementTranslation.statement_id).where(
+                StatementTranslation.id.in_(_fts_rowids('statement_translation_fts', match))
+            ),
+        )
+        return Statement.id.in_(matched), func.coalesce(_fts_rank('statement_fts', match, Statement.id), 0)
+
+    cleaned = (term or '').strip()
+    return Statement.content.ilike(f"%{cleaned}%"), literal(0)
+
+
+def discussion_search(term: Optional[str]):
+    """``(condition, rank)`` for discussions whose title/description match ``term``."""
+    from app.models import Discussion, DiscussionTranslation
+
+    terms = search_terms(term)
+    if not terms:
+        return None
+    backend = search_backend()
+
+    if backend == 'postgresql':
+        tsquery = _pg_tsquery(terms)
+        vector = literal_column(_PG_DISCUSSION_VECTOR)
+        # Same single id set as statement_search, so both GIN indexes are used.
+        matched = union(
+            select(Discussion.id).where(vector.op('@@')(tsquery)),
+            select(DiscussionTranslation.discussion_id).where(
+                literal_column(_PG_DISCUSSION_TRANSLATION_VECTOR).op('@@')(tsquery)
+            ),
+        )
+        return Discussion.id.in_(matched), func.ts_rank(vector, tsquery)
+
+    if backend == 'sqlite':
+        match = _fts5_query(terms, ('title', 'description'))
+        matched = union(
+            _fts_rowids('discussion_fts', match),
+            select(DiscussionTranslation.discussion_id).where(
+                DiscussionTranslation.id.in_(_fts_rowids('discussion_translation_fts', _fts5_query(terms)))
+            ),
+        )
+        rank = _fts_rank('discussion_fts', match, Discussion.id, _SQLITE_DISCUSSION_WEIGHTS)
+        return Discussion.id.in_(matched), func.coalesce(rank, 0)
+
+    cleaned = (term or '').strip()
+    return or_(
+        Discussion.title.ilike(f"%{cleaned}%"),
+        Discussion.description.ilike(f"%{cleaned}%"),
+    ), literal(0)
+
+
+def discussion_keywords_condition(keywords: Optional[str]):
+    """Filter clause for the separate ``keywords`` search field, or None."""
+    from app.models import Discussion
+
+    terms = search_terms(keywords)
+    if not terms:
+        return None
+    backend = search_backend()
+    if backend == 'postgresql':
+        return literal_column(_PG_DISCUSSION_KEYWORDS_VECTOR).op('@@')(_pg_tsquery(terms))
+    if backend == 'sqlite':
+        return Discussion.id.in_(_fts_rowids('discussion_fts', _fts5_query(terms, ('keywords',))))
+    return Discussion.keywords.ilike(f"%{(keywords or '').strip()}%")
+
+
+def apply_statement_search(query, term, order_by_rank=False):
+    """Filter a ``Statement`` query by ``term``; optionally order best match first."""
+    from app.models import Statement
+
+    found = statement_search(term)
+    if found is None:
+        return query
+    condition, rank = found
+    query = query.filter(condition)
+    if order_by_rank:
+        query = query.order_by(rank.desc(), Statement.id.desc())
+    return query
+
+
+def apply_discussion_search(query, term, order_by_rank=False):
+    """Filter a ``Discussion`` query by ``term``; optionally order best match first."""
+    from app.models import Discussion
+
+    found = discussion_search(term)
+    if found is None:
+        return query
+    condition, rank = found
+    query = query.filter(condition)
+    if order_by_rank:
+        query = query.order_by(rank.desc(), Discussion.created_at.desc())
+    return query
+
+
+# ---------------------------------------------------------------------------
+# SQLite FTS5 schema (tests / local dev). Postgres indexes live in migrations.
+# ---------------------------------------------------------------------------
+
+def _sqlite_fts_ddl() -> List[str]:
+    statements = []
+    for fts_table, (source, columns) in SQLITE_FTS_TABLES.items():
+        cols = ', '.join(columns)
+        new_vals = ', '.join(f'new.{c}' for c in columns)
+        old_vals = ', '.join(f'old.{c}' for c in columns)
+        statements += [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+            f"{cols}, content='{source}', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {source} BEGIN "
+            f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_vals}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {source} BEGIN "
+            f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_vals}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {cols} ON {source} BEGIN "
+            f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_vals}); "
+            f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_vals}); END",
+        ]
+    return statements
+
+
+def install_sqlite_fts(connection, rebuild=False) -> bool:
+    """
+    Create the FTS5 tables and sync triggers on a SQLite connection.
+
+    ``rebuild`` re-indexes existing rows (needed when tables predate FTS).
+    Returns False when the SQLite build has no FTS5; search then uses ILIKE.
+    """
+    if connection.dialect.name != 'sqlite':
+        return False
+    try:
+        for ddl in _sqlite_fts_ddl():
+            connection.exec_driver_sql(ddl)
+    except Exception as e:
+        logger.warning(f"SQLite FTS5 unavailable, search falls back to ILIKE: {e}")
+        return False
+    if rebuild:
+        for fts_table in SQLITE_FTS_TABLES:
+            connection.exec_driver_sql(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+    return True
+
+
+def drop_sqlite_fts(connection) -> None:
+    if connection.dialect.name != 'sqlite':
+        return
+    for fts_table in SQLITE_FTS_TABLES:
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {fts_table}")
+
+
+def _install_after_create(target, connection, **kw):
+    install_sqlite_fts(connection)
+
+
+def _drop_before_drop(target, connection, **kw):
+    drop_sqlite_fts(connection)
+
+
+def register_sqlite_fts(metadata) -> None:
+    """Hook FTS5 install/teardown onto ``metadata.create_all`` / ``drop_all``."""
+    from sqlalchemy import event
+
+    event.listen(metadata, 'after_create', _install_after_create)
+    event.listen(metadata, 'before_drop', _drop_before_drop)
@@ -23,14 +23,19 @@ from app.models._base import generate_slug, generate_unique_slug  # noqa: F401
 
 from app.models.polymarket import PolymarketMarket, TopicMarketMatch  # noqa: F401
 from app.models.billing import PricingPlan, Subscription, Donation  # noqa: F401
-from app.models.email import EmailEvent, BriefEmailEvent  # noqa: F401
-from app.models.analytics import AnalyticsEvent, AnalyticsDailyAggregate  # noqa: F401
+from app.models.email import EmailEvent, BriefEmailEvent, EmailEventHourlyRollup, EmailRecipientEngagement  # noqa: F401
+from app.models.analytics import (  # noqa: F401
+    AnalyticsEvent,
+    AnalyticsDailyAggregate,
+    AnalyticsRollupState,
+    ProgrammeVoteDailyRollup,
+)
 from app.models.translations import (  # noqa: F401
     StatementTranslation,
     DiscussionTranslation,
     ProgrammeTranslation,
 )
-from app.models.consensus import ConsensusAnalysis, ConsensusJob  # noqa: F401
+from app.models.consensus import ConsensusAnalysis, ConsensusAnalysisParticipants, ConsensusJob  # noqa: F401
 from app.models.admin import AdminAuditEvent, AdminSettings  # noqa: F401
 from app.models.briefing import (  # noqa: F401
     BriefTemplate,
@@ -61,6 +66,7 @@ from app.models.daily_question import (  # noqa: F401
     DailyQuestionResponseFlag,
     DailyQuestionSubscriber,
     DailyQuestionSelection,
+    DailyQuestionSendRun,
 )
 from app.models.trending import (  # noqa: F401
     TrendingTopic,
@@ -100,6 +106,7 @@ from app.models.discussions import (  # noqa: F401
     Discussion,
     Statement,
     StatementVote,
+    DiscussionStats,
     Response,
     Evidence,
     JourneyReminderSubscription,
@@ -108,6 +115,7 @@ from app.models.discussions import (  # noqa: F401
 from app.models.users import User, UserAPIKey  # noqa: F401
 from app.models.game import (  # noqa: F401
     GameChallenge,
+    GameDailyChoiceTally,
     GameDailySchedule,
     GameReminderSubscription,
     GameRun,
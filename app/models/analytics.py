@@ -6,6 +6,9 @@ the pre-aggregated dashboard view. Moved here from app/models.py as
 part of the models-split refactor. All foreign keys (User, Programme,
 Discussion, Statement) are plain table-name strings, so this submodule
 has no cross-submodule imports.
+
+ProgrammeVoteDailyRollup holds the programme vote trends, so the NSP
+dashboard never scans statement_vote.
 """
 
 from app import db
@@ -69,4 +72,53 @@ class AnalyticsDailyAggregate(db.Model):
 
     event_count = db.Column(db.Integer, nullable=False, default=0)
     unique_users = db.Column(db.Integer, nullable=False, default=0)
+    # HyperLogLog sketch of user_ids behind unique_users (app.lib.hyperloglog),
+    # so incremental rollups can merge new events without rescanning old ones.
+    unique_users_sketch = db.Column(db.LargeBinary, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow_naive, onupdate=utcnow_naive)
+
+
+class AnalyticsRollupState(db.Model):
+    """High-water mark for an incremental rollup over an append-only table.
+
+    ``last_event_id`` is the highest source row id already folded into the
+    rollup named ``name``. Rollups lock their row FOR UPDATE, which also
+    serialises incremental and full-rebuild runs of the same rollup.
+    """
+    __tablename__ = 'analytics_rollup_state'
+
+    name = db.Column(db.String(64), primary_key=True)
+    last_event_id = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow_naive, onupdate=utcnow_naive)
+
+
+class ProgrammeVoteDailyRollup(db.Model):
+    """Per-discussion daily vote counts backing the NSP dashboard vote trends.
+
+    One row per (vote_date, discussion, vote, confidence) holding the number of
+    published votes whose latest change fell on that date. Maintained with
+    +1/-1 deltas on the vote write path and rebuilt exactly per programme by
+    ``reconcile_programme_vote_rollups``. ``confidence`` is 0 when the vote
+    carried none, so the unique key never contains NULLs.
+    """
+    __tablename__ = 'programme_vote_daily_rollup'
+    __table_args__ = (
+        db.Index('idx_programme_vote_rollup_programme_date', 'programme_id', 'vote_date'),
+        db.UniqueConstraint(
+            'vote_date',
+            'discussion_id',
+            'vote',
+            'confidence',
+            name='uq_programme_vote_rollup_dims'
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    vote_date = db.Column(db.Date, nullable=False)
+    programme_id = db.Column(db.Integer, db.ForeignKey('programme.id', ondelete='CASCADE'), nullable=False)
+    discussion_id = db.Column(db.Integer, db.ForeignKey('discussion.id', ondelete='CASCADE'), nullable=False)
+    vote = db.Column(db.SmallInteger, nullable=False)
+    confidence = db.Column(db.SmallInteger, nullable=False, default=0)
+
+    vote_count = db.Column(db.Integer, nullable=False, default=0)
     updated_at = db.Column(db.DateTime, nullable=False, default=utcnow_naive, onupdate=utcnow_naive)
@@ -2,11 +2,18 @@
 Consensus clustering models.
 
 ConsensusAnalysis caches clustering results (like pol.is's math_main).
-ConsensusJob is the persisted queue item that drives the clustering
-workers. Moved here from app/models.py as part of the models-split
-refactor. Related models (Discussion, User) use string references.
+ConsensusAnalysisParticipants holds the per-participant arrays (cluster
+labels, PCA coordinates) for one analysis, stored compressed and loaded
+only by the endpoints that plot individual participants. ConsensusJob
+is the persisted queue item that drives the clustering workers. Moved
+here from app/models.py as part of the models-split refactor. Related
+models (Discussion, User) use string references.
 """
 
+import json
+import sys
+import zlib
+from array import array
 from datetime import timedelta
 
 from sqlalchemy.ext.mutable import MutableDict
@@ -27,7 +34,10 @@ class ConsensusAnalysis(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     discussion_id = db.Column(db.Integer, db.ForeignKey('discussion.id'), nullable=False)
 
-    # Clustering results stored as JSON. Wrapped in MutableDict so in-place
+    # Clustering summary stored as JSON: consensus/bridge/divisive lists,
+    # representative statements, cluster_sizes and metadata. Per-participant
+    # arrays live in ``participants`` (older rows may still carry
+    # cluster_assignments/pca_coordinates inline). Wrapped in MutableDict so in-place
     # mutations (e.g. `analysis.cluster_data['ai_summary'] = ...`) are
     # flagged dirty and persisted on commit — otherwise SQLAlchemy sees
     # the same Python object reference and skips the UPDATE.
@@ -44,6 +54,96 @@ class ConsensusAnalysis(db.Model):
 
     # Relationships
     discussion = db.relationship('Discussion', backref='consensus_analyses')
+    participants = db.relationship(
+        'ConsensusAnalysisParticipants',
+        uselist=False,
+        lazy='select',
+        cascade='all, delete-orphan',
+        passive_deletes=True,
+    )
+
+    def cluster_sizes(self):
+        """Participants per cluster id (string keys), without loading participants."""
+        data = self.cluster_data or {}
+        if 'cluster_sizes' in data:
+            return data['cluster_sizes']
+        sizes = {}
+        for cluster_id in (data.get('cluster_assignments') or {}).values():
+            sizes[str(cluster_id)] = sizes.get(str(cluster_id), 0) + 1
+        return sizes
+
+    def participant_arrays(self):
+        """
+        ``(cluster_assignments, pca_coordinates)`` keyed by participant id.
+
+        Loads and decodes the separate participants row; analyses written
+        before the split fall back to the inline JSON.
+        """
+        if self.participants is not None:
+            return self.participants.decode()
+        data = self.cluster_data or {}
+        return data.get('cluster_assignments', {}), data.get('pca_coordinates', {})
+
+
+class ConsensusAnalysisParticipants(db.Model):
+    """
+    Per-participant clustering output for one ConsensusAnalysis.
+
+    Stored as parallel zlib-compressed arrays — a JSON list of participant ids,
+    int32 cluster labels and float32 (x, y) pairs — rather than JSON objects,
+    which for large discussions were most of the analysis payload.
+    """
+    __tablename__ = 'consensus_analysis_participants'
+
+    analysis_id = db.Column(
+        db.Integer,
+        db.ForeignKey('consensus_analysis.id', ondelete='CASCADE'),
+        primary_key=True,
+    )
+    participant_count = db.Column(db.Integer, nullable=False, default=0)
+    participant_ids = db.Column(db.LargeBinary, nullable=False)
+    cluster_labels = db.Column(db.LargeBinary, nullable=False)
+    coordinates = db.Column(db.LargeBinary, nullable=False)
+    created_at = db.Column(db.DateTime, default=utcnow_naive)
+
+    @staticmethod
+    def _pack(typecode, values):
+        packed = array(typecode, values)
+        if sys.byteorder == 'big':
+            packed.byteswap()
+        return zlib.compress(packed.tobytes())
+
+    @staticmethod
+    def _unpack(typecode, blob):
+        unpacked = array(typecode)
+        unpacked.frombytes(zlib.decompress(blob))
+        if sys.byteorder == 'big':
+            unpacked.byteswap()
+        return unpacked
+
+    @classmethod
+    def from_results(cls, cluster_assignments, pca_coordinates):
+        """Encode engine output dicts; participant order follows cluster_assignments."""
+        ids = [str(pid) for pid in cluster_assignments]
+        coords = []
+        for pid in cluster_assignments:
+            x, y = pca_coordinates.get(pid) or pca_coordinates.get(str(pid)) or (0.0, 0.0)
+            coords.extend((float(x), float(y)))
+        return cls(
+            participant_count=len(ids),
+            participant_ids=zlib.compress(json.dumps(ids).encode('utf-8')),
+            cluster_labels=cls._pack('i', (int(c) for c in cluster_assignments.values())),
+            coordinates=cls._pack('f', coords),
+        )
+
+    def decode(self):
+        """Inverse of ``from_results``: ``(cluster_assignments, pca_coordinates)``."""
+        ids = json.loads(zlib.decompress(self.participant_ids))
+        labels = self._unpack('i', self.cluster_labels)
+        coords = self._unpack('f', self.coordinates)
+        assignments = dict(zip(ids, labels))
+        positions = {pid: (coords[2 * i], coords[2 * i + 1]) for i, pid in enumerate(ids)}
+        return assignments, positions
 
 
 class ConsensusJob(db.Model):
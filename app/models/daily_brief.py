@@ -503,6 +503,10 @@ class DailyBriefSubscriber(db.Model):
     total_briefs_received = db.Column(db.Integer, default=0)
     welcome_email_sent_at = db.Column(db.DateTime)  # Prevents duplicate welcome emails
 
+    # In-flight send claim (app/lib/send_claims.py); cleared when the send is acknowledged
+    send_claim_id = db.Column(db.String(64), nullable=True)
+    send_claimed_at = db.Column(db.DateTime, nullable=True)
+
     # Email analytics
     total_opens = db.Column(db.Integer, default=0)
     total_clicks = db.Column(db.Integer, default=0)
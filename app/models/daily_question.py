@@ -12,6 +12,8 @@ signed-token auth, timezone-aware weekly/monthly digest scheduling,
 and participation streaks.
 DailyQuestionSelection — history of content used as question source to
 prevent near-term repetition.
+DailyQuestionSendRun — resumable checkpoint and lease for the daily
+question email send.
 
 Moved here from app/models.py as part of the models-split refactor.
 Cross-domain relationships (User, Discussion, Statement, TrendingTopic)
@@ -417,6 +419,8 @@ class DailyQuestionSubscriber(db.Model):
         db.Index('idx_dqs_token', 'magic_token'),
         db.Index('idx_dqs_unsubscribe_token', 'unsubscribe_token'),
         db.Index('idx_dqs_frequency', 'email_frequency', 'is_active'),
+        # Keyset walk of the daily send: WHERE frequency/active AND id > :last ORDER BY id
+        db.Index('idx_dqs_frequency_active_id', 'email_frequency', 'is_active', 'id'),
         db.Index('idx_dqs_send_day', 'preferred_send_day', 'is_active'),
     )
 
@@ -451,6 +455,10 @@ class DailyQuestionSubscriber(db.Model):
     preferred_send_hour = db.Column(db.Integer, default=9, nullable=False)  # 0-23, default 9am
     timezone = db.Column(db.String(50), nullable=True)  # e.g., 'Europe/London', 'America/New_York'
 
+    # In-flight send claim (app/lib/send_claims.py); cleared when the send is acknowledged
+    send_claim_id = db.Column(db.String(64), nullable=True)
+    send_claimed_at = db.Column(db.DateTime, nullable=True)
+
     user = db.relationship('User', backref='daily_subscription')
 
     def generate_magic_token(self, expires_hours=48):
@@ -804,3 +812,46 @@ class DailyQuestionSelection(db.Model):
             query = query.filter(DailyQuestionSelection.source_trending_topic_id == source_id)
 
         return query.first() is not None
+
+
+class DailyQuestionSendRun(db.Model):
+    """
+    Checkpoint for one daily question email send.
+
+    The sender walks subscribers in id order and records the last id it
+    finished after each page, so a send interrupted by a restart resumes
+    where it stopped rather than from the top. ``lease_owner`` /
+    ``lease_expires_at`` make the run exclusive across workers: a worker
+    only sends while it holds an unexpired lease, and any worker may take
+    over once the lease lapses.
+    """
+    __tablename__ = 'daily_question_send_run'
+
+    id = db.Column(db.Integer, primary_key=True)
+    daily_question_id = db.Column(
+        db.Integer, db.ForeignKey('daily_question.id', ondelete='CASCADE'), nullable=False, unique=True
+    )
+
+    last_subscriber_id = db.Column(db.Integer, nullable=False, default=0)
+    sent_count = db.Column(db.Integer, nullable=False, default=0)
+    failed_count = db.Column(db.Integer, nullable=False, default=0)
+    pages = db.Column(db.Integer, nullable=False, default=0)
+
+    lease_owner = db.Column(db.String(128), nullable=True)
+    lease_expires_at = db.Column(db.DateTime, nullable=True)
+
+    started_at = db.Column(db.DateTime, nullable=False, default=utcnow_naive)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow_naive, onupdate=utcnow_naive)
+    completed_at = db.Column(db.DateTime, nullable=True)
+
+    @property
+    def is_complete(self):
+        return self.completed_at is not None
+
+    def emails_per_second(self, now=None):
+        end = self.completed_at or now or utcnow_naive()
+        elapsed = (end - self.started_at).total_seconds() if self.started_at else 0
+        return (self.sent_count or 0) / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return f'<DailyQuestionSendRun question={self.daily_question_id} last_id={self.last_subscriber_id}>'
@@ -12,16 +12,19 @@ refactor:
   Discussion, Statement, StatementVote, Response, Evidence,
   JourneyReminderSubscription, StatementFlag
 
-No event listeners in this block. Cross-domain relationships (User,
-Programme, Partner, CompanyProfile, TrendingTopic, Polymarket,
-NewsArticle) all use string references. One lazy import lives in
-Discussion.search_discussions to avoid a circular pull with
-generate_slug, which lives in app.models._base.
+DiscussionStats holds the maintained participation numbers. The
+listeners below it count new visible statements and mark the row stale
+when statements or votes change in ways a delta cannot express.
+Cross-domain relationships (User, Programme, Partner, CompanyProfile,
+TrendingTopic, Polymarket, NewsArticle) all use string references. One
+lazy import lives in Discussion.search_discussions to avoid a circular
+pull with generate_slug, which lives in app.models._base.
 """
 
 from datetime import timedelta
 
 from flask import current_app
+from sqlalchemy import event
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import validates
 
@@ -532,6 +535,7 @@ class Discussion(db.Model):
         # Lazy import: Programme now lives in app.models.programme; importing it at
         # module top would create a circular dependency with generate_slug.
         from app.models.programme import Programme
+        from app.lib.text_search import apply_discussion_search, discussion_keywords_condition
         query = Discussion.query.options(db.joinedload(Discussion.creator)).filter(Discussion.partner_env != 'test')
         query = query.outerjoin(Programme, Discussion.programme_id == Programme.id).filter(
             db.or_(
@@ -541,13 +545,7 @@ class Discussion(db.Model):
         )
 
         if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                db.or_(
-                    Discussion.title.ilike(search_term),
-                    Discussion.description.ilike(search_term)
-                )
-            )
+            query = apply_discussion_search(query, search, order_by_rank=True)
 
         if scope:
             query = query.filter(Discussion.geographic_scope == scope)
@@ -563,7 +561,9 @@ class Discussion(db.Model):
 
         # New keyword filtering
         if keywords:
-            query = query.filter(Discussion.keywords.ilike(f"%{keywords}%"))
+            keyword_condition = discussion_keywords_condition(keywords)
+            if keyword_condition is not None:
+                query = query.filter(keyword_condition)
 
         if programme_id:
             query = query.filter(Discussion.programme_id == programme_id)
@@ -801,6 +801,95 @@ class StatementVote(db.Model):
         return confidence
 
 
+class DiscussionStats(db.Model):
+    """
+    Maintained participation numbers for the published view of a discussion.
+
+    Mirrors what discussion pages and embeds used to recompute on every view:
+    distinct participants, visible statements and vote totals, all restricted
+    to visible statements (not deleted, ``mod_status >= 0``). The vote paths
+    apply deltas (see ``app.discussions.discussion_stats``); changes a delta
+    cannot express — moderation, deletion, vote removal — set ``is_stale`` so
+    the row is recomputed exactly before it is trusted again.
+    """
+    __tablename__ = 'discussion_stats'
+
+    discussion_id = db.Column(
+        db.Integer, db.ForeignKey('discussion.id', ondelete='CASCADE'), primary_key=True
+    )
+    participant_count = db.Column(db.Integer, nullable=False, default=0)
+    statement_count = db.Column(db.Integer, nullable=False, default=0)
+    agree_votes = db.Column(db.Integer, nullable=False, default=0)
+    disagree_votes = db.Column(db.Integer, nullable=False, default=0)
+    unsure_votes = db.Column(db.Integer, nullable=False, default=0)
+    is_stale = db.Column(db.Boolean, nullable=False, default=False)
+
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow_naive, onupdate=utcnow_naive)
+    reconciled_at = db.Column(db.DateTime, nullable=True)
+
+    @property
+    def total_votes(self):
+        return (self.agree_votes or 0) + (self.disagree_votes or 0) + (self.unsure_votes or 0)
+
+    def to_dict(self):
+        return {
+            'participant_count': self.participant_count or 0,
+            'statement_count': self.statement_count or 0,
+            'agree_votes': self.agree_votes or 0,
+            'disagree_votes': self.disagree_votes or 0,
+            'unsure_votes': self.unsure_votes or 0,
+            'total_votes': self.total_votes,
+        }
+
+    def __repr__(self):
+        return f'<DiscussionStats discussion={self.discussion_id} participants={self.participant_count}>'
+
+
+def _mark_discussion_stats_stale(connection, discussion_id):
+    if discussion_id is None:
+        return
+    table = DiscussionStats.__table__
+    connection.execute(
+        table.update().where(table.c.discussion_id == discussion_id).values(is_stale=True)
+    )
+
+
+def _statement_is_visible(statement):
+    return not statement.is_deleted and (statement.mod_status or 0) >= 0
+
+
+@event.listens_for(Statement, 'after_insert')
+def _count_new_statement_in_stats(mapper, connection, target):
+    """A new visible statement is a pure +1; missing stats rows are built on first vote."""
+    if not _statement_is_visible(target):
+        return
+    table = DiscussionStats.__table__
+    connection.execute(
+        table.update().where(table.c.discussion_id == target.discussion_id).values(
+            statement_count=table.c.statement_count + 1,
+            agree_votes=table.c.agree_votes + (target.vote_count_agree or 0),
+            disagree_votes=table.c.disagree_votes + (target.vote_count_disagree or 0),
+            unsure_votes=table.c.unsure_votes + (target.vote_count_unsure or 0),
+        )
+    )
+
+
+@event.listens_for(Statement, 'after_update')
+def _stale_stats_on_statement_visibility_change(mapper, connection, target):
+    """Hiding or restoring a statement can change participants, so recount."""
+    state = db.inspect(target)
+    if state.attrs.is_deleted.history.has_changes() or state.attrs.mod_status.history.has_changes():
+        _mark_discussion_stats_stale(connection, target.discussion_id)
+
+
+@event.listens_for(Statement, 'after_delete')
+def _stale_stats_on_statement_delete(mapper, connection, target):
+    _mark_discussion_stats_stale(connection, target.discussion_id)
+
+
+@event.listens_for(StatementVote, 'after_delete')
+def _stale_stats_on_vote_delete(mapper, connection, target):
+    _mark_discussion_stats_stale(connection, target.discussion_id)
 
 
 class Response(db.Model):
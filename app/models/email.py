@@ -254,10 +254,6 @@ class EmailEvent(db.Model):
         from sqlalchemy import func
 
         cutoff = utcnow_naive() - timedelta(days=days)
-        query = cls.query.filter(cls.created_at >= cutoff)
-
-        if email_category:
-            query = query.filter(cls.email_category == email_category)
 
         # Count by event type
         event_counts = db.session.query(
@@ -269,7 +265,14 @@ class EmailEvent(db.Model):
             event_counts = event_counts.filter(cls.email_category == email_category)
 
         raw_event_counts = dict(event_counts.group_by(cls.event_type).all())
+        return cls.stats_from_counts(raw_event_counts)
 
+    @classmethod
+    def stats_from_counts(cls, raw_event_counts: Dict[str, int]) -> dict:
+        """
+        Build the get_stats() dict from ``{event_type: count}``, however the
+        counts were obtained (raw events or the hourly rollup).
+        """
         # Normalize legacy and current event type formats into one rollup.
         event_counts = {}
         for event_type, count in raw_event_counts.items():
@@ -333,5 +336,69 @@ class EmailEvent(db.Model):
         return f'<EmailEvent {self.event_type} ({self.email_category}) to {self.recipient_email}>'
 
 
+class EmailEventHourlyRollup(db.Model):
+    """
+    Email events per hour, category and (normalized) event type.
+
+    Folded incrementally from email_event by app.lib.email_rollup so the
+    admin dashboard sums a few hundred rows instead of scanning the window.
+    """
+    __tablename__ = 'email_event_hourly_rollup'
+    __table_args__ = (
+        db.UniqueConstraint('bucket_start', 'email_category', 'event_type', name='uq_email_event_hourly_dims'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    bucket_start = db.Column(db.DateTime, nullable=False)  # start of the UTC hour
+    email_category = db.Column(db.String(30), nullable=False)
+    event_type = db.Column(db.String(50), nullable=False)
+    event_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<EmailEventHourlyRollup {self.bucket_start} {self.email_category}/{self.event_type}={self.event_count}>'
+
+
+class EmailRecipientEngagement(db.Model):
+    """
+    Lifetime event counts per recipient address and email category.
+
+    Maintained from email_event alongside EmailEventHourlyRollup; backs
+    per-address performance views without reading the address's events.
+    """
+    __tablename__ = 'email_recipient_engagement'
+    __table_args__ = (
+        db.UniqueConstraint('recipient_email', 'email_category', name='uq_email_recipient_engagement'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    recipient_email = db.Column(db.String(255), nullable=False)
+    email_category = db.Column(db.String(30), nullable=False)
+
+    sent_count = db.Column(db.Integer, nullable=False, default=0)
+    delivered_count = db.Column(db.Integer, nullable=False, default=0)
+    opened_count = db.Column(db.Integer, nullable=False, default=0)
+    clicked_count = db.Column(db.Integer, nullable=False, default=0)
+    bounced_count = db.Column(db.Integer, nullable=False, default=0)
+    complained_count = db.Column(db.Integer, nullable=False, default=0)
+
+    first_event_at = db.Column(db.DateTime, nullable=True)
+    last_event_at = db.Column(db.DateTime, nullable=True)
+    last_opened_at = db.Column(db.DateTime, nullable=True)
+    last_clicked_at = db.Column(db.DateTime, nullable=True)
+
+    # event_type -> count column
+    COUNT_COLUMNS = {
+        EmailEvent.EVENT_SENT: 'sent_count',
+        EmailEvent.EVENT_DELIVERED: 'delivered_count',
+        EmailEvent.EVENT_OPENED: 'opened_count',
+        EmailEvent.EVENT_CLICKED: 'clicked_count',
+        EmailEvent.EVENT_BOUNCED: 'bounced_count',
+        EmailEvent.EVENT_COMPLAINED: 'complained_count',
+    }
+
+    def __repr__(self):
+        return f'<EmailRecipientEngagement {self.recipient_email} ({self.email_category})>'
+
+
 # Backward compatibility alias
 BriefEmailEvent = EmailEvent
@@ -148,6 +148,35 @@ class GameDailySchedule(db.Model):
     created_at = db.Column(db.DateTime, default=utcnow_naive)
 
 
+class GameDailyChoiceTally(db.Model):
+    """Running per-(scenario, day, turn, choice) counts for the daily game.
+
+    Bumped when a daily run completes so the "how the world governed today"
+    distribution reads a handful of counter rows instead of every run's
+    choice_log. The row at ``turn_index = RUNS_TURN_INDEX`` (empty choice_id)
+    counts completed runs — the sample size. Rebuildable from ``game_run``
+    via ``flask rebuild-game-daily-tally``.
+    """
+
+    __tablename__ = 'game_daily_choice_tally'
+    __table_args__ = (
+        db.UniqueConstraint(
+            'scenario_slug', 'tally_date', 'turn_index', 'choice_id',
+            name='uq_game_daily_choice_tally_dims',
+        ),
+    )
+
+    RUNS_TURN_INDEX = -1
+
+    id = db.Column(db.Integer, primary_key=True)
+    scenario_slug = db.Column(db.String(80), nullable=False)
+    tally_date = db.Column(db.Date, nullable=False)
+    turn_index = db.Column(db.Integer, nullable=False)
+    choice_id = db.Column(db.String(80), nullable=False, default='')
+    count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow_naive, onupdate=utcnow_naive)
+
+
 class GameChallenge(db.Model):
     """Shareable friend challenge — creator headline revealed after friend completes."""
 
@@ -10,6 +10,7 @@ string.
 """
 
 from app import db
+from app.lib.text_search import register_sqlite_fts
 from app.lib.time import utcnow_naive
 
 
@@ -75,3 +76,9 @@ class ProgrammeTranslation(db.Model):
     created_at = db.Column(db.DateTime, default=utcnow_naive)
 
     programme = db.relationship('Programme', backref=db.backref('translations', cascade='all, delete-orphan'))
+
+
+# Full-text search over statements/discussions and these translations: the
+# SQLite FTS5 tables are created with the schema (tests / local dev);
+# Postgres uses GIN indexes from migrations.
+register_sqlite_fts(db.metadata)
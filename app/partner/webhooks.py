@@ -10,6 +10,7 @@ from flask import current_app
 
 from app import db
 from app.lib.llm_utils import decrypt_api_key, encrypt_api_key
+from app.lib.queue_wakeup import QUEUE_PARTNER_WEBHOOKS, notify
 from app.lib.time import utcnow_naive
 from app.models import PartnerWebhookEndpoint, PartnerWebhookDelivery
 from flask_babel import gettext as _
@@ -65,6 +66,7 @@ def enqueue_partner_event(partner_id, event_type, data, event_id=None):
         created += 1
     if created:
         db.session.commit()
+        notify(QUEUE_PARTNER_WEBHOOKS)
     return created
 
 
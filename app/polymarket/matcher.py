@@ -18,11 +18,12 @@ from datetime import datetime, timedelta
 from app.lib.time import utcnow_naive
 from typing import Optional, List, Dict
 
-import numpy as np
-
 from app import db
+from app.lib.lazy_import import lazy_module
 from app.models import TrendingTopic, PolymarketMarket, TopicMarketMatch
 
+np = lazy_module('numpy')
+
 logger = logging.getLogger(__name__)
 
 
@@ -308,7 +309,7 @@ class MarketMatcher:
 
         return matches
 
-    def _cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
+    def _cosine_similarity(self, vec1: 'np.ndarray', vec2: 'np.ndarray') -> float:
         """Calculate cosine similarity between two vectors."""
         if vec1.size == 0 or vec2.size == 0:
             return 0.0
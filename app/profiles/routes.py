@@ -2,7 +2,9 @@
 from flask import Blueprint, render_template, redirect, url_for, request, flash, send_file, current_app, abort, make_response
 from flask_login import login_required, current_user
 from app import db
+from app.lib.image_variants import load_manifest, select_variant
 from app.lib.posthog_utils import safe_posthog_capture
+from app.lib.storage_cache import serve_cached
 from app.models import IndividualProfile, CompanyProfile, Discussion, Programme, generate_unique_slug
 from app.profiles.forms import IndividualProfileForm, CompanyProfileForm
 from replit.object_storage import Client
@@ -25,6 +27,8 @@ from app.profiles.helpers import apply_form_to_profile
 profiles_bp = Blueprint('profiles', __name__, template_folder='../templates/profiles')
 
 client = Client()
+# Uploads get unique names, but deletes only invalidate the local cache.
+PROFILE_IMAGE_CACHE_TTL_SECONDS = 24 * 3600
 
 
 
@@ -39,24 +43,33 @@ def get_image(filename):
         
         storage_path = f"profile_images/{filename}"
 
-        # Download the file data as bytes
-        file_data = client.download_as_bytes(storage_path)
-
-        if file_data:
-            file_like = io.BytesIO(file_data)
-
-            # Determine MIME type based on file extension
-            mime_type = 'image/jpeg'
-            if filename.lower().endswith('.png'):
-                mime_type = 'image/png'
-            elif filename.lower().endswith('.gif'):
-                mime_type = 'image/gif'
-            elif filename.lower().endswith('.svg'):
-                mime_type = 'image/svg+xml'
-            elif filename.lower().endswith('.webp'):
-                mime_type = 'image/webp'
-
-            return send_file(file_like, mimetype=mime_type, as_attachment=False, download_name=filename)
+        # Determine MIME type based on file extension
+        mime_type = 'image/jpeg'
+        if filename.lower().endswith('.png'):
+            mime_type = 'image/png'
+        elif filename.lower().endswith('.gif'):
+            mime_type = 'image/gif'
+        elif filename.lower().endswith('.svg'):
+            mime_type = 'image/svg+xml'
+        elif filename.lower().endswith('.webp'):
+            mime_type = 'image/webp'
+
+        width = request.args.get('w', type=int)
+        if width:
+            response = _serve_image_variant(filename, width)
+            if response is not None:
+                return response
+
+        response = serve_cached(
+            storage_path,
+            lambda: client.download_as_bytes(storage_path),
+            mimetype=mime_type,
+            download_name=filename,
+            cache_control='public, max-age=3600',
+            ttl_seconds=PROFILE_IMAGE_CACHE_TTL_SECONDS,
+        )
+        if response is not None:
+            return response
 
         current_app.logger.error(f"Image not found: {filename}")
         return send_file('static/images/default-avatar.png', mimetype='image/png')
@@ -68,6 +81,29 @@ def get_image(filename):
         return send_file('static/images/default-avatar.png', mimetype='image/png')
 
 
+def _serve_image_variant(filename, width):
+    """Resized variant of a profile image for a ``width``-px slot, or None to serve the original."""
+    manifest = load_manifest(filename, client)
+    if not manifest:
+        return None
+    key, mime_type = select_variant(manifest, width, request.accept_mimetypes)
+    try:
+        # Variant keys are content-hashed, so cached copies never go stale.
+        response = serve_cached(
+            key,
+            lambda: client.download_as_bytes(key),
+            mimetype=mime_type,
+            download_name=key.rsplit('/', 1)[-1],
+            cache_control='public, max-age=86400',
+        )
+    except Exception as e:
+        current_app.logger.warning(f"Image variant {key} unavailable for {filename}: {str(e)}")
+        return None
+    if response is not None:
+        response.vary.add('Accept')
+    return response
+
+
 @profiles_bp.route('/assets/<path:filename>')
 def get_static_asset(filename):
     """Serve static assets (hero, speakers) from Replit Object Storage.
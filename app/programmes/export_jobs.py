@@ -6,6 +6,7 @@ from datetime import timedelta
 from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
 
 from app import db
+from app.lib.queue_wakeup import QUEUE_PROGRAMME_EXPORT, notify
 from app.lib.time import utcnow_naive
 from app.models import Programme, ProgrammeExportJob
 from app.programmes.export import (
@@ -52,6 +53,7 @@ def enqueue_programme_export_job(programme_id, requested_by_user_id, export_form
     )
     db.session.add(job)
     db.session.commit()
+    notify(QUEUE_PROGRAMME_EXPORT)
     return job, True, "Export queued."
 
 
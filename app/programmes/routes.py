@@ -1,4 +1,4 @@
-from flask import Blueprint, abort, current_app, flash, make_response, redirect, render_template, request, session, url_for, jsonify, send_file
+from flask import Blueprint, abort, current_app, flash, make_response, redirect, render_template, request, session, url_for, jsonify
 from flask_login import current_user, login_required
 try:
     import posthog as _posthog
@@ -6,12 +6,12 @@ except ImportError:
     _posthog = None
 from sqlalchemy import distinct, func
 from sqlalchemy.orm import load_only, joinedload
-from io import BytesIO
 
 from app import cache, csrf, db, limiter
 from app.lib.auth_utils import normalize_email
 from app.lib.posthog_utils import resolve_request_distinct_id, safe_posthog_capture
 from app.lib.participation_metrics import visible_statement_vote_filters
+from app.lib.storage_cache import serve_cached
 from app.lib.time import utcnow_naive
 from app.models import (
     AnalyticsDailyAggregate,
@@ -23,6 +23,7 @@ from app.models import (
     ProgrammeAccessGrant,
     ProgrammeExportJob,
     ProgrammeSteward,
+    ProgrammeVoteDailyRollup,
     Statement,
     StatementVote,
 )
@@ -196,33 +197,33 @@ def _programme_nsp_dashboard_payload(programme):
         AnalyticsDailyAggregate.cohort_slug.isnot(None)
     ).group_by(AnalyticsDailyAggregate.cohort_slug).all()
 
+    # Vote trends and confidence come from the maintained rollup (see
+    # app.programmes.vote_rollup) rather than grouping every statement_vote
+    # row of the programme on each load.
     vote_rows = db.session.query(
-        func.date(func.coalesce(StatementVote.updated_at, StatementVote.created_at)).label('event_date'),
-        StatementVote.vote,
-        func.count(StatementVote.id).label('vote_count')
-    ).join(
-        Discussion, Discussion.id == StatementVote.discussion_id
-    ).join(
-        Statement, StatementVote.statement_id == Statement.id
+        ProgrammeVoteDailyRollup.vote_date.label('event_date'),
+        ProgrammeVoteDailyRollup.vote,
+        func.sum(ProgrammeVoteDailyRollup.vote_count).label('vote_count')
     ).filter(
-        Discussion.programme_id == programme.id,
-        *visible_statement_vote_filters(Statement),
+        ProgrammeVoteDailyRollup.programme_id == programme.id,
     ).group_by(
-        func.date(func.coalesce(StatementVote.updated_at, StatementVote.created_at)),
-        StatementVote.vote
-    ).order_by(func.date(func.coalesce(StatementVote.updated_at, StatementVote.created_at)).asc()).all()
+        ProgrammeVoteDailyRollup.vote_date,
+        ProgrammeVoteDailyRollup.vote
+    ).order_by(ProgrammeVoteDailyRollup.vote_date.asc()).all()
 
     trend_map = {}
     for row in vote_rows:
         day = row.event_date.isoformat()
         if day not in trend_map:
             trend_map[day] = {'agree': 0, 'disagree': 0, 'unsure': 0}
+        # Deltas can briefly undershoot before reconciliation; never show < 0.
+        vote_count = max(0, int(row.vote_count or 0))
         if row.vote == 1:
-            trend_map[day]['agree'] += int(row.vote_count or 0)
+            trend_map[day]['agree'] += vote_count
         elif row.vote == -1:
-            trend_map[day]['disagree'] += int(row.vote_count or 0)
+            trend_map[day]['disagree'] += vote_count
         else:
-            trend_map[day]['unsure'] += int(row.vote_count or 0)
+            trend_map[day]['unsure'] += vote_count
 
     consensus_vs_divisive_trends = []
     for day in sorted(trend_map.keys()):
@@ -241,23 +242,18 @@ def _programme_nsp_dashboard_payload(programme):
         })
 
     confidence_rows = db.session.query(
-        StatementVote.confidence,
-        func.count(StatementVote.id)
-    ).join(
-        Discussion, Discussion.id == StatementVote.discussion_id
-    ).join(
-        Statement, StatementVote.statement_id == Statement.id
+        ProgrammeVoteDailyRollup.confidence,
+        func.sum(ProgrammeVoteDailyRollup.vote_count)
     ).filter(
-        Discussion.programme_id == programme.id,
-        StatementVote.confidence.isnot(None),
-        *visible_statement_vote_filters(Statement),
-    ).group_by(StatementVote.confidence).all()
+        ProgrammeVoteDailyRollup.programme_id == programme.id,
+        ProgrammeVoteDailyRollup.confidence > 0,
+    ).group_by(ProgrammeVoteDailyRollup.confidence).all()
 
     confidence_distribution = []
     for confidence, count in sorted(confidence_rows, key=lambda item: int(item[0] or 0)):
         confidence_distribution.append({
             'confidence': int(confidence or 0),
-            'count': int(count or 0),
+            'count': max(0, int(count or 0)),
         })
 
     # Single query for all three funnel counts — avoids 3 separate table scans.
@@ -1308,16 +1304,21 @@ def download_export_artifact(token):
     if not programme or not can_steward_programme(programme, current_user):
         abort(403)
 
-    data = read_export_artifact_bytes(job)
-    if not data:
+    if not job.storage_key:
         abort(404)
 
-    return send_file(
-        BytesIO(data),
+    # Artifacts are written once per job, under a key that includes the job id.
+    response = serve_cached(
+        job.storage_key,
+        lambda: read_export_artifact_bytes(job),
         mimetype=job.content_type or 'application/octet-stream',
         as_attachment=True,
-        download_name=job.artifact_filename or f"programme-export-{job.id}.{job.export_format}"
+        download_name=job.artifact_filename or f"programme-export-{job.id}.{job.export_format}",
+        cache_control='private, no-cache',
     )
+    if response is None:
+        abort(404)
+    return response
 
 
 @programmes_bp.route('/journey/step-timing', methods=['POST'])
@@ -1,6 +1,8 @@
 from urllib.parse import urlparse
 from markupsafe import escape
 
+from app.lib.cpu_offload import MARKDOWN_OFFLOAD_MIN_CHARS, offload
+
 try:
     import bleach
 except ImportError:  # pragma: no cover - optional dependency fallback
@@ -136,6 +138,12 @@ def render_safe_markdown(markdown_text):
     if md is None or bleach is None:
         # Safe fallback if optional packages are unavailable in local/dev environments.
         return str(escape(markdown_text)).replace("\n", "<br>")
+    if len(markdown_text) >= MARKDOWN_OFFLOAD_MIN_CHARS:
+        return offload("markdown", _render_and_clean_markdown, markdown_text)
+    return _render_and_clean_markdown(markdown_text)
+
+
+def _render_and_clean_markdown(markdown_text):
     rendered = md.markdown(markdown_text, extensions=["extra", "nl2br"])
     cleaned = _bleach_information_fragment(rendered)
     externalized = _apply_external_link_attrs(cleaned)
@@ -0,0 +1,157 @@
+"""
+Programme vote rollups — incrementally maintained NSP dashboard vote trends.
+
+``ProgrammeVoteDailyRollup`` mirrors the published-vote GROUP BY the dashboard
+used to run on every load (votes bucketed by the date of their latest change,
+split by vote value and confidence). The vote write paths apply +1/-1 deltas
+as votes are cast or changed, and ``reconcile_programme_vote_rollups`` rebuilds
+each programme exactly from ``statement_vote`` to absorb drift from deletions,
+moderation and merges, which no delta sees.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func, insert, literal, select
+
+from app import db
+from app.lib.db_upsert import upsert
+from app.lib.participation_metrics import visible_statement_vote_filters
+from app.lib.time import utcnow_naive
+from app.models import Discussion, ProgrammeVoteDailyRollup, Statement, StatementVote
+
+logger = logging.getLogger(__name__)
+
+
+def _bucket(vote, confidence, changed_at) -> Tuple[date, int, int]:
+    when = changed_at or utcnow_naive()
+    if isinstance(when, datetime):
+        when = when.date()
+    return when, int(vote), int(confidence or 0)
+
+
+def record_vote_rollup_delta(
+    programme_id: Optional[int],
+    discussion_id: int,
+    *,
+    old_vote=None,
+    old_confidence=None,
+    old_changed_at=None,
+    new_vote=None,
+    new_confidence=None,
+    new_changed_at=None,
+) -> None:
+    """
+    Move one vote between rollup buckets in the caller's transaction.
+
+    ``old_*`` describes the vote row before the write (omit for a first vote);
+    ``new_*`` describes it after (omit for a deletion). ``*_changed_at`` is
+    ``coalesce(updated_at, created_at)``; ``new_changed_at`` defaults to now.
+    Votes outside programmes are not rolled up.
+    """
+    if not programme_id:
+        return
+
+    deltas: Dict[Tuple[date, int, int], int] = {}
+    if old_vote is not None:
+        key = _bucket(old_vote, old_confidence, old_changed_at)
+        deltas[key] = deltas.get(key, 0) - 1
+    if new_vote is not None:
+        key = _bucket(new_vote, new_confidence, new_changed_at)
+        deltas[key] = deltas.get(key, 0) + 1
+    deltas = {key: n for key, n in deltas.items() if n}
+    if not deltas:
+        return
+
+    now = utcnow_naive()
+    rows = [
+        {
+            'vote_date': vote_date,
+            'programme_id': programme_id,
+            'discussion_id': discussion_id,
+            'vote': vote,
+            'confidence': confidence,
+            'vote_count': n,
+            'updated_at': now,
+        }
+        for (vote_date, vote, confidence), n in sorted(deltas.items())
+    ]
+    upsert(
+        ProgrammeVoteDailyRollup,
+        rows,
+        index_elements=['vote_date', 'discussion_id', 'vote', 'confidence'],
+        increment=['vote_count'],
+        set_={'programme_id': programme_id, 'updated_at': now},
+    )
+
+
+def rebuild_programme_vote_rollup(programme_id: int) -> None:
+    """
+    Replace a programme's rollup rows with an exact recount of published votes.
+
+    A single INSERT ... SELECT, so no vote rows travel to Python. Caller commits.
+    """
+    changed_on = func.date(func.coalesce(StatementVote.updated_at, StatementVote.created_at))
+    recount = select(
+        changed_on,
+        literal(programme_id),
+        StatementVote.discussion_id,
+        StatementVote.vote,
+        func.coalesce(StatementVote.confidence, 0),
+        func.count(StatementVote.id),
+        literal(utcnow_naive()),
+    ).join(
+        Discussion, Discussion.id == StatementVote.discussion_id
+    ).join(
+        Statement, StatementVote.statement_id == Statement.id
+    ).where(
+        Discussion.programme_id == programme_id,
+        *visible_statement_vote_filters(Statement),
+    ).group_by(
+        changed_on,
+        StatementVote.discussion_id,
+        StatementVote.vote,
+        func.coalesce(StatementVote.confidence, 0),
+    )
+
+    db.session.query(ProgrammeVoteDailyRollup).filter(
+        ProgrammeVoteDailyRollup.programme_id == programme_id
+    ).delete(synchronize_session=False)
+    db.session.execute(
+        insert(ProgrammeVoteDailyRollup).from_select(
+            ['vote_date', 'programme_id', 'discussion_id', 'vote', 'confidence', 'vote_count', 'updated_at'],
+            recount,
+        )
+    )
+
+
+def reconcile_programme_vote_rollups() -> int:
+    """
+    Rebuild every programme's rollup from authoritative vote rows.
+    Commits per programme so one failure does not discard the rest.
+    Returns the number of programmes rebuilt.
+    """
+    programme_ids = [
+        int(row[0]) for row in db.session.query(Discussion.programme_id).filter(
+            Discussion.programme_id.isnot(None)
+        ).distinct().all()
+    ]
+    # Programmes whose last discussion moved away still hold stale rows.
+    programme_ids += [
+        int(row[0]) for row in db.session.query(ProgrammeVoteDailyRollup.programme_id).filter(
+            ProgrammeVoteDailyRollup.programme_id.notin_(programme_ids or [0])
+        ).distinct().all()
+    ]
+
+    rebuilt = 0
+    for programme_id in programme_ids:
+        try:
+            rebuild_programme_vote_rollup(programme_id)
+            db.session.commit()
+            rebuilt += 1
+        except Exception:
+            db.session.rollback()
+            logger.exception("Programme vote rollup rebuild failed for programme_id=%s", programme_id)
+    return rebuilt
@@ -20,6 +20,7 @@ from flask_babel import force_locale, gettext
 import requests
 from app.email_utils import RateLimiter, extract_clean_email as _extract_clean_email  # shared utilities
 from app.briefing.link_tracker import wrap_links as _wrap_links
+from app.lib.bulk_email_render import ClickTracking, bulk_renderer_for
 from app.lib.locale_utils import resolve_user_locale, email_html_locale_kwargs
 from app.programmes.journey import GUIDED_JOURNEY_DISPLAY_MINUTES_PER_THEME
 
@@ -747,6 +748,61 @@ class ResendEmailClient:
 
         return success
 
+    def _render_questions_digest(self, subscriber, questions, *, send_day_name, send_hour, is_monthly=False) -> str:
+        """
+        Render the weekly/monthly digest body with click tracking.
+
+        The body (discussion stats, source articles, copy) is rendered once
+        per locale and send slot; each subscriber only fills in their own
+        batch, preferences, unsubscribe and vote URLs.
+        """
+        from app.daily.utils import build_question_email_data, digest_vote_urls
+
+        # Build URLs with question IDs for batch page
+        question_ids = ','.join(str(q.id) for q in questions)
+        slots = {
+            'batch_url': f"{self.base_url}/daily/weekly?token={subscriber.magic_token}&questions={question_ids}",
+            'preferences_url': f"{self.base_url}/daily/preferences?token={subscriber.magic_token}",
+            'unsubscribe_url': f"{self.base_url}/daily/unsubscribe/{subscriber.unsubscribe_token or subscriber.magic_token}",
+        }
+        for index, question in enumerate(questions):
+            vote_urls = digest_vote_urls(question, subscriber.generate_vote_token(question.id), self.base_url)
+            for choice, url in vote_urls.items():
+                slots[f'vote_{index}_{choice}'] = url
+
+        def shared_context(placeholders):
+            # Build question data with vote URLs, discussion stats, and source articles
+            questions_data = []
+            for index, question in enumerate(questions):
+                q_data = build_question_email_data(question, subscriber, base_url=self.base_url)
+                q_data['vote_urls'] = {
+                    choice: placeholders[f'vote_{index}_{choice}']
+                    for choice in ('agree', 'disagree', 'unsure')
+                }
+                questions_data.append(q_data)
+            return {
+                'questions': questions_data,
+                'send_day_name': send_day_name,
+                'send_hour': send_hour,
+                'base_url': self.base_url,
+                'is_monthly': is_monthly,
+            }
+
+        return bulk_renderer_for(self).render(
+            subscriber,
+            'emails/weekly_questions_digest.html',
+            content_key=('questions_digest', tuple(q.id for q in questions), send_day_name, send_hour, is_monthly),
+            slots=slots,
+            context=shared_context,
+            tracking=ClickTracking(
+                base_url=self.base_url,
+                run_id=questions[0].id,
+                secret=current_app.config.get('SECRET_KEY', ''),
+                track_path='/daily/track/click',
+            ),
+            r_hash=str(subscriber.id),
+        )
+
     def send_weekly_questions_digest(self, subscriber, questions) -> bool:
         """
         Send weekly digest email with 5 questions to a single subscriber.
@@ -764,54 +820,22 @@ class ResendEmailClient:
             logger.warning(f"No questions provided for weekly digest to {subscriber.email}")
             return False
 
-        # Build URLs with question IDs for batch page
-        question_ids = ','.join(str(q.id) for q in questions)
-        batch_url = f"{self.base_url}/daily/weekly?token={subscriber.magic_token}&questions={question_ids}"
-        preferences_url = f"{self.base_url}/daily/preferences?token={subscriber.magic_token}"
         unsubscribe_url = f"{self.base_url}/daily/unsubscribe/{subscriber.unsubscribe_token or subscriber.magic_token}"
 
-        # Build question data with vote URLs, discussion stats, and source articles
-        from app.daily.utils import build_question_email_data
-        
-        questions_data = []
-        for question in questions:
-            # Use DRY helper function to build all question data (with base_url for email context)
-            q_data = build_question_email_data(question, subscriber, base_url=self.base_url)
-            questions_data.append(q_data)
-
-        # Get send day name for footer
-        send_day_name = subscriber.get_send_day_name()
-        send_hour = subscriber.preferred_send_hour
-
         try:
-            html = _render_for_user(
+            html = self._render_questions_digest(
                 subscriber,
-                'emails/weekly_questions_digest.html',
-                questions=questions_data,
-                batch_url=batch_url,
-                preferences_url=preferences_url,
-                unsubscribe_url=unsubscribe_url,
-                send_day_name=send_day_name,
-                send_hour=send_hour,
-                base_url=self.base_url
+                questions,
+                send_day_name=subscriber.get_send_day_name(),
+                send_hour=subscriber.preferred_send_hour,
             )
         except Exception as e:
             logger.error(f"Template rendering failed for weekly_questions_digest: {e}")
             return False
 
-        secret = current_app.config.get('SECRET_KEY', '')
-        html = _wrap_links(
-            html=html,
-            base_url=self.base_url,
-            run_id=questions[0].id,
-            r_hash=str(subscriber.id),
-            secret=secret,
-            track_path='/daily/track/click',
-        )
-
         # Build subject line
         first_question = questions[0].question_text[:50]
-        subject = _subject_for_user(subscriber, '5 Questions This Week: %(first)s...', first=first_question)
+        subject = bulk_renderer_for(self).subject(subscriber, '5 Questions This Week: %(first)s...', first=first_question)
 
         email_data = {
             'from': self.from_email_daily,
@@ -861,52 +885,24 @@ class ResendEmailClient:
             logger.warning(f"No questions provided for monthly digest to {subscriber.email}")
             return False
 
-        # Build URLs with question IDs for batch page
-        question_ids = ','.join(str(q.id) for q in questions)
-        batch_url = f"{self.base_url}/daily/weekly?token={subscriber.magic_token}&questions={question_ids}"
-        preferences_url = f"{self.base_url}/daily/preferences?token={subscriber.magic_token}"
         unsubscribe_url = f"{self.base_url}/daily/unsubscribe/{subscriber.unsubscribe_token or subscriber.magic_token}"
 
-        # Build question data with vote URLs, discussion stats, and source articles
-        from app.daily.utils import build_question_email_data
-        
-        questions_data = []
-        for question in questions:
-            # Use DRY helper function to build all question data (with base_url for email context)
-            q_data = build_question_email_data(question, subscriber, base_url=self.base_url)
-            questions_data.append(q_data)
-
         try:
             # Reuse weekly digest template but with different title
-            html = _render_for_user(
+            html = self._render_questions_digest(
                 subscriber,
-                'emails/weekly_questions_digest.html',
-                questions=questions_data,
-                batch_url=batch_url,
-                preferences_url=preferences_url,
-                unsubscribe_url=unsubscribe_url,
+                questions,
                 send_day_name='Monthly',
                 send_hour=9,
-                base_url=self.base_url,
-                is_monthly=True
+                is_monthly=True,
             )
         except Exception as e:
             logger.error(f"Template rendering failed for monthly_questions_digest: {e}")
             return False
 
-        secret = current_app.config.get('SECRET_KEY', '')
-        html = _wrap_links(
-            html=html,
-            base_url=self.base_url,
-            run_id=questions[0].id,
-            r_hash=str(subscriber.id),
-            secret=secret,
-            track_path='/daily/track/click',
-        )
-
         # Build subject line
         first_question = questions[0].question_text[:50]
-        subject = _subject_for_user(subscriber, '10 Questions This Month: %(first)s...', first=first_question)
+        subject = bulk_renderer_for(self).subject(subscriber, '10 Questions This Month: %(first)s...', first=first_question)
 
         email_data = {
             'from': self.from_email_daily,
@@ -943,6 +939,9 @@ class ResendEmailClient:
         """
         Build email payload for a daily question (used in batch sending).
 
+        The body is rendered once per locale (see app/lib/bulk_email_render.py);
+        each subscriber only fills in their own magic, unsubscribe and vote URLs.
+
         Args:
             subscriber: DailyQuestionSubscriber with magic_token
             question: DailyQuestion object
@@ -950,8 +949,7 @@ class ResendEmailClient:
         Returns:
             dict: Email payload for Resend API
         """
-        magic_link_url = f"{self.base_url}/daily/m/{subscriber.magic_token}"
-        question_url = f"{self.base_url}/daily/{question.question_date.isoformat()}"
+        renderer = bulk_renderer_for(self)
         unsubscribe_url = f"{self.base_url}/daily/unsubscribe/{subscriber.unsubscribe_token or subscriber.magic_token}"
 
         # Generate question-specific vote URLs using helper (DRY)
@@ -961,37 +959,43 @@ class ResendEmailClient:
         if subscriber.current_streak > 1:
             streak_message = f"You've participated {subscriber.current_streak} days in a row!"
 
-        why_this = question.why_this_question or "This question helps us understand how the public thinks about important issues."
+        def shared_context(_placeholders):
+            why_this = question.why_this_question or "This question helps us understand how the public thinks about important issues."
+            try:
+                from app.daily.utils import get_source_articles_for_question
+                source_articles = get_source_articles_for_question(question, limit=3)
+            except Exception:
+                source_articles = []
+            return {
+                'question_number': question.question_number,
+                'question_text': question.question_text,
+                'question_context': question.context or "",
+                'why_this_question': why_this,
+                'topic_category': question.topic_category or "Civic",
+                'question_url': f"{self.base_url}/daily/{question.question_date.isoformat()}",
+                'base_url': self.base_url,
+                'source_articles': source_articles,
+            }
 
-        try:
-            from app.daily.utils import get_source_articles_for_question
-            source_articles = get_source_articles_for_question(question, limit=3)
-        except Exception:
-            source_articles = []
-        
-        html = _render_for_user(
+        html = renderer.render(
             subscriber,
             'emails/daily_question.html',
-            question_number=question.question_number,
-            question_text=question.question_text,
-            question_context=question.context or "",
-            why_this_question=why_this,
-            topic_category=question.topic_category or "Civic",
-            magic_link_url=magic_link_url,
-            question_url=question_url,
-            streak_message=streak_message,
-            unsubscribe_url=unsubscribe_url,
-            vote_agree_url=vote_urls['agree'],
-            vote_disagree_url=vote_urls['disagree'],
-            vote_unsure_url=vote_urls['unsure'],
-            base_url=self.base_url,
-            source_articles=source_articles
+            content_key=('daily_question', question.id),
+            slots={
+                'magic_link_url': f"{self.base_url}/daily/m/{subscriber.magic_token}",
+                'streak_message': streak_message,
+                'unsubscribe_url': unsubscribe_url,
+                'vote_agree_url': vote_urls['agree'],
+                'vote_disagree_url': vote_urls['disagree'],
+                'vote_unsure_url': vote_urls['unsure'],
+            },
+            context=shared_context,
         )
 
         return {
             'from': self.from_email_daily,
             'to': [subscriber.email],
-            'subject': _subject_for_user(subscriber, 'Daily Question #%(num)s: %(topic)s', num=question.question_number, topic=question.topic_category or _subject_for_user(subscriber, 'Civic')),
+            'subject': renderer.subject(subscriber, 'Daily Question #%(num)s: %(topic)s', num=question.question_number, topic=question.topic_category or renderer.subject(subscriber, 'Civic')),
             'html': html,
             'headers': {
                 'List-Unsubscribe': f'<{unsubscribe_url}>',
@@ -1011,21 +1015,27 @@ class ResendEmailClient:
         Processes subscribers in batches of 100 for efficiency.
         Much faster than individual sends (1 API call per 100 vs 100 calls).
 
+        Does not write subscriber rows: the caller acknowledges the outcome
+        for the whole page (see app.daily.email_send and app.lib.send_claims).
+
         Args:
             subscribers: List of DailyQuestionSubscriber objects (must have magic_tokens set)
             question: DailyQuestion object
             on_progress: Optional callback(sent, failed, total) for progress updates
 
         Returns:
-            dict: {'sent': int, 'failed': int, 'errors': list, 'failed_emails': list}
+            dict: {'sent': int, 'failed': int, 'errors': list, 'failed_emails': list,
+                   'sent_ids': list, 'invalid_ids': list} — ``invalid_ids`` are
+                   subscribers whose address Resend rejected individually
+                   after a batch 422; they should be deactivated.
         """
-        from app import db
-
         results = {
             'sent': 0,
             'failed': 0,
             'errors': [],
-            'failed_emails': []
+            'failed_emails': [],
+            'sent_ids': [],
+            'invalid_ids': [],
         }
 
         if not subscribers:
@@ -1038,11 +1048,13 @@ class ResendEmailClient:
         for i in range(0, total, self.BATCH_SIZE):
             batch_subscribers = subscribers[i:i + self.BATCH_SIZE]
             batch_emails = []
+            built_subscribers = []
 
             for subscriber in batch_subscribers:
                 try:
                     email_payload = self._build_daily_question_email(subscriber, question)
                     batch_emails.append(email_payload)
+                    built_subscribers.append(subscriber)
                 except Exception as e:
                     logger.error(f"Failed to build email for {subscriber.email}: {e}")
                     results['failed'] += 1
@@ -1061,68 +1073,30 @@ class ResendEmailClient:
                 if is_validation_failure:
                     # Batch rejected by Resend due to a bad address (422).
                     # Resend doesn't say which one, so fall back to individual sends.
-                    # Any address that also fails individually is invalid — deactivate
-                    # it so it never blocks future batches again.
+                    # Any address that also fails individually is invalid — the
+                    # caller deactivates it so it never blocks future batches again.
                     logger.warning(
                         f"Batch rejected with 422 (bad address in batch of {len(batch_emails)}); "
                         f"falling back to individual sends to identify the invalid address."
                     )
-                    individual_sent = 0
-                    individual_failed = 0
-                    for sub, payload in zip(batch_subscribers, batch_emails):
-                        ok = self._send_with_retry(payload, use_rate_limit=True)
-                        if ok:
-                            individual_sent += 1
-                            sub.last_email_sent = utcnow_naive()
-                            try:
-                                from app.lib.email_analytics import EmailAnalytics
-                                EmailAnalytics.record_send(
-                                    email=sub.email,
-                                    category=EmailAnalytics.CATEGORY_DAILY_QUESTION,
-                                    subject=f"Daily Question #{question.question_number}: {question.topic_category or 'Civic'}",
-                                    question_subscriber_id=sub.id,
-                                    daily_question_id=question.id
-                                )
-                            except Exception as analytics_error:
-                                logger.warning(f"Failed to record analytics for {sub.email}: {analytics_error}")
+                    for sub, payload in zip(built_subscribers, batch_emails):
+                        if self._send_with_retry(payload, use_rate_limit=True):
+                            results['sent'] += 1
+                            results['sent_ids'].append(sub.id)
                         else:
-                            individual_failed += 1
-                            # Permanently deactivate — bad address that blocks everyone else.
-                            try:
-                                sub.is_active = False
-                                sub.unsubscribe_reason = 'invalid_email'
-                                sub.unsubscribed_at = utcnow_naive()
-                                logger.warning(
-                                    f"Deactivated subscriber {sub.id} <{sub.email}> — "
-                                    f"individual send failed after batch 422; address is invalid."
-                                )
-                            except Exception as deactivate_err:
-                                logger.error(f"Failed to deactivate subscriber {sub.id}: {deactivate_err}")
-                    results['sent'] += individual_sent
-                    results['failed'] += individual_failed
+                            results['failed'] += 1
+                            results['invalid_ids'].append(sub.id)
+                            logger.warning(
+                                f"Subscriber {sub.id} <{sub.email}> failed an individual send "
+                                f"after batch 422; address is invalid."
+                            )
                     results['errors'].extend(batch_errors)
                 else:
                     results['sent'] += batch_result['sent']
                     results['failed'] += batch_result['failed']
                     results['errors'].extend(batch_errors)
-
-                # Update last_email_sent for successful batch sends
-                if batch_result['sent'] > 0:
-                    for subscriber in batch_subscribers:
-                        subscriber.last_email_sent = utcnow_naive()
-                        
-                        # Record analytics event for each successful send
-                        try:
-                            from app.lib.email_analytics import EmailAnalytics
-                            EmailAnalytics.record_send(
-                                email=subscriber.email,
-                                category=EmailAnalytics.CATEGORY_DAILY_QUESTION,
-                                subject=f"Daily Question #{question.question_number}: {question.topic_category or 'Civic'}",
-                                question_subscriber_id=subscriber.id,
-                                daily_question_id=question.id
-                            )
-                        except Exception as analytics_error:
-                            logger.warning(f"Failed to record analytics for {subscriber.email}: {analytics_error}")
+                    if batch_result['sent'] > 0:
+                        results['sent_ids'].extend(sub.id for sub in built_subscribers)
 
             processed += len(batch_subscribers)
 
@@ -1134,12 +1108,6 @@ class ResendEmailClient:
                 f"{results['sent']} sent, {results['failed']} failed of {total}"
             )
 
-        # Commit last_email_sent updates
-        try:
-            db.session.commit()
-        except Exception as e:
-            logger.error(f"Failed to commit last_email_sent updates: {e}")
-
         return results
 
 
@@ -1832,11 +1800,14 @@ def send_daily_question_to_all_subscribers() -> int:
     Send today's daily question to all active subscribers using batch API.
     Drop-in replacement for email_utils.send_daily_question_to_all_subscribers
 
+    Streams subscribers in keyset pages and resumes an interrupted send for
+    the same question (see app.daily.email_send).
+
     Returns:
         int: Number of emails successfully sent
     """
-    from app.models import DailyQuestion, DailyQuestionSubscriber
-    from app import db
+    from app.daily.email_send import send_daily_question_emails
+    from app.models import DailyQuestion
 
     # Get today's question
     question = DailyQuestion.get_today()
@@ -1844,103 +1815,14 @@ def send_daily_question_to_all_subscribers() -> int:
         logger.info("No daily question to send - none published for today")
         return 0
 
-    # Get all active subscribers with 'daily' frequency (filter for weekly digest feature)
-    total_subscribers = DailyQuestionSubscriber.query.filter_by(
-        is_active=True,
-        email_frequency='daily'
-    ).count()
-
-    if total_subscribers == 0:
-        logger.info("No active daily frequency subscribers to send daily question to")
-        return 0
-
-    logger.info(
-        f"Starting daily question #{question.question_number} send to {total_subscribers} daily frequency subscribers "
-        f"(using batch API for efficiency)"
-    )
-
-    start_time = time.time()
-    
     try:
         client = get_resend_client()
     except Exception as e:
         logger.error(f"Failed to initialize Resend client: {e}")
         return 0
 
-    # Process in chunks to manage memory
-    CHUNK_SIZE = 500
-    total_sent = 0
-    total_failed = 0
-    skipped_duplicates = 0
-    offset = 0
-
-    while True:
-        # Get chunk of subscribers (filtered by daily frequency)
-        subscribers = DailyQuestionSubscriber.query.filter_by(
-            is_active=True,
-            email_frequency='daily'
-        ).order_by(DailyQuestionSubscriber.id)\
-            .offset(offset)\
-            .limit(CHUNK_SIZE)\
-            .all()
-
-        if not subscribers:
-            break
-
-        # Filter out subscribers who already received today's email (duplicate prevention)
-        eligible_subscribers = []
-        for subscriber in subscribers:
-            if subscriber.can_receive_email():
-                eligible_subscribers.append(subscriber)
-            else:
-                skipped_duplicates += 1
-        
-        if not eligible_subscribers:
-            offset += CHUNK_SIZE
-            continue
-
-        # Refresh magic tokens and ensure stable unsubscribe tokens for this chunk
-        for subscriber in eligible_subscribers:
-            subscriber.generate_magic_token()
-            subscriber.ensure_unsubscribe_token()
-        
-        try:
-            db.session.commit()
-        except Exception as e:
-            logger.error(f"Failed to generate magic tokens: {e}")
-            db.session.rollback()
-            offset += CHUNK_SIZE
-            continue
-
-        # Send batch
-        results = client.send_daily_question_batch(eligible_subscribers, question)
-        total_sent += results['sent']
-        total_failed += results['failed']
-
-        if results['errors']:
-            for error in results['errors'][:5]:  # Log first 5 errors
-                logger.warning(f"Batch error: {error}")
-
-        offset += CHUNK_SIZE
-
-        # Progress log
-        elapsed = time.time() - start_time
-        rate = total_sent / elapsed if elapsed > 0 else 0
-        logger.info(
-            f"Progress: {total_sent} sent, {total_failed} failed "
-            f"({rate:.1f} emails/sec)"
-        )
-
-    elapsed_total = time.time() - start_time
-    final_rate = total_sent / elapsed_total if elapsed_total > 0 else 0
-
-    logger.info(
-        f"Daily question #{question.question_number} complete: "
-        f"{total_sent} sent, {total_failed} failed, {skipped_duplicates} skipped (already sent) "
-        f"of {total_subscribers} in {elapsed_total:.1f} seconds ({final_rate:.1f} emails/sec)"
-    )
-
-    return total_sent
+    results = send_daily_question_emails(question, client=client)
+    return results['sent']
 
 
 def send_journey_reminder_email(
@@ -1,5 +1,5 @@
 import stripe
-from flask import Blueprint, render_template, request, jsonify, Response, current_app, url_for, abort, send_file, make_response, send_from_directory, redirect, flash
+from flask import Blueprint, render_template, request, jsonify, Response, current_app, url_for, abort, make_response, send_from_directory, redirect, flash
 from flask_login import login_required, current_user
 from app.models import Discussion, IndividualProfile, CompanyProfile, DailyQuestion, DailyBrief, Programme, User
 from app.programmes.journey import (
@@ -11,7 +11,16 @@ from app.programmes.journey import (
 from app import cache, db, limiter
 from datetime import datetime, date
 from slugify import slugify
-from app.seo import generate_sitemap, get_base_url as seo_get_base_url
+from app.seo import (
+    SITEMAP_INDEX_NAME,
+    SITEMAP_RETRY_AFTER_SECONDS,
+    SITEMAP_SECTION_NAMES,
+    SitemapUnavailable,
+    generate_sitemap,
+    get_base_url as seo_get_base_url,
+    get_sitemap_document,
+    sitemap_shard_name,
+)
 try:
     from replit.object_storage import Client
     from replit.object_storage.errors import ObjectNotFoundError
@@ -23,7 +32,7 @@ from sqlalchemy.orm import joinedload
 from app.lib.time import utcnow_naive
 from app.lib.url_utils import safe_next_url
 from app.lib.locale_utils import language_preference_cookie_params
-import io
+from app.lib.storage_cache import serve_cached
 import mimetypes
 import os
 import time
@@ -31,6 +40,8 @@ from flask_babel import gettext as _
 
 main_bp = Blueprint('main', __name__)
 asset_client = Client() if Client is not None else None
+# Assets can be re-uploaded under the same key; match their browser max-age.
+STATIC_ASSET_CACHE_TTL_SECONDS = 3600
 
 def init_routes(app):
     app.register_blueprint(main_bp)
@@ -350,13 +361,39 @@ def _serve_object_storage_asset(filename):
 
     storage_path = f"static_assets/{filename}"
 
+    mime_type, __ = mimetypes.guess_type(filename)
+    if not mime_type:
+        mime_type = 'application/octet-stream'
+
+    try:
+        response = serve_cached(
+            storage_path,
+            lambda: _download_object_storage_asset(storage_path),
+            mimetype=mime_type,
+            download_name=os.path.basename(filename),
+            cache_control='public, max-age=3600',
+            ttl_seconds=STATIC_ASSET_CACHE_TTL_SECONDS,
+        )
+    except _AssetUnavailable:
+        return Response("Service unavailable", status=503)
+
+    if response is None:
+        current_app.logger.info(f"Asset not found in storage: {storage_path}")
+        abort(404)
+    return response
+
+
+class _AssetUnavailable(Exception):
+    """Object storage could not be reached for an asset."""
+
+
+def _download_object_storage_asset(storage_path):
+    """Download an asset, retrying transient errors; raises _AssetUnavailable."""
     max_attempts = 3
     last_error = None
     for attempt in range(max_attempts):
         try:
-            file_data = asset_client.download_as_bytes(storage_path)
-            last_error = None
-            break
+            return asset_client.download_as_bytes(storage_path)
         except ObjectNotFoundError:
             current_app.logger.warning(f"Asset not found in storage: {storage_path}")
             abort(404)
@@ -371,30 +408,10 @@ def _serve_object_storage_asset(filename):
                 continue
             # Non-transient error — log and bail immediately
             current_app.logger.error(f"Error fetching asset {storage_path}: {error}")
-            return Response("Service unavailable", status=503)
+            raise _AssetUnavailable(storage_path) from error
 
-    if last_error is not None:
-        current_app.logger.warning(f"Transient error fetching asset {storage_path} after {max_attempts} attempts: {last_error}")
-        return Response("Service unavailable", status=503)
-
-    if not file_data:
-        current_app.logger.info(f"Asset not found in storage: {storage_path}")
-        abort(404)
-
-    mime_type, __ = mimetypes.guess_type(filename)
-    if not mime_type:
-        mime_type = 'application/octet-stream'
-
-    response = make_response(
-        send_file(
-            io.BytesIO(file_data),
-            mimetype=mime_type,
-            as_attachment=False,
-            download_name=os.path.basename(filename)
-        )
-    )
-    response.headers['Cache-Control'] = 'public, max-age=3600'
-    return response
+    current_app.logger.warning(f"Transient error fetching asset {storage_path} after {max_attempts} attempts: {last_error}")
+    raise _AssetUnavailable(storage_path) from last_error
 
 
 @main_bp.route('/favicon.ico')
@@ -458,16 +475,37 @@ def faq():
 
 @main_bp.route('/sitemap.xml')
 def sitemap():
-    """Serve the sitemap.xml file"""
+    """Serve the sitemap index (pre-generated shards; see app.seo.refresh_sitemaps)."""
+    return _serve_sitemap_document(SITEMAP_INDEX_NAME)
+
+
+@main_bp.route('/sitemap-<section>-<int:page>.xml')
+def sitemap_shard(section, page):
+    """Serve one pre-generated sitemap shard listed in the index."""
+    if section not in SITEMAP_SECTION_NAMES or page < 1:
+        abort(404)
+    return _serve_sitemap_document(sitemap_shard_name(section, page))
+
+
+def _serve_sitemap_document(name):
     try:
-        sitemap_xml = generate_sitemap()
-        response = Response(sitemap_xml, mimetype='application/xml')
-        response.headers['X-Robots-Tag'] = 'noarchive'  # Allow Google to crawl but not cache
-        response.headers['Cache-Control'] = 'public, max-age=3600'  # Cache for 1 hour
+        document = get_sitemap_document(name)
+    except SitemapUnavailable:
+        response = Response("Sitemap is being generated", status=503, mimetype='text/plain')
+        response.headers['Retry-After'] = str(SITEMAP_RETRY_AFTER_SECONDS)
         return response
     except Exception as e:
         current_app.logger.error(f"Error generating sitemap: {e}")
         return Response("Error generating sitemap", status=500)
+    if document is None:
+        abort(404)
+    response = Response(document.body, mimetype='application/xml')
+    response.set_etag(document.etag)
+    if document.lastmod:
+        response.last_modified = datetime.combine(document.lastmod, datetime.min.time())
+    response.headers['X-Robots-Tag'] = 'noarchive'  # Allow Google to crawl but not cache
+    response.headers['Cache-Control'] = 'public, max-age=3600'  # Cache for 1 hour
+    return response.make_conditional(request)
 
 
 
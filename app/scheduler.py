@@ -16,10 +16,11 @@ from apscheduler.events import (
     EVENT_JOB_ERROR, EVENT_JOB_MISSED,
     EVENT_JOB_SUBMITTED, EVENT_JOB_EXECUTED,
 )
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from app.lib.time import utcnow_naive
 import logging
 import threading
+import time
 import atexit
 import signal
 import os
@@ -124,6 +125,57 @@ def _on_job_done(event):
     """Remove a job from the running set when it finishes (success, error, or missed)."""
     with _running_jobs_lock:
         _running_jobs.discard(event.job_id)
+        rerun = event.job_id in _pending_wakeups
+        _pending_wakeups.discard(event.job_id)
+    if rerun:
+        _run_job_now(event.job_id)
+
+
+# Queue wakeups (app.lib.queue_wakeup) mapped to the job that consumes the
+# queue; filled by init_scheduler() for the queues this process handles.
+_wakeup_jobs: dict[str, str] = {}
+# Jobs woken while already running: run once more when the current run ends,
+# since that run may have claimed its work before the new job was enqueued.
+_pending_wakeups: set = set()
+_WAKEUP_WAIT_SECONDS = 30
+
+
+def _run_job_now(job_id: str) -> None:
+    try:
+        scheduler.modify_job(job_id, next_run_time=datetime.now(timezone.utc))
+    except Exception as e:
+        logger.debug(f"Could not wake job {job_id}: {e}")
+
+
+def _wake_job(job_id: str) -> None:
+    with _running_jobs_lock:
+        if job_id in _running_jobs:
+            _pending_wakeups.add(job_id)
+            return
+    _run_job_now(job_id)
+
+
+def _start_wakeup_listener():
+    """Start the daemon thread that runs queue consumers when producers notify."""
+    if not _wakeup_jobs:
+        return None
+
+    def _listen():
+        from app.lib.queue_wakeup import wait_for_wakeup
+
+        while not _shutting_down and scheduler is not None and scheduler.running:
+            try:
+                queue = wait_for_wakeup(list(_wakeup_jobs), timeout=_WAKEUP_WAIT_SECONDS)
+            except Exception as e:
+                logger.warning(f"Queue wakeup listener error: {e}")
+                time.sleep(_WAKEUP_WAIT_SECONDS)
+                continue
+            if queue in _wakeup_jobs:
+                _wake_job(_wakeup_jobs[queue])
+
+    listener = threading.Thread(target=_listen, daemon=True, name="scheduler-queue-wakeup")
+    listener.start()
+    return listener
 
 
 def _ops_alert_fingerprint(message: str) -> str:
@@ -412,7 +464,8 @@ def init_scheduler(app):
             logger.info("Automated clustering task complete")
 
 
-    @scheduler.scheduled_job('interval', minutes=1, id='process_consensus_job_queue', max_instances=1, coalesce=True)
+    # Woken by enqueue_consensus_job() via app.lib.queue_wakeup; the interval is a safety net.
+    @scheduler.scheduled_job('interval', minutes=5, id='process_consensus_job_queue', max_instances=1, coalesce=True)
     def process_consensus_job_queue():
         """
         Process queued consensus jobs.
@@ -440,7 +493,8 @@ def init_scheduler(app):
                 logger.warning(f"Marked {stale_count} consensus jobs as stale")
 
 
-    @scheduler.scheduled_job('interval', minutes=1, id='process_programme_export_queue', max_instances=1, coalesce=True)
+    # Woken by enqueue_programme_export_job(); the interval is a safety net.
+    @scheduler.scheduled_job('interval', minutes=5, id='process_programme_export_queue', max_instances=1, coalesce=True)
     def process_programme_export_queue():
         """Process queued async programme export jobs."""
         if not app.config.get('EXPORT_QUEUE_PROCESS_IN_SCHEDULER', False):
@@ -452,6 +506,7 @@ def init_scheduler(app):
                 logger.info("Processed one programme export job from queue")
 
 
+    # Woken by enqueue_partner_event(); stays at 1 minute for the retry backoff's first step.
     @scheduler.scheduled_job('interval', minutes=1, id='process_partner_webhook_queue', max_instances=1, coalesce=True)
     def process_partner_webhook_queue():
         """Process queued partner webhook deliveries with retry backoff."""
@@ -465,6 +520,19 @@ def init_scheduler(app):
                 logger.exception("Unexpected error in process_partner_webhook_queue")
 
 
+    @scheduler.scheduled_job('interval', seconds=10, id='process_email_webhook_queue', max_instances=1, coalesce=True)
+    def process_email_webhook_queue():
+        """Record queued Resend webhook events in batches."""
+        with app.app_context():
+            try:
+                from app.lib.email_webhook_queue import process_webhook_queue
+                processed = process_webhook_queue()
+                if processed:
+                    logger.info("Processed %s queued Resend webhooks", processed)
+            except Exception:
+                logger.exception("Unexpected error in process_email_webhook_queue")
+
+
     @scheduler.scheduled_job('interval', minutes=5, id='mark_stale_programme_export_jobs', max_instances=1, coalesce=True)
     def mark_stale_programme_export_jobs_job():
         """Mark timed-out running programme export jobs as stale."""
@@ -497,12 +565,72 @@ def init_scheduler(app):
 
     @scheduler.scheduled_job('interval', minutes=15, id='rollup_analytics_daily', max_instances=1, coalesce=True)
     def rollup_analytics_daily_job():
-        """Refresh curated analytics aggregates from immutable raw event stream."""
+        """Fold new raw analytics events into the curated daily aggregates."""
+        with app.app_context():
+            from app.analytics.events import rollup_analytics_incremental
+            try:
+                rows = rollup_analytics_incremental()
+                if rows:
+                    logger.info(f"Updated analytics daily aggregates ({rows} grouped rows)")
+            except Exception as e:
+                logger.error(f"Analytics daily rollup failed: {e}", exc_info=True)
+
+
+    @scheduler.scheduled_job('interval', minutes=5, id='rollup_email_events', max_instances=1, coalesce=True)
+    def rollup_email_events_job():
+        """Fold new email events into the hourly and per-recipient email rollups."""
+        with app.app_context():
+            from app.lib.email_rollup import rollup_email_events_incremental
+            try:
+                folded = rollup_email_events_incremental()
+                if folded:
+                    logger.info(f"Folded {folded} email events into email analytics rollups")
+            except Exception as e:
+                logger.error(f"Email events rollup failed: {e}", exc_info=True)
+
+
+    @scheduler.scheduled_job('cron', hour=4, minute=15, id='rollup_analytics_daily_repair', max_instances=1, coalesce=True, misfire_grace_time=3600)
+    def rollup_analytics_daily_repair_job():
+        """Nightly exact rebuild of the last two days of analytics aggregates."""
         with app.app_context():
             from app.analytics.events import rollup_analytics_daily
-            rows = rollup_analytics_daily(days_back=14)
-            if rows:
-                logger.info(f"Refreshed analytics daily aggregates ({rows} grouped rows)")
+            try:
+                rows = rollup_analytics_daily(days_back=2)
+                logger.info(f"Rebuilt analytics daily aggregates ({rows} grouped rows)")
+            except Exception as e:
+                logger.error(f"Analytics daily repair failed: {e}", exc_info=True)
+
+
+    @scheduler.scheduled_job('interval', seconds=30, id='flush_brief_tracking_events', max_instances=1, coalesce=True)
+    def flush_brief_tracking_events_job():
+        """Write buffered briefing open/click events and their counter deltas."""
+        with app.app_context():
+            from app.briefing.tracking_buffer import flush_tracking_events
+            try:
+                totals = flush_tracking_events()
+                if totals['opens'] or totals['clicks']:
+                    logger.info(
+                        f"Flushed brief tracking: {totals['opens']} opens "
+                        f"({totals['unique_opens']} unique), {totals['clicks']} clicks"
+                    )
+            except Exception as e:
+                logger.error(f"Brief tracking flush failed: {e}")
+
+
+    @scheduler.scheduled_job('interval', minutes=30, id='refresh_sitemaps', max_instances=1, coalesce=True)
+    def refresh_sitemaps_job():
+        """Re-render changed sitemap sections into the stored index and shards."""
+        with app.app_context():
+            from app.seo import refresh_sitemaps
+            try:
+                result = refresh_sitemaps()
+                if result['rebuilt']:
+                    logger.info(
+                        f"Sitemaps refreshed: rebuilt {', '.join(result['rebuilt'])} "
+                        f"({result['urls']} URLs in {result['shards']} shards)"
+                    )
+            except Exception as e:
+                logger.error(f"Sitemap refresh failed: {e}")
 
 
     @scheduler.scheduled_job('interval', minutes=10, id='statement_counter_reconciliation', max_instances=1, coalesce=True)
@@ -541,6 +669,61 @@ def init_scheduler(app):
                 logger.error(f"Statement counter reconciliation failed: {e}", exc_info=True)
     
     
+    @scheduler.scheduled_job('cron', hour=2, minute=30, id='programme_vote_rollup_reconciliation', max_instances=1, coalesce=True, misfire_grace_time=3600)
+    def programme_vote_rollup_reconciliation():
+        """
+        Nightly exact rebuild of programme vote rollups.
+        Absorbs drift the vote-path deltas cannot see (deleted or moderated
+        statements, merged anonymous votes, discussions moving programme).
+        """
+        with app.app_context():
+            from app import db
+            from app.programmes.vote_rollup import reconcile_programme_vote_rollups
+            try:
+                rebuilt = reconcile_programme_vote_rollups()
+                logger.info(f"Programme vote rollups rebuilt for {rebuilt} programmes")
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Programme vote rollup reconciliation failed: {e}", exc_info=True)
+
+
+    @scheduler.scheduled_job('interval', minutes=10, id='discussion_stats_stale_refresh', max_instances=1, coalesce=True)
+    def discussion_stats_stale_refresh():
+        """
+        Recompute discussion stats rows flagged stale by moderation, statement
+        deletion or vote removal, so reads go back to the O(1) path.
+        """
+        with app.app_context():
+            from app import db
+            from app.discussions.discussion_stats import reconcile_discussion_stats
+            try:
+                refreshed = reconcile_discussion_stats(stale_only=True)
+                if refreshed:
+                    logger.info(f"Discussion stats refreshed for {refreshed} stale discussions")
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Discussion stats stale refresh failed: {e}", exc_info=True)
+
+
+    @scheduler.scheduled_job('cron', hour=2, minute=45, id='discussion_stats_reconciliation', max_instances=1, coalesce=True, misfire_grace_time=3600)
+    def discussion_stats_reconciliation():
+        """
+        Nightly exact recount of every discussion's maintained stats.
+        Absorbs drift the vote-path deltas cannot see (merged anonymous votes,
+        concurrent first votes) and builds rows for discussions that lack one.
+        """
+        with app.app_context():
+            from app import db
+            from app.discussions.discussion_stats import reconcile_discussion_stats
+            try:
+                drifted = reconcile_discussion_stats()
+                if drifted:
+                    logger.warning(f"Discussion stats reconciliation repaired {drifted} discussions")
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Discussion stats reconciliation failed: {e}", exc_info=True)
+
+
     @scheduler.scheduled_job('cron', hour=3, id='cleanup_old_analyses', max_instances=1, coalesce=True, misfire_grace_time=3600)
     def cleanup_old_consensus_analyses():
         """
@@ -550,7 +733,7 @@ def init_scheduler(app):
         with app.app_context():
             from app import db
             from app.models import (
-                ConsensusAnalysis, Discussion, NewsArticle, TrendingTopic, 
+                Discussion, NewsArticle, TrendingTopic,
                 TrendingTopicArticle, DiscussionSourceArticle, BriefItem
             )
             from datetime import timedelta
@@ -674,33 +857,12 @@ def init_scheduler(app):
             
             logger.info("Starting cleanup of old consensus analyses")
             
-            # Only get discussion IDs that have analyses to clean up (more efficient)
-            discussion_ids_with_analyses = db.session.query(
-                ConsensusAnalysis.discussion_id
-            ).group_by(ConsensusAnalysis.discussion_id).having(
-                db.func.count(ConsensusAnalysis.id) > 10
-            ).all()
-            
-            for (discussion_id,) in discussion_ids_with_analyses:
-                try:
-                    # Get all analyses for this discussion
-                    analyses = ConsensusAnalysis.query.filter_by(
-                        discussion_id=discussion_id
-                    ).order_by(ConsensusAnalysis.created_at.desc()).all()
-                    
-                    # Keep only 10 most recent
-                    if len(analyses) > 10:
-                        to_delete = analyses[10:]
-                        for analysis in to_delete:
-                            db.session.delete(analysis)
-                        
-                        db.session.commit()
-                        logger.info(f"Deleted {len(to_delete)} old analyses for discussion {discussion_id}")
-                    
-                except Exception as e:
-                    logger.error(f"Error cleaning up analyses for discussion {discussion_id}: {e}")
-                    db.session.rollback()
-                    continue
+            from app.discussions.jobs import prune_consensus_analyses
+            participants_deleted, analyses_deleted = prune_consensus_analyses()
+            logger.info(
+                f"Pruned participant arrays for {participants_deleted} analyses; "
+                f"deleted {analyses_deleted} old analyses"
+            )
 
             # Clean up old news perspective cache entries (keep last 7 days)
             try:
@@ -1645,50 +1807,28 @@ def init_scheduler(app):
         """Run email send in background thread with its own app context"""
         try:
             with app_instance.app_context():
-                # Use new Resend client with batch API for faster sending
-                from app.resend_client import get_resend_client
-                from app.models import DailyQuestion, DailyQuestionSubscriber
-                
+                from app.daily.email_send import send_daily_question_emails
+                from app.models import DailyQuestion
+
                 logger.info("Background thread: Starting daily question email send (via Resend)")
-                
+
                 # Get today's question
                 question = DailyQuestion.get_today()
                 if not question:
                     logger.info("No daily question to send - none published for today")
                     return
-                
-                # Filter to only daily frequency subscribers who have NOT already received
-                # an email today (UTC).  This prevents double-sends on scheduler restart:
-                # the job has misfire_grace_time=3600, so if the scheduler restarts
-                # within an hour of 7:30 UTC the job fires again.  The DB-level check
-                # (last_email_sent date) is the idempotency guard.
-                from datetime import date as _date
-                from sqlalchemy import or_
-                today_utc = _date.today()
-                today_utc_start = datetime(today_utc.year, today_utc.month, today_utc.day)
-                daily_subscribers = DailyQuestionSubscriber.query.filter_by(
-                    is_active=True,
-                    email_frequency='daily'
-                ).filter(
-                    or_(
-                        DailyQuestionSubscriber.last_email_sent.is_(None),
-                        DailyQuestionSubscriber.last_email_sent < today_utc_start
-                    )
-                ).all()
-                
-                logger.info(f"Found {len(daily_subscribers)} daily frequency subscribers (not yet sent today)")
-                
-                if not daily_subscribers:
-                    logger.info("No daily frequency subscribers to send to")
-                    return
-                
-                # Send to daily subscribers using batch API
-                client = get_resend_client()
-                result = client.send_daily_question_batch(daily_subscribers, question)
-                
+
+                # Streams daily subscribers in keyset pages and checkpoints each
+                # page, so a restart mid-send resumes instead of starting over.
+                # last_email_sent (not yet sent today, UTC) remains the
+                # per-subscriber idempotency guard: the job has
+                # misfire_grace_time=3600 and may fire twice around a restart.
+                result = send_daily_question_emails(question)
+
                 logger.info(
-                    f"Background thread: Sent daily question to {result['sent']} subscribers, "
-                    f"{result['failed']} failed"
+                    f"Background thread: Daily question send {result['status']}: "
+                    f"{result['sent']} sent, {result['failed']} failed "
+                    f"({result['emails_per_second']:.1f} emails/sec)"
                 )
         except Exception as e:
             logger.error(f"Background thread: Daily question email error: {e}", exc_info=True)
@@ -1735,6 +1875,36 @@ def init_scheduler(app):
         logger.info("Daily question email thread launched, scheduler continuing")
 
 
+    @scheduler.scheduled_job('interval', minutes=10, id='daily_question_email_resume', max_instances=1, coalesce=True)
+    def daily_question_email_resume():
+        """
+        Resume today's daily question send if a worker died mid-run.
+        Only acts on an unfinished run whose lease has lapsed; the send itself
+        continues from the checkpointed subscriber id.
+        """
+        if not _is_production_environment():
+            return
+        if _email_send_in_progress.is_set():
+            return
+
+        with app.app_context():
+            from app.daily.email_send import pending_send_run
+            from app.models import DailyQuestion
+
+            question = DailyQuestion.get_today()
+            if not question or pending_send_run(question.id) is None:
+                return
+
+        _email_send_in_progress.set()
+        logger.warning("Resuming interrupted daily question email send")
+        threading.Thread(
+            target=_run_email_send_in_thread,
+            args=(app,),
+            daemon=True,
+            name="daily-email-sender-resume"
+        ).start()
+
+
     @scheduler.scheduled_job('cron', minute=0, id='send_journey_reminders', max_instances=1, coalesce=True, misfire_grace_time=3600)
     def send_journey_reminders_job():
         """
@@ -2695,11 +2865,13 @@ def init_scheduler(app):
                 logger.error(f"Daily brief safety-net-2 failed: {e}", exc_info=True)
                 _send_ops_alert(f"CRITICAL: Daily brief safety-net-2 raised an unhandled error: {e}")
 
-    @scheduler.scheduled_job('interval', seconds=15, id='check_emergency_brief_generate')
+    # Woken by the admin emergency-generate action; the interval is a safety net.
+    @scheduler.scheduled_job('interval', seconds=60, id='check_emergency_brief_generate')
     def check_emergency_brief_generate_job():
         """
         Check for emergency brief generation requests queued via admin dashboard.
-        Runs every 5 seconds. The actual pipeline work happens here in the scheduler
+        Runs as soon as one is queued, and every minute as a safety net.
+        The actual pipeline work happens here in the scheduler
         thread, avoiding gunicorn worker timeouts.
         """
         with app.app_context():
@@ -2978,11 +3150,12 @@ def init_scheduler(app):
                 logger.error(f"Weekly brief generation failed: {e}", exc_info=True)
 
 
-    @scheduler.scheduled_job('interval', seconds=10, id='process_extraction_queue')
+    # Woken on upload / retry via app.lib.queue_wakeup; the interval is a safety net.
+    @scheduler.scheduled_job('interval', seconds=60, id='process_extraction_queue')
     def process_extraction_queue_job():
         """
         Process pending PDF/DOCX extraction jobs.
-        Runs every 10 seconds to process uploads quickly.
+        Runs as soon as an upload is queued, and every minute as a safety net.
         """
         with app.app_context():
             from app.briefing.ingestion.extraction_queue import process_extraction_queue
@@ -2995,11 +3168,12 @@ def init_scheduler(app):
                     "See scheduler logs for traceback."
                 )
 
-    @scheduler.scheduled_job('interval', seconds=10, id='process_brief_generation_queue')
+    # Woken by queue_brief_generation(); 30s also picks up retries (30s backoff base).
+    @scheduler.scheduled_job('interval', seconds=30, id='process_brief_generation_queue')
     def process_brief_generation_queue_job():
         """
         Process pending brief generation jobs.
-        Runs every 3 seconds for responsive user experience.
+        Runs as soon as a job is queued, and every 30 seconds for retries.
         """
         with app.app_context():
             from app.briefing.jobs import process_pending_jobs
@@ -3012,7 +3186,8 @@ def init_scheduler(app):
                     "See scheduler logs for traceback."
                 )
 
-    @scheduler.scheduled_job('interval', seconds=15, id='process_source_ingestion_queue')
+    # Woken by queue_ingestion_job(); the interval is a safety net.
+    @scheduler.scheduled_job('interval', seconds=60, id='process_source_ingestion_queue')
     def process_source_ingestion_queue_job():
         """
         Process queued briefing source ingestion jobs with backpressure controls.
@@ -4139,6 +4314,30 @@ def init_scheduler(app):
                 logger.error(f"Polymarket matching failed: {e}", exc_info=True)
 
 
+    from app.lib.queue_wakeup import (
+        QUEUE_BRIEF_GENERATION,
+        QUEUE_CONSENSUS,
+        QUEUE_EMERGENCY_BRIEF,
+        QUEUE_EXTRACTION,
+        QUEUE_PARTNER_WEBHOOKS,
+        QUEUE_PROGRAMME_EXPORT,
+        QUEUE_SOURCE_INGESTION,
+    )
+    _wakeup_jobs.update({
+        QUEUE_EXTRACTION: 'process_extraction_queue',
+        QUEUE_BRIEF_GENERATION: 'process_brief_generation_queue',
+        QUEUE_SOURCE_INGESTION: 'process_source_ingestion_queue',
+        QUEUE_EMERGENCY_BRIEF: 'check_emergency_brief_generate',
+        QUEUE_PARTNER_WEBHOOKS: 'process_partner_webhook_queue',
+    })
+    # Only claim consensus/export tokens when this process runs those queues;
+    # otherwise the dedicated worker must receive them.
+    if app.config.get('CONSENSUS_QUEUE_PROCESS_IN_SCHEDULER', False) and \
+            app.config.get('CONSENSUS_ALLOW_IN_PROCESS_EXECUTION', False):
+        _wakeup_jobs[QUEUE_CONSENSUS] = 'process_consensus_job_queue'
+    if app.config.get('EXPORT_QUEUE_PROCESS_IN_SCHEDULER', False):
+        _wakeup_jobs[QUEUE_PROGRAMME_EXPORT] = 'process_programme_export_queue'
+
     logger.info("Scheduler initialized with jobs:")
     for job in scheduler.get_jobs():
         logger.info(f"  - {job.id}: {job.trigger}")
@@ -4228,7 +4427,18 @@ def start_scheduler():
         # so it never restarts mid-execution (email send, brief generation, etc.)
         scheduler.add_listener(_on_job_submitted, EVENT_JOB_SUBMITTED)
         scheduler.add_listener(_on_job_done, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED)
+        dispatched = []
+        if _app is not None and _app.config.get('SCHEDULER_DISPATCH_ENABLED', False):
+            # Long jobs run on scripts/run_job_worker.py processes (app.lib.job_dispatch).
+            from app.lib.job_dispatch import install as _install_job_dispatch
+            dispatched = _install_job_dispatch(scheduler)
+            logger.info(f"Dispatching {len(dispatched)} jobs to job workers: {', '.join(dispatched)}")
+        # Per-job duration / lag / query-count histograms (app.lib.scheduler_metrics).
+        # Dispatched jobs are measured where they actually run (job_dispatch.run_with_history).
+        from app.lib.scheduler_metrics import instrument as _instrument_jobs
+        _instrument_jobs(scheduler, skip=dispatched)
         scheduler.start()
+        _start_wakeup_listener()
         logger.info("Scheduler started with shutdown handlers and running-job trackers")
         # Run startup recovery in a background thread so it doesn't block scheduler start.
         # This catches any 'ready' briefs that were missed if the scheduler restarted
@@ -3,6 +3,10 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import secrets
+import threading
 from dataclasses import dataclass
 from datetime import date, datetime
 from typing import Iterator, Optional, Sequence
@@ -11,6 +15,7 @@ from xml.sax.saxutils import escape as xml_escape
 from flask import current_app, has_request_context, request, url_for
 
 from app.discussions.query_utils import crawlable_discussions_query
+from app.lib.cpu_offload import offload
 from app.models import (
     Briefing,
     DailyBrief,
@@ -390,6 +395,175 @@ def generate_sitemap() -> str:
             len(entries),
         )
 
+    return offload('sitemap', _render_urlset, entries).decode('utf-8')
+
+
+# ---------------------------------------------------------------------------
+# Sitemap index: per-section, per-shard documents pre-generated off-request
+# ---------------------------------------------------------------------------
+#
+# ``refresh_sitemaps`` (scheduler job) renders each section into shards of at
+# most ``SITEMAP_SHARD_SIZE`` URLs and stores the XML bytes plus a strong ETag
+# in Redis. /sitemap.xml serves the index and /sitemap-<section>-<n>.xml the
+# shards straight from storage, so crawler hits never query content tables.
+# A section is only re-rendered when its cheap signature (row counts and
+# latest timestamps) moves, with a forced full pass every
+# ``_SITEMAP_FULL_REFRESH_HOURS``.
+#
+# URLs are de-duplicated within each section only. The sections cover
+# disjoint routes (fixed pages vs. per-row detail pages), so this matches
+# the single-document sitemap's global de-duplication.
+#
+# A cold store is rebuilt inline by at most one request at a time
+# (``_SITEMAP_REFRESH_LOCK_KEY``); the others serve whatever copy is still
+# stored, or ``SitemapUnavailable`` (503 + Retry-After) if there is none.
+
+SITEMAP_SHARD_SIZE = 10_000
+_SITEMAP_FULL_REFRESH_HOURS = 24
+_SITEMAP_STORE_TTL_SECONDS = 7 * 24 * 3600
+_SITEMAP_KEY_PREFIX = 'sitemap:v1:'
+_SITEMAP_META_KEY = f'{_SITEMAP_KEY_PREFIX}meta'
+SITEMAP_INDEX_NAME = 'index'
+_SITEMAP_REFRESH_LOCK_KEY = f'{_SITEMAP_KEY_PREFIX}refresh_lock'
+# Longer than a full rebuild takes; frees itself if the builder dies.
+_SITEMAP_REFRESH_LOCK_SECONDS = 300
+SITEMAP_RETRY_AFTER_SECONDS = 120
+
+
+class SitemapUnavailable(Exception):
+    """The sitemap is being (re)built elsewhere and no stored copy exists."""
+
+# Process-local fallback when Redis is not configured (local dev, tests
+# without the fake): same semantics, just not shared between workers.
+_local_sitemap_store: dict[str, bytes] = {}
+_local_refresh_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class SitemapDocument:
+    """A stored sitemap file: body plus the validators served with it."""
+
+    body: bytes
+    etag: str
+    lastmod: Optional[date] = None
+
+
+def _static_section_entries() -> Iterator[SitemapUrl]:
+    yield from _static_entries(
+        game_enabled=bool(current_app.config.get('GAME_ENABLED', True)),
+        self_serve_trial=bool(current_app.config.get('SELF_SERVE_TRIAL_ENABLED')),
+    )
+
+
+def _signature_of(*parts) -> str:
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def _aggregate_signature(query_columns, *filters) -> tuple:
+    from app import db
+
+    return tuple(db.session.query(*query_columns).filter(*filters).one())
+
+
+def _static_signature() -> str:
+    from app.game.services.quick_run_service import quick_run_pool
+
+    game_enabled = bool(current_app.config.get('GAME_ENABLED', True))
+    return _signature_of(
+        get_base_url(),
+        game_enabled,
+        bool(current_app.config.get('SELF_SERVE_TRIAL_ENABLED')),
+        [item.get('scenario_slug') for item in quick_run_pool(exclude_today=False)] if game_enabled else None,
+    )
+
+
+def _discussions_signature() -> str:
+    from sqlalchemy import func
+
+    from app.models import Statement
+
+    return _signature_of(
+        current_app.config.get('SITEMAP_MIN_STATEMENTS', _DISCUSSION_MIN_STATEMENTS),
+        _aggregate_signature((func.count(Discussion.id), func.max(Discussion.updated_at), func.max(Discussion.id))),
+        # Statements move discussions across the content floor without
+        # touching Discussion.updated_at.
+        _aggregate_signature((func.count(Statement.id), func.max(Statement.updated_at))),
+        # Programme visibility decides which discussions are crawlable.
+        _programmes_signature(),
+    )
+
+
+def _programmes_signature() -> str:
+    from sqlalchemy import func
+
+    return _signature_of(
+        _aggregate_signature((func.count(Programme.id), func.max(Programme.updated_at))),
+    )
+
+
+def _sources_signature() -> str:
+    from sqlalchemy import func
+
+    return _signature_of(
+        _aggregate_signature((func.count(NewsSource.id), func.max(NewsSource.updated_at))),
+    )
+
+
+def _briefs_signature() -> str:
+    from sqlalchemy import func
+
+    return _signature_of(
+        _aggregate_signature(
+            (func.count(DailyBrief.id), func.max(DailyBrief.id), func.max(DailyBrief.published_at)),
+            DailyBrief.status == 'published',
+        ),
+    )
+
+
+def _questions_signature() -> str:
+    from sqlalchemy import func
+
+    return _signature_of(
+        _aggregate_signature(
+            (func.count(DailyQuestion.id), func.max(DailyQuestion.id), func.max(DailyQuestion.published_at)),
+            DailyQuestion.status == 'published',
+        ),
+    )
+
+
+def _briefings_signature() -> str:
+    from sqlalchemy import func
+
+    return _signature_of(
+        _aggregate_signature(
+            (func.count(Briefing.id), func.max(Briefing.updated_at)),
+            Briefing.visibility == 'public',
+        ),
+    )
+
+
+# (section name, entry collector, signature) — order is the index order.
+_SITEMAP_SECTIONS = (
+    ('static', _static_section_entries, _static_signature),
+    ('discussions', _discussion_entries, _discussions_signature),
+    ('programmes', _programme_entries, _programmes_signature),
+    ('sources', _source_entries, _sources_signature),
+    ('briefs', _daily_brief_entries, _briefs_signature),
+    ('questions', _daily_question_entries, _questions_signature),
+    ('briefings', _public_briefing_entries, _briefings_signature),
+)
+SITEMAP_SECTION_NAMES = frozenset(name for name, _, _ in _SITEMAP_SECTIONS)
+
+
+def sitemap_shard_name(section: str, page: int) -> str:
+    return f'{section}-{page}'
+
+
+def _etag_for(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def _render_urlset(entries: Sequence[SitemapUrl]) -> bytes:
     xml_lines = [
         '<?xml version="1.0" encoding="UTF-8"?>',
         '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
@@ -397,4 +571,254 @@ def generate_sitemap() -> str:
     for entry in entries:
         xml_lines.extend(_render_url(entry))
     xml_lines.append('</urlset>')
-    return '\n'.join(xml_lines)
+    return '\n'.join(xml_lines).encode('utf-8')
+
+
+def _render_index(shards: Sequence[dict]) -> bytes:
+    base = get_base_url().rstrip('/')
+    xml_lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+    ]
+    for shard in shards:
+        loc = f"{base}/sitemap-{shard['name']}.xml"
+        xml_lines.append('  <sitemap>')
+        xml_lines.append(f'    <loc>{xml_escape(loc)}</loc>')
+        if shard.get('lastmod'):
+            xml_lines.append(f'    <lastmod>{shard["lastmod"]}</lastmod>')
+        xml_lines.append('  </sitemap>')
+    xml_lines.append('</sitemapindex>')
+    return '\n'.join(xml_lines).encode('utf-8')
+
+
+def _sitemap_store():
+    try:
+        from app.lib.redis_client import get_client
+        return get_client(decode_responses=False)
+    except Exception:  # noqa: BLE001 — storage wiring must not break crawling
+        return None
+
+
+def _store_get(client, key: str) -> Optional[bytes]:
+    if client is None:
+        return _local_sitemap_store.get(key)
+    try:
+        raw = client.get(key)
+    except Exception:  # noqa: BLE001
+        current_app.logger.warning('Sitemap store read failed for %s', key, exc_info=True)
+        return None
+    if isinstance(raw, str):
+        raw = raw.encode('utf-8')
+    return raw
+
+
+def _store_set(client, key: str, value: bytes) -> None:
+    if client is None:
+        _local_sitemap_store[key] = value
+        return
+    try:
+        client.set(key, value, ex=_SITEMAP_STORE_TTL_SECONDS)
+    except Exception:  # noqa: BLE001
+        current_app.logger.warning('Sitemap store write failed for %s', key, exc_info=True)
+
+
+def _store_delete(client, key: str) -> None:
+    if client is None:
+        _local_sitemap_store.pop(key, None)
+        return
+    try:
+        client.delete(key)
+    except Exception:  # noqa: BLE001
+        current_app.logger.warning('Sitemap store delete failed for %s', key, exc_info=True)
+
+
+def _load_meta(client) -> dict:
+    raw = _store_get(client, _SITEMAP_META_KEY)
+    if not raw:
+        return {}
+    try:
+        return json.loads(raw)
+    except (TypeError, ValueError):
+        return {}
+
+
+def _build_section(name: str, collector) -> list[tuple[str, bytes, Optional[date], int]]:
+    """Render one section into ``(shard_name, body, lastmod, url_count)`` shards."""
+    entries = _dedupe_entries(list(collector()))
+    shards = []
+    for page, offset in enumerate(range(0, max(len(entries), 1), SITEMAP_SHARD_SIZE), start=1):
+        chunk = entries[offset:offset + SITEMAP_SHARD_SIZE]
+        if not chunk and page > 1:
+            break
+        lastmods = [e.lastmod for e in chunk if e.lastmod]
+        shards.append((
+            sitemap_shard_name(name, page),
+            offload('sitemap', _render_urlset, chunk),
+            max(lastmods) if lastmods else None,
+            len(chunk),
+        ))
+    return shards
+
+
+def refresh_sitemaps(*, force: bool = False) -> dict:
+    """
+    Regenerate stale sitemap sections and the index into storage.
+
+    A section is re-rendered when its signature changed, its stored shards
+    are missing, ``force`` is set, or the last full pass is older than
+    ``_SITEMAP_FULL_REFRESH_HOURS``. Returns ``{'rebuilt': [...], 'urls': N,
+    'shards': N}``.
+    """
+    from app.lib.time import utcnow_naive
+
+    client = _sitemap_store()
+    meta = _load_meta(client)
+    now = utcnow_naive()
+    last_full = meta.get('full_refresh_at')
+    if last_full:
+        try:
+            age_hours = (now - datetime.fromisoformat(last_full)).total_seconds() / 3600
+            force = force or age_hours >= _SITEMAP_FULL_REFRESH_HOURS
+        except ValueError:
+            force = True
+    else:
+        force = True
+
+    sections_meta = meta.get('sections', {})
+    rebuilt: list[str] = []
+    orphaned: list[str] = []
+    for name, collector, signature_fn in _SITEMAP_SECTIONS:
+        try:
+            signature = signature_fn()
+        except Exception as exc:
+            current_app.logger.error('Sitemap: %s signature failed: %s', name, exc)
+            signature = None
+        previous = sections_meta.get(name)
+        if (
+            not force
+            and previous
+            and signature is not None
+            and previous.get('signature') == signature
+            and all(_store_get(client, f'{_SITEMAP_KEY_PREFIX}doc:{s["name"]}') for s in previous['shards'])
+        ):
+            continue
+        try:
+            shards = _build_section(name, collector)
+        except Exception as exc:
+            current_app.logger.error('Sitemap: %s failed: %s', name, exc)
+            continue
+        shard_meta = []
+        for shard_name, body, lastmod, count in shards:
+            etag = _etag_for(body)
+            _store_set(client, f'{_SITEMAP_KEY_PREFIX}doc:{shard_name}', body)
+            shard_meta.append({
+                'name': shard_name,
+                'etag': etag,
+                'lastmod': _format_lastmod(lastmod),
+                'count': count,
+            })
+        written = {s['name'] for s in shard_meta}
+        orphaned += [s['name'] for s in (previous or {}).get('shards', []) if s['name'] not in written]
+        sections_meta[name] = {'signature': signature, 'shards': shard_meta}
+        rebuilt.append(name)
+
+    all_shards = [
+        shard
+        for name, _, _ in _SITEMAP_SECTIONS
+        for shard in sections_meta.get(name, {}).get('shards', [])
+    ]
+    total_urls = sum(int(s.get('count') or 0) for s in all_shards)
+    if total_urls >= _SITEMAP_URL_WARN_THRESHOLD:
+        current_app.logger.info('Sitemap index covers %s URLs in %s shards', total_urls, len(all_shards))
+
+    index_body = _render_index(all_shards)
+    _store_set(client, f'{_SITEMAP_KEY_PREFIX}doc:{SITEMAP_INDEX_NAME}', index_body)
+    meta = {
+        'sections': sections_meta,
+        'index': {'etag': _etag_for(index_body), 'lastmod': _format_lastmod(now.date())},
+        'generated_at': now.isoformat(),
+        'full_refresh_at': now.isoformat() if force else meta.get('full_refresh_at'),
+    }
+    _store_set(client, _SITEMAP_META_KEY, json.dumps(meta).encode('utf-8'))
+    # Shards a section no longer has are dropped once the new index is live.
+    for shard_name in orphaned:
+        _store_delete(client, f'{_SITEMAP_KEY_PREFIX}doc:{shard_name}')
+    return {'rebuilt': rebuilt, 'urls': total_urls, 'shards': len(all_shards)}
+
+
+def _refresh_single_flight(client) -> bool:
+    """Run ``refresh_sitemaps`` unless another caller already is. True if it ran."""
+    if client is None:
+        if not _local_refresh_lock.acquire(blocking=False):
+            return False
+        try:
+            refresh_sitemaps()
+        finally:
+            _local_refresh_lock.release()
+        return True
+
+    token = secrets.token_hex(8)
+    try:
+        if not client.set(_SITEMAP_REFRESH_LOCK_KEY, token, nx=True, ex=_SITEMAP_REFRESH_LOCK_SECONDS):
+            return False
+    except Exception:  # noqa: BLE001 — an unreachable store must not turn every hit into a rebuild
+        current_app.logger.warning('Sitemap refresh lock unavailable', exc_info=True)
+        return False
+    try:
+        refresh_sitemaps()
+    finally:
+        try:
+            held = client.get(_SITEMAP_REFRESH_LOCK_KEY)
+            if held in (token, token.encode('utf-8')):
+                client.delete(_SITEMAP_REFRESH_LOCK_KEY)
+        except Exception:  # noqa: BLE001
+            pass
+    return True
+
+
+def _shard_info(meta: dict, name: str) -> Optional[dict]:
+    return next(
+        (s for sec in meta.get('sections', {}).values() for s in sec.get('shards', []) if s['name'] == name),
+        None,
+    )
+
+
+def get_sitemap_document(name: str) -> Optional[SitemapDocument]:
+    """
+    Stored sitemap index (``SITEMAP_INDEX_NAME``) or shard (``<section>-<n>``).
+
+    Only a cold store (first hit after deploy or expiry) generates inline,
+    and only in one request at a time; otherwise this is two key lookups.
+    Returns None for unknown shards and raises ``SitemapUnavailable`` when
+    another request is building and nothing is stored yet.
+    """
+    client = _sitemap_store()
+    meta = _load_meta(client)
+    body = _store_get(client, f'{_SITEMAP_KEY_PREFIX}doc:{name}')
+    if body is None or not meta:
+        if name != SITEMAP_INDEX_NAME and meta and _shard_info(meta, name) is None:
+            return None
+        if _refresh_single_flight(client):
+            meta = _load_meta(client)
+            body = _store_get(client, f'{_SITEMAP_KEY_PREFIX}doc:{name}')
+            if body is None:
+                return None
+        elif body is None:
+            raise SitemapUnavailable(name)
+
+    if name == SITEMAP_INDEX_NAME:
+        info = meta.get('index', {})
+    else:
+        # A shard the index no longer lists is gone, even if its key has not
+        # expired yet.
+        info = _shard_info(meta, name)
+        if info is None:
+            if meta:
+                return None
+            info = {}
+    lastmod = info.get('lastmod')
+    return SitemapDocument(
+        body=body,
+        etag=info.get('etag') or _etag_for(body),
+        lastmod=date.fromisoformat(lastmod) if lastmod else None,
+    )
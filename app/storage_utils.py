@@ -4,6 +4,7 @@ from flask import current_app
 import io
 import time
 from werkzeug.utils import secure_filename
+from app.lib.storage_cache import invalidate as invalidate_cached_object
 from app.models import Discussion
 
 
@@ -120,16 +121,27 @@ def upload_to_object_storage(file_data, filename, user_id=None):
         _get_client().upload_from_bytes(storage_path, file_content)
 
         current_app.logger.info(f"Successfully uploaded {filename} to object storage")
+        _generate_image_variants(filename, file_content)
         return filename
     except Exception as e:
         current_app.logger.error(f"Error uploading file: {str(e)}")
         return None
 
+def _generate_image_variants(filename, file_content):
+    """Best effort: the original is stored, and the backfill command retries misses."""
+    from app.lib.image_variants import generate_variants
+    try:
+        generate_variants(filename, file_content, _get_client())
+    except Exception as e:
+        current_app.logger.warning(f"Image variants not generated for {filename}: {str(e)}")
+
+
 def delete_from_object_storage(filename):
     """Delete a file from Replit's object storage"""
     try:
         storage_path = f"profile_images/{filename}"
         _get_client().delete(storage_path)
+        invalidate_cached_object(storage_path)
         current_app.logger.info(f"Successfully deleted {filename} from object storage")
         return True
     except Exception as e:
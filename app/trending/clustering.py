@@ -7,7 +7,6 @@ Deduplicates new clusters against recent topics (find_duplicate_topic).
 
 import os
 import logging
-import numpy as np
 from datetime import datetime, timedelta
 from app.lib.time import utcnow_naive
 from typing import List, Dict, Optional, Tuple
@@ -17,11 +16,10 @@ from sqlalchemy import func
 
 from app import db
 from app.models import NewsArticle, TrendingTopic, TrendingTopicArticle
-from app.lib.sklearn_compat import (
-    SKLEARN_AVAILABLE,
-    cosine_similarity,
-    AgglomerativeClustering,
-)
+from app.lib.lazy_import import lazy_module
+from app.lib.sklearn_compat import get_sklearn
+
+np = lazy_module('numpy')
 
 logger = logging.getLogger(__name__)
 
@@ -197,12 +195,13 @@ def cluster_articles(articles: List[NewsArticle], threshold: float = 0.7) -> Lis
     
     embeddings_array = np.array(embeddings)
 
-    if not SKLEARN_AVAILABLE:
+    sklearn = get_sklearn()
+    if sklearn is None:
         return _numpy_cluster_articles(articles, embeddings_array, threshold)
 
     try:
-        distance_matrix = 1 - cosine_similarity(embeddings_array)
-        clustering = AgglomerativeClustering(
+        distance_matrix = 1 - sklearn.cosine_similarity(embeddings_array)
+        clustering = sklearn.AgglomerativeClustering(
             n_clusters=None,
             distance_threshold=1 - threshold,
             metric='precomputed',
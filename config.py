@@ -579,10 +579,28 @@ class Config:
     # Default off in scheduler so heavy consensus compute only runs in dedicated workers.
     CONSENSUS_QUEUE_PROCESS_IN_SCHEDULER = os.getenv('CONSENSUS_QUEUE_PROCESS_IN_SCHEDULER', 'false').lower() == 'true'
     CONSENSUS_ALLOW_IN_PROCESS_EXECUTION = os.getenv('CONSENSUS_ALLOW_IN_PROCESS_EXECUTION', 'false').lower() == 'true'
-    CONSENSUS_WORKER_IDLE_SLEEP_SECONDS = float(os.getenv('CONSENSUS_WORKER_IDLE_SLEEP_SECONDS', '2.0'))
+    # Safety-net poll only: enqueues wake the worker through app.lib.queue_wakeup.
+    CONSENSUS_WORKER_IDLE_SLEEP_SECONDS = float(os.getenv('CONSENSUS_WORKER_IDLE_SLEEP_SECONDS', '15.0'))
     CONSENSUS_WORKER_ACTIVE_SLEEP_SECONDS = float(os.getenv('CONSENSUS_WORKER_ACTIVE_SLEEP_SECONDS', '0.2'))
     CONSENSUS_WORKER_METRICS_INTERVAL_SECONDS = int(os.getenv('CONSENSUS_WORKER_METRICS_INTERVAL_SECONDS', '30'))
 
+    # Run the long scheduler jobs in app.lib.job_dispatch.DISPATCHED_JOBS on
+    # scripts/run_job_worker.py processes instead of the scheduler's thread pool.
+    # Falls back to inline runs while no worker heartbeat is seen.
+    SCHEDULER_DISPATCH_ENABLED = os.getenv('SCHEDULER_DISPATCH_ENABLED', 'false').lower() == 'true'
+    # Bearer token that lets a Prometheus scraper read /admin/launch-room/scheduler/metrics
+    # without an admin session. Unset: admin session only.
+    SCHEDULER_METRICS_TOKEN = os.getenv('SCHEDULER_METRICS_TOKEN') or None
+
+    # Admin page status breakdowns / totals (app.lib.admin_counters): cache
+    # lifetime, and the table size above which PostgreSQL's planner estimate
+    # replaces an exact COUNT(*) for unfiltered totals.
+    ADMIN_COUNTERS_CACHE_SECONDS = _env_int('ADMIN_COUNTERS_CACHE_SECONDS', 30)
+    ADMIN_COUNTERS_ESTIMATE_MIN_ROWS = _env_int('ADMIN_COUNTERS_ESTIMATE_MIN_ROWS', 1000000)
+    # Longest a brief-generation progress stream (SSE) stays open; clients
+    # fall back to long-polling the status endpoint after it ends.
+    BRIEFING_GENERATION_EVENTS_MAX_SECONDS = _env_int('BRIEFING_GENERATION_EVENTS_MAX_SECONDS', 300)
+
     # Async programme export queue controls.
     EXPORT_QUEUE_PROCESS_IN_SCHEDULER = os.getenv('EXPORT_QUEUE_PROCESS_IN_SCHEDULER', 'false').lower() == 'true'
     EXPORT_DOWNLOAD_TOKEN_MAX_AGE_SECONDS = int(os.getenv('EXPORT_DOWNLOAD_TOKEN_MAX_AGE_SECONDS', '3600'))
@@ -144,6 +144,20 @@ def post_fork(server, worker):
     except Exception as exc:
         _log.warning("post_fork [%s]: Flask-Caching pool reset failed: %s", worker.pid, exc)
 
+    # ------------------------------------------------------------------
+    # 5. Event-loop block monitor
+    #    gevent's monitor thread is per-process, so it is started here in
+    #    each worker. Any greenlet that holds the hub longer than
+    #    GEVENT_MAX_BLOCKING_MS is logged with its stack (see
+    #    app/lib/cpu_offload.py for the offload API that fixes them).
+    # ------------------------------------------------------------------
+    try:
+        from app.lib.cpu_offload import install_loop_block_monitor
+        if install_loop_block_monitor() is not None:
+            _log.info("post_fork [%s]: gevent loop-block monitor started", worker.pid)
+    except Exception as exc:
+        _log.warning("post_fork [%s]: gevent loop-block monitor failed: %s", worker.pid, exc)
+
 
 class _NoWinchFilter(logging.Filter):
     """Suppress the high-frequency SIGWINCH noise Replit emits on terminal resize."""
@@ -0,0 +1,39 @@
+"""Add game_daily_choice_tally for incrementally maintained daily tallies.
+
+Revision ID: gmr007
+Revises: gmr006
+Create Date: 2026-10-18
+
+Counters are bumped as daily runs complete. Days played before this
+migration stay empty until backfilled with:
+
+    flask rebuild-game-daily-tally --days 30
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = 'gmr007'
+down_revision = 'gmr006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'game_daily_choice_tally',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('scenario_slug', sa.String(length=80), nullable=False),
+        sa.Column('tally_date', sa.Date(), nullable=False),
+        sa.Column('turn_index', sa.Integer(), nullable=False),
+        sa.Column('choice_id', sa.String(length=80), nullable=False, server_default=''),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.UniqueConstraint(
+            'scenario_slug', 'tally_date', 'turn_index', 'choice_id',
+            name='uq_game_daily_choice_tally_dims',
+        ),
+    )
+
+
+def downgrade():
+    op.drop_table('game_daily_choice_tally')
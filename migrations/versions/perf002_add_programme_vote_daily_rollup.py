@@ -0,0 +1,46 @@
+"""Add programme_vote_daily_rollup for the NSP dashboard vote trends
+
+The dashboard used to group every statement_vote row of the programme on
+each load. Rows here are maintained on the vote write path and rebuilt
+nightly; run `flask rebuild-programme-vote-rollups` once after upgrading
+to backfill existing votes.
+
+Revision ID: perf002
+Revises: gmr007
+Create Date: 2026-10-18
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = 'perf002'
+down_revision = 'gmr007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'programme_vote_daily_rollup',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('vote_date', sa.Date(), nullable=False),
+        sa.Column('programme_id', sa.Integer(), nullable=False),
+        sa.Column('discussion_id', sa.Integer(), nullable=False),
+        sa.Column('vote', sa.SmallInteger(), nullable=False),
+        sa.Column('confidence', sa.SmallInteger(), nullable=False, server_default='0'),
+        sa.Column('vote_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['programme_id'], ['programme.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['discussion_id'], ['discussion.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('vote_date', 'discussion_id', 'vote', 'confidence', name='uq_programme_vote_rollup_dims'),
+    )
+    op.create_index(
+        'idx_programme_vote_rollup_programme_date',
+        'programme_vote_daily_rollup',
+        ['programme_id', 'vote_date'],
+    )
+
+
+def downgrade():
+    op.drop_index('idx_programme_vote_rollup_programme_date', table_name='programme_vote_daily_rollup')
+    op.drop_table('programme_vote_daily_rollup')
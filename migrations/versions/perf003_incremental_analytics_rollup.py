@@ -0,0 +1,46 @@
+"""Incremental analytics rollup: HLL sketch column and watermark table
+
+- analytics_daily_aggregate.unique_users_sketch — mergeable distinct-user
+  sketch so unique_users can be updated from new events only
+- analytics_rollup_state — per-rollup high-water mark on source row id
+
+The watermark is seeded at the current max(analytics_event.id): existing
+aggregates already count every event up to it, so the first incremental run
+must not fold that history again. Existing aggregate rows have no sketch; run
+`flask rollup-analytics --full` once after upgrading to rebuild the recent
+window with sketches.
+
+Revision ID: perf003
+Revises: perf002
+Create Date: 2026-10-18
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = 'perf003'
+down_revision = 'perf002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'analytics_daily_aggregate',
+        sa.Column('unique_users_sketch', sa.LargeBinary(), nullable=True),
+    )
+    op.create_table(
+        'analytics_rollup_state',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('last_event_id', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    op.execute(sa.text(
+        "INSERT INTO analytics_rollup_state (name, last_event_id, updated_at) "
+        "SELECT 'analytics_daily', COALESCE(MAX(id), 0), CURRENT_TIMESTAMP FROM analytics_event"
+    ))
+
+
+def downgrade():
+    op.drop_table('analytics_rollup_state')
+    op.drop_column('analytics_daily_aggregate', 'unique_users_sketch')
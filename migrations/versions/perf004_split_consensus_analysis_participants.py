@@ -0,0 +1,37 @@
+"""Split per-participant consensus arrays out of consensus_analysis.cluster_data
+
+- consensus_analysis_participants — compressed participant ids, cluster
+  labels and PCA coordinates, one row per analysis
+
+Existing analyses keep their inline arrays and are still readable; run
+`flask split-consensus-analyses` to move them into the new table.
+
+Revision ID: perf004
+Revises: perf003
+Create Date: 2026-10-18
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = 'perf004'
+down_revision = 'perf003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'consensus_analysis_participants',
+        sa.Column('analysis_id', sa.Integer(), nullable=False),
+        sa.Column('participant_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('participant_ids', sa.LargeBinary(), nullable=False),
+        sa.Column('cluster_labels', sa.LargeBinary(), nullable=False),
+        sa.Column('coordinates', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['analysis_id'], ['consensus_analysis.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('analysis_id'),
+    )
+
+
+def downgrade():
+    op.drop_table('consensus_analysis_participants')
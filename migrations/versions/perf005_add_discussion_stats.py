@@ -0,0 +1,40 @@
+"""Add discussion_stats: maintained per-discussion participation numbers
+
+- discussion_stats — participants, visible statements and vote totals,
+  kept current by vote-path deltas and reconciled by the scheduler
+
+Rows are built on a discussion's next vote; run
+`flask reconcile-discussion-stats` to backfill every discussion at once.
+
+Revision ID: perf005
+Revises: perf004
+Create Date: 2026-10-18
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = 'perf005'
+down_revision = 'perf004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'discussion_stats',
+        sa.Column('discussion_id', sa.Integer(), nullable=False),
+        sa.Column('participant_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('statement_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('agree_votes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('disagree_votes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('unsure_votes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('is_stale', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('reconciled_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['discussion_id'], ['discussion.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('discussion_id'),
+    )
+
+
+def downgrade():
+    op.drop_table('discussion_stats')
@@ -0,0 +1,71 @@
+"""Add GIN full-text indexes for discussion and statement search
+
+Discussion and statement search used leading-wildcard ILIKE, which cannot
+use an index and scans the table on every query. These expression indexes
+back app/lib/text_search.py; the expressions must stay identical to the
+ones it queries.
+
+Affected tables / queries
+--------------------------
+statement              – /statements/search, in-discussion statement search
+statement_translation  – translated statement matches
+discussion             – /search, /api/search (title + description, keywords)
+discussion_translation – translated discussion matches
+
+Postgres keeps expression indexes current on every write, so no triggers
+or backfill are needed. On SQLite the FTS5 tables are created with the
+schema instead; nothing to do here.
+
+Note: CONCURRENTLY is intentionally omitted — it cannot run inside
+Alembic's implicit transaction.
+
+Revision ID: perf006
+Revises: perf005
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = 'perf006'
+down_revision = 'perf005'
+branch_labels = None
+depends_on = None
+
+
+_INDEXES = {
+    'ix_statement_content_fts': (
+        "statement",
+        "to_tsvector('simple'::regconfig, content)",
+    ),
+    'ix_statement_translation_content_fts': (
+        "statement_translation",
+        "to_tsvector('simple'::regconfig, content)",
+    ),
+    'ix_discussion_text_fts': (
+        "discussion",
+        "(setweight(to_tsvector('simple'::regconfig, coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'B'))",
+    ),
+    'ix_discussion_keywords_fts': (
+        "discussion",
+        "to_tsvector('simple'::regconfig, coalesce(keywords, ''))",
+    ),
+    'ix_discussion_translation_text_fts': (
+        "discussion_translation",
+        "to_tsvector('simple'::regconfig, coalesce(title, '') || ' ' || coalesce(description, ''))",
+    ),
+}
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for name, (table, expression) in _INDEXES.items():
+        op.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin (({expression}))')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for name in _INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
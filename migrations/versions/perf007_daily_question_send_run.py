@@ -0,0 +1,48 @@
+"""Add daily_question_send_run checkpoint and keyset index for the daily send
+
+- daily_question_send_run — per-question checkpoint (last subscriber id,
+  counts) and worker lease so an interrupted send resumes
+- idx_dqs_frequency_active_id — serves the keyset page query
+  (email_frequency, is_active, id > :last ORDER BY id)
+
+Revision ID: perf007
+Revises: perf006
+Create Date: 2026-10-18
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = 'perf007'
+down_revision = 'perf006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'daily_question_send_run',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('daily_question_id', sa.Integer(), nullable=False),
+        sa.Column('last_subscriber_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('sent_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('failed_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('pages', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('lease_owner', sa.String(length=128), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['daily_question_id'], ['daily_question.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('daily_question_id'),
+    )
+    op.create_index(
+        'idx_dqs_frequency_active_id',
+        'daily_question_subscriber',
+        ['email_frequency', 'is_active', 'id'],
+    )
+
+
+def downgrade():
+    op.drop_index('idx_dqs_frequency_active_id', table_name='daily_question_subscriber')
+    op.drop_table('daily_question_send_run')
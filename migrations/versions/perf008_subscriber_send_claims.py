@@ -0,0 +1,32 @@
+"""Add in-flight send claim columns to brief and daily question subscribers
+
+- send_claim_id / send_claimed_at on daily_brief_subscriber and
+  daily_question_subscriber — a send claims a page of subscribers with one
+  UPDATE ... RETURNING and acknowledges the page with one UPDATE, instead
+  of locking, flushing and committing each row
+
+Revision ID: perf008
+Revises: perf007
+Create Date: 2026-10-18
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = 'perf008'
+down_revision = 'perf007'
+branch_labels = None
+depends_on = None
+
+_TABLES = ('daily_brief_subscriber', 'daily_question_subscriber')
+
+
+def upgrade():
+    for table in _TABLES:
+        op.add_column(table, sa.Column('send_claim_id', sa.String(length=64), nullable=True))
+        op.add_column(table, sa.Column('send_claimed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    for table in _TABLES:
+        op.drop_column(table, 'send_claimed_at')
+        op.drop_column(table, 'send_claim_id')
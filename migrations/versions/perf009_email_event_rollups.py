@@ -0,0 +1,56 @@
+"""Pre-aggregated email analytics: hourly rollup and per-recipient summary
+
+- email_event_hourly_rollup — event counts per (hour, category, event type)
+- email_recipient_engagement — lifetime counts per (address, category)
+
+Both are folded from email_event above the ``email_events`` watermark in
+analytics_rollup_state. Run `flask rollup-email-analytics --rebuild` once
+after upgrading to backfill history.
+
+Revision ID: perf009
+Revises: perf008
+Create Date: 2026-10-18
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = 'perf009'
+down_revision = 'perf008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'email_event_hourly_rollup',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('email_category', sa.String(length=30), nullable=False),
+        sa.Column('event_type', sa.String(length=50), nullable=False),
+        sa.Column('event_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('bucket_start', 'email_category', 'event_type', name='uq_email_event_hourly_dims'),
+    )
+    op.create_table(
+        'email_recipient_engagement',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('recipient_email', sa.String(length=255), nullable=False),
+        sa.Column('email_category', sa.String(length=30), nullable=False),
+        sa.Column('sent_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('delivered_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('opened_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('clicked_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('bounced_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('complained_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('first_event_at', sa.DateTime(), nullable=True),
+        sa.Column('last_event_at', sa.DateTime(), nullable=True),
+        sa.Column('last_opened_at', sa.DateTime(), nullable=True),
+        sa.Column('last_clicked_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('recipient_email', 'email_category', name='uq_email_recipient_engagement'),
+    )
+
+
+def downgrade():
+    op.drop_table('email_recipient_engagement')
+    op.drop_table('email_event_hourly_rollup')
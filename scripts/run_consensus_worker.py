@@ -33,11 +33,13 @@ from app.programmes.export_jobs import (
     mark_stale_programme_export_jobs,
     get_programme_export_queue_metrics,
 )  # noqa: E402
+from app.lib.queue_wakeup import QUEUE_CONSENSUS, QUEUE_PROGRAMME_EXPORT, wait_for_wakeup  # noqa: E402
 
 
 logger = logging.getLogger("consensus_worker")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
 _RUNNING = True
+WORKER_QUEUES = (QUEUE_CONSENSUS, QUEUE_PROGRAMME_EXPORT)
 
 
 def _worker_id():
@@ -84,7 +86,7 @@ def main():
     signal.signal(signal.SIGTERM, _handle_shutdown)
     signal.signal(signal.SIGINT, _handle_shutdown)
 
-    idle_sleep = max(0.1, float(app.config.get("CONSENSUS_WORKER_IDLE_SLEEP_SECONDS", 2.0)))
+    idle_sleep = max(0.1, float(app.config.get("CONSENSUS_WORKER_IDLE_SLEEP_SECONDS", 15.0)))
     active_sleep = max(0.0, float(app.config.get("CONSENSUS_WORKER_ACTIVE_SLEEP_SECONDS", 0.2)))
     metrics_interval = max(5, int(app.config.get("CONSENSUS_WORKER_METRICS_INTERVAL_SECONDS", 30)))
 
@@ -126,7 +128,11 @@ def main():
                     )
                     last_metrics_at = now
 
-                time.sleep(active_sleep if processed else idle_sleep)
+                if processed:
+                    time.sleep(active_sleep)
+                else:
+                    # Enqueues notify the worker; idle_sleep is only the safety-net poll.
+                    wait_for_wakeup(WORKER_QUEUES, idle_sleep)
             except Exception as exc:
                 logger.error(f"Consensus worker loop error: {exc}", exc_info=True)
                 try:
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Scheduler job worker.
+
+Runs the long scheduler jobs that the leader scheduler dispatches when
+SCHEDULER_DISPATCH_ENABLED is set (see app/lib/job_dispatch.py). Start as
+many of these as needed; concurrency per job group is enforced in Redis.
+
+Run as:
+    APP_ROLE=worker python3 scripts/run_job_worker.py
+"""
+
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# IPv4-preference patch — single source of truth lives in app/lib/network_patches.
+# Must run before create_app() (which opens the SESSION_REDIS pool and pings it).
+from app.lib.network_patches import apply_ipv4_preference  # noqa: E402
+apply_ipv4_preference()
+
+# Ensure this process never starts the in-app scheduler or takes its lock.
+os.environ.setdefault("DISABLE_SCHEDULER", "1")
+
+from app import create_app, db  # noqa: E402
+from app.lib.job_dispatch import (  # noqa: E402
+    DISPATCHED_JOBS,
+    claim_next,
+    execute,
+    publish_heartbeat,
+    worker_name,
+)
+
+logger = logging.getLogger("job_worker")
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+_RUNNING = True
+_HEARTBEAT_INTERVAL_SECONDS = 15
+
+
+def _handle_shutdown(signum, _frame):
+    global _RUNNING
+    logger.info(f"Job worker received signal {signum}; finishing current run and shutting down.")
+    _RUNNING = False
+
+
+def main():
+    app = create_app()
+    worker_id = worker_name()
+    signal.signal(signal.SIGTERM, _handle_shutdown)
+    signal.signal(signal.SIGINT, _handle_shutdown)
+
+    # Build the same job functions the leader schedules, without starting
+    # APScheduler here.
+    from app.scheduler import init_scheduler
+    job_scheduler = init_scheduler(app)
+    jobs = {job.id: job.func for job in job_scheduler.get_jobs() if job.id in DISPATCHED_JOBS}
+
+    # Heartbeats come from a thread so a worker busy with an hour-long
+    # brief run still counts as live and the leader keeps dispatching.
+    def _heartbeat_loop():
+        while _RUNNING:
+            publish_heartbeat(worker_id)
+            time.sleep(_HEARTBEAT_INTERVAL_SECONDS)
+
+    threading.Thread(target=_heartbeat_loop, daemon=True, name="job-worker-heartbeat").start()
+
+    logger.info(f"Job worker started (id={worker_id}, jobs={', '.join(sorted(jobs))}).")
+    while _RUNNING:
+        try:
+            payload = claim_next()
+            if payload is None:
+                continue
+            logger.info(f"Running {payload['job_id']} (run_id={payload['run_id']})")
+            status = execute(payload, jobs, worker_id)
+            logger.info(f"Finished {payload['job_id']} (run_id={payload['run_id']}): {status}")
+        except Exception as exc:
+            logger.error(f"Job worker loop error: {exc}", exc_info=True)
+            time.sleep(5)
+        finally:
+            # Jobs open their own app contexts; make sure no session or
+            # connection outlives a run while the worker blocks on the queue.
+            with app.app_context():
+                try:
+                    db.session.remove()
+                except Exception:
+                    pass
+
+    logger.info(f"Job worker stopped (id={worker_id}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -139,8 +139,11 @@ class _FakeRedis:
     def setex(self, k, ttl, v):
         self.store[k] = v
 
-    def set(self, k, v, ex=None):
+    def set(self, k, v, ex=None, nx=False):
+        if nx and k in self.store:
+            return None
         self.store[k] = v
+        return True
 
     def delete(self, *keys):
         for k in keys:
@@ -0,0 +1,94 @@
+"""Cached, single-statement admin status breakdowns and totals."""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.lib import admin_counters
+from app.lib.email_analytics import EmailAnalytics
+from app.models import DailyQuestionSubscriber, User
+
+
+@contextmanager
+def _count_statements(db):
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', _record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', _record)
+
+
+def _subscribe(db, email, frequency, active=True):
+    db.session.add(DailyQuestionSubscriber(email=email, email_frequency=frequency, is_active=active))
+
+
+def test_breakdown_is_one_group_by_and_cached_until_invalidated(app, db):
+    _subscribe(db, 'a@example.com', 'daily')
+    _subscribe(db, 'b@example.com', 'daily')
+    _subscribe(db, 'c@example.com', 'weekly')
+    _subscribe(db, 'd@example.com', 'weekly', active=False)
+    db.session.commit()
+    columns = (DailyQuestionSubscriber.is_active, DailyQuestionSubscriber.email_frequency)
+
+    with _count_statements(db) as statements:
+        breakdown = admin_counters.grouped_counts(*columns)
+        assert admin_counters.grouped_counts(*columns) == breakdown
+    assert len(statements) == 1 and 'GROUP BY' in statements[0]
+    assert breakdown == {(True, 'daily'): 2, (True, 'weekly'): 1, (False, 'weekly'): 1}
+
+    _subscribe(db, 'e@example.com', 'monthly')
+    db.session.commit()
+    assert (True, 'monthly') not in admin_counters.grouped_counts(*columns)
+    admin_counters.invalidate(*columns)
+    assert admin_counters.grouped_counts(*columns)[(True, 'monthly')] == 1
+
+    # The email dashboard shares the cached breakdown.
+    with _count_statements(db) as statements:
+        stats = EmailAnalytics.get_dashboard_stats(days=7)
+    assert stats['subscribers']['question'] == 4
+    assert not any('daily_question_subscriber' in sql for sql in statements)
+
+
+def test_table_totals_read_in_one_statement(app, db):
+    db.session.add_all([
+        User(username=f'count_user_{i}', email=f'count{i}@example.com', password='hashed')
+        for i in range(3)
+    ])
+    db.session.commit()
+
+    with _count_statements(db) as statements:
+        totals = admin_counters.table_totals(User, DailyQuestionSubscriber)
+    assert totals == {'user': 3, 'daily_question_subscriber': 0}
+    assert len(statements) == 1
+
+
+def test_flag_page_counts_refresh_after_review(app, db):
+    from app.models import Discussion, Statement, StatementFlag
+
+    admin = User(username='flag_admin', email='flagadmin@example.com', password='hashed', is_admin=True)
+    db.session.add(admin)
+    db.session.flush()
+    discussion = Discussion(title='Counters', creator_id=admin.id, slug='counters', topic='Society', geographic_scope='global')
+    db.session.add(discussion)
+    db.session.flush()
+    statement = Statement(discussion_id=discussion.id, user_id=admin.id, content='A statement to flag')
+    db.session.add(statement)
+    db.session.flush()
+    flag = StatementFlag(statement_id=statement.id, flagger_user_id=admin.id, flag_reason='spam')
+    db.session.add(flag)
+    db.session.commit()
+
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(admin.id)
+        sess['_fresh'] = True
+    assert client.get('/admin/flags/statements').status_code == 200
+    assert admin_counters.status_counts(StatementFlag.status) == {'pending': 1}
+
+    client.post(f'/admin/flags/statements/{flag.id}/review', data={'action': 'dismiss'})
+    assert admin_counters.status_counts(StatementFlag.status) == {'dismissed': 1}
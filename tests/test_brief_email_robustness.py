@@ -89,7 +89,7 @@ def test_fallback_html_survives_brief_attribute_expiry(app, db, brief_and_subscr
         assert 'https://example.com/brief/m/x' in html
 
 
-def test_batch_send_continues_after_flush_failure(app, db, brief_and_subscriber):
+def test_batch_send_continues_after_send_failure_and_acks_page(app, db, brief_and_subscriber):
     brief_id, sub_id, sub2_id = brief_and_subscriber
     with app.app_context():
         brief = db.session.get(DailyBrief, brief_id)
@@ -97,23 +97,27 @@ def test_batch_send_continues_after_flush_failure(app, db, brief_and_subscriber)
         sub2 = db.session.get(DailyBriefSubscriber, sub2_id)
 
         mock_client = MagicMock()
-        mock_client.send_brief.return_value = True
+        mock_client.send_brief.side_effect = [RuntimeError('connection dropped'), True]
 
         sched = BriefEmailScheduler.__new__(BriefEmailScheduler)
         sched.client = mock_client
 
-        original_flush = db.session.flush
-        calls = {'n': 0}
-
-        def flaky_flush():
-            calls['n'] += 1
-            if calls['n'] == 1:
-                raise RuntimeError('connection dropped')
-            return original_flush()
-
-        with patch.object(db.session, 'flush', side_effect=flaky_flush):
-            results = sched.send_to_subscribers([sub, sub2], brief)
+        results = sched.send_to_subscribers([sub, sub2], brief)
 
         assert results['sent'] == 1
         assert results['failed'] == 1
-        assert mock_client.send_brief.call_count == 1
+        assert mock_client.send_brief.call_count == 2
+
+        db.session.expire_all()
+        failed, sent = db.session.get(DailyBriefSubscriber, sub_id), db.session.get(DailyBriefSubscriber, sub2_id)
+        assert sent.last_brief_id_sent == brief_id and sent.total_briefs_received == 1
+        assert failed.last_brief_id_sent is None
+        assert sent.unsubscribe_token and failed.unsubscribe_token
+        assert failed.send_claim_id is None and sent.send_claim_id is None
+
+        # A second pass skips the sent subscriber and retries the failed one.
+        mock_client.send_brief.side_effect = None
+        mock_client.send_brief.return_value = True
+        again = sched.send_to_subscribers([failed, sent], brief)
+        assert again['sent'] == 1
+        assert mock_client.send_brief.call_args[0][0].id == sub_id
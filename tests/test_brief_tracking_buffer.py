@@ -0,0 +1,192 @@
+"""Buffered briefing open/click tracking and its flush job."""
+
+import pytest
+
+from app.lib.time import utcnow_naive
+
+
+class _ListRedis:
+    """Enough of Redis for the tracking buffer: the record script, lists and sets."""
+
+    def __init__(self):
+        self.lists = {}
+        self.sets = {}
+
+    def eval(self, script, numkeys, *args):
+        keys, argv = args[:numkeys], args[numkeys:]
+        items = self.lists.setdefault(keys[0], [])
+        if len(items) >= int(argv[3]):
+            return -1
+        unique = 1
+        if len(keys) > 1:
+            members = self.sets.setdefault(keys[1], set())
+            unique = int(argv[1] not in members)
+            members.add(argv[1])
+        items.append(f'{unique}{argv[0]}')
+        return unique
+
+    def lpush(self, key, *values):
+        items = self.lists.setdefault(key, [])
+        for value in values:
+            items.insert(0, value)
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+
+class _Pipeline:
+    def __init__(self, redis):
+        self.redis, self.ops = redis, []
+
+    def lpush(self, key, *values):
+        self.ops.append(lambda: self.redis.lpush(key, *values))
+
+    def lrange(self, key, start, end):
+        self.ops.append(lambda: list(self.redis.lists.get(key, [])[start:end + 1]))
+
+    def ltrim(self, key, start, end):
+        def trim():
+            items = self.redis.lists.get(key, [])
+            self.redis.lists[key] = items[start:] if end == -1 else items[start:end + 1]
+        self.ops.append(trim)
+
+    def execute(self):
+        return [op() for op in self.ops]
+
+
+def _make_run(db):
+    from app.models import Briefing, BriefRun
+
+    briefing = Briefing(name='Tracking test', owner_type='user', owner_id=1, status='active')
+    db.session.add(briefing)
+    db.session.flush()
+    run = BriefRun(briefing_id=briefing.id, scheduled_at=utcnow_naive(), status='sent')
+    db.session.add(run)
+    db.session.commit()
+    return run.id
+
+
+def _click_url(app, run_id, target):
+    from app.briefing.link_tracker import sign_url
+
+    sig = sign_url(run_id, target, app.config['SECRET_KEY'])
+    return f'/briefings/track/click/{run_id}?url={target}&sig={sig}&r=abc'
+
+
+def test_tracking_hits_are_buffered_then_flushed_atomically(app, db, client, monkeypatch):
+    from app.briefing import tracking_buffer
+    from app.models import BriefEmailOpen, BriefLinkClick, BriefRun
+
+    redis = _ListRedis()
+    monkeypatch.setattr(tracking_buffer, '_get_redis_client', lambda: redis)
+    run_id = _make_run(db)
+
+    for recipient in ('abc', 'abc', 'def'):
+        response = client.get(f'/briefings/track/open/{run_id}.gif?r={recipient}')
+        assert response.status_code == 200 and response.mimetype == 'image/gif'
+    response = client.get(_click_url(app, run_id, 'https://example.com/story'))
+    assert response.status_code == 302
+    client.get('/briefings/track/open/999999.gif?r=abc')
+
+    assert BriefEmailOpen.query.count() == 0
+    assert len(redis.lists[tracking_buffer.TRACKING_EVENTS_KEY]) == 5
+
+    totals = tracking_buffer.flush_tracking_events(batch_size=2)
+    assert totals == {'opens': 3, 'clicks': 1, 'unique_opens': 2}
+    assert redis.lists[tracking_buffer.TRACKING_EVENTS_KEY] == []
+
+    db.session.expire_all()
+    run = db.session.get(BriefRun, run_id)
+    assert (run.unique_opens, run.total_clicks) == (2, 1)
+    assert BriefEmailOpen.query.filter_by(brief_run_id=run_id).count() == 3
+    assert BriefLinkClick.query.one().target_url == 'https://example.com/story'
+
+    # Seen set expired (or pre-dated the buffer): the stored rows still dedupe.
+    redis.sets.clear()
+    client.get(f'/briefings/track/open/{run_id}.gif?r=abc')
+    assert tracking_buffer.flush_tracking_events()['unique_opens'] == 0
+
+
+def test_failed_flush_requeues_batch(app, db, client, monkeypatch):
+    from app.briefing import tracking_buffer
+
+    redis = _ListRedis()
+    monkeypatch.setattr(tracking_buffer, '_get_redis_client', lambda: redis)
+    run_id = _make_run(db)
+    client.get(f'/briefings/track/open/{run_id}.gif?r=abc')
+    client.get(f'/briefings/track/open/{run_id}.gif?r=def')
+    queued = list(redis.lists[tracking_buffer.TRACKING_EVENTS_KEY])
+
+    def boom(events):
+        raise RuntimeError('db down')
+
+    monkeypatch.setattr(tracking_buffer, '_apply_events', boom)
+    with pytest.raises(RuntimeError):
+        tracking_buffer.flush_tracking_events()
+    assert redis.lists[tracking_buffer.TRACKING_EVENTS_KEY] == queued
+
+
+def test_rejected_events_are_dead_lettered_not_requeued(app, db, client, monkeypatch):
+    from sqlalchemy.exc import DataError
+
+    from app.briefing import tracking_buffer
+    from app.models import BriefEmailOpen
+
+    redis = _ListRedis()
+    monkeypatch.setattr(tracking_buffer, '_get_redis_client', lambda: redis)
+    run_id = _make_run(db)
+    client.get(f'/briefings/track/open/{run_id}.gif?r=abc')
+    client.get(f'/briefings/track/open/{run_id}.gif?r=bad')
+    client.get(f'/briefings/track/open/{run_id}.gif?r=def')
+    # Oversized recipient values are cut to the column width when recorded.
+    client.get(f'/briefings/track/open/{run_id}.gif?r={"x" * 1000}')
+    assert len(tracking_buffer._decode(redis.lists[tracking_buffer.TRACKING_EVENTS_KEY][-1])['r']) == 255
+
+    apply_events = tracking_buffer._apply_events
+
+    def reject_bad(events):
+        if any(e.get('r') == 'bad' for e in events):
+            raise DataError('INSERT', {}, Exception('value too long'))
+        return apply_events(events)
+
+    monkeypatch.setattr(tracking_buffer, '_apply_events', reject_bad)
+    totals = tracking_buffer.flush_tracking_events()
+    assert totals == {'opens': 3, 'clicks': 0, 'unique_opens': 3}
+    assert redis.lists[tracking_buffer.TRACKING_EVENTS_KEY] == []
+    [dead] = redis.lists[tracking_buffer.TRACKING_DEAD_LETTER_KEY]
+    assert tracking_buffer._decode(dead)['r'] == 'bad'
+    assert BriefEmailOpen.query.filter_by(brief_run_id=run_id).count() == 3
+
+
+def test_full_buffer_drops_opens_without_marking_them_seen(app, db, client, monkeypatch):
+    from app.briefing import tracking_buffer
+
+    redis = _ListRedis()
+    monkeypatch.setattr(tracking_buffer, '_get_redis_client', lambda: redis)
+    monkeypatch.setattr(tracking_buffer, 'TRACKING_BUFFER_MAX', 1)
+    run_id = _make_run(db)
+
+    client.get(f'/briefings/track/open/{run_id}.gif?r=abc')
+    client.get(f'/briefings/track/open/{run_id}.gif?r=def')
+    assert len(redis.lists[tracking_buffer.TRACKING_EVENTS_KEY]) == 1
+
+    tracking_buffer.flush_tracking_events()
+    client.get(f'/briefings/track/open/{run_id}.gif?r=def')
+    assert tracking_buffer.flush_tracking_events()['unique_opens'] == 1
+
+
+def test_tracking_writes_directly_without_redis(app, db, client, monkeypatch):
+    from app.briefing import tracking_buffer
+    from app.models import BriefEmailOpen, BriefRun
+
+    monkeypatch.setattr(tracking_buffer, '_get_redis_client', lambda: None)
+    run_id = _make_run(db)
+
+    client.get(f'/briefings/track/open/{run_id}.gif?r=abc')
+    client.get(f'/briefings/track/open/{run_id}.gif?r=abc')
+    client.get(_click_url(app, run_id, 'https://example.com/story'))
+
+    db.session.expire_all()
+    run = db.session.get(BriefRun, run_id)
+    assert (run.unique_opens, run.total_clicks) == (1, 1)
+    assert BriefEmailOpen.query.filter_by(brief_run_id=run_id).count() == 2
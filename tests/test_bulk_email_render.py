@@ -0,0 +1,169 @@
+"""Render-once bulk email bodies must match the per-recipient renderer byte for byte."""
+
+from datetime import date
+
+import pytest
+
+
+@pytest.fixture
+def fixed_vote_tokens(monkeypatch):
+    # Serializer tokens embed a timestamp; pin them so both renders agree.
+    from app.models import DailyQuestionSubscriber
+
+    monkeypatch.setattr(
+        DailyQuestionSubscriber,
+        'generate_vote_token',
+        lambda self, question_id, expires_hours=None: f'vt-{self.id}-{question_id}',
+    )
+
+
+def _seed_questions(db, count=1):
+    from app.models import DailyQuestion, DailyQuestionSubscriber
+
+    questions = [
+        DailyQuestion(
+            question_date=date(2026, 10, 1 + i),
+            question_number=900 + i,
+            question_text=f'Should "fees" & <charges> rise? #{i}',
+            context='Councils & trusts say <costs> are up.',
+            topic_category='Economy',
+            status='published',
+        )
+        for i in range(count)
+    ]
+    subscribers = [
+        DailyQuestionSubscriber(email='a@example.com', magic_token='m-a&b', current_streak=0),
+        DailyQuestionSubscriber(email='b@example.com', magic_token='m-b', unsubscribe_token='u-b', current_streak=4),
+        DailyQuestionSubscriber(email='c@example.com', magic_token='m-c', current_streak=1),
+        DailyQuestionSubscriber(email='d@example.com', magic_token='m-d', current_streak=9),
+    ]
+    db.session.add_all(questions + subscribers)
+    db.session.commit()
+    return questions, subscribers
+
+
+def test_daily_question_batch_body_matches_per_recipient_render(app, db, fixed_vote_tokens):
+    from app.resend_client import ResendEmailClient, _render_for_user
+
+    with app.app_context():
+        (question,), subscribers = _seed_questions(db)
+        client = ResendEmailClient()
+
+        for sub in subscribers:
+            base = client.base_url
+            expected = _render_for_user(
+                sub,
+                'emails/daily_question.html',
+                question_number=question.question_number,
+                question_text=question.question_text,
+                question_context=question.context,
+                why_this_question="This question helps us understand how the public thinks about important issues.",
+                topic_category='Economy',
+                magic_link_url=f'{base}/daily/m/{sub.magic_token}',
+                question_url=f'{base}/daily/{question.question_date.isoformat()}',
+                streak_message=f"You've participated {sub.current_streak} days in a row!" if sub.current_streak > 1 else '',
+                unsubscribe_url=f'{base}/daily/unsubscribe/{sub.unsubscribe_token or sub.magic_token}',
+                vote_agree_url=f'{base}/daily/v/vt-{sub.id}-{question.id}/agree',
+                vote_disagree_url=f'{base}/daily/v/vt-{sub.id}-{question.id}/disagree',
+                vote_unsure_url=f'{base}/daily/v/vt-{sub.id}-{question.id}/unsure',
+                base_url=base,
+                source_articles=[],
+            )
+            assert client._build_daily_question_email(sub, question)['html'] == expected
+
+        # One render with a streak banner, one without.
+        assert client._bulk_renderer.renders == 2
+
+
+def test_weekly_digest_body_matches_per_recipient_render_and_tracking(app, db, fixed_vote_tokens):
+    from app.daily.utils import build_question_email_data
+    from app.resend_client import ResendEmailClient, _render_for_user, _wrap_links
+
+    with app.app_context():
+        questions, subscribers = _seed_questions(db, count=3)
+        client = ResendEmailClient()
+        base = client.base_url
+        ids = ','.join(str(q.id) for q in questions)
+
+        for sub in subscribers:
+            expected = _render_for_user(
+                sub,
+                'emails/weekly_questions_digest.html',
+                questions=[build_question_email_data(q, sub, base_url=base) for q in questions],
+                batch_url=f'{base}/daily/weekly?token={sub.magic_token}&questions={ids}',
+                preferences_url=f'{base}/daily/preferences?token={sub.magic_token}',
+                unsubscribe_url=f'{base}/daily/unsubscribe/{sub.unsubscribe_token or sub.magic_token}',
+                send_day_name=sub.get_send_day_name(),
+                send_hour=sub.preferred_send_hour,
+                base_url=base,
+            )
+            expected = _wrap_links(
+                html=expected,
+                base_url=base,
+                run_id=questions[0].id,
+                r_hash=str(sub.id),
+                secret=app.config.get('SECRET_KEY', ''),
+                track_path='/daily/track/click',
+            )
+            actual = client._render_questions_digest(
+                sub, questions,
+                send_day_name=sub.get_send_day_name(),
+                send_hour=sub.preferred_send_hour,
+            )
+            assert actual == expected
+
+        assert client._bulk_renderer.renders == 1
+
+
+def test_daily_brief_body_matches_minified_tracked_render(app, db):
+    from app.brief.email_client import ResendClient, _minify_email_html
+    from app.models import DailyBrief, DailyBriefSubscriber
+    from app.resend_client import _render_for_user, _wrap_links
+
+    with app.app_context():
+        brief = DailyBrief(date=date(2026, 10, 2), title='Rates & <rents>', intro_text='Intro', status='published')
+        subs = [
+            DailyBriefSubscriber(email='x@example.com', status='active', magic_token='bx'),
+            DailyBriefSubscriber(email='y@example.com', status='active', magic_token='by', unsubscribe_token='uy'),
+        ]
+        db.session.add_all([brief, *subs])
+        db.session.commit()
+
+        client = ResendClient.__new__(ResendClient)
+        for sub in subs:
+            html = client._render_email(sub, brief, sorted_items=[], track_clicks=True)
+
+            from app.brief.sections import SECTIONS, TOPIC_DISPLAY_COLORS, TOPIC_DISPLAY_LABELS
+            from app.lib.personal_briefs_cta import DEFAULT_TRIAL_TEMPLATE_SLUG, personal_briefs_cta_url
+            from app.storage_utils import get_base_url
+
+            base = get_base_url()
+            expected = _minify_email_html(_render_for_user(
+                None,
+                'emails/daily_brief.html',
+                brief=brief,
+                sorted_items=[],
+                subscriber=sub,
+                magic_link_url=f'{base}/brief/m/{sub.magic_token}',
+                unsubscribe_url=f'{base}/brief/unsubscribe/{sub.unsubscribe_token or sub.magic_token}',
+                preferences_url=f'{base}/brief/preferences/{sub.magic_token}',
+                base_url=base,
+                personal_briefs_cta_url=personal_briefs_cta_url(
+                    base, utm_source='daily_brief', utm_medium='email',
+                    utm_campaign='personal_briefs_cta', template_slug=DEFAULT_TRIAL_TEMPLATE_SLUG,
+                ),
+                SECTIONS=SECTIONS,
+                TOPIC_DISPLAY_LABELS=TOPIC_DISPLAY_LABELS,
+                TOPIC_DISPLAY_COLORS=TOPIC_DISPLAY_COLORS,
+            ))
+            expected = _wrap_links(
+                html=expected,
+                base_url=base,
+                run_id=brief.id,
+                r_hash=str(sub.id),
+                secret=app.config.get('SECRET_KEY', ''),
+                track_path='/brief/track/click',
+            )
+            assert html == expected
+
+        assert client._bulk_renderer.renders == 1
@@ -0,0 +1,40 @@
+"""Pre-encoded city lists: ETag/304, gzip variant, prefix search."""
+
+import gzip
+import json
+
+from app.lib.city_index import CityIndex
+
+
+def test_city_list_is_etagged_and_revalidates(client):
+    response = client.get('/discussions/api/cities/FR', headers={'Accept-Encoding': 'identity'})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+    assert 'Lyon' in json.loads(response.data)
+    assert 'max-age' in response.headers['Cache-Control']
+    etag = response.headers['ETag']
+
+    again = client.get('/discussions/api/cities/FR', headers={'If-None-Match': etag, 'Accept-Encoding': 'identity'})
+    assert again.status_code == 304
+    assert again.data == b''
+
+    zipped = client.get('/discussions/api/cities/FR', headers={'Accept-Encoding': 'gzip'})
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert zipped.headers['ETag'] != etag
+    assert 'Accept-Encoding' in zipped.headers['Vary']
+    assert json.loads(gzip.decompress(zipped.data)) == json.loads(response.data)
+
+    unknown = client.get('/discussions/api/cities/ZZ', headers={'Accept-Encoding': 'identity'})
+    assert unknown.status_code == 200 and json.loads(unknown.data) == []
+
+
+def test_city_prefix_search(client):
+    response = client.get('/discussions/api/cities/FR/search?q=ly&limit=2')
+    assert response.status_code == 200
+    assert response.get_json() == ['Lyaud', 'Lynde']
+
+    index = CityIndex({'Brazil': ['São Paulo', 'Santos', 'Salvador', 'sao carlos']})
+    assert index.search('Brazil', 'SAO') == ['sao carlos', 'São Paulo']
+    assert index.search('Brazil', 's', limit=2) == ['Salvador', 'Santos']
+    assert index.search('Brazil', '') == []
+    assert index.search('Chile', 'sa') == []
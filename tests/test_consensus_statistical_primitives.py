@@ -602,6 +602,97 @@ def test_cluster_data_mutations_persist_across_sessions(app, db):
         assert reloaded.cluster_data.get('summary_generated_at') == '2026-04-21T12:00:00'
 
 
+# ── Storage split: lean summary + lazily loaded participant arrays ────────
+
+def _engine_results(n_participants):
+    return {
+        'cluster_assignments': {f'u_{i}': i % 3 for i in range(n_participants)},
+        'pca_coordinates': {f'u_{i}': (i * 0.5, -i * 0.25) for i in range(n_participants)},
+        'consensus_statements': [{'statement_id': 1, 'agreement_rate': 0.9}],
+        'bridge_statements': [],
+        'divisive_statements': [],
+        'representative_statements': {'0': [], '1': [], '2': []},
+        'metadata': {
+            'num_clusters': 3,
+            'silhouette_score': 0.4,
+            'method': 'agglomerative',
+            'participants_count': n_participants,
+            'statements_count': 4,
+        },
+    }
+
+
+def test_saved_analysis_keeps_participant_arrays_out_of_summary(app, client, db):
+    from app.lib.consensus_engine import save_consensus_analysis
+    from app.models import ConsensusAnalysis, Discussion, generate_slug
+
+    with app.app_context():
+        discussion = Discussion(
+            title='Split storage',
+            slug=generate_slug('Split storage'),
+            has_native_statements=True,
+            topic='Society',
+            geographic_scope='global',
+        )
+        db.session.add(discussion)
+        db.session.commit()
+        discussion_id = discussion.id
+
+        analysis_id = save_consensus_analysis(discussion_id, _engine_results(300), db).id
+        db.session.expire_all()
+        analysis = db.session.get(ConsensusAnalysis, analysis_id)
+        assert 'cluster_assignments' not in analysis.cluster_data
+        assert 'pca_coordinates' not in analysis.cluster_data
+        assert analysis.cluster_sizes() == {'0': 100, '1': 100, '2': 100}
+
+        assignments, coordinates = analysis.participant_arrays()
+        assert assignments['u_7'] == 1
+        assert coordinates['u_7'] == pytest.approx((3.5, -1.75))
+
+    resp = client.get(f'/api/discussions/{discussion_id}/consensus/data')
+    assert resp.status_code == 200
+    payload = resp.get_json()
+    assert len(payload['cluster_assignments']) == 300
+    assert payload['pca_coordinates']['u_2'] == pytest.approx([1.0, -0.5])
+
+
+def test_prune_consensus_analyses_drops_participant_arrays_first(app, db):
+    from datetime import timedelta
+
+    from app.discussions.jobs import prune_consensus_analyses
+    from app.lib.consensus_engine import save_consensus_analysis
+    from app.lib.time import utcnow_naive
+    from app.models import ConsensusAnalysis, ConsensusAnalysisParticipants, Discussion, generate_slug
+
+    with app.app_context():
+        discussion = Discussion(
+            title='Prune analyses',
+            slug=generate_slug('Prune analyses'),
+            has_native_statements=True,
+            topic='Society',
+            geographic_scope='global',
+        )
+        db.session.add(discussion)
+        db.session.commit()
+
+        now = utcnow_naive()
+        ids = []
+        for age in range(5):
+            analysis = save_consensus_analysis(discussion.id, _engine_results(10), db)
+            analysis.created_at = now - timedelta(hours=age)
+            ids.append(analysis.id)
+        db.session.commit()
+
+        assert prune_consensus_analyses(keep_participants=2, keep_analyses=4) == (3, 1)
+        remaining = {row.id for row in ConsensusAnalysis.query.all()}
+        assert remaining == set(ids[:4])
+        with_arrays = {row.analysis_id for row in ConsensusAnalysisParticipants.query.all()}
+        assert with_arrays == set(ids[:2])
+
+        # Older summaries still render their group sizes without the arrays.
+        assert db.session.get(ConsensusAnalysis, ids[3]).cluster_sizes() == {'0': 4, '1': 3, '2': 3}
+
+
 # ── Help page regression: native_system.html reflects new methodology ────
 
 def test_native_system_help_page_surfaces_rigour_copy(app):
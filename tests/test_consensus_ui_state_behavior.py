@@ -289,3 +289,217 @@ def test_anonymous_discussion_page_seeds_vote_buttons_from_fingerprint_cookie(ap
     assert 'data-vote-selected="1"' in html
     assert 'Vote to see results' not in html
     assert 'total votes' in html
+
+
+def test_consensus_results_page_served_from_prebuilt_view_model(app, db, monkeypatch):
+    from app.discussions import consensus as consensus_module
+    from app.discussions.consensus import get_results_view_model
+    from app.lib.consensus_engine import save_consensus_analysis
+
+    with app.app_context():
+        creator = _create_user(db, 'resultsowner', 'resultsowner@example.com')
+        discussion = Discussion(
+            title='Cached Results Discussion',
+            slug=generate_slug('Cached Results Discussion'),
+            has_native_statements=True,
+            topic='Society',
+            geographic_scope='global',
+            creator_id=creator.id,
+        )
+        db.session.add(discussion)
+        db.session.flush()
+        statement = Statement(
+            discussion_id=discussion.id,
+            user_id=creator.id,
+            content='Libraries should open on Sundays.',
+        )
+        db.session.add(statement)
+        db.session.commit()
+        discussion_id = discussion.id
+        statement_id = statement.id
+
+        def _results(statement_ids):
+            return {
+                'cluster_assignments': {'u_1': 0, 'u_2': 1},
+                'pca_coordinates': {'u_1': (0.1, 0.2), 'u_2': (-0.1, -0.2)},
+                'consensus_statements': [
+                    {'statement_id': sid, 'agreement_rate': 0.9} for sid in statement_ids
+                ],
+                'bridge_statements': [],
+                'divisive_statements': [],
+                'representative_statements': {},
+                'metadata': {
+                    'num_clusters': 2,
+                    'silhouette_score': 0.5,
+                    'method': 'agglomerative',
+                    'participants_count': 2,
+                    'statements_count': 1,
+                },
+            }
+
+        first = save_consensus_analysis(discussion_id, _results([statement_id]), db)
+        app.config['CONSENSUS_DEMO_DISCUSSION_IDS'] = str(discussion_id)
+
+        # Built at save time: reading it back touches no tables.
+        Statement.query.filter_by(id=statement_id).update({'content': 'Edited after analysis.'})
+        db.session.commit()
+        cached = get_results_view_model(db.session.get(Discussion, discussion_id), 'en')
+        assert cached['analysis_id'] == first.id
+        assert cached['consensus_statements'][0]['content'] == 'Libraries should open on Sundays.'
+
+    client = app.test_client()
+    response = client.get(f'/discussions/{discussion_id}/consensus')
+    assert response.status_code == 200
+    assert b'Libraries should open on Sundays.' in response.data
+    assert response.headers['Content-Type'].startswith('text/html')
+
+    # A new analysis swaps the page over to a freshly built view-model.
+    with app.app_context():
+        save_consensus_analysis(discussion_id, _results([statement_id]), db)
+    response = client.get(f'/discussions/{discussion_id}/consensus')
+    assert b'Edited after analysis.' in response.data
+
+    # If pre-building fails, the page builds live rather than serving the
+    # previous analysis from cache.
+    build = consensus_module.build_results_view_model
+    failures = []
+
+    def build_once_broken(*args):
+        if not failures:
+            failures.append(True)
+            raise RuntimeError('translation backend down')
+        return build(*args)
+
+    monkeypatch.setattr(consensus_module, 'build_results_view_model', build_once_broken)
+    with app.app_context():
+        latest = save_consensus_analysis(discussion_id, _results([statement_id]), db)
+        assert failures
+        view_model = get_results_view_model(db.session.get(Discussion, discussion_id), 'en')
+        assert view_model['analysis_id'] == latest.id
+
+
+def test_discussion_stats_maintained_on_vote_path_match_exact_counts(app, db):
+    from app.discussions.discussion_stats import (
+        compute_discussion_stats,
+        get_discussion_stats,
+        reconcile_discussion_stats,
+        record_vote_stats_delta,
+    )
+    from app.models import DiscussionStats
+
+    with app.app_context():
+        voter = _create_user(db, 'statsvoter', 'statsvoter@example.com')
+        discussion = Discussion(
+            title='Maintained Stats',
+            slug=generate_slug('Maintained Stats'),
+            has_native_statements=True,
+            topic='Society',
+            geographic_scope='global',
+        )
+        db.session.add(discussion)
+        db.session.flush()
+        first = Statement(discussion_id=discussion.id, content='First statement for maintained stats.')
+        second = Statement(discussion_id=discussion.id, content='Second statement for maintained stats.')
+        db.session.add_all([first, second])
+        db.session.commit()
+
+        counter = {1: 'vote_count_agree', -1: 'vote_count_disagree', 0: 'vote_count_unsure'}
+
+        def cast(statement, vote, user_id=None, fingerprint=None):
+            existing = StatementVote.query.filter_by(
+                statement_id=statement.id, user_id=user_id, session_fingerprint=fingerprint
+            ).first()
+            old_vote = existing.vote if existing else None
+            if existing:
+                existing.vote = vote
+                setattr(statement, counter[old_vote], getattr(statement, counter[old_vote]) - 1)
+            else:
+                db.session.add(StatementVote(
+                    statement_id=statement.id, discussion_id=discussion.id,
+                    user_id=user_id, session_fingerprint=fingerprint, vote=vote,
+                ))
+            setattr(statement, counter[vote], (getattr(statement, counter[vote]) or 0) + 1)
+            db.session.flush()
+            record_vote_stats_delta(
+                statement, old_vote=old_vote, new_vote=vote,
+                user_id=user_id, session_fingerprint=fingerprint,
+            )
+            db.session.commit()
+
+        # The first vote builds the row exactly; later votes apply deltas.
+        cast(first, 1, user_id=voter.id)
+        cast(second, -1, user_id=voter.id)
+        cast(first, 0, fingerprint='stats-anon')
+        cast(first, -1, fingerprint='stats-anon')
+        db.session.add(Statement(discussion_id=discussion.id, content='Third statement, no votes yet.'))
+        db.session.commit()
+
+        row = db.session.get(DiscussionStats, discussion.id)
+        assert row is not None and not row.is_stale
+        assert get_discussion_stats(discussion.id) == compute_discussion_stats(discussion.id) == {
+            'participant_count': 2,
+            'statement_count': 3,
+            'agree_votes': 1,
+            'disagree_votes': 2,
+            'unsure_votes': 0,
+            'total_votes': 3,
+        }
+        assert get_discussion_participant_count(discussion) == 2
+
+        # Moderation is not a delta: the row goes stale and reads fall back
+        # to the exact recount until reconciliation rebuilds it.
+        first.mod_status = -1
+        db.session.commit()
+        db.session.refresh(row)
+        assert row.is_stale
+        assert get_discussion_stats(discussion.id)['participant_count'] == 1
+
+        assert reconcile_discussion_stats(stale_only=True) == 1
+        db.session.refresh(row)
+        assert not row.is_stale
+        assert row.to_dict() == compute_discussion_stats(discussion.id)
+        assert row.statement_count == 2
+
+
+def test_stale_discussion_stats_refresh_persists_recount(app, db, monkeypatch):
+    from app.discussions import discussion_stats
+    from app.models import DiscussionStats
+
+    with app.app_context():
+        voter = _create_user(db, 'stalevoter', 'stalevoter@example.com')
+        discussion = Discussion(
+            title='Stale Stats',
+            slug=generate_slug('Stale Stats'),
+            has_native_statements=True,
+            topic='Society',
+            geographic_scope='global',
+        )
+        db.session.add(discussion)
+        db.session.flush()
+        kept = Statement(discussion_id=discussion.id, user_id=voter.id, content='Kept statement here.')
+        hidden = Statement(discussion_id=discussion.id, user_id=voter.id, content='Hidden statement here.')
+        db.session.add_all([kept, hidden])
+        db.session.flush()
+        for statement in (kept, hidden):
+            db.session.add(StatementVote(
+                statement_id=statement.id, discussion_id=discussion.id, user_id=voter.id, vote=1,
+            ))
+            statement.vote_count_agree = 1
+        db.session.flush()
+        discussion_stats.refresh_discussion_stats(discussion.id)
+        hidden.mod_status = -1
+        db.session.commit()
+
+        assert discussion_stats.reconcile_discussion_stats(stale_only=True) == 1
+        row = db.session.get(DiscussionStats, discussion.id)
+        db.session.refresh(row)
+        assert not row.is_stale and row.reconciled_at is not None
+        assert (row.statement_count, row.agree_votes) == (1, 1)
+
+        # The next run has nothing left to recount, and reads use the row.
+        def no_recount(discussion_id):
+            raise AssertionError('recounted a refreshed row')
+
+        monkeypatch.setattr(discussion_stats, 'compute_discussion_stats', no_recount)
+        assert discussion_stats.reconcile_discussion_stats(stale_only=True) == 0
+        assert discussion_stats.get_discussion_stats(discussion.id)['statement_count'] == 1
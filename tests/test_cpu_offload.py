@@ -0,0 +1,61 @@
+"""Offloading CPU-bound work from gevent workers, and the loop-block log."""
+
+import logging
+import threading
+import time
+
+import gevent
+import pytest
+from gevent.events import EventLoopBlocked
+
+from app.lib import cpu_offload
+from app.lib.cpu_offload import offload
+
+
+@pytest.fixture
+def gevent_worker(monkeypatch):
+    """Behave as inside a monkey-patched gunicorn gevent worker."""
+    monkeypatch.setattr(cpu_offload, 'gevent_active', lambda: True)
+    monkeypatch.setattr(cpu_offload, '_semaphores', {})
+
+
+def test_offload_calls_inline_outside_gevent():
+    assert not cpu_offload.gevent_active()
+    assert offload('export', threading.get_ident) == threading.get_ident()
+
+
+def test_offload_runs_on_native_thread_and_propagates_errors(gevent_worker):
+    assert offload('export', threading.get_ident) != threading.get_ident()
+    assert offload('export', sorted, [3, 1, 2], reverse=True) == [3, 2, 1]
+    with pytest.raises(ZeroDivisionError):
+        offload('export', lambda: 1 / 0)
+
+
+def test_offload_caps_concurrency_per_kind(gevent_worker, monkeypatch):
+    monkeypatch.setitem(cpu_offload.OFFLOAD_LIMITS, 'image', 1)
+    lock = threading.Lock()
+    running = {'now': 0, 'peak': 0}
+
+    def work():
+        with lock:
+            running['now'] += 1
+            running['peak'] = max(running['peak'], running['now'])
+        time.sleep(0.05)
+        with lock:
+            running['now'] -= 1
+        return True
+
+    jobs = [gevent.spawn(offload, 'image', work) for _ in range(3)]
+    gevent.joinall(jobs, timeout=5, raise_error=True)
+    assert [job.value for job in jobs] == [True, True, True]
+    assert running['peak'] == 1
+
+
+def test_loop_block_event_is_logged(caplog):
+    event = EventLoopBlocked('<Greenlet handler>', 0.25, ['Traceback line 1', 'line 2'])
+    with caplog.at_level(logging.WARNING, logger='app.lib.cpu_offload'):
+        cpu_offload._log_loop_blocked(event)
+        cpu_offload._log_loop_blocked(object())
+    assert len(caplog.records) == 1
+    message = caplog.records[0].getMessage()
+    assert 'blocked for more than 250ms' in message and 'Traceback line 1' in message
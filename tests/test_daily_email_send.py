@@ -0,0 +1,99 @@
+"""Keyset-paginated, resumable daily question email send."""
+
+from datetime import date
+
+import pytest
+
+
+class _RecordingClient:
+    """Stands in for ResendEmailClient.send_daily_question_batch (no network)."""
+
+    def __init__(self, fail_on_call=None):
+        self.sent_ids = []
+        self.calls = 0
+        self.fail_on_call = fail_on_call
+
+    def send_daily_question_batch(self, subscribers, question):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise RuntimeError('worker died mid-send')
+        for subscriber in subscribers:
+            assert subscriber.magic_token and subscriber.unsubscribe_token
+            assert subscriber.send_claim_id
+            self.sent_ids.append(subscriber.id)
+        ids = [s.id for s in subscribers]
+        return {'sent': len(ids), 'failed': 0, 'errors': [], 'failed_emails': [],
+                'sent_ids': ids, 'invalid_ids': []}
+
+
+def _seed(db):
+    from app.models import DailyQuestion, DailyQuestionSubscriber
+
+    question = DailyQuestion(
+        question_date=date.today(),
+        question_number=4242,
+        question_text='Should councils publish every planning decision?',
+        status='published',
+    )
+    db.session.add(question)
+    subscribers = [
+        DailyQuestionSubscriber(email=f'daily{i}@example.com', email_frequency='daily')
+        for i in range(7)
+    ]
+    subscribers.append(DailyQuestionSubscriber(email='weekly@example.com', email_frequency='weekly'))
+    subscribers.append(DailyQuestionSubscriber(email='gone@example.com', email_frequency='daily', is_active=False))
+    db.session.add_all(subscribers)
+    db.session.commit()
+    return question, sorted(s.id for s in subscribers[:7])
+
+
+def test_daily_send_walks_keyset_pages_and_checkpoints(app, db):
+    from app.daily.email_send import send_daily_question_emails
+    from app.models import DailyQuestionSendRun
+
+    with app.app_context():
+        question, daily_ids = _seed(db)
+        client = _RecordingClient()
+
+        result = send_daily_question_emails(question, client=client, page_size=3)
+
+        assert result['status'] == 'complete'
+        assert (result['sent'], result['pages']) == (7, 3)
+        assert client.sent_ids == daily_ids
+        run = DailyQuestionSendRun.query.filter_by(daily_question_id=question.id).one()
+        assert run.is_complete and run.last_subscriber_id == daily_ids[-1]
+        assert run.sent_count == 7 and run.lease_owner is None
+
+        again = send_daily_question_emails(question, client=client, page_size=3)
+        assert again['status'] == 'already_complete'
+        assert client.calls == 3
+
+
+def test_daily_send_resumes_from_checkpoint_after_interruption(app, db):
+    from app.daily.email_send import claim_send_run, pending_send_run, send_daily_question_emails
+    from app.models import DailyQuestionSendRun, DailyQuestionSubscriber
+
+    with app.app_context():
+        question, daily_ids = _seed(db)
+
+        crashing = _RecordingClient(fail_on_call=2)
+        with pytest.raises(RuntimeError):
+            send_daily_question_emails(question, client=crashing, page_size=3)
+
+        run = DailyQuestionSendRun.query.filter_by(daily_question_id=question.id).one()
+        assert run.last_subscriber_id == daily_ids[2]
+        assert not run.is_complete
+        assert pending_send_run(question.id) is not None
+        assert DailyQuestionSubscriber.query.filter(DailyQuestionSubscriber.send_claim_id.isnot(None)).count() == 0
+
+        # A live lease held by another worker blocks a second sender.
+        assert claim_send_run(question.id, 'other-worker') is not None
+        assert send_daily_question_emails(question, client=_RecordingClient())['status'] == 'busy'
+        run.lease_owner = None
+        db.session.commit()
+
+        resumed = _RecordingClient()
+        result = send_daily_question_emails(question, client=resumed, page_size=3)
+        assert result['status'] == 'complete'
+        assert resumed.sent_ids == daily_ids[3:]
+        assert sorted(crashing.sent_ids + resumed.sent_ids) == daily_ids
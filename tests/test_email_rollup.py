@@ -0,0 +1,78 @@
+"""Hourly and per-recipient email analytics rollups behind the admin dashboard."""
+
+from datetime import timedelta
+
+from app.lib.time import utcnow_naive
+
+
+def _events(db, specs, minutes_ago=10):
+    from app.models import EmailEvent
+
+    created = utcnow_naive() - timedelta(minutes=minutes_ago)
+    for email, category, event_type in specs:
+        db.session.add(EmailEvent(recipient_email=email, email_category=category,
+                                  event_type=event_type, created_at=created))
+    db.session.commit()
+
+
+def test_dashboard_matches_raw_stats_before_and_after_rollup(app, db):
+    from app.lib.email_analytics import EmailAnalytics
+    from app.lib.email_rollup import rollup_email_events_incremental
+    from app.models import EmailEvent, EmailEventHourlyRollup
+
+    _events(db, [
+        ('a@example.com', 'daily_brief', 'sent'),
+        ('a@example.com', 'daily_brief', 'email.delivered'),
+        ('a@example.com', 'daily_brief', 'opened'),
+        ('b@example.com', 'daily_brief', 'sent'),
+        ('b@example.com', 'daily_brief', 'bounced'),
+        ('c@example.com', 'auth', 'sent'),
+    ])
+    _events(db, [('old@example.com', 'auth', 'sent')], minutes_ago=60 * 24 * 30)
+
+    def dashboard():
+        stats = EmailAnalytics.get_dashboard_stats(days=7)
+        return stats['overall'], stats['by_category']['daily_brief'], stats['by_category']['auth']
+
+    unfolded = dashboard()
+    assert unfolded[0] == EmailEvent.get_stats(days=7)
+    assert unfolded[1]['total_sent'] == 2 and unfolded[1]['total_delivered'] == 1
+    assert unfolded[2]['total_sent'] == 1
+
+    assert rollup_email_events_incremental(chunk_ids=3) == 7
+    assert rollup_email_events_incremental() == 0
+    assert EmailEventHourlyRollup.query.count() > 0
+    assert dashboard() == unfolded
+
+    # New events show up before the next fold (read from the tail).
+    _events(db, [('d@example.com', 'auth', 'sent')], minutes_ago=0)
+    assert dashboard()[2]['total_sent'] == 2
+
+
+def test_recipient_engagement_summary_and_backfill(app, db):
+    from app.lib.email_analytics import EmailAnalytics
+    from app.lib.email_rollup import rebuild_email_rollups, rollup_email_events_incremental
+    from app.models import EmailRecipientEngagement
+
+    _events(db, [
+        ('a@example.com', 'daily_brief', 'sent'),
+        ('a@example.com', 'daily_brief', 'delivered'),
+        ('a@example.com', 'daily_brief', 'opened'),
+        ('a@example.com', 'daily_question', 'sent'),
+    ])
+    rollup_email_events_incremental(chunk_ids=2)
+    _events(db, [('a@example.com', 'daily_brief', 'opened')])
+    rollup_email_events_incremental()
+
+    row = EmailRecipientEngagement.query.filter_by(
+        recipient_email='a@example.com', email_category='daily_brief').one()
+    assert (row.sent_count, row.delivered_count, row.opened_count) == (1, 1, 2)
+    assert row.last_opened_at is not None and row.first_event_at <= row.last_event_at
+
+    lifetime = EmailAnalytics.get_email_performance('a@example.com', days=None)
+    assert (lifetime['total_sent'], lifetime['total_opened']) == (2, 2)
+    assert lifetime['categories'] == {'daily_brief': 4, 'daily_question': 1}
+    assert EmailAnalytics.get_email_performance('a@example.com') == lifetime
+
+    assert rebuild_email_rollups() == 5
+    assert EmailAnalytics.get_email_performance('a@example.com', days=None) == lifetime
@@ -0,0 +1,147 @@
+"""Queued Resend webhook ingestion and set-wise batch recording."""
+
+
+class _QueueRedis:
+    def __init__(self):
+        self.lists = {}
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(values)
+
+    def lmove(self, source, destination, src_side, dest_side):
+        items = self.lists.get(source)
+        if not items:
+            return None
+        item = items.pop(0 if src_side == 'LEFT' else -1)
+        target = self.lists.setdefault(destination, [])
+        target.insert(0 if dest_side == 'LEFT' else len(target), item)
+        return item
+
+    def delete(self, key):
+        self.lists.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+
+class _Pipeline:
+    def __init__(self, redis):
+        self.redis, self.ops = redis, []
+
+    def __getattr__(self, name):
+        command = getattr(self.redis, name)
+        return lambda *args: self.ops.append(lambda: command(*args))
+
+    def execute(self):
+        return [op() for op in self.ops]
+
+
+def _webhook(event_type, email, email_id, **data):
+    return {'type': f'email.{event_type}', 'data': {'to': [email], 'email_id': email_id, **data}}
+
+
+def _use_queue(monkeypatch):
+    from app.lib import email_webhook_queue
+
+    redis = _QueueRedis()
+    monkeypatch.setattr(email_webhook_queue, '_get_redis_client', lambda: redis)
+    monkeypatch.delenv('RESEND_WEBHOOK_SECRET', raising=False)
+    return redis
+
+
+def test_webhooks_are_queued_then_recorded_in_bulk(app, db, client, monkeypatch):
+    from app.lib.email_webhook_queue import WEBHOOK_QUEUE_KEY, process_webhook_queue
+    from app.models import BriefRecipient, Briefing, DailyBriefSubscriber, DailyQuestionSubscriber, EmailEvent
+
+    redis = _use_queue(monkeypatch)
+    reader = DailyBriefSubscriber(email='reader@example.com', status='active')
+    soft = DailyBriefSubscriber(email='soft@example.com', status='active')
+    hard = DailyQuestionSubscriber(email='hard@example.com', is_active=True)
+    briefing = Briefing(name='Queue test', owner_type='user', owner_id=1, status='active')
+    db.session.add_all([reader, soft, hard, briefing])
+    db.session.flush()
+    db.session.add(BriefRecipient(briefing_id=briefing.id, email='angry@example.com'))
+    for _ in range(2):
+        db.session.add(EmailEvent(recipient_email='soft@example.com', event_type='bounced',
+                                  bounce_type='soft', email_category='daily_brief'))
+    db.session.commit()
+
+    payloads = [
+        _webhook('opened', 'reader@example.com', 'e1'),
+        _webhook('opened', 'reader@example.com', 'e1'),  # Resend retry
+        _webhook('opened', 'reader@example.com', 'e2'),
+        _webhook('bounced', 'hard@example.com', 'e3', bounce={'type': 'hard'}),
+        _webhook('bounced', 'soft@example.com', 'e4', bounce={'type': 'soft'}),
+        _webhook('complained', 'angry@example.com', 'e5'),
+        {'type': 'email.delivered', 'data': {}},
+    ]
+    for payload in payloads:
+        response = client.post('/brief/webhooks/resend', json=payload)
+        assert response.get_json()['status'] == 'queued'
+    assert EmailEvent.query.count() == 2
+    assert len(redis.lists[WEBHOOK_QUEUE_KEY]) == 7
+
+    assert process_webhook_queue(batch_size=4) == 7
+    assert redis.lists[WEBHOOK_QUEUE_KEY] == []
+
+    db.session.expire_all()
+    assert EmailEvent.query.filter_by(event_type='opened').count() == 2
+    opened = EmailEvent.query.filter_by(event_type='opened').first()
+    assert opened.email_category == 'daily_brief' and opened.brief_subscriber_id == reader.id
+    assert db.session.get(DailyBriefSubscriber, reader.id).total_opens == 2
+    assert db.session.get(DailyBriefSubscriber, soft.id).status == 'bounced'
+    assert db.session.get(DailyQuestionSubscriber, hard.id).is_active is False
+    assert BriefRecipient.query.one().status == 'unsubscribed'
+
+
+def test_failed_batch_is_retried_per_payload(app, db, monkeypatch):
+    from app.lib import email_webhook_queue
+    from app.lib.email_analytics import EmailAnalytics
+    from app.models import EmailEvent
+
+    redis = _use_queue(monkeypatch)
+    for i in range(3):
+        email_webhook_queue.enqueue_webhook(_webhook('delivered', f'user{i}@example.com', f'd{i}'))
+    redis.lists[email_webhook_queue.WEBHOOK_QUEUE_KEY].append('not json')
+
+    real = EmailAnalytics.record_webhook_batch.__func__
+
+    def flaky(cls, payloads):
+        if len(payloads) > 1 or payloads[0]['data']['to'][0] == 'user1@example.com':
+            raise RuntimeError('poison payload')
+        return real(cls, payloads)
+
+    monkeypatch.setattr(EmailAnalytics, 'record_webhook_batch', classmethod(flaky))
+    assert email_webhook_queue.process_webhook_queue() == 3
+
+    assert {e.recipient_email for e in EmailEvent.query} == {'user0@example.com', 'user2@example.com'}
+    requeued = redis.lists[email_webhook_queue.WEBHOOK_QUEUE_KEY]
+    assert len(requeued) == 1 and '"n":1' in requeued[0]
+
+
+def test_batch_interrupted_before_commit_is_requeued(app, db, monkeypatch):
+    from app.lib import email_webhook_queue
+    from app.lib.email_analytics import EmailAnalytics
+    from app.models import EmailEvent
+
+    redis = _use_queue(monkeypatch)
+    for i in range(3):
+        email_webhook_queue.enqueue_webhook(_webhook('delivered', f'user{i}@example.com', f'd{i}'))
+    email_webhook_queue.process_webhook_queue(batch_size=2)
+    email_webhook_queue.enqueue_webhook(_webhook('delivered', 'late@example.com', 'd3'))
+
+    def worker_dies(cls, payloads):
+        raise SystemExit('worker killed')
+
+    with monkeypatch.context() as patched:
+        patched.setattr(EmailAnalytics, 'record_webhook_batch', classmethod(worker_dies))
+        try:
+            email_webhook_queue.process_webhook_queue(batch_size=1)
+        except SystemExit:
+            pass
+    assert len(redis.lists[email_webhook_queue.WEBHOOK_PROCESSING_KEY]) == 1
+
+    assert email_webhook_queue.process_webhook_queue() == 1
+    assert email_webhook_queue.WEBHOOK_PROCESSING_KEY not in redis.lists
+    assert redis.lists[email_webhook_queue.WEBHOOK_QUEUE_KEY] == []
+    assert EmailEvent.query.count() == 4
@@ -9,7 +9,12 @@ import pytest
 from app.game.constants import GAME_RUN_STATUS_COMPLETED
 from app.game.engine.scenario import load_scenario
 from app.game.services.bridge_service import _TAG_TO_DISCUSSION_TOPICS, _scenario_tags
-from app.game.services.daily_results_service import world_today, world_today_share_line
+from app.game.services.daily_results_service import (
+    rebuild_daily_tally,
+    record_completed_daily_run,
+    world_today,
+    world_today_share_line,
+)
 from app.game.services.daily_service import utc_game_date
 from app.game.services.profile_service import compute_player_profile
 from app.game.services import stats_service
@@ -49,6 +54,8 @@ def _daily_with_turn0(db, *, slug, fingerprint, choice_id, when=None):
         completed_at=started,
     )
     db.session.add(run)
+    db.session.flush()
+    record_completed_daily_run(run)
     db.session.commit()
     return run
 
@@ -139,19 +146,8 @@ def test_world_today_reports_distribution_and_marks_your_choice(app, db):
         assert mine['choice_id'] == 'trust_the_public'
 
 
-def test_world_today_tally_is_cached_and_overlay_is_per_player(app, db, monkeypatch):
-    """The distribution caches per (scenario, day); only 'is_yours' is per-run."""
-    class FakeRedis:
-        def __init__(self):
-            self.store = {}
-        def get(self, k):
-            return self.store.get(k)
-        def setex(self, k, ttl, v):
-            self.store[k] = v
-
-    fake = FakeRedis()
-    monkeypatch.setattr('app.lib.redis_client.get_client', lambda decode_responses=True: fake)
-
+def test_world_today_reads_counters_and_overlay_is_per_player(app, db):
+    """The distribution comes from the maintained counters; only 'is_yours' is per-run."""
     with app.app_context():
         db.create_all()
         for i in range(6):
@@ -162,28 +158,102 @@ def test_world_today_tally_is_cached_and_overlay_is_per_player(app, db, monkeypa
 
         first = world_today(me, min_n=5)
         assert first['ready'] is True and first['sample_size'] == 7
-        # Something landed in the cache.
-        assert any('game:world:tally' in k for k in fake.store)
 
-        # Mutate the DB after caching — the cached tally must not move.
-        for i in range(20):
-            _daily_with_turn0(db, slug='pandemic-outbreak',
-                              fingerprint=f'x{i}' + 'x' * 59, choice_id='targeted_measures')
-        cached = world_today(me, min_n=5)
-        assert cached['sample_size'] == 7  # still the stale, cached sample
+        # Each completion bumps the counters once; later edits to a run's log
+        # are not rescanned — the tally only moves when counters are bumped.
+        stray = _daily_with_turn0(db, slug='pandemic-outbreak', fingerprint='s' * 64,
+                                  choice_id='targeted_measures')
+        assert world_today(me, min_n=5)['sample_size'] == 8
+        stray.choice_log_json = [{'turn_index': 0, 'choice_id': 'lockdown_hard'}]
+        db.session.commit()
+        assert world_today(me, min_n=5)['sample_size'] == 8
 
-        # A different player reads the same cached distribution, but the overlay
+        # A different player reads the same distribution, but the overlay
         # follows *their* pick.
         other = _daily_with_turn0(db, slug='pandemic-outbreak', fingerprint='o' * 64,
                                   choice_id='lockdown_hard')
+        mine = world_today(me, min_n=5)
         other_view = world_today(other, min_n=5)
-        my_turn0 = {c['choice_id']: c['percent'] for c in cached['turns'][0]['choices']}
+        my_turn0 = {c['choice_id']: c['percent'] for c in mine['turns'][0]['choices']}
         other_turn0 = {c['choice_id']: c['percent'] for c in other_view['turns'][0]['choices']}
-        assert my_turn0 == other_turn0  # same cached percentages
-        assert next(c['choice_id'] for c in cached['turns'][0]['choices'] if c['is_yours']) == 'trust_the_public'
+        assert my_turn0 == other_turn0
+        assert next(c['choice_id'] for c in mine['turns'][0]['choices'] if c['is_yours']) == 'trust_the_public'
         assert next(c['choice_id'] for c in other_view['turns'][0]['choices'] if c['is_yours']) == 'lockdown_hard'
 
 
+def test_rebuild_daily_tally_recounts_from_runs(app, db):
+    with app.app_context():
+        db.create_all()
+        runs = [
+            _daily_with_turn0(db, slug='pandemic-outbreak',
+                              fingerprint=f'l{i}' + 'l' * 60, choice_id='lockdown_hard')
+            for i in range(5)
+        ]
+        me = runs[0]
+        before = world_today(me, min_n=5)
+
+        # Drift the counters (double-count every run), then repair.
+        for run in runs:
+            record_completed_daily_run(run)
+        db.session.commit()
+        assert world_today(me, min_n=5)['sample_size'] == 10
+
+        assert rebuild_daily_tally('pandemic-outbreak', me.started_at.date()) == 5
+        db.session.commit()
+        assert world_today(me, min_n=5) == before
+
+
+def test_rebuild_command_clears_counters_of_deleted_runs(app, db):
+    from app.models.game import GameDailyChoiceTally
+
+    with app.app_context():
+        db.create_all()
+        run = _daily_with_turn0(db, slug='crime-and-justice', fingerprint='d' * 64,
+                                choice_id='anything')
+        db.session.delete(run)
+        db.session.commit()
+        assert GameDailyChoiceTally.query.filter_by(scenario_slug='crime-and-justice').count() > 0
+
+        result = app.test_cli_runner().invoke(args=['rebuild-game-daily-tally'])
+        assert result.exit_code == 0, result.output
+        assert 'crime-and-justice: 0 runs' in result.output
+        assert GameDailyChoiceTally.query.filter_by(scenario_slug='crime-and-justice').count() == 0
+
+
+def test_completing_daily_run_bumps_counters(app, db):
+    from app.game.services.run_service import apply_run_choice
+
+    with app.app_context():
+        db.create_all()
+        scenario = load_scenario('pandemic-outbreak')
+        run = GameRun(
+            uuid=GameRun.generate_uuid(),
+            scenario_slug='pandemic-outbreak',
+            mode='daily',
+            session_fingerprint='p' * 64,
+            society_name='Testland',
+            emblem_seed=GameRun.generate_uuid(),
+            state_json={},
+            choice_log_json=[],
+            delayed_queue_json=[],
+            headline_log_json=[],
+            turn_index=0,
+            total_turns=len(scenario['turns']),
+            started_at=datetime.combine(utc_game_date(), time(12, 0)),
+        )
+        db.session.add(run)
+        db.session.commit()
+
+        while run.status != GAME_RUN_STATUS_COMPLETED:
+            turn = scenario['turns'][run.turn_index]
+            apply_run_choice(run, turn['choices'][0]['id'])
+
+        world = world_today(run, min_n=1)
+        assert world['sample_size'] == 1
+        assert len(world['turns']) == len(scenario['turns'])
+        assert all(t['choices'][0]['percent'] == 100 for t in world['turns'])
+
+
 def test_world_today_share_line_only_for_minority(app, db):
     with app.app_context():
         db.create_all()
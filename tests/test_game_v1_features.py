@@ -336,7 +336,8 @@ def test_sitemap_includes_play_routes(app, client, db):
     """SEO: /play and /play/editorial-principles are crawlable per the sitemap."""
     with app.app_context():
         db.create_all()
-    resp = client.get('/sitemap.xml')
+    assert client.get('/sitemap.xml').status_code == 200
+    resp = client.get('/sitemap-static-1.xml')
     assert resp.status_code == 200
     body = resp.data.decode('utf-8')
     assert '/play/' in body or '/play</loc>' in body
@@ -347,7 +348,7 @@ def test_sitemap_omits_play_routes_when_game_disabled(app, client, db):
     with app.app_context():
         db.create_all()
         app.config['GAME_ENABLED'] = False
-    resp = client.get('/sitemap.xml')
+    resp = client.get('/sitemap-static-1.xml')
     assert resp.status_code == 200
     body = resp.data.decode('utf-8')
     assert '/play/' not in body and '/play</loc>' not in body
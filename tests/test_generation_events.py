@@ -0,0 +1,151 @@
+"""Pushed brief-generation progress: SSE stream and long-poll fallback."""
+
+import json
+import queue
+import threading
+
+import pytest
+
+from app.briefing import jobs
+from app.briefing.jobs import GenerationJob
+from app.models import User
+
+
+class _FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.messages = queue.Queue()
+        self.patterns = []
+
+    def psubscribe(self, pattern):
+        self.patterns.append(pattern.rstrip('*'))
+        self.redis.subscribers.append(self)
+
+    def get_message(self, timeout=0):
+        try:
+            return self.messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.redis.subscribers.remove(self)
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.subscribers = []
+        self.connections_opened = 0
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    def publish(self, channel, data):
+        for pubsub in self.subscribers:
+            if any(channel.startswith(prefix) for prefix in pubsub.patterns):
+                pubsub.messages.put({'type': 'pmessage', 'channel': channel, 'data': data})
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        self.connections_opened += 1
+        return _FakePubSub(self)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(jobs, 'get_redis_client', lambda: fake)
+    yield fake
+    # Wake the shared subscriber so it notices it has no watchers left and exits.
+    monkeypatch.undo()
+    for pubsub in list(fake.subscribers):
+        pubsub.messages.put(None)
+    thread = jobs._JOB_EVENTS._thread
+    if thread is not None:
+        thread.join(timeout=5)
+
+
+def _login(app, db, username):
+    user = User(username=username, email=f'{username}@example.com', password='hashed', email_verified=True)
+    db.session.add(user)
+    db.session.commit()
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(user.id)
+        sess['_fresh'] = True
+    return client, user
+
+
+def _events(chunks):
+    for chunk in chunks:
+        text = chunk.decode() if isinstance(chunk, bytes) else chunk
+        if text.startswith('event: status'):
+            yield json.loads(text.split('data: ', 1)[1])
+
+
+def test_event_stream_pushes_updates_until_completed(app, db, redis):
+    client, user = _login(app, db, 'sse_owner')
+    job = GenerationJob('job-sse', briefing_id=7, user_id=user.id)
+    job.save()
+
+    response = client.get('/briefings/7/generation-events/job-sse', buffered=False)
+    assert response.status_code == 200 and response.mimetype == 'text/event-stream'
+    assert response.headers['Cache-Control'] == 'no-cache'
+    events = _events(response.response)
+    assert next(events)['status'] == 'queued'
+
+    # The worker saves from another thread; the stream wakes on the publish.
+    threading.Timer(0.05, job.update_status, args=('processing', 'Selecting stories')).start()
+    update = next(events)
+    assert update['status'] == 'processing' and update['message'] == 'Selecting stories'
+
+    job.update_status('completed', 'Done', brief_run_id=42)
+    final = next(events)
+    assert final['status'] == 'completed' and final['redirect_url'].endswith('/briefings/7/runs/42')
+    assert list(events) == []
+    response.close()
+    assert 'job-sse' not in jobs._JOB_EVENTS._waiters
+
+
+def test_long_poll_returns_on_change_or_after_wait(app, db, redis):
+    client, user = _login(app, db, 'poll_owner')
+    job = GenerationJob('job-poll', briefing_id=7, user_id=user.id)
+    job.save()
+
+    unchanged = client.get(
+        f'/briefings/7/generation-status/job-poll?wait=0.2&since={job.updated_at}'
+    ).get_json()
+    assert unchanged['status'] == 'queued' and unchanged['updated_at'] == job.updated_at
+
+    threading.Timer(0.05, job.update_status, args=('processing', 'Writing')).start()
+    changed = client.get(
+        f'/briefings/7/generation-status/job-poll?wait=5&since={job.updated_at}'
+    ).get_json()
+    assert changed['status'] == 'processing' and changed['message'] == 'Writing'
+
+
+def test_other_users_cannot_watch_a_job(app, db, redis):
+    _, owner = _login(app, db, 'job_owner')
+    GenerationJob('job-private', briefing_id=7, user_id=owner.id).save()
+    client, _ = _login(app, db, 'job_snoop')
+
+    assert client.get('/briefings/7/generation-events/job-private').status_code == 404
+    assert client.get('/briefings/7/generation-status/job-private?wait=1').status_code == 404
+    assert client.get('/briefings/8/generation-events/job-private').status_code == 404
+
+
+def test_concurrent_watchers_share_one_subscription(app, redis):
+    job = GenerationJob('job-shared', briefing_id=7, user_id=1)
+    job.save()
+    watchers = [jobs.watch_job('job-shared', timeout=10) for _ in range(25)]
+    assert {next(watcher).status for watcher in watchers} == {'queued'}
+
+    job.update_status('processing', 'Writing')
+    assert {next(watcher).status for watcher in watchers} == {'processing'}
+    assert redis.connections_opened == 1
+
+    for watcher in watchers:
+        watcher.close()
+    assert jobs._JOB_EVENTS._waiters == {}
@@ -0,0 +1,90 @@
+"""Resized profile-image variants: rendering, upload hook and variant serving."""
+
+import io
+
+import pytest
+from PIL import Image
+
+from app.lib import image_variants, storage_cache
+
+
+class _FakeStorage:
+    def __init__(self):
+        self.objects = {}
+
+    def upload_from_bytes(self, key, data):
+        self.objects[key] = data
+
+    def download_as_bytes(self, key):
+        if key not in self.objects:
+            raise Exception(f"Object not found: {key}")
+        return self.objects[key]
+
+
+def _png(width, height, mode='RGB'):
+    out = io.BytesIO()
+    Image.new(mode, (width, height), (200, 30, 30, 128) if mode == 'RGBA' else (200, 30, 30)).save(out, 'PNG')
+    return out.getvalue()
+
+
+@pytest.fixture
+def storage(monkeypatch, tmp_path):
+    import app.profiles.routes as profile_routes
+    import app.storage_utils as storage_utils
+
+    fake = _FakeStorage()
+    monkeypatch.setattr(storage_utils, '_storage_client', fake)
+    monkeypatch.setattr(profile_routes, 'client', fake)
+    monkeypatch.setattr(storage_cache, 'STORAGE_CACHE_DIR', str(tmp_path))
+    return fake
+
+
+def test_render_variants_downscales_without_upscaling():
+    variants = image_variants.render_variants(_png(600, 300, mode='RGBA'))
+    assert set(variants) == {(w, f) for w in image_variants.VARIANT_WIDTHS for f in image_variants.VARIANT_FORMATS}
+    sizes = {key: Image.open(io.BytesIO(data)) for key, data in variants.items()}
+    assert sizes[(64, 'webp')].format == 'WEBP' and sizes[(64, 'webp')].size == (64, 32)
+    assert sizes[(256, 'jpeg')].format == 'JPEG' and sizes[(256, 'jpeg')].size == (256, 128)
+    assert sizes[(1024, 'jpeg')].size == (600, 300)
+    assert image_variants.render_variants(b'not an image') == {}
+
+
+def test_upload_generates_variants_served_by_accept_header(app, client, storage):
+    from app.storage_utils import upload_to_object_storage
+
+    original = _png(800, 800)
+    with app.test_request_context('/'):
+        filename = upload_to_object_storage(io.BytesIO(original), 'me.png', user_id=5)
+        assert image_variants.image_variant_url(filename, 40) == f'/profiles/get-image/{filename}?w=40'
+
+    digest = image_variants.content_hash(original)
+    assert storage.objects[f'profile_images/{filename}'] == original
+    assert image_variants.variant_key(digest, 64, 'webp') in storage.objects
+    assert image_variants.manifest_key(filename) in storage.objects
+
+    webp = client.get(f'/profiles/get-image/{filename}?w=40', headers={'Accept': 'image/avif,image/webp,*/*;q=0.8'})
+    assert webp.status_code == 200 and webp.mimetype == 'image/webp'
+    assert Image.open(io.BytesIO(webp.data)).size == (64, 64)
+    assert 'Accept' in webp.headers['Vary']
+
+    jpeg = client.get(f'/profiles/get-image/{filename}?w=200', headers={'Accept': 'image/jpeg'})
+    assert jpeg.mimetype == 'image/jpeg'
+    assert Image.open(io.BytesIO(jpeg.data)).size == (256, 256)
+
+    assert client.get(f'/profiles/get-image/{filename}').data == original
+
+
+def test_images_without_manifest_fall_back_then_backfill(app, client, storage):
+    original = _png(300, 100)
+    storage.objects['profile_images/old.png'] = original
+
+    assert client.get('/profiles/get-image/old.png?w=64').data == original
+
+    with app.app_context():
+        image_variants.cache.clear()
+        totals = image_variants.backfill_variants(['old.png', 'old.png', 'logo.svg', None], storage)
+    assert totals == {'generated': 1, 'skipped': 1, 'failed': 0}
+
+    resized = client.get('/profiles/get-image/old.png?w=64', headers={'Accept': 'image/webp'})
+    assert resized.mimetype == 'image/webp'
+    assert Image.open(io.BytesIO(resized.data)).size == (64, 21)
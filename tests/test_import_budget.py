@@ -0,0 +1,56 @@
+"""Web-worker boot must not import heavy scientific / LLM libraries."""
+
+import os
+
+import pytest
+
+from app.lib.import_profile import parse_importtime, profile_app_boot, time_by_package
+from app.lib.lazy_import import lazy_module
+
+# Generous: boot is ~3s here. A regression that pulls sklearn/scipy back in
+# is caught by the heavy-module check regardless of machine speed.
+BOOT_BUDGET_SECONDS = float(os.environ.get('IMPORT_BUDGET_SECONDS', '10'))
+
+# Mirrors tests/conftest.py for a fresh interpreter.
+_TEST_BOOT_SETUP = '''
+import os
+from unittest.mock import MagicMock
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+os.environ['FLASK_ENV'] = 'development'
+for name in ('replit', 'replit.object_storage', 'replit.object_storage.errors'):
+    sys.modules.setdefault(name, MagicMock())
+from config import Config
+Config.SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+Config.SQLALCHEMY_ENGINE_OPTIONS = {'pool_pre_ping': True}
+Config.RATELIMIT_STORAGE_URL = 'memory://'
+'''
+
+
+def test_create_app_stays_within_import_budget():
+    profile = profile_app_boot(setup=_TEST_BOOT_SETUP)
+
+    assert profile['heavy_loaded'] == []
+    assert profile['boot_seconds'] < BOOT_BUDGET_SECONDS
+    imported = {row['module'] for row in profile['modules']}
+    assert 'app.lib.consensus_engine' in imported  # still wired, just light
+
+
+def test_lazy_module_imports_on_first_attribute_access():
+    proxy = lazy_module('json')
+    assert 'not loaded' in repr(proxy)
+    assert proxy.dumps({'a': 1}) == '{"a": 1}'
+    assert 'loaded' in repr(proxy) and 'not loaded' not in repr(proxy)
+
+
+def test_parse_importtime_rows_and_package_totals():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       500 |        500 |     app.lib.time\n"
+        "import time:      1500 |       2000 |   app.lib\n"
+        "some log line\n"
+        "import time:      2000 |       4000 | app\n"
+    )
+    rows = parse_importtime(stderr)
+    assert [(r['module'], r['depth']) for r in rows] == [('app.lib.time', 2), ('app.lib', 1), ('app', 0)]
+    assert rows[-1]['cumulative_ms'] == pytest.approx(4.0)
+    assert time_by_package(rows) == {'app': pytest.approx(4.0)}
@@ -0,0 +1,148 @@
+"""Leader -> worker dispatch of long scheduler jobs."""
+
+import fnmatch
+
+import pytest
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from app.lib import job_dispatch
+
+
+class _DispatchRedis:
+    def __init__(self):
+        self.values = {}
+        self.lists = {}
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+    def scan_iter(self, match=None, count=None):
+        return [key for key in list(self.values) if fnmatch.fnmatch(key, match)]
+
+    def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+
+    def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value)
+
+    def ltrim(self, key, start, end):
+        self.lists[key] = self.lists.get(key, [])[start:end + 1]
+
+    def lrange(self, key, start, end):
+        return self.lists.get(key, [])[start:end + 1]
+
+    def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    def blpop(self, keys, timeout=0):
+        for key in keys:
+            if self.lists.get(key):
+                return key, self.lists[key].pop(0)
+        return None
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = _DispatchRedis()
+    monkeypatch.setattr(job_dispatch, '_get_redis_client', lambda: fake)
+    return fake
+
+
+def test_without_live_workers_leader_runs_job_inline(redis):
+    calls = []
+    job_dispatch.dispatch('trending_topics_pipeline', lambda: calls.append('ran'))
+
+    assert calls == ['ran']
+    assert redis.llen(job_dispatch.DISPATCH_QUEUE_KEY) == 0
+    [run] = job_dispatch.run_history('trending_topics_pipeline')
+    assert run['status'] == 'succeeded' and run['worker'] == 'scheduler-inline'
+
+
+def test_dispatched_runs_coalesce_and_record_history(redis):
+    job_dispatch.publish_heartbeat('worker-a')
+    leader_calls = []
+    for _ in range(3):
+        job_dispatch.dispatch('send_brief_emails', lambda: leader_calls.append('inline'))
+    assert leader_calls == []
+    assert redis.llen(job_dispatch.DISPATCH_QUEUE_KEY) == 1
+
+    worker_calls = []
+
+    def failing():
+        worker_calls.append('ran')
+        raise RuntimeError('provider down')
+
+    payload = job_dispatch.claim_next(timeout=1)
+    assert payload['job_id'] == 'send_brief_emails'
+    assert job_dispatch.execute(payload, {'send_brief_emails': failing}, 'worker-a') == 'failed'
+    assert worker_calls == ['ran']
+
+    # Claimed, so the next trigger queues it again.
+    job_dispatch.dispatch('send_brief_emails', lambda: None)
+    assert redis.llen(job_dispatch.DISPATCH_QUEUE_KEY) == 1
+
+    stats = job_dispatch.dispatch_stats()
+    assert stats['workers'] == ['worker-a'] and stats['queue_depth'] == 1
+    job_stats = stats['jobs']['send_brief_emails']
+    assert job_stats['runs'] == 1 and job_stats['failed'] == 1
+    assert job_stats['last_status'] == 'failed' and job_stats['lag_ms_p95'] >= 0
+    assert job_dispatch.run_history('send_brief_emails')[0]['error'] == 'provider down'
+
+
+def test_failed_push_runs_inline_without_blocking_later_dispatch(redis, monkeypatch):
+    job_dispatch.publish_heartbeat('worker-a')
+    calls = []
+
+    def broken_rpush(key, value):
+        raise ConnectionError('redis went away')
+
+    rpush = redis.rpush
+    monkeypatch.setattr(redis, 'rpush', broken_rpush)
+    job_dispatch.dispatch('generate_daily_brief', lambda: calls.append('inline'))
+    assert calls == ['inline']
+
+    # The marker was cleared, so the next trigger queues normally.
+    monkeypatch.setattr(redis, 'rpush', rpush)
+    job_dispatch.dispatch('generate_daily_brief', lambda: calls.append('inline'))
+    assert calls == ['inline']
+    assert job_dispatch.claim_next(timeout=1)['job_id'] == 'generate_daily_brief'
+
+
+def test_concurrency_group_is_shared_across_jobs(redis):
+    job_dispatch.publish_heartbeat('worker-a')
+    nested = []
+
+    def primary():
+        # A safety-net run claimed by another worker while the primary runs.
+        payload = {'run_id': 'second', 'job_id': 'daily_brief_safety_net', 'queued_at': None}
+        nested.append(job_dispatch.execute(payload, {'daily_brief_safety_net': lambda: None}, 'worker-b'))
+
+    payload = {'run_id': 'first', 'job_id': 'generate_daily_brief', 'queued_at': None}
+    assert job_dispatch.execute(payload, {'generate_daily_brief': primary}, 'worker-a') == 'succeeded'
+    assert nested == ['skipped']
+    assert not any(key.startswith('job_dispatch:slot:') for key in redis.values)
+
+
+def test_install_routes_scheduler_jobs_through_dispatch(redis):
+    scheduler = BackgroundScheduler(timezone='UTC')
+    calls = []
+    scheduler.add_job(lambda: calls.append('brief'), 'cron', hour=17, id='generate_daily_brief')
+    scheduler.add_job(lambda: calls.append('tick'), 'interval', seconds=10, id='process_extraction_queue')
+
+    assert job_dispatch.install(scheduler) == ['generate_daily_brief']
+    brief_job = scheduler.get_job('generate_daily_brief')
+    brief_job.func(*brief_job.args)
+    assert calls == ['brief']
+    assert job_dispatch.run_history('generate_daily_brief')[0]['status'] == 'succeeded'
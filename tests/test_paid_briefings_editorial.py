@@ -37,6 +37,37 @@ def test_cluster_scored_items_merges_same_story():
     assert clusters[1].primary is other
 
 
+def test_cluster_scored_items_matches_pairwise_reference():
+    """Indexed clustering must reproduce the original pairwise scan exactly."""
+    import random
+
+    from app.briefing.story_clustering import _same_story
+
+    def pairwise(scored):
+        clusters = []
+        for item, score in sorted(scored, key=lambda x: x[1], reverse=True):
+            for cluster in clusters:
+                if any(_same_story(item, member) for member in cluster.all_items):
+                    cluster.related.append(item)
+                    break
+            else:
+                clusters.append(StoryCluster(primary=item, score=score))
+        clusters.sort(key=lambda c: c.score, reverse=True)
+        return [[m.id for m in c.all_items] for c in clusters]
+
+    rng = random.Random(7)
+    vocab = ['google', 'openai', 'search', 'agents', 'launch', 'europe', 'markets',
+             'regulation', 'chips', 'nvidia', 'earnings', 'model', 'privacy', 'court']
+    scored = [
+        (MagicMock(id=i, title=' '.join(rng.sample(vocab, rng.randint(2, 6)))),
+         float(rng.randint(0, 20)))
+        for i in range(200)
+    ]
+
+    clusters = cluster_scored_items(scored)
+    assert [[m.id for m in c.all_items] for c in clusters] == pairwise(scored)
+
+
 def test_attach_cluster_metadata_sets_also_covered():
     primary = MagicMock(id=1, title="Story", source_id=1, source_name="TechCrunch")
     related = MagicMock(id=2, title="Story alt", source_id=2, source_name="Ars Technica", url="https://example.com/a")
@@ -529,6 +529,80 @@ def test_programme_summary_cache_and_invalidation(app, db):
         assert summary_after_invalidate["discussion_count"] == 2
 
 
+def test_nsp_dashboard_vote_trends_read_maintained_rollup(app, db):
+    from datetime import datetime
+
+    from app.programmes.routes import _programme_nsp_dashboard_payload
+    from app.programmes.vote_rollup import rebuild_programme_vote_rollup, record_vote_rollup_delta
+
+    with app.app_context():
+        creator = _create_user(db, 'rollupuser', 'rollup@example.com')
+        programme = Programme(
+            name='Rollup Programme',
+            slug=generate_slug('Rollup Programme'),
+            creator_id=creator.id,
+        )
+        db.session.add(programme)
+        db.session.flush()
+        discussion = Discussion(
+            title='Rollup discussion',
+            slug=generate_slug('Rollup discussion'),
+            description='Description for rollup discussion long enough.',
+            creator_id=creator.id,
+            geographic_scope='global',
+            programme_id=programme.id,
+        )
+        db.session.add(discussion)
+        db.session.flush()
+        statement = Statement(
+            discussion_id=discussion.id,
+            user_id=creator.id,
+            content='A valid seed statement with enough length.',
+        )
+        db.session.add(statement)
+        db.session.flush()
+
+        day = datetime(2026, 5, 4, 12, 0)
+        for i, (vote, confidence) in enumerate([(1, 5), (1, 3), (-1, None), (0, 3)]):
+            db.session.add(StatementVote(
+                statement_id=statement.id,
+                discussion_id=discussion.id,
+                session_fingerprint=f'rollup-fp-{i}',
+                vote=vote,
+                confidence=confidence,
+                created_at=day,
+                updated_at=day,
+            ))
+        db.session.commit()
+
+        # Raw votes alone are invisible until rolled up.
+        assert _programme_nsp_dashboard_payload(programme)['consensus_vs_divisive_trends'] == []
+
+        rebuild_programme_vote_rollup(programme.id)
+        db.session.commit()
+        payload = _programme_nsp_dashboard_payload(programme)
+        assert payload['consensus_vs_divisive_trends'] == [{
+            'date': '2026-05-04', 'agree': 2, 'disagree': 1, 'unsure': 1, 'divisive_index': 0.6667,
+        }]
+        assert payload['statement_confidence_distribution'] == [
+            {'confidence': 3, 'count': 2},
+            {'confidence': 5, 'count': 1},
+        ]
+
+        # A changed vote moves from its old bucket to today's.
+        record_vote_rollup_delta(
+            programme.id, discussion.id,
+            old_vote=-1, old_confidence=None, old_changed_at=day,
+            new_vote=1, new_confidence=4, new_changed_at=datetime(2026, 5, 5, 9, 0),
+        )
+        db.session.commit()
+        trends = _programme_nsp_dashboard_payload(programme)['consensus_vs_divisive_trends']
+        assert [(t['date'], t['agree'], t['disagree']) for t in trends] == [
+            ('2026-05-04', 2, 0),
+            ('2026-05-05', 1, 0),
+        ]
+
+
 def test_edit_discussion_accepts_valid_programme_theme_phase(app, db):
     with app.app_context():
         creator = _create_user(db, 'editcreator', 'editcreator@example.com')
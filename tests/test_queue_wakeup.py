@@ -0,0 +1,88 @@
+"""Producer -> consumer wakeups for scheduler and worker queues."""
+
+from types import SimpleNamespace
+
+from app import scheduler as scheduler_module
+from app.lib import queue_wakeup
+
+
+class _ListRedis:
+    def __init__(self):
+        self.lists = {}
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(values)
+
+    def ltrim(self, key, start, end):
+        items = self.lists.get(key, [])
+        end = len(items) + end if end < 0 else end
+        start = len(items) + start if start < 0 else start
+        self.lists[key] = items[start:end + 1]
+
+    def expire(self, key, seconds):
+        pass
+
+    def blpop(self, keys, timeout=0):
+        for key in keys:
+            if self.lists.get(key):
+                return key, self.lists[key].pop(0)
+        return None
+
+
+class _Pipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append((name, args))
+
+    def execute(self):
+        return [getattr(self.client, name)(*args) for name, args in self.calls]
+
+
+def test_burst_of_notifies_is_one_wakeup(monkeypatch):
+    redis = _ListRedis()
+    monkeypatch.setattr(queue_wakeup, '_get_redis_client', lambda: redis)
+
+    for _ in range(5):
+        queue_wakeup.notify(queue_wakeup.QUEUE_EXTRACTION)
+    queue_wakeup.notify(queue_wakeup.QUEUE_CONSENSUS)
+    assert redis.lists['queue_wakeup:extraction'] == ['1']
+
+    queues = [queue_wakeup.QUEUE_CONSENSUS, queue_wakeup.QUEUE_PROGRAMME_EXPORT]
+    assert queue_wakeup.wait_for_wakeup(queues, timeout=1) == 'consensus'
+    assert queue_wakeup.wait_for_wakeup(queues, timeout=0.01) is None
+
+
+def test_without_redis_notify_is_noop_and_wait_sleeps(monkeypatch):
+    monkeypatch.setattr(queue_wakeup, '_get_redis_client', lambda: None)
+    slept = []
+    monkeypatch.setattr(queue_wakeup.time, 'sleep', slept.append)
+
+    queue_wakeup.notify(queue_wakeup.QUEUE_EXTRACTION)
+    assert queue_wakeup.wait_for_wakeup([queue_wakeup.QUEUE_EXTRACTION], timeout=5) is None
+    assert len(slept) == 1 and 4 < slept[0] <= 5
+
+
+def test_wakeup_of_running_job_reruns_it_when_done(monkeypatch):
+    woken = []
+    fake_scheduler = SimpleNamespace(modify_job=lambda job_id, next_run_time: woken.append(job_id))
+    monkeypatch.setattr(scheduler_module, 'scheduler', fake_scheduler)
+    monkeypatch.setattr(scheduler_module, '_running_jobs', set())
+    monkeypatch.setattr(scheduler_module, '_pending_wakeups', set())
+
+    scheduler_module._wake_job('process_extraction_queue')
+    assert woken == ['process_extraction_queue']
+
+    scheduler_module._on_job_submitted(SimpleNamespace(job_id='process_extraction_queue'))
+    scheduler_module._wake_job('process_extraction_queue')
+    assert woken == ['process_extraction_queue']
+
+    scheduler_module._on_job_done(SimpleNamespace(job_id='process_extraction_queue'))
+    assert woken == ['process_extraction_queue', 'process_extraction_queue']
+    scheduler_module._on_job_done(SimpleNamespace(job_id='process_extraction_queue'))
+    assert len(woken) == 2
@@ -0,0 +1,42 @@
+"""Bulk claim / acknowledge protocol for subscriber sends."""
+
+from datetime import timedelta
+
+from app.lib.time import utcnow_naive
+
+
+def test_claims_exclude_concurrent_senders_until_acked_or_stale(app, db):
+    from app.lib.send_claims import ack_sends, claim_for_send, per_row_value, release_claims
+    from app.models import DailyBriefSubscriber as Sub
+
+    with app.app_context():
+        subs = [Sub(email=f'claim{i}@example.com', status='active') for i in range(3)]
+        subs[2].status = 'unsubscribed'
+        db.session.add_all(subs)
+        db.session.commit()
+        ids = [s.id for s in subs]
+
+        claimed = claim_for_send(
+            Sub, ids, 'send-a',
+            eligible=(Sub.status == 'active',),
+            values={Sub.unsubscribe_token: per_row_value(Sub.id, {i: f'tok-{i}' for i in ids})},
+        )
+        assert [s.id for s in claimed] == ids[:2]
+        assert [s.unsubscribe_token for s in claimed] == [f'tok-{i}' for i in ids[:2]]
+        assert claim_for_send(Sub, ids[:2], 'send-b') == []
+
+        ack_sends(Sub, 'send-a', [([ids[0]], {Sub.total_briefs_received: 7})], release_ids=[ids[1]])
+        db.session.commit()
+        db.session.expire_all()
+        first = db.session.get(Sub, ids[0])
+        assert first.total_briefs_received == 7 and first.send_claim_id is None
+        assert db.session.get(Sub, ids[1]).total_briefs_received in (0, None)
+
+        # A crashed sender's claim can be taken over once it is stale.
+        assert len(claim_for_send(Sub, ids[:2], 'send-c')) == 2
+        Sub.query.filter(Sub.id.in_(ids[:2])).update(
+            {Sub.send_claimed_at: utcnow_naive() - timedelta(hours=2)}, synchronize_session=False
+        )
+        db.session.commit()
+        assert len(claim_for_send(Sub, ids[:2], 'send-d', stale_seconds=3600)) == 2
+        assert release_claims(Sub, 'send-d') == 2
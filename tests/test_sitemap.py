@@ -14,7 +14,7 @@ from app.models import (
     Programme,
     Statement,
 )
-from app.seo import generate_sitemap
+from app.seo import generate_sitemap, refresh_sitemaps
 
 
 NS = {'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
@@ -39,14 +39,33 @@ def _locs(body: str) -> list[str]:
     return [e['loc'] for e in _parse_sitemap(body)]
 
 
+def _index_locs(body: str) -> list[str]:
+    root = ET.fromstring(body)
+    assert root.tag.endswith('sitemapindex')
+    return [el.find('sm:loc', NS).text.strip() for el in root.findall('sm:sitemap', NS)]
+
+
+def _crawl(client) -> str:
+    """Fetch /sitemap.xml and every shard it lists; return one merged urlset."""
+    resp = client.get('/sitemap.xml')
+    assert resp.status_code == 200
+    assert resp.mimetype == 'application/xml'
+    urls = []
+    for loc in _index_locs(resp.data.decode('utf-8')):
+        shard = client.get('/' + loc.split('/', 3)[3])
+        assert shard.status_code == 200
+        assert shard.mimetype == 'application/xml'
+        urls.extend(ET.fromstring(shard.data).findall('sm:url', NS))
+    root = ET.Element('{%s}urlset' % NS['sm'])
+    root.extend(urls)
+    return ET.tostring(root, encoding='unicode')
+
+
 @pytest.fixture
 def sitemap_body(client, db):
     with client.application.app_context():
         db.create_all()
-    resp = client.get('/sitemap.xml')
-    assert resp.status_code == 200
-    assert resp.mimetype == 'application/xml'
-    return resp.data.decode('utf-8')
+    return _crawl(client)
 
 
 def test_sitemap_xml_well_formed(sitemap_body):
@@ -88,8 +107,7 @@ def test_sitemap_includes_play_when_game_enabled(app, client, db):
     with app.app_context():
         db.create_all()
         app.config['GAME_ENABLED'] = True
-    body = client.get('/sitemap.xml').data.decode('utf-8')
-    locs = _locs(body)
+    locs = _locs(_crawl(client))
     assert any(loc.rstrip('/').endswith('/play') for loc in locs)
     assert any('/play/editorial-principles' in loc for loc in locs)
     assert any('/play/run/' in loc for loc in locs)
@@ -100,8 +118,7 @@ def test_sitemap_omits_play_when_game_disabled(app, client, db):
     with app.app_context():
         db.create_all()
         app.config['GAME_ENABLED'] = False
-    body = client.get('/sitemap.xml').data.decode('utf-8')
-    locs = _locs(body)
+    locs = _locs(_crawl(client))
     assert not any(loc.endswith('/play') or '/play/' in loc for loc in locs)
     assert not any('/help/tradeoffs' in loc for loc in locs)
 
@@ -110,12 +127,14 @@ def test_sitemap_sample_brief_follows_self_serve_flag(app, client, db):
     with app.app_context():
         db.create_all()
         app.config['SELF_SERVE_TRIAL_ENABLED'] = True
-    on = _locs(client.get('/sitemap.xml').data.decode('utf-8'))
+    on = _locs(_crawl(client))
     assert any('/briefings/sample' in loc for loc in on)
 
+    # Stored shards only change when the scheduled refresh notices the flag.
     with app.app_context():
         app.config['SELF_SERVE_TRIAL_ENABLED'] = False
-    off = _locs(client.get('/sitemap.xml').data.decode('utf-8'))
+        refresh_sitemaps()
+    off = _locs(_crawl(client))
     assert not any('/briefings/sample' in loc for loc in off)
 
 
@@ -431,3 +450,96 @@ def test_sitemap_escapes_xml_special_characters_in_loc(app, db):
         body = generate_sitemap()
         assert 'a&amp;b-source' in body
         assert re.search(r'<loc>[^<]*a&amp;b-source[^<]*</loc>', body)
+
+
+def test_sitemap_index_serves_etagged_shards(app, client, db):
+    with app.app_context():
+        db.create_all()
+    index = client.get('/sitemap.xml')
+    assert index.headers['ETag']
+    assert index.headers['X-Robots-Tag'] == 'noarchive'
+    shard_locs = _index_locs(index.data.decode('utf-8'))
+    assert any(loc.endswith('/sitemap-static-1.xml') for loc in shard_locs)
+
+    shard = client.get('/sitemap-static-1.xml')
+    assert shard.status_code == 200
+    again = client.get('/sitemap-static-1.xml', headers={'If-None-Match': shard.headers['ETag']})
+    assert again.status_code == 304
+    assert again.data == b''
+
+    assert client.get('/sitemap-static-99.xml').status_code == 404
+    assert client.get('/sitemap-bogus-1.xml').status_code == 404
+
+
+def test_cold_sitemap_is_built_by_one_request_at_a_time(app, client, db, monkeypatch):
+    from app import seo
+
+    with app.app_context():
+        db.create_all()
+    builds = []
+    monkeypatch.setattr(seo, 'refresh_sitemaps', lambda **kw: builds.append(kw))
+    store = seo._sitemap_store()
+    store.set(seo._SITEMAP_REFRESH_LOCK_KEY, 'other-request', nx=True, ex=60)
+
+    # Another request holds the build lock and nothing is stored yet.
+    busy = client.get('/sitemap.xml')
+    assert busy.status_code == 503
+    assert busy.headers['Retry-After'] == str(seo.SITEMAP_RETRY_AFTER_SECONDS)
+    assert builds == []
+
+    # A stored copy is served (stale) instead of waiting for the rebuild.
+    store.set(f'{seo._SITEMAP_KEY_PREFIX}doc:{seo.SITEMAP_INDEX_NAME}', b'<sitemapindex/>')
+    stale = client.get('/sitemap.xml')
+    assert stale.status_code == 200 and stale.data == b'<sitemapindex/>'
+    assert builds == []
+
+
+def test_refresh_sitemaps_rebuilds_only_changed_sections(app, client, db):
+    with app.app_context():
+        db.create_all()
+        first = refresh_sitemaps()
+        assert 'static' in first['rebuilt'] and 'programmes' in first['rebuilt']
+        assert refresh_sitemaps()['rebuilt'] == []
+
+    before = client.get('/sitemap-programmes-1.xml')
+    with app.app_context():
+        db.session.add(Programme(
+            name='Shard Programme', slug='shard-programme', visibility='public', status='active',
+        ))
+        db.session.commit()
+        assert refresh_sitemaps()['rebuilt'] == ['discussions', 'programmes']
+    after = client.get('/sitemap-programmes-1.xml')
+    assert after.headers['ETag'] != before.headers['ETag']
+    assert any('/programmes/shard-programme' in loc for loc in _locs(after.data.decode('utf-8')))
+
+
+def test_shards_dropped_from_the_index_stop_being_served(app, client, db, monkeypatch):
+    from app import seo
+
+    monkeypatch.setattr(seo, 'SITEMAP_SHARD_SIZE', 1)
+    with app.app_context():
+        db.create_all()
+        programme = Programme(name='Short Lived', slug='short-lived', visibility='public', status='active')
+        db.session.add_all([
+            Programme(name='Long Lived', slug='long-lived', visibility='public', status='active'),
+            programme,
+        ])
+        db.session.commit()
+        refresh_sitemaps()
+        shards = [
+            loc.rsplit('/', 1)[1] for loc in _index_locs(client.get('/sitemap.xml').data.decode('utf-8'))
+            if '/sitemap-programmes-' in loc
+        ]
+        last = shards[-1][len('sitemap-'):-len('.xml')]
+        assert len(shards) >= 2 and client.get(f'/{shards[-1]}').status_code == 200
+
+        db.session.delete(programme)
+        db.session.commit()
+        refresh_sitemaps()
+        store = seo._sitemap_store()
+        assert store.get(f'{seo._SITEMAP_KEY_PREFIX}doc:{last}') is None
+        assert client.get(f'/{shards[-1]}').status_code == 404
+
+        # A leftover key the index does not list is not served either.
+        store.set(f'{seo._SITEMAP_KEY_PREFIX}doc:{last}', b'<urlset/>')
+        assert client.get(f'/{shards[-1]}').status_code == 404
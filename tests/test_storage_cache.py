@@ -0,0 +1,109 @@
+"""Read-through disk cache for object-storage files: ETag, Range and LRU."""
+
+import os
+import time
+
+import pytest
+
+from app.lib import storage_cache
+
+AUDIO_NAME = 'brief_run_7_item_3_20260101_120000_deadbeef.mp3'
+AUDIO_BYTES = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage_cache, 'STORAGE_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(storage_cache, '_stats', dict.fromkeys(storage_cache._stats, 0))
+    monkeypatch.setattr(storage_cache, '_etags', {})
+    monkeypatch.setattr(storage_cache, '_size_estimate', None)
+    return tmp_path
+
+
+@pytest.fixture
+def audio_origin(monkeypatch):
+    from app.brief.audio_storage import audio_storage
+
+    calls = []
+
+    def fake_get(filename):
+        calls.append(filename)
+        return AUDIO_BYTES if filename == AUDIO_NAME else None
+
+    monkeypatch.setattr(audio_storage, 'get', fake_get)
+    return calls
+
+
+def test_audio_is_fetched_once_then_served_with_etag_and_ranges(client, cache_dir, audio_origin):
+    first = client.get(f'/audio/{AUDIO_NAME}')
+    assert first.status_code == 200
+    assert first.data == AUDIO_BYTES
+    assert first.mimetype == 'audio/mpeg'
+    assert first.headers['Cache-Control'] == 'public, max-age=31536000'
+    assert first.headers['Accept-Ranges'] == 'bytes'
+    etag = first.headers['ETag']
+    assert etag and not etag.startswith('W/')
+
+    partial = client.get(f'/audio/{AUDIO_NAME}', headers={'Range': 'bytes=100-199'})
+    assert partial.status_code == 206
+    assert partial.data == AUDIO_BYTES[100:200]
+    assert partial.headers['Content-Range'] == f'bytes 100-199/{len(AUDIO_BYTES)}'
+
+    revalidated = client.get(f'/audio/{AUDIO_NAME}', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers['ETag'] == etag
+
+    assert audio_origin == [AUDIO_NAME]
+    stats = storage_cache.cache_stats()
+    assert stats['misses'] == 1 and stats['hits'] == 2 and stats['not_modified'] == 1
+    assert stats['bytes_from_origin'] == len(AUDIO_BYTES)
+    assert stats['bytes_from_cache'] == 100
+    assert stats['hit_rate'] == pytest.approx(2 / 3, abs=1e-3)
+
+
+def test_missing_audio_is_not_cached(client, cache_dir, audio_origin):
+    missing = 'brief_run_7_item_4_20260101_120000_deadbeef.mp3'
+    assert client.get(f'/audio/{missing}').status_code == 404
+    assert client.get(f'/audio/{missing}').status_code == 404
+    assert audio_origin == [missing, missing]
+    assert storage_cache.cache_stats()['not_found'] == 2
+
+
+def test_ttl_refetches_and_restart_rederives_etag(app, cache_dir):
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        return b'v1'
+
+    with app.test_request_context('/'):
+        first = storage_cache.serve_cached('k', fetch, mimetype='text/plain', download_name='k.txt', ttl_seconds=60)
+        first.close()
+        path = storage_cache._path_for('k')
+        storage_cache._etags.clear()  # as after a worker restart
+        second = storage_cache.serve_cached('k', fetch, mimetype='text/plain', download_name='k.txt', ttl_seconds=60)
+        second.close()
+        assert second.headers['ETag'] == first.headers['ETag']
+        assert len(fetches) == 1
+
+        stale = time.time() - 120
+        os.utime(path, (stale, stale))
+        storage_cache.serve_cached('k', fetch, mimetype='text/plain', download_name='k.txt', ttl_seconds=60).close()
+        assert len(fetches) == 2
+
+
+def test_eviction_drops_least_recently_served(app, cache_dir, monkeypatch):
+    monkeypatch.setattr(storage_cache, 'STORAGE_CACHE_MAX_BYTES', 250)
+    with app.test_request_context('/'):
+        for index, key in enumerate(['a', 'b']):
+            storage_cache.serve_cached(key, lambda: b'x' * 100, mimetype='text/plain', download_name=key).close()
+            past = time.time() - 1000 + index
+            os.utime(storage_cache._path_for(key), (past, past))
+        # Serving 'a' again makes 'b' the least recently used.
+        storage_cache.serve_cached('a', lambda: None, mimetype='text/plain', download_name='a').close()
+        storage_cache.serve_cached('c', lambda: b'x' * 100, mimetype='text/plain', download_name='c').close()
+
+    assert os.path.exists(storage_cache._path_for('a'))
+    assert not os.path.exists(storage_cache._path_for('b'))
+    assert os.path.exists(storage_cache._path_for('c'))
+    assert storage_cache.cache_stats()['evictions'] == 1
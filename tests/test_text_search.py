@@ -0,0 +1,111 @@
+"""Full-text search over discussions and statements (SQLite FTS5 backend in tests)."""
+
+from app.lib.text_search import search_backend, search_terms
+
+
+def _discussion(db, title, description='', keywords=None):
+    from app.models import Discussion, generate_slug
+
+    discussion = Discussion(
+        title=title,
+        slug=generate_slug(title),
+        description=description,
+        keywords=keywords,
+        has_native_statements=True,
+        topic='Society',
+        geographic_scope='global',
+    )
+    db.session.add(discussion)
+    db.session.commit()
+    return discussion
+
+
+def test_search_terms_strip_query_syntax():
+    assert search_terms('  Housing AND "rent"* (caps) ') == ['housing', 'and', 'rent', 'caps']
+    assert search_terms('!!!') == []
+
+
+def test_statement_search_ranks_matches_and_covers_translations(app, db):
+    from app.lib.text_search import apply_statement_search
+    from app.models import Statement, StatementTranslation
+
+    with app.app_context():
+        assert search_backend() == 'sqlite'
+        discussion = _discussion(db, 'Public transport')
+        strong = Statement(discussion_id=discussion.id, content='Buses buses buses should run all night.')
+        weak = Statement(discussion_id=discussion.id, content='Night trains matter more than buses, honestly.')
+        other = Statement(discussion_id=discussion.id, content='Cycling lanes deserve the money instead.')
+        db.session.add_all([strong, weak, other])
+        db.session.commit()
+        db.session.add(StatementTranslation(
+            statement_id=other.id, language_code='fr', content='Les pistes cyclables méritent cet argent.'
+        ))
+        db.session.commit()
+
+        def ids(term, **kw):
+            return [s.id for s in apply_statement_search(Statement.query, term, **kw).all()]
+
+        assert ids('bus', order_by_rank=True) == [strong.id, weak.id]
+        assert ids('cyclables') == [other.id]
+        assert ids('meritent') == [other.id]  # diacritics folded
+        assert ids('!!!') == [strong.id, weak.id, other.id]  # no words, no filter
+
+        # Edits re-index: the old wording no longer matches.
+        other.content = 'Trams are the better long-term investment here.'
+        db.session.commit()
+        assert ids('cycling') == []
+        assert ids('trams') == [other.id]
+
+
+def test_search_routes_use_full_text_index(app, db, client):
+    from app.models import DiscussionTranslation, Statement
+
+    with app.app_context():
+        housing = _discussion(db, 'Housing costs', 'Rents keep rising in cities', keywords='rent,housing')
+        _discussion(db, 'Water quality', 'Keeping rivers clean')
+        db.session.add(DiscussionTranslation(
+            discussion_id=housing.id, language_code='de', title='Wohnkosten', description='Mieten steigen'
+        ))
+        db.session.add(Statement(discussion_id=housing.id, content='Rent controls would help young renters.'))
+        db.session.commit()
+
+    resp = client.get('/discussions/api/search?search=rising')
+    titles = [d['title'] for d in resp.get_json()['data']['discussions']]
+    assert titles == ['Housing costs']
+
+    resp = client.get('/discussions/api/search?search=wohnkosten')
+    assert [d['title'] for d in resp.get_json()['data']['discussions']] == ['Housing costs']
+
+    resp = client.get('/discussions/api/search?keywords=river')
+    assert resp.get_json()['data']['discussions'] == []
+
+    page = client.get('/discussions/search?q=rivers&sort=relevance').get_data(as_text=True)
+    assert 'Water quality' in page and 'Housing costs' not in page
+
+    page = client.get('/discussions/statements/search?q=renters').get_data(as_text=True)
+    assert 'Rent controls would help young renters.' in page
+
+
+def test_postgres_search_matches_one_id_set_per_index(app, db, monkeypatch):
+    """
+    Each arm of the id UNION is a plain ``@@`` filter its own GIN index can
+    serve (``Bitmap Index Scan`` in EXPLAIN); the outer query has no OR that
+    would force a sequential scan computing to_tsvector per row.
+    """
+    from sqlalchemy.dialects import postgresql
+
+    from app.lib import text_search
+    from app.models import Discussion, Statement
+
+    monkeypatch.setattr(text_search, 'search_backend', lambda: 'postgresql')
+    with app.app_context():
+        for apply_search, model, translation in (
+            (text_search.apply_statement_search, Statement, 'statement_translation'),
+            (text_search.apply_discussion_search, Discussion, 'discussion_translation'),
+        ):
+            query = apply_search(db.session.query(model.id), 'rent control')
+            sql = str(query.statement.compile(dialect=postgresql.dialect()))
+            where = sql.split('WHERE', 1)[1]
+            assert ' OR ' not in sql
+            assert f'{model.__tablename__}.id IN (SELECT {model.__tablename__}.id \nFROM {model.__tablename__} \nWHERE' in sql
+            assert 'UNION SELECT' in where and f'FROM {translation}' in where